@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-Benchmark für die geteilten Block-Vorlagen.
+
+Vergleicht die Allokationen pro Block, wenn die Tabellen-Styles und
+Spaltenbreiten für jeden Block neu erstellt werden (bisheriges Verhalten),
+mit der Wiederverwendung der Vorlagen eines Generators. Trennlinien und
+Abstände werden in beiden Varianten bei jedem Zugriff neu erstellt, da
+ReportLab Layout-Zustand auf ihnen ablegt; geteilt werden nur die Styles.
+
+Aufruf:
+    python benchmarks/bench_block_templates.py [--bloecke 500]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+from generator.block_templates import BlockVorlagen
+from generator.elements import (
+    erstelle_flug_block, erstelle_hotel_block, erstelle_aktivitaet_block, erstelle_zusatzinfo_block
+)
+
+FLUG = {
+    "airline": "SWISS", "flugNr": "LX1070", "flugDatum": "2025-05-15",
+    "abflugOrt": "Zürich", "abflugCode": "ZRH", "abflugZeit": "2025-05-15T07:00:00",
+    "ankunftOrt": "Frankfurt", "ankunftCode": "FRA", "ankunftZeit": "2025-05-15T08:05:00",
+    "buchungsNr": "ABC123"
+}
+HOTEL = {
+    "name": "Benchmark Hotel", "adresse": "Teststrasse 1, 8000 Zürich",
+    "checkin": "2025-05-15T14:00:00", "checkout": "2025-05-17T12:00:00", "buchungsNr": "HOTEL456"
+}
+AKTIVITAET = {
+    "name": "Meeting", "datum": "2025-05-16", "startzeit": "2025-05-16T09:00:00",
+    "endzeit": "2025-05-16T12:00:00", "ort": "Büro"
+}
+ZUSATZINFO = {
+    "notfallkontakte": [{"name": "Büro Zürich", "telefon": "+41 44 123 45 67"}],
+    "waehrung": "Euro (€)", "zeitzone": "CET", "notizen": "Keine"
+}
+
+
+def erstelle_styles():
+    """
+    Erstellt die Styles wie der Generator, ohne Fonts zu registrieren.
+    """
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='Untertitel', fontSize=16, spaceAfter=8))
+    return styles
+
+
+def erstelle_bloecke(anzahl: int, styles, vorlagen_fabrik) -> list:
+    """
+    Erstellt `anzahl` Durchläufe aller vier Blocktypen und hält die Elemente am Leben,
+    damit die Allokationen wie in einer Story bis zum `doc.build` bestehen bleiben.
+    """
+    elemente = []
+    for _ in range(anzahl):
+        erstelle_flug_block(elemente, FLUG, styles, vorlagen_fabrik())
+        erstelle_hotel_block(elemente, HOTEL, styles, vorlagen_fabrik())
+        erstelle_aktivitaet_block(elemente, AKTIVITAET, styles, vorlagen_fabrik())
+        erstelle_zusatzinfo_block(elemente, ZUSATZINFO, styles, vorlagen_fabrik())
+    return elemente
+
+
+def messe(name: str, anzahl: int, styles, vorlagen_fabrik) -> None:
+    """
+    Misst Laufzeit und Allokationen pro Block und gibt sie aus.
+    """
+    bloecke = anzahl * 4
+
+    start = time.perf_counter()
+    erstelle_bloecke(anzahl, styles, vorlagen_fabrik)
+    dauer = time.perf_counter() - start
+
+    tracemalloc.start()
+    snapshot_vorher = tracemalloc.take_snapshot()
+    elemente = erstelle_bloecke(anzahl, styles, vorlagen_fabrik)
+    snapshot_nachher = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del elemente
+
+    statistik = snapshot_nachher.compare_to(snapshot_vorher, 'filename')
+    allokationen = sum(s.count_diff for s in statistik if s.count_diff > 0)
+    bytes_gesamt = sum(s.size_diff for s in statistik if s.size_diff > 0)
+
+    print(f"{name:<22} {dauer / bloecke * 1e6:>10.1f} µs/Block "
+          f"{allokationen / bloecke:>10.1f} Allokationen/Block "
+          f"{bytes_gesamt / bloecke:>10.0f} Bytes/Block")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-Benchmark für die Block-Vorlagen.")
+    parser.add_argument("--bloecke", type=int, default=500, help="Anzahl Durchläufe pro Blocktyp")
+    args = parser.parse_args()
+
+    styles = erstelle_styles()
+    geteilt = BlockVorlagen()
+
+    messe("Neu pro Block", args.bloecke, styles, BlockVorlagen)
+    messe("Geteilte Styles", args.bloecke, styles, lambda: geteilt)
+
+
+if __name__ == "__main__":
+    main()
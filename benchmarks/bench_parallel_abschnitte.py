@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark für die parallele Erstellung grosser Reisepläne in Abschnitten.
+
+Erstellt eine synthetische Roadshow (ein Flug, ein Hotel und mehrere
+Aktivitäten pro Tag) und misst die Laufzeit eines einzelnen doc.build im
+Vergleich zur Erstellung in Abschnitten mit steigender Prozesszahl. Die
+Zeiten enthalten den Start der Prozesse, wie bei einem Aufruf über das CLI.
+
+Aufruf:
+    python benchmarks/bench_parallel_abschnitte.py [--tage 30] [--aktivitaeten 8] [--prozesse 1,2,4,8]
+"""
+
+import argparse
+import datetime
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from generator.core import ReiseplanGenerator
+from generator.sections import rendere_in_abschnitten
+from generator.utils.pdf_utils import PdfTeil
+
+STAEDTE = [("Zürich", "ZRH"), ("Frankfurt", "FRA"), ("London City", "LCY"), ("Paris", "CDG"),
+           ("Wien", "VIE"), ("Amsterdam", "AMS"), ("Madrid", "MAD"), ("Mailand", "MXP")]
+
+
+def erstelle_roadshow(tage: int, aktivitaeten_pro_tag: int) -> dict:
+    """
+    Erstellt die Daten einer Roadshow über `tage` Tage.
+    """
+    start = datetime.date(2025, 3, 3)
+    fluege, hotels, aktivitaeten = [], [], []
+    for nummer in range(tage):
+        tag = start + datetime.timedelta(days=nummer)
+        (von_ort, von_code), (nach_ort, nach_code) = STAEDTE[nummer % 8], STAEDTE[(nummer + 1) % 8]
+        fluege.append({
+            "flugNr": f"LX{1000 + nummer}", "flugDatum": tag.isoformat(),
+            "abflugOrt": von_ort, "abflugCode": von_code, "abflugZeit": f"{tag}T07:00:00",
+            "ankunftOrt": nach_ort, "ankunftCode": nach_code, "ankunftZeit": f"{tag}T09:15:00",
+            "buchungsNr": f"RS{nummer:03d}"
+        })
+        hotels.append({
+            "name": f"Hotel {nach_ort} {nummer}", "adresse": f"Hauptstrasse {nummer}, {nach_ort}",
+            "checkin": f"{tag}T15:00:00", "checkout": f"{tag + datetime.timedelta(days=1)}T10:00:00"
+        })
+        for termin in range(aktivitaeten_pro_tag):
+            stunde = 10 + termin % 12
+            aktivitaeten.append({
+                "name": f"Termin {termin + 1} in {nach_ort}", "datum": tag.isoformat(),
+                "startzeit": f"{tag}T{stunde:02d}:00:00", "endzeit": f"{tag}T{stunde:02d}:50:00",
+                "ort": f"Kunde {termin}, {nach_ort}"
+            })
+    return {
+        "titel": "Roadshow", "startdatum": start.isoformat(),
+        "enddatum": (start + datetime.timedelta(days=tage)).isoformat(), "reiseziel": "Europa",
+        "reisende": ["Max Mustermann"], "fluege": fluege, "hotels": hotels, "aktivitaeten": aktivitaeten,
+        "zusatzinfo": {"waehrung": "EUR", "zeitzone": "MEZ"}
+    }
+
+
+def messe(generator: ReiseplanGenerator, daten: dict, wiederholungen: int) -> tuple:
+    """
+    Liefert die beste Laufzeit und die Seitenzahl des erstellten PDFs.
+    """
+    beste, pdf = float("inf"), None
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        pdf = generator.rendere_pdf_daten(daten)
+        beste = min(beste, time.perf_counter() - start)
+    return beste, PdfTeil(pdf).seiten
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für die Erstellung in Abschnitten.")
+    parser.add_argument("--tage", type=int, default=30, help="Dauer der Roadshow in Tagen")
+    parser.add_argument("--aktivitaeten", type=int, default=8, help="Aktivitäten pro Tag")
+    parser.add_argument("--prozesse", default=None,
+                        help="Prozesszahlen, kommagetrennt (Standard: 1, 2, 4, ... bis zur Anzahl Kerne)")
+    parser.add_argument("--wiederholungen", type=int, default=3, help="Messungen pro Variante (beste zählt)")
+    args = parser.parse_args()
+
+    kerne = os.cpu_count() or 1
+    if args.prozesse:
+        prozesszahlen = [int(anzahl) for anzahl in args.prozesse.split(",")]
+    else:
+        prozesszahlen = [anzahl for anzahl in (1, 2, 4, 8, 16, 32, 64) if anzahl < kerne] + [kerne]
+
+    daten = erstelle_roadshow(args.tage, args.aktivitaeten)
+    bloecke = len(daten["fluege"]) + len(daten["hotels"]) + len(daten["aktivitaeten"])
+    print(f"Roadshow: {args.tage} Tage, {bloecke} Blöcke, {kerne} Kerne")
+
+    einzeln, seiten = messe(ReiseplanGenerator(linearisiert=False, parallel_prozesse=0), daten, args.wiederholungen)
+    print(f"{'Ein Durchlauf':<22} {einzeln:>8.2f} s {'':>8} {seiten:>6} Seiten")
+
+    generator = ReiseplanGenerator(linearisiert=False)
+    for anzahl in prozesszahlen:
+        beste = float("inf")
+        for _ in range(args.wiederholungen):
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=anzahl) as executor:
+                seiten = rendere_in_abschnitten(generator, daten, io.BytesIO(), anzahl, executor)
+            beste = min(beste, time.perf_counter() - start)
+        print(f"{f'Abschnitte, {anzahl} Proz.':<22} {beste:>8.2f} s {einzeln / beste:>7.2f}x {seiten:>6} Seiten")
+
+if __name__ == "__main__":
+    main()
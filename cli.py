@@ -12,8 +12,13 @@ import argparse
 from pathlib import Path
 import logging
 
-from generator.core import ReiseplanGenerator
-from generator.config import BASE_DIR
+from generator.core import ReiseplanGenerator, PROFIL_KOMPAKT, ReisendeFehlen
+from generator.apis.flugplan import FlugplanIndex, FlugplanFehler
+from generator.batch import fuehre_batch_aus, merge_manifeste, parse_shard
+from generator.bundle import erstelle_sammeldokument, SammeldokumentFehler
+from generator.themes import ThemeFehler
+from generator.config import BASE_DIR, PDF_PROFIL, PDF_LINEARISIERT, THEME, PARALLEL_PROZESSE
+from generator.logo_cache import bereite_logos_vor
 from generator.utils.logging_setup import setup_logging
 
 
@@ -31,7 +36,8 @@ def main():
     
     parser.add_argument(
         "reiseplan_pfad",
-        help="Pfad zur JSON-Datei mit Reisedaten"
+        nargs="+",
+        help="Pfad zur JSON-Datei mit Reisedaten (mehrere Dateien oder Verzeichnisse für den Batch-Modus)"
     )
     
     parser.add_argument(
@@ -46,28 +52,248 @@ def main():
         action="store_true"
     )
     
+    parser.add_argument(
+        "--pro-reisendem",
+        help="Erstellt für jeden Reisenden ein eigenes PDF aus dem gemeinsamen Reiseplan",
+        action="store_true"
+    )
+    
+    parser.add_argument(
+        "--shard",
+        help="Bearbeitet im Batch-Modus nur den Anteil i von n (Format 'i/n', i ab 0)"
+    )
+    
+    parser.add_argument(
+        "--manifest",
+        help="Pfad für das Manifest des Batch-Laufs (Standard: im Ausgabeverzeichnis)"
+    )
+    
+    parser.add_argument(
+        "--kein-vorabruf",
+        help="Deaktiviert im Batch-Modus den gemeinsamen Vorabruf der Flugdaten",
+        action="store_true"
+    )
+    
+    parser.add_argument(
+        "--nach-name",
+        help="Bearbeitet im Batch-Modus die Reisepläne nach Dateiname statt nach Priorität und Abreise",
+        action="store_true"
+    )
+    
+    parser.add_argument(
+        "--merge-manifeste",
+        metavar="ZIEL",
+        help="Führt die angegebenen Shard-Manifeste zu einem Gesamtbericht in ZIEL zusammen"
+    )
+    
+    parser.add_argument(
+        "--sammeldokument",
+        metavar="ZIEL",
+        help="Fasst alle angegebenen Reisepläne zu einem PDF mit Inhaltsverzeichnis und Lesezeichen in ZIEL zusammen"
+    )
+    
+    parser.add_argument(
+        "--archiv",
+        metavar="ZIEL",
+        help="Schreibt die PDFs des Batches mit Manifest in ein Archiv (.zip, .tar, .tar.gz oder '-' für TAR auf stdout)"
+    )
+    
+    parser.add_argument(
+        "--kompakt",
+        help="Erstellt kompakte PDFs (verkleinerte Logos, maximale Kompression) und meldet die gesparten Bytes",
+        action="store_true"
+    )
+    
+    parser.add_argument(
+        "--theme",
+        metavar="ID",
+        help="Theme für Reisepläne ohne eigenes Feld 'theme' (Standard: REISEPLAN_THEME oder 'standard')"
+    )
+    
+    parser.add_argument(
+        "--format",
+        metavar="FORMATE",
+        help="Erstellt den Reiseplan in den angegebenen Formaten, z.B. 'pdf,html,ics' (Standard: pdf)"
+    )
+    
+    parser.add_argument(
+        "--linearisiert",
+        help="Linearisiert die PDFs für die schnelle Anzeige im Browser (benötigt pikepdf oder qpdf)",
+        action="store_true"
+    )
+    
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=PARALLEL_PROZESSE,
+        metavar="N",
+        help="Erstellt sehr grosse Reisepläne in Abschnitten auf N Prozessen (Standard: REISEPLAN_PARALLEL_PROZESSE oder 0 = aus)"
+    )
+    
+    parser.add_argument(
+        "--importiere-flugplan",
+        help="Importiert die angegebenen CSV-/JSON-Flugplandateien in den lokalen Flugplan-Index",
+        action="store_true"
+    )
+    
+    parser.add_argument(
+        "--logos-vorbereiten",
+        help="Erstellt die Logo-Derivate für die angegebenen Logo-Dateien oder Asset-Verzeichnisse im Logo-Cache",
+        action="store_true"
+    )
+    
     args = parser.parse_args()
     
+    # Bei Archiv-Ausgabe auf stdout protokollieren wir auf stderr
+    if args.archiv == "-":
+        logger = setup_logging(konsole=sys.stderr)
+    
     # Debug-Modus
     if args.debug:
         logger.setLevel(logging.DEBUG)
         logger.debug("Debug-Modus wurde aktiviert")
     
-    # Überprüfe, ob die Reiseplan-Datei existiert
-    reiseplan_pfad = Path(args.reiseplan_pfad)
-    if not reiseplan_pfad.exists():
-        logger.error(f"Fehler: Die angegebene Datei '{reiseplan_pfad}' existiert nicht.")
-        sys.exit(1)
+    # Überprüfe, ob die Reiseplan-Dateien existieren
+    reiseplan_pfade = [Path(pfad) for pfad in args.reiseplan_pfad]
+    for reiseplan_pfad in reiseplan_pfade:
+        if not reiseplan_pfad.exists():
+            logger.error(f"Fehler: Die angegebene Datei '{reiseplan_pfad}' existiert nicht.")
+            sys.exit(1)
+    
+    # Flugplandaten importieren
+    if args.importiere_flugplan:
+        flugplan = FlugplanIndex()
+        try:
+            for flugplan_pfad in reiseplan_pfade:
+                flugplan.importiere(flugplan_pfad)
+        except (FlugplanFehler, ValueError) as e:
+            logger.error(f"Fehler beim Importieren des Flugplans: {e}")
+            sys.exit(1)
+        logger.info(f"Flugplan-Index enthält {flugplan.anzahl()} Einträge: {flugplan.db_pfad}")
+        return
+    
+    # Logo-Derivate vorab erstellen
+    if args.logos_vorbereiten:
+        try:
+            bereite_logos_vor(reiseplan_pfade)
+        except OSError as e:
+            logger.error(f"Fehler beim Vorbereiten der Logos: {e}")
+            sys.exit(1)
+        return
+    
+    # Shard-Manifeste zusammenführen
+    if args.merge_manifeste:
+        bericht = merge_manifeste(reiseplan_pfade, args.merge_manifeste)
+        zusammenfassung = bericht["zusammenfassung"]
+        logger.info(f"{zusammenfassung['ok']} von {zusammenfassung['reiseplaene']} Reiseplänen erfolgreich, "
+                    f"Bericht: {args.merge_manifeste}")
+        if zusammenfassung["fehler"] or bericht["fehlende_shards"]:
+            sys.exit(1)
+        return
+    
+    shard = None
+    if args.shard:
+        try:
+            shard = parse_shard(args.shard)
+        except ValueError as e:
+            logger.error(f"Fehler: {e}")
+            sys.exit(1)
     
     # Initialisiere den Generator
-    generator = ReiseplanGenerator()
+    try:
+        generator = ReiseplanGenerator(PROFIL_KOMPAKT if args.kompakt else PDF_PROFIL,
+                                       linearisiert=args.linearisiert or PDF_LINEARISIERT,
+                                       theme=args.theme or THEME,
+                                       parallel_prozesse=args.parallel)
+    except ThemeFehler as e:
+        logger.error(f"Fehler: {e}")
+        sys.exit(1)
     
     try:
+        # Alle Reisepläne in einem Dokument für den Druck
+        if args.sammeldokument:
+            try:
+                ergebnis = erstelle_sammeldokument(
+                    generator, reiseplan_pfade, args.sammeldokument, shard, vorabruf=not args.kein_vorabruf
+                )
+            except SammeldokumentFehler as e:
+                logger.error(f"Fehler beim Erstellen des Sammeldokuments: {e}")
+                sys.exit(1)
+            fehler = [eintrag for eintrag in ergebnis["eintraege"] if eintrag["status"] != "ok"]
+            logger.info(f"Sammeldokument mit {ergebnis['seiten']} Seiten erstellt: {ergebnis['pdf']}")
+            for eintrag in fehler:
+                logger.error(f"Nicht enthalten: {eintrag['reiseplan']} ({eintrag['fehler']})")
+            if fehler:
+                sys.exit(1)
+            return
+        
+        # Batch-Modus für mehrere Dateien, Verzeichnisse oder Shards
+        batch = len(reiseplan_pfade) > 1 or reiseplan_pfade[0].is_dir() or shard or args.manifest or args.archiv
+        if batch:
+            try:
+                manifest = fuehre_batch_aus(
+                    generator, reiseplan_pfade, shard, args.manifest, args.pro_reisendem,
+                    vorabruf=not args.kein_vorabruf, archiv=args.archiv, nach_abreise=not args.nach_name
+                )
+            except ValueError as e:
+                logger.error(f"Fehler: {e}")
+                sys.exit(1)
+            zusammenfassung = manifest["zusammenfassung"]
+            logger.info(f"Batch abgeschlossen: {zusammenfassung['ok']} von {zusammenfassung['reiseplaene']} "
+                        f"Reiseplänen erfolgreich, {zusammenfassung['pdfs']} PDFs erstellt")
+            for eintrag in manifest["verpasste_fristen"]:
+                logger.warning(f"Frist verpasst: {eintrag['reiseplan']} (Frist {eintrag['frist']}, "
+                               f"fertig {eintrag['fertig']})")
+            if zusammenfassung["fehler"]:
+                sys.exit(1)
+            return
+        
+        reiseplan_pfad = reiseplan_pfade[0]
+        
+        # Weitere Formate aus demselben aufbereiteten Reiseplan
+        if args.format:
+            formate = tuple(format_.strip().lower() for format_ in args.format.split(",") if format_.strip())
+            try:
+                pfade = generator.generiere_formate(reiseplan_pfad, formate)
+            except ValueError as e:
+                logger.error(f"Fehler: {e}")
+                sys.exit(1)
+            if not pfade:
+                logger.error("Fehler beim Generieren des Reiseplans.")
+                sys.exit(1)
+            for format_, pfad in pfade.items():
+                logger.info(f"Reiseplan ({format_}) wurde erfolgreich generiert: {pfad}")
+            if args.open and "pdf" in pfade:
+                oeffne_pdf(pfade["pdf"])
+            return
+        
+        # Ein PDF pro Reisendem aus dem gemeinsamen Reiseplan
+        if args.pro_reisendem:
+            try:
+                pdf_pfade = generator.generiere_reiseplaene_pro_reisendem(reiseplan_pfad)
+                fehler = None if pdf_pfade else "Fehler beim Generieren der persönlichen Reisepläne."
+            except ReisendeFehlen as e:
+                pdf_pfade, fehler = e.pdf_pfade, f"Fehler: {e}"
+            for pdf_pfad in pdf_pfade:
+                logger.info(f"Reiseplan wurde erfolgreich generiert: {pdf_pfad}")
+                if args.open:
+                    oeffne_pdf(pdf_pfad)
+            if fehler:
+                logger.error(fehler)
+                sys.exit(1)
+            return
+        
         # Generiere den Reiseplan
-        pdf_pfad = generator.generiere_reiseplan(reiseplan_pfad)
+        bericht = {}
+        pdf_pfad = generator.generiere_reiseplan(reiseplan_pfad, bericht=bericht)
         
         if pdf_pfad:
             logger.info(f"Reiseplan wurde erfolgreich generiert: {pdf_pfad}")
+            if bericht:
+                logger.info(f"Grösse: {bericht['bytes']} Bytes, {bericht['bytes_gespart']} Bytes "
+                            f"gegenüber dem Standardprofil gespart")
+                if bericht["fonts_ohne_subset"]:
+                    logger.warning(f"Fonts ohne Subset: {', '.join(bericht['fonts_ohne_subset'])}")
             
             # Wenn --open Option gesetzt ist, versuche das PDF zu öffnen
             if args.open:
@@ -2,87 +2,159 @@
 Integration mit Flight-APIs für den Reiseplan-Generator.
 """
 
-import requests
 import logging
-from typing import Dict, Any, Optional
-import datetime
+import threading
+import time
+from typing import Dict, Any, Optional, Tuple
 
-from ..config import FLIGHT_API_KEY, FLIGHT_API_URL
+from ..config import FLIGHT_API_NEGATIVE_TTL
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
 
+# Maximale Anzahl Einträge im Negativ-Cache, bevor abgelaufene Einträge entfernt werden
+MAX_NEGATIV_CACHE = 1024
+
 
 class FlightAPIException(Exception):
     """Exception für Flight-API-Fehler."""
     pass
 
 
+class KeineFlugdatenException(FlightAPIException):
+    """Exception, wenn die Flight-API für einen Flug keine Daten liefert."""
+    pass
+
+
+class _LaufenderAbruf:
+    """Ein API-Abruf, auf dessen Ergebnis weitere Aufrufer warten können."""
+    
+    def __init__(self):
+        self.fertig = threading.Event()
+        self.ergebnis: Optional[Dict[str, Any]] = None
+        self.fehler: Optional[FlightAPIException] = None
+
+
+_lock = threading.Lock()
+_laufende_abrufe: Dict[Tuple[str, str], _LaufenderAbruf] = {}
+_negativ_cache: Dict[Tuple[str, str], Tuple[float, str]] = {}
+
+
 def hole_fluginformationen(flug_nr: str, flug_datum: str) -> Optional[Dict[str, Any]]:
     """
     Holt Fluginformationen von einer Flight-API.
     
+    Gleichzeitige Anfragen für denselben Flug im selben Prozess teilen sich einen
+    einzigen API-Abruf. Flüge, für die die API keine Daten liefert, werden für
+    FLIGHT_API_NEGATIVE_TTL Sekunden nicht erneut angefragt.
+    
     Args:
         flug_nr: Flugnummer (z.B. 'LX1234')
         flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
         
     Returns:
-        Optional[Dict[str, Any]]: Vollständige Flugdaten oder None bei Fehler
+        Optional[Dict[str, Any]]: Vollständige Flugdaten (eigene Kopie pro Aufrufer)
         
     Raises:
         FlightAPIException: Bei Fehlern in der API-Integration
     """
-    if not FLIGHT_API_KEY:
-        logger.warning("Kein API-Schlüssel für Flight-API konfiguriert")
-        raise FlightAPIException("Kein API-Schlüssel konfiguriert")
+    schluessel = (flug_nr, flug_datum)
     
-    try:
-        logger.info(f"Rufe Flugdaten für {flug_nr} am {flug_datum} ab...")
-        
-        # Bereite API-Anfrage vor
-        params = {
-            "access_key": FLIGHT_API_KEY,
-            "flight_iata": flug_nr,
-            "flight_date": flug_datum
-        }
+    with _lock:
+        # Negativ-Cache prüfen
+        negativ = _negativ_cache.get(schluessel)
+        if negativ:
+            if negativ[0] > time.monotonic():
+                logger.debug(f"Negativ-Cache-Treffer für Flug {flug_nr} am {flug_datum}")
+                raise KeineFlugdatenException(negativ[1])
+            del _negativ_cache[schluessel]
         
-        # Sende API-Anfrage
-        response = requests.get(FLIGHT_API_URL, params=params)
-        response.raise_for_status()
+        # An laufenden Abruf anhängen oder selbst abrufen
+        abruf = _laufende_abrufe.get(schluessel)
+        fuehrend = abruf is None
+        if fuehrend:
+            abruf = _LaufenderAbruf()
+            _laufende_abrufe[schluessel] = abruf
+    
+    if not fuehrend:
+        logger.debug(f"Warte auf laufenden Abruf für Flug {flug_nr} am {flug_datum}")
+        abruf.fertig.wait()
+        if abruf.fehler:
+            raise abruf.fehler
+        if abruf.ergebnis is None:
+            raise FlightAPIException(f"Laufender Abruf für Flug {flug_nr} am {flug_datum} ohne Ergebnis beendet")
+        return dict(abruf.ergebnis)
+    
+    try:
+        abruf.ergebnis = _frage_api_ab(flug_nr, flug_datum)
+        return dict(abruf.ergebnis)
+    except FlightAPIException as e:
+        abruf.fehler = e
+        if isinstance(e, KeineFlugdatenException):
+            _merke_negativ(schluessel, str(e))
+        raise
+    except BaseException as e:
+        # Wartende Aufrufer erhalten auch unerwartete Fehler als FlightAPIException
+        abruf.fehler = FlightAPIException(f"Unerwarteter Fehler beim Abruf von Flug {flug_nr}: {e!r}")
+        raise
+    finally:
+        with _lock:
+            del _laufende_abrufe[schluessel]
+        abruf.fertig.set()
+
+
+def _merke_negativ(schluessel: Tuple[str, str], meldung: str) -> None:
+    """
+    Speichert einen Flug ohne Daten im Negativ-Cache.
+    
+    Args:
+        schluessel: Flugnummer und Datum
+        meldung: Fehlermeldung für spätere Treffer
+    """
+    if FLIGHT_API_NEGATIVE_TTL <= 0:
+        return
+    
+    jetzt = time.monotonic()
+    with _lock:
+        if len(_negativ_cache) >= MAX_NEGATIV_CACHE:
+            for alt in [k for k, (ablauf, _) in _negativ_cache.items() if ablauf <= jetzt]:
+                del _negativ_cache[alt]
+        _negativ_cache[schluessel] = (jetzt + FLIGHT_API_NEGATIVE_TTL, meldung)
+
+
+def _frage_api_ab(flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+    """
+    Fragt die konfigurierten Flugdaten-Provider ab (siehe providers.py).
+    
+    Args:
+        flug_nr: Flugnummer (z.B. 'LX1234')
+        flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
         
-        # Verarbeite Antwort
-        data = response.json()
+    Returns:
+        Dict[str, Any]: Vollständige Flugdaten
         
-        if "data" in data and len(data["data"]) > 0:
-            flight_data = data["data"][0]
-            
-            # Extrahiere relevante Daten
-            airline = flight_data["airline"]["name"]
-            departure = flight_data["departure"]
-            arrival = flight_data["arrival"]
-            
-            # Erstelle Flug-Dictionary
-            return {
-                "airline": airline,
-                "flugNr": flug_nr,
-                "abflugOrt": departure["airport"],
-                "abflugCode": departure["iata"],
-                "abflugZeit": departure["scheduled"],
-                "ankunftOrt": arrival["airport"],
-                "ankunftCode": arrival["iata"],
-                "ankunftZeit": arrival["scheduled"],
-                "buchungsNr": flight_data.get("flight", {}).get("number", "")
-            }
-        else:
-            logger.warning(f"Keine Daten für Flug {flug_nr} am {flug_datum} gefunden")
-            raise FlightAPIException(f"Keine Daten für Flug {flug_nr} gefunden")
-            
-    except requests.RequestException as e:
-        logger.error(f"HTTP-Fehler bei der Flight-API-Anfrage: {e}")
-        raise FlightAPIException(f"Fehler bei der API-Anfrage: {str(e)}")
-    except KeyError as e:
-        logger.error(f"Unerwartetes Format der Flight-API-Antwort: {e}")
-        raise FlightAPIException(f"Unerwartetes Format der API-Antwort: {str(e)}")
-    except Exception as e:
-        logger.error(f"Unerwarteter Fehler bei der Flight-API-Integration: {e}")
-        raise FlightAPIException(f"Unerwarteter Fehler: {str(e)}")
\ No newline at end of file
+    Raises:
+        KeineFlugdatenException: Wenn kein Provider für den Flug Daten liefert
+        FlightAPIException: Bei anderen Fehlern in der API-Integration
+    """
+    # Verzögerter Import, da providers.py die Exceptions dieses Moduls verwendet
+    from .providers import hedging_abrufer
+    
+    abrufer = hedging_abrufer()
+    if abrufer is None:
+        logger.warning("Kein API-Schlüssel für Flight-API konfiguriert")
+        raise FlightAPIException("Kein API-Schlüssel konfiguriert")
+    
+    return abrufer.hole(flug_nr, flug_datum)
+
+
+def flight_api_konfiguriert() -> bool:
+    """
+    Prüft, ob mindestens ein Flugdaten-Provider mit API-Schlüssel konfiguriert ist.
+    
+    Returns:
+        bool: True, wenn Flugdaten abgerufen werden können
+    """
+    from .providers import konfigurierte_provider
+    
+    return bool(konfigurierte_provider())
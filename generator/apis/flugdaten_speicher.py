@@ -0,0 +1,340 @@
+"""
+Gespeicherte Flugdaten-Ergänzungen mit Revalidierung im Hintergrund (stale-while-revalidate).
+
+Im Speichermodus verwendet ein Render immer sofort die zuletzt bekannte
+Ergänzung eines Flugs und wartet nie auf die Flight-API. Zusätzlich wird
+festgehalten, welche Reisepläne welchen Flug verwenden. Ein Aktualisierer
+prüft die gespeicherten Flüge der nächsten Tage regelmässig erneut; ändern
+sich dabei Abflug- oder Ankunftszeit, werden die betroffenen Reisepläne
+vermerkt, damit nur deren PDFs neu erstellt werden müssen.
+"""
+
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any, List, Optional, Union
+
+from ..config import FLUGDATEN_DB, FLUGDATEN_SWR, FLUGDATEN_REVALIDIERUNG_TAGE, FLUGDATEN_REVALIDIERUNG_INTERVALL
+from .flight_api import hole_fluginformationen, FlightAPIException
+from .flugplan import standard_flugplan
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Felder, deren Änderung eine Neuerstellung der betroffenen PDFs erfordert
+ZEITFELDER = ("abflugZeit", "ankunftZeit")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flugdaten (
+    flug_nr TEXT NOT NULL,
+    flug_datum TEXT NOT NULL,
+    daten TEXT NOT NULL,
+    abgerufen REAL NOT NULL,
+    geprueft REAL NOT NULL,
+    PRIMARY KEY (flug_nr, flug_datum)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS verwendung (
+    flug_nr TEXT NOT NULL,
+    flug_datum TEXT NOT NULL,
+    reiseplan TEXT NOT NULL,
+    PRIMARY KEY (flug_nr, flug_datum, reiseplan)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS betroffen (
+    reiseplan TEXT PRIMARY KEY,
+    flug_nr TEXT NOT NULL,
+    flug_datum TEXT NOT NULL,
+    alt TEXT NOT NULL,
+    neu TEXT NOT NULL,
+    erkannt REAL NOT NULL
+);
+"""
+
+
+class FlugdatenSpeicher:
+    """
+    Zuletzt bekannte Flugdaten und ihre Verwendung in Reiseplänen, gespeichert in SQLite.
+    """
+
+    def __init__(self, db_pfad: Union[str, Path] = FLUGDATEN_DB):
+        """
+        Args:
+            db_pfad: Pfad zur SQLite-Datei des Speichers
+        """
+        self.db_pfad = Path(db_pfad)
+        self._lock = threading.Lock()
+        self._verbindung: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _db(self) -> sqlite3.Connection:
+        """
+        Liefert die Datenbankverbindung dieses Prozesses (nach einem fork eine neue).
+        """
+        if self._verbindung is None or self._pid != os.getpid():
+            self.db_pfad.parent.mkdir(exist_ok=True, parents=True)
+            self._verbindung = sqlite3.connect(str(self.db_pfad), timeout=30, check_same_thread=False)
+            self._verbindung.row_factory = sqlite3.Row
+            self._verbindung.execute("PRAGMA journal_mode=WAL")
+            self._verbindung.executescript(SCHEMA)
+            self._pid = os.getpid()
+        return self._verbindung
+
+    def lade(self, flug_nr: str, flug_datum: str) -> Optional[Dict[str, Any]]:
+        """
+        Liefert die zuletzt bekannten Daten eines Flugs.
+
+        Args:
+            flug_nr: Flugnummer
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+
+        Returns:
+            Optional[Dict[str, Any]]: Flugdaten oder None, wenn der Flug nicht gespeichert ist
+        """
+        with self._lock:
+            zeile = self._db().execute(
+                "SELECT daten FROM flugdaten WHERE flug_nr = ? AND flug_datum = ?", (flug_nr, flug_datum)
+            ).fetchone()
+        return json.loads(zeile["daten"]) if zeile else None
+
+    def speichere(self, flug_nr: str, flug_datum: str, flugdaten: Dict[str, Any]) -> None:
+        """
+        Speichert die aktuellen Daten eines Flugs.
+
+        Args:
+            flug_nr: Flugnummer
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+            flugdaten: Vollständige Flugdaten
+        """
+        jetzt = time.time()
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO flugdaten VALUES (?, ?, ?, ?, ?)",
+                    (flug_nr, flug_datum, json.dumps(flugdaten, ensure_ascii=False), jetzt, jetzt)
+                )
+
+    def merke_verwendung(self, reiseplan: str, flug_nr: str, flug_datum: str) -> None:
+        """
+        Vermerkt, dass ein Reiseplan einen Flug verwendet.
+
+        Args:
+            reiseplan: Kennung des Reiseplans (absoluter Pfad der JSON-Datei)
+            flug_nr: Flugnummer
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+        """
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute("INSERT OR IGNORE INTO verwendung VALUES (?, ?, ?)", (flug_nr, flug_datum, reiseplan))
+
+    def faellige_fluege(self, bis_datum: str, geprueft_vor: float) -> List[Dict[str, Any]]:
+        """
+        Liefert gespeicherte Flüge ab heute bis zu einem Datum, die vor einem Zeitpunkt zuletzt geprüft wurden.
+
+        Args:
+            bis_datum: Letztes Abflugdatum im Format 'YYYY-MM-DD'
+            geprueft_vor: Zeitstempel der spätesten letzten Prüfung
+
+        Returns:
+            List[Dict[str, Any]]: Flugnummer, Datum und gespeicherte Daten, nach Abflugdatum sortiert
+        """
+        with self._lock:
+            zeilen = self._db().execute(
+                "SELECT flug_nr, flug_datum, daten FROM flugdaten "
+                "WHERE flug_datum >= ? AND flug_datum <= ? AND geprueft < ? ORDER BY flug_datum",
+                (datetime.date.today().isoformat(), bis_datum, geprueft_vor)
+            ).fetchall()
+        return [
+            {"flug_nr": z["flug_nr"], "flug_datum": z["flug_datum"], "daten": json.loads(z["daten"])}
+            for z in zeilen
+        ]
+
+    def aktualisiere(self, flug_nr: str, flug_datum: str, flugdaten: Dict[str, Any]) -> List[str]:
+        """
+        Speichert revalidierte Flugdaten und vermerkt bei geänderten Zeiten die betroffenen Reisepläne.
+
+        Args:
+            flug_nr: Flugnummer
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+            flugdaten: Frisch abgerufene Flugdaten
+
+        Returns:
+            List[str]: Betroffene Reisepläne (leer, wenn sich keine Zeit geändert hat)
+        """
+        jetzt = time.time()
+        with self._lock:
+            db = self._db()
+            with db:
+                zeile = db.execute(
+                    "SELECT daten FROM flugdaten WHERE flug_nr = ? AND flug_datum = ?", (flug_nr, flug_datum)
+                ).fetchone()
+                alt = json.loads(zeile["daten"]) if zeile else {}
+                db.execute(
+                    "INSERT OR REPLACE INTO flugdaten VALUES (?, ?, ?, ?, ?)",
+                    (flug_nr, flug_datum, json.dumps(flugdaten, ensure_ascii=False), jetzt, jetzt)
+                )
+
+                alte_zeiten = {feld: alt.get(feld) for feld in ZEITFELDER}
+                neue_zeiten = {feld: flugdaten.get(feld) for feld in ZEITFELDER}
+                if not zeile or alte_zeiten == neue_zeiten:
+                    return []
+
+                reiseplaene = [z["reiseplan"] for z in db.execute(
+                    "SELECT reiseplan FROM verwendung WHERE flug_nr = ? AND flug_datum = ?", (flug_nr, flug_datum)
+                )]
+                db.executemany(
+                    "INSERT OR REPLACE INTO betroffen VALUES (?, ?, ?, ?, ?, ?)",
+                    [(reiseplan, flug_nr, flug_datum, json.dumps(alte_zeiten), json.dumps(neue_zeiten), jetzt)
+                     for reiseplan in reiseplaene]
+                )
+        return reiseplaene
+
+    def betroffene_reiseplaene(self) -> List[Dict[str, Any]]:
+        """
+        Liefert die Reisepläne, deren PDFs wegen geänderter Flugzeiten neu erstellt werden müssen.
+
+        Returns:
+            List[Dict[str, Any]]: Reiseplan, auslösender Flug sowie alte und neue Zeiten
+        """
+        with self._lock:
+            zeilen = self._db().execute("SELECT * FROM betroffen ORDER BY erkannt").fetchall()
+        return [
+            {
+                "reiseplan": z["reiseplan"],
+                "flug_nr": z["flug_nr"],
+                "flug_datum": z["flug_datum"],
+                "alt": json.loads(z["alt"]),
+                "neu": json.loads(z["neu"]),
+                "erkannt": z["erkannt"]
+            }
+            for z in zeilen
+        ]
+
+    def quittiere(self, reiseplan: str) -> None:
+        """
+        Entfernt einen Reiseplan aus den betroffenen Reiseplänen, nachdem sein PDF neu erstellt wurde.
+
+        Args:
+            reiseplan: Kennung des Reiseplans (absoluter Pfad der JSON-Datei)
+        """
+        with self._lock:
+            db = self._db()
+            with db:
+                db.execute("DELETE FROM betroffen WHERE reiseplan = ?", (reiseplan,))
+
+
+def _frische_flugdaten(flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+    """
+    Ruft die aktuellen Daten eines Flugs ab (lokaler Flugplan, sonst Flight-API).
+    """
+    flugplan = standard_flugplan()
+    if flugplan:
+        flugdaten = flugplan.suche(flug_nr, flug_datum)
+        if flugdaten:
+            return flugdaten
+    return hole_fluginformationen(flug_nr, flug_datum)
+
+
+class FlugdatenAktualisierer:
+    """
+    Revalidiert gespeicherte Flugdaten der nächsten Tage, einmalig oder periodisch im Hintergrund.
+    """
+
+    def __init__(self, speicher: FlugdatenSpeicher, tage: int = FLUGDATEN_REVALIDIERUNG_TAGE,
+                 intervall: float = FLUGDATEN_REVALIDIERUNG_INTERVALL,
+                 quelle: Callable[[str, str], Dict[str, Any]] = _frische_flugdaten):
+        """
+        Args:
+            speicher: Speicher mit den zuletzt bekannten Flugdaten
+            tage: Flüge mit Abflug in den nächsten so vielen Tagen werden revalidiert
+            intervall: Mindestabstand zwischen zwei Prüfungen desselben Flugs in Sekunden
+            quelle: Liefert die aktuellen Daten eines Flugs
+        """
+        self.speicher = speicher
+        self.tage = tage
+        self.intervall = intervall
+        self.quelle = quelle
+        self._stopp = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def revalidiere(self) -> List[Dict[str, Any]]:
+        """
+        Prüft alle fälligen Flüge einmal erneut.
+
+        Flüge, die nicht abgerufen werden können, behalten ihre bisherigen Daten.
+
+        Returns:
+            List[Dict[str, Any]]: Geänderte Flüge mit den betroffenen Reiseplänen
+        """
+        bis_datum = (datetime.date.today() + datetime.timedelta(days=self.tage)).isoformat()
+        faellig = self.speicher.faellige_fluege(bis_datum, time.time() - self.intervall)
+        logger.info(f"Revalidiere {len(faellig)} Flüge bis {bis_datum}")
+
+        aenderungen = []
+        for eintrag in faellig:
+            if self._stopp.is_set():
+                break
+            flug_nr, flug_datum = eintrag["flug_nr"], eintrag["flug_datum"]
+            try:
+                flugdaten = self.quelle(flug_nr, flug_datum)
+            except FlightAPIException as e:
+                logger.warning(f"Revalidierung von Flug {flug_nr} am {flug_datum} fehlgeschlagen: {e}")
+                continue
+
+            reiseplaene = self.speicher.aktualisiere(flug_nr, flug_datum, flugdaten)
+            if reiseplaene:
+                logger.info(f"Flugzeiten von {flug_nr} am {flug_datum} geändert, "
+                            f"{len(reiseplaene)} Reisepläne betroffen")
+                aenderungen.append({"flug_nr": flug_nr, "flug_datum": flug_datum, "reiseplaene": reiseplaene})
+        return aenderungen
+
+    def starten(self) -> None:
+        """
+        Startet die periodische Revalidierung in einem Hintergrund-Thread.
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopp.clear()
+        self._thread = threading.Thread(target=self._schleife, name="flugdaten-revalidierung", daemon=True)
+        self._thread.start()
+
+    def stoppen(self) -> None:
+        """
+        Beendet die periodische Revalidierung und wartet auf den Hintergrund-Thread.
+        """
+        self._stopp.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _schleife(self) -> None:
+        """
+        Hauptschleife des Hintergrund-Threads.
+        """
+        while not self._stopp.is_set():
+            try:
+                self.revalidiere()
+            except Exception as e:
+                logger.error(f"Fehler bei der Revalidierung der Flugdaten: {e}")
+            self._stopp.wait(self.intervall)
+
+
+_standard_speicher: Optional[FlugdatenSpeicher] = None
+
+
+def standard_flugdaten_speicher() -> Optional[FlugdatenSpeicher]:
+    """
+    Liefert den konfigurierten Flugdaten-Speicher, falls der Speichermodus aktiviert ist.
+
+    Returns:
+        Optional[FlugdatenSpeicher]: Speicher oder None, wenn REISEPLAN_FLUGDATEN_SWR nicht gesetzt ist
+    """
+    global _standard_speicher
+    if _standard_speicher is None and FLUGDATEN_SWR:
+        _standard_speicher = FlugdatenSpeicher(FLUGDATEN_DB)
+    return _standard_speicher
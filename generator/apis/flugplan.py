@@ -0,0 +1,230 @@
+"""
+Lokaler Flugplan-Index als primäre Quelle für die Flugdaten-Ergänzung.
+
+Regelmässige Linienflüge werden aus Flugplandaten (CSV oder JSON) in eine
+indizierte SQLite-Datenbank importiert, mit Flugnummer, Wochentag und
+Gültigkeitszeitraum als Schlüssel. Ein minimaler Flug, der im Flugplan
+steht, wird damit ohne Netzwerkzugriff ergänzt.
+
+Erwartete Felder pro Eintrag:
+    flugNr, wochentage (ISO-Wochentage als Ziffern, z.B. "12345"),
+    gueltigVon, gueltigBis (YYYY-MM-DD), airline, abflugOrt, abflugCode,
+    abflugZeit (HH:MM), ankunftOrt, ankunftCode, ankunftZeit (HH:MM),
+    optional ankunftTagVersatz (Tage bis zur Ankunft, Standard 0)
+"""
+
+import csv
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, Iterable, Optional, Union
+
+from ..config import FLUGPLAN_DB
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS flugplan (
+    flug_nr TEXT NOT NULL,
+    wochentag INTEGER NOT NULL,
+    gueltig_von TEXT NOT NULL,
+    gueltig_bis TEXT NOT NULL,
+    airline TEXT,
+    abflug_ort TEXT NOT NULL,
+    abflug_code TEXT NOT NULL,
+    abflug_zeit TEXT NOT NULL,
+    ankunft_ort TEXT NOT NULL,
+    ankunft_code TEXT NOT NULL,
+    ankunft_zeit TEXT NOT NULL,
+    ankunft_tag_versatz INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (flug_nr, wochentag, gueltig_von)
+) WITHOUT ROWID;
+"""
+
+ERFORDERLICHE_FELDER = [
+    "flugNr", "wochentage", "gueltigVon", "gueltigBis", "abflugOrt", "abflugCode",
+    "abflugZeit", "ankunftOrt", "ankunftCode", "ankunftZeit"
+]
+
+
+class FlugplanFehler(Exception):
+    """Exception für ungültige Flugplandaten."""
+    pass
+
+
+class FlugplanIndex:
+    """
+    Indizierter Flugplan in einer lokalen SQLite-Datenbank.
+    """
+
+    def __init__(self, db_pfad: Union[str, Path] = FLUGPLAN_DB):
+        """
+        Args:
+            db_pfad: Pfad zur SQLite-Datei des Flugplans
+        """
+        self.db_pfad = Path(db_pfad)
+        self._lock = threading.Lock()
+        self._verbindung: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _db(self) -> sqlite3.Connection:
+        """
+        Liefert die Datenbankverbindung dieses Prozesses.
+
+        Nach einem fork wird eine neue Verbindung geöffnet, da SQLite-Verbindungen
+        nicht zwischen Prozessen geteilt werden dürfen.
+        """
+        if self._verbindung is None or self._pid != os.getpid():
+            self.db_pfad.parent.mkdir(exist_ok=True, parents=True)
+            self._verbindung = sqlite3.connect(str(self.db_pfad), check_same_thread=False)
+            self._verbindung.row_factory = sqlite3.Row
+            self._verbindung.executescript(SCHEMA)
+            self._pid = os.getpid()
+        return self._verbindung
+
+    def importiere(self, datei_pfad: Union[str, Path]) -> int:
+        """
+        Importiert Flugplandaten aus einer CSV- oder JSON-Datei.
+
+        Bestehende Einträge mit gleicher Flugnummer, gleichem Wochentag und
+        gleichem Gültigkeitsbeginn werden ersetzt.
+
+        Args:
+            datei_pfad: Pfad zur CSV- oder JSON-Datei
+
+        Returns:
+            int: Anzahl importierter Einträge (pro Wochentag)
+
+        Raises:
+            FlugplanFehler: Bei fehlenden Feldern oder ungültigen Werten
+        """
+        datei_pfad = Path(datei_pfad)
+        with open(datei_pfad, 'r', encoding='utf-8', newline='') as f:
+            if datei_pfad.suffix.lower() == ".json":
+                try:
+                    eintraege = json.load(f)
+                except ValueError as e:
+                    raise FlugplanFehler(f"Ungültiges JSON in {datei_pfad}: {e}")
+                if not isinstance(eintraege, list):
+                    raise FlugplanFehler(f"{datei_pfad}: Erwartet wird eine Liste von Flugplan-Einträgen")
+            else:
+                eintraege = list(csv.DictReader(f))
+
+        zeilen = list(self._zu_zeilen(eintraege))
+        with self._lock:
+            db = self._db()
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO flugplan VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", zeilen
+                )
+
+        logger.info(f"{len(zeilen)} Flugplan-Einträge aus {datei_pfad} importiert")
+        return len(zeilen)
+
+    def _zu_zeilen(self, eintraege: Iterable[Dict[str, Any]]):
+        """
+        Wandelt Flugplan-Einträge in Tabellenzeilen um (eine Zeile pro Wochentag).
+        """
+        for nummer, eintrag in enumerate(eintraege, start=1):
+            if not isinstance(eintrag, dict):
+                raise FlugplanFehler(f"Eintrag #{nummer}: Erwartet wird ein Objekt")
+            fehlend = [feld for feld in ERFORDERLICHE_FELDER if not eintrag.get(feld)]
+            if fehlend:
+                raise FlugplanFehler(f"Eintrag #{nummer}: Felder fehlen: {', '.join(fehlend)}")
+
+            try:
+                gueltig_von = datetime.date.fromisoformat(eintrag["gueltigVon"]).isoformat()
+                gueltig_bis = datetime.date.fromisoformat(eintrag["gueltigBis"]).isoformat()
+                abflug_zeit = datetime.time.fromisoformat(eintrag["abflugZeit"]).strftime("%H:%M")
+                ankunft_zeit = datetime.time.fromisoformat(eintrag["ankunftZeit"]).strftime("%H:%M")
+                versatz = int(eintrag.get("ankunftTagVersatz") or 0)
+                wochentage = {int(tag) for tag in str(eintrag["wochentage"])}
+            except (ValueError, TypeError) as e:
+                raise FlugplanFehler(f"Eintrag #{nummer}: Ungültiger Wert: {e}")
+
+            if gueltig_von > gueltig_bis:
+                raise FlugplanFehler(f"Eintrag #{nummer}: gueltigVon ({gueltig_von}) liegt nach "
+                                     f"gueltigBis ({gueltig_bis})")
+
+            if not wochentage <= set(range(1, 8)):
+                raise FlugplanFehler(f"Eintrag #{nummer}: Wochentage müssen zwischen 1 und 7 liegen")
+
+            for wochentag in sorted(wochentage):
+                yield (
+                    eintrag["flugNr"].replace(" ", "").upper(), wochentag, gueltig_von, gueltig_bis,
+                    eintrag.get("airline"), eintrag["abflugOrt"], eintrag["abflugCode"], abflug_zeit,
+                    eintrag["ankunftOrt"], eintrag["ankunftCode"], ankunft_zeit, versatz
+                )
+
+    def suche(self, flug_nr: str, flug_datum: str) -> Optional[Dict[str, Any]]:
+        """
+        Sucht einen Flug im Flugplan.
+
+        Args:
+            flug_nr: Flugnummer (z.B. 'LX1070')
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+
+        Returns:
+            Optional[Dict[str, Any]]: Flugdaten im Format von hole_fluginformationen
+            oder None, wenn der Flug an diesem Tag nicht im Flugplan steht
+        """
+        try:
+            datum = datetime.date.fromisoformat(flug_datum)
+        except (ValueError, TypeError):
+            return None
+
+        with self._lock:
+            zeile = self._db().execute(
+                "SELECT * FROM flugplan WHERE flug_nr = ? AND wochentag = ? "
+                "AND gueltig_von <= ? AND gueltig_bis >= ? ORDER BY gueltig_von DESC LIMIT 1",
+                (flug_nr.replace(" ", "").upper(), datum.isoweekday(), datum.isoformat(), datum.isoformat())
+            ).fetchone()
+
+        if zeile is None:
+            return None
+
+        ankunft_datum = datum + datetime.timedelta(days=zeile["ankunft_tag_versatz"])
+        flug = {
+            "flugNr": flug_nr,
+            "abflugOrt": zeile["abflug_ort"],
+            "abflugCode": zeile["abflug_code"],
+            "abflugZeit": f"{datum.isoformat()}T{zeile['abflug_zeit']}:00",
+            "ankunftOrt": zeile["ankunft_ort"],
+            "ankunftCode": zeile["ankunft_code"],
+            "ankunftZeit": f"{ankunft_datum.isoformat()}T{zeile['ankunft_zeit']}:00",
+            "buchungsNr": ""
+        }
+        if zeile["airline"]:
+            flug["airline"] = zeile["airline"]
+        return flug
+
+    def anzahl(self) -> int:
+        """
+        Liefert die Anzahl Einträge im Flugplan.
+
+        Returns:
+            int: Anzahl Einträge (pro Wochentag)
+        """
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM flugplan").fetchone()[0]
+
+
+_standard_index: Optional[FlugplanIndex] = None
+
+
+def standard_flugplan() -> Optional[FlugplanIndex]:
+    """
+    Liefert den konfigurierten Flugplan-Index, falls bereits ein Flugplan importiert wurde.
+
+    Returns:
+        Optional[FlugplanIndex]: Flugplan-Index oder None, wenn keine Datenbank existiert
+    """
+    global _standard_index
+    if _standard_index is None and FLUGPLAN_DB.exists():
+        _standard_index = FlugplanIndex(FLUGPLAN_DB)
+    return _standard_index
@@ -0,0 +1,406 @@
+"""
+Flugdaten-Provider und Hedging über mehrere Provider.
+
+Jeder Provider übersetzt die Antwort seiner API in dasselbe Flug-Dictionary,
+das hole_fluginformationen liefert. Sind mehrere Provider konfiguriert,
+wird der nächste Provider zusätzlich angefragt, wenn der vorherige nicht
+innerhalb seiner bisherigen p95-Antwortzeit geantwortet hat. Die erste
+erfolgreiche Antwort gewinnt.
+"""
+
+import collections
+import datetime
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, List, Optional
+
+import requests
+
+from ..config import (
+    FLIGHT_API_KEY, FLIGHT_API_URL, AIRLABS_API_KEY, AIRLABS_API_URL, FLIGHT_API_PROVIDERS,
+    FLIGHT_API_TIMEOUT, FLIGHT_API_HEDGE_DELAY
+)
+from .flight_api import FlightAPIException, KeineFlugdatenException
+from .rate_limiter import flight_api_bucket
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Anzahl Antwortzeiten pro Provider für die p95-Schätzung
+LATENZ_FENSTER = 200
+
+# Mindestanzahl Messungen, bevor die p95-Verzögerung statt der Startverzögerung gilt
+MIN_MESSUNGEN = 20
+
+
+def _ohne_zeitzone(zeitpunkt: str) -> str:
+    """
+    Entfernt die Zeitzonen-Angabe eines ISO-Zeitpunkts ("2025-04-10T16:55:00+00:00" -> "2025-04-10T16:55:00").
+    """
+    try:
+        return datetime.datetime.fromisoformat(zeitpunkt).replace(tzinfo=None).isoformat()
+    except (ValueError, TypeError):
+        return zeitpunkt
+
+
+class FlugdatenProvider:
+    """
+    Basisklasse für Flugdaten-Provider.
+    """
+
+    name = "basis"
+
+    def __init__(self, api_key: str, url: str):
+        """
+        Args:
+            api_key: API-Schlüssel des Providers
+            url: Endpunkt der API
+        """
+        self.api_key = api_key
+        self.url = url
+        self._latenzen = collections.deque(maxlen=LATENZ_FENSTER)
+        self._latenzen_lock = threading.Lock()
+
+    def hole(self, flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+        """
+        Fragt den Provider ab und misst die Antwortzeit.
+
+        Args:
+            flug_nr: Flugnummer (z.B. 'LX1234')
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+
+        Returns:
+            Dict[str, Any]: Vollständige Flugdaten
+
+        Raises:
+            KeineFlugdatenException: Wenn der Provider für den Flug keine Daten liefert
+            FlightAPIException: Bei anderen Fehlern
+        """
+        self.warte_auf_token()
+        return self.frage_ab(flug_nr, flug_datum)
+
+    def warte_auf_token(self) -> float:
+        """
+        Wartet auf einen Token des gemeinsamen Rate-Limits dieses Providers.
+
+        Returns:
+            float: Wartezeit in Sekunden
+        """
+        bucket = flight_api_bucket(self.name)
+        return bucket.erwerbe() if bucket else 0.0
+
+    def frage_ab(self, flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+        """
+        Fragt den Provider ohne Rate-Limit ab und misst die Antwortzeit.
+
+        Args:
+            flug_nr: Flugnummer (z.B. 'LX1234')
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+
+        Returns:
+            Dict[str, Any]: Vollständige Flugdaten
+
+        Raises:
+            KeineFlugdatenException: Wenn der Provider für den Flug keine Daten liefert
+            FlightAPIException: Bei anderen Fehlern
+        """
+        start = time.monotonic()
+        try:
+            logger.info(f"Rufe Flugdaten für {flug_nr} am {flug_datum} bei {self.name} ab...")
+            response = requests.get(self.url, params=self._parameter(flug_nr, flug_datum),
+                                    timeout=FLIGHT_API_TIMEOUT)
+            response.raise_for_status()
+            flug = self._verarbeite(response.json(), flug_nr, flug_datum)
+        except FlightAPIException:
+            raise
+        except requests.RequestException as e:
+            logger.error(f"HTTP-Fehler bei der Anfrage an {self.name}: {e}")
+            raise FlightAPIException(f"Fehler bei der API-Anfrage: {str(e)}")
+        except (KeyError, TypeError, IndexError) as e:
+            logger.error(f"Unerwartetes Format der Antwort von {self.name}: {e}")
+            raise FlightAPIException(f"Unerwartetes Format der API-Antwort: {str(e)}")
+        except Exception as e:
+            logger.error(f"Unerwarteter Fehler bei der Anfrage an {self.name}: {e}")
+            raise FlightAPIException(f"Unerwarteter Fehler: {str(e)}")
+
+        with self._latenzen_lock:
+            self._latenzen.append(time.monotonic() - start)
+        return flug
+
+    def p95(self) -> Optional[float]:
+        """
+        Schätzt das 95. Perzentil der Antwortzeit.
+
+        Returns:
+            Optional[float]: p95 in Sekunden oder None bei zu wenigen Messungen
+        """
+        with self._latenzen_lock:
+            if len(self._latenzen) < MIN_MESSUNGEN:
+                return None
+            latenzen = sorted(self._latenzen)
+        return latenzen[min(len(latenzen) - 1, int(len(latenzen) * 0.95))]
+
+    def _parameter(self, flug_nr: str, flug_datum: str) -> Dict[str, str]:
+        """
+        Erstellt die Query-Parameter der Anfrage.
+        """
+        raise NotImplementedError
+
+    def _verarbeite(self, data: Dict[str, Any], flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+        """
+        Übersetzt die API-Antwort in das gemeinsame Flug-Dictionary.
+        """
+        raise NotImplementedError
+
+
+class AviationstackProvider(FlugdatenProvider):
+    """
+    Provider für aviationstack.com.
+    """
+
+    name = "aviationstack"
+
+    def _parameter(self, flug_nr: str, flug_datum: str) -> Dict[str, str]:
+        return {
+            "access_key": self.api_key,
+            "flight_iata": flug_nr,
+            "flight_date": flug_datum
+        }
+
+    def _verarbeite(self, data: Dict[str, Any], flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+        if "data" in data and len(data["data"]) > 0:
+            flight_data = data["data"][0]
+
+            # Extrahiere relevante Daten
+            airline = flight_data["airline"]["name"]
+            departure = flight_data["departure"]
+            arrival = flight_data["arrival"]
+
+            # Erstelle Flug-Dictionary; aviationstack liefert Ortszeiten mit der
+            # Angabe +00:00, daher wird die Angabe entfernt und die Zeitzone separat übernommen
+            flug = {
+                "airline": airline,
+                "flugNr": flug_nr,
+                "abflugOrt": departure["airport"],
+                "abflugCode": departure["iata"],
+                "abflugZeit": _ohne_zeitzone(departure["scheduled"]),
+                "ankunftOrt": arrival["airport"],
+                "ankunftCode": arrival["iata"],
+                "ankunftZeit": _ohne_zeitzone(arrival["scheduled"]),
+                "buchungsNr": flight_data.get("flight", {}).get("number", "")
+            }
+            if departure.get("timezone"):
+                flug["abflugZeitzone"] = departure["timezone"]
+            if arrival.get("timezone"):
+                flug["ankunftZeitzone"] = arrival["timezone"]
+            return flug
+
+        logger.warning(f"Keine Daten für Flug {flug_nr} am {flug_datum} bei {self.name} gefunden")
+        raise KeineFlugdatenException(f"Keine Daten für Flug {flug_nr} gefunden")
+
+
+class AirLabsProvider(FlugdatenProvider):
+    """
+    Provider für airlabs.co (Flugplan-Endpunkt).
+
+    AirLabs liefert keine Flughafennamen, daher werden die IATA-Codes als Ort verwendet.
+    """
+
+    name = "airlabs"
+
+    def _parameter(self, flug_nr: str, flug_datum: str) -> Dict[str, str]:
+        return {
+            "api_key": self.api_key,
+            "flight_iata": flug_nr
+        }
+
+    def _verarbeite(self, data: Dict[str, Any], flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+        if "error" in data:
+            raise FlightAPIException(f"Fehler von {self.name}: {data['error'].get('message', data['error'])}")
+
+        for flight_data in data.get("response") or []:
+            # Zeiten im Format 'YYYY-MM-DD HH:MM' (Ortszeit)
+            if not str(flight_data.get("dep_time", "")).startswith(flug_datum):
+                continue
+
+            return {
+                "airline": flight_data.get("airline_iata", ""),
+                "flugNr": flug_nr,
+                "abflugOrt": flight_data["dep_iata"],
+                "abflugCode": flight_data["dep_iata"],
+                "abflugZeit": flight_data["dep_time"].replace(" ", "T"),
+                "ankunftOrt": flight_data["arr_iata"],
+                "ankunftCode": flight_data["arr_iata"],
+                "ankunftZeit": flight_data["arr_time"].replace(" ", "T"),
+                "buchungsNr": ""
+            }
+
+        logger.warning(f"Keine Daten für Flug {flug_nr} am {flug_datum} bei {self.name} gefunden")
+        raise KeineFlugdatenException(f"Keine Daten für Flug {flug_nr} gefunden")
+
+
+# Verfügbare Provider mit Schlüssel und Endpunkt aus der Konfiguration
+PROVIDER = {
+    AviationstackProvider.name: (AviationstackProvider, FLIGHT_API_KEY, FLIGHT_API_URL),
+    AirLabsProvider.name: (AirLabsProvider, AIRLABS_API_KEY, AIRLABS_API_URL),
+}
+
+
+class HedgingAbrufer:
+    """
+    Fragt mehrere Provider mit gestaffelten (hedged) Anfragen ab.
+    """
+
+    def __init__(self, provider: List[FlugdatenProvider], start_verzoegerung: float = FLIGHT_API_HEDGE_DELAY):
+        """
+        Args:
+            provider: Provider in der Reihenfolge ihrer Priorität
+            start_verzoegerung: Verzögerung bis zur Absicherungsanfrage, solange noch
+                zu wenige Antwortzeiten für eine p95-Schätzung vorliegen
+        """
+        self.provider = provider
+        self.start_verzoegerung = start_verzoegerung
+        self._executor = ThreadPoolExecutor(max_workers=max(4, 4 * len(provider)),
+                                            thread_name_prefix="flugdaten")
+
+    def verzoegerung(self, provider: FlugdatenProvider) -> float:
+        """
+        Bestimmt, wie lange auf einen Provider gewartet wird, bevor der nächste angefragt wird.
+
+        Args:
+            provider: Zuletzt angefragter Provider
+
+        Returns:
+            float: Verzögerung in Sekunden
+        """
+        p95 = provider.p95()
+        return p95 if p95 is not None else self.start_verzoegerung
+
+    def hole(self, flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+        """
+        Fragt die Provider ab und liefert die erste erfolgreiche Antwort.
+
+        Antwortet ein Provider nicht innerhalb seiner p95-Antwortzeit, wird der
+        nächste zusätzlich angefragt. Die Frist beginnt erst, wenn der Provider
+        einen Token seines Rate-Limits erhalten hat, damit Wartezeit am Limit
+        keine Absicherungsanfragen auslöst. Schlägt ein Provider fehl, wird der
+        nächste sofort angefragt, auch wenn andere Anfragen noch laufen.
+
+        Args:
+            flug_nr: Flugnummer (z.B. 'LX1234')
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+
+        Returns:
+            Dict[str, Any]: Vollständige Flugdaten
+
+        Raises:
+            KeineFlugdatenException: Wenn kein Provider Daten für den Flug hat
+            FlightAPIException: Wenn alle Provider fehlgeschlagen sind
+        """
+        wartend = list(self.provider)
+        # Futures der Token-Wartezeit und der eigentlichen Anfragen
+        token = {}
+        laufend = {}
+        fehler: List[FlightAPIException] = []
+        # Zeitpunkt (monotonic), ab dem der nächste Provider zusätzlich angefragt wird
+        frist = None
+
+        def starte_naechsten():
+            nonlocal frist
+            provider = wartend.pop(0)
+            token[self._executor.submit(provider.warte_auf_token)] = provider
+            frist = None
+            return provider
+
+        def fehlgeschlagen(provider, e):
+            nonlocal zuletzt
+            fehler.append(e)
+            if wartend:
+                logger.info(f"{provider.name} fehlgeschlagen, frage {wartend[0].name} an")
+                zuletzt = starte_naechsten()
+
+        zuletzt = starte_naechsten()
+        try:
+            while token or laufend:
+                timeout = max(0.0, frist - time.monotonic()) if wartend and frist is not None else None
+                fertig, _ = wait(list(token) + list(laufend), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                if not fertig:
+                    logger.info(f"{zuletzt.name} antwortet nicht innerhalb von "
+                                f"{self.verzoegerung(zuletzt):.2f}s, frage zusätzlich {wartend[0].name} an")
+                    zuletzt = starte_naechsten()
+                    continue
+
+                for future in fertig:
+                    if future in token:
+                        provider = token.pop(future)
+                        try:
+                            future.result()
+                        except Exception as e:
+                            # z.B. OSError der Zustandsdatei; der nächste Provider hat ein eigenes Limit
+                            logger.error(f"Rate-Limit von {provider.name} nicht verfügbar: {e}")
+                            fehlgeschlagen(provider, FlightAPIException(f"Rate-Limit nicht verfügbar: {e}"))
+                            continue
+                        laufend[self._executor.submit(provider.frage_ab, flug_nr, flug_datum)] = provider
+                        if provider is zuletzt:
+                            frist = time.monotonic() + self.verzoegerung(provider)
+                        continue
+
+                    provider = laufend.pop(future)
+                    try:
+                        return future.result()
+                    except FlightAPIException as e:
+                        fehlgeschlagen(provider, e)
+        finally:
+            # Noch nicht gestartete Anfragen der unterlegenen Provider verwerfen
+            for offen in list(token) + list(laufend):
+                offen.cancel()
+
+        if fehler and all(isinstance(e, KeineFlugdatenException) for e in fehler):
+            raise fehler[0]
+        raise FlightAPIException("; ".join(str(e) for e in fehler))
+
+
+_abrufer: Optional[HedgingAbrufer] = None
+_abrufer_pid: Optional[int] = None
+_abrufer_lock = threading.Lock()
+
+
+def konfigurierte_provider() -> List[FlugdatenProvider]:
+    """
+    Erstellt die Provider aus FLIGHT_API_PROVIDERS, für die ein API-Schlüssel vorhanden ist.
+
+    Returns:
+        List[FlugdatenProvider]: Provider in der konfigurierten Reihenfolge
+    """
+    provider = []
+    for name in FLIGHT_API_PROVIDERS:
+        if name not in PROVIDER:
+            logger.warning(f"Unbekannter Flugdaten-Provider: {name}")
+            continue
+        klasse, api_key, url = PROVIDER[name]
+        if api_key:
+            provider.append(klasse(api_key, url))
+    return provider
+
+
+def hedging_abrufer() -> Optional[HedgingAbrufer]:
+    """
+    Liefert den gemeinsamen Abrufer über alle konfigurierten Provider.
+
+    Nach einem fork wird ein neuer Abrufer erstellt, da die Threads des
+    Executors nicht in den Kindprozess übernommen werden.
+
+    Returns:
+        Optional[HedgingAbrufer]: Abrufer oder None, wenn kein Provider konfiguriert ist
+    """
+    global _abrufer, _abrufer_pid
+    with _abrufer_lock:
+        if _abrufer is None or _abrufer_pid != os.getpid():
+            provider = konfigurierte_provider()
+            _abrufer = HedgingAbrufer(provider) if provider else None
+            _abrufer_pid = os.getpid()
+    return _abrufer
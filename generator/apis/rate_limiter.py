@@ -0,0 +1,172 @@
+"""
+Prozessübergreifender Rate-Limiter für die Flugdaten-Provider.
+
+Token-Bucket, dessen Zustand in einer kleinen Datei liegt und per Dateisperre
+(fcntl.flock) geschützt wird. Alle Prozesse auf demselben Host, die dieselbe
+Zustandsdatei verwenden, teilen sich damit ein gemeinsames Kontingent.
+
+Ein Aufrufer, der keinen Token vorfindet, reserviert trotzdem einen (der
+Füllstand wird negativ) und wartet ausserhalb der Sperre, bis sein Token
+nachgefüllt ist. So warten gleichzeitige Aufrufer gestaffelt statt sich
+gegenseitig zu wecken.
+"""
+
+import logging
+import os
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from ..config import FLIGHT_API_RATE, FLIGHT_API_BURST, FLIGHT_API_RATE_FILE
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Zustand: Füllstand und Zeitpunkt der letzten Aktualisierung
+_ZUSTAND_FORMAT = "dd"
+_ZUSTAND_GROESSE = struct.calcsize(_ZUSTAND_FORMAT)
+
+
+class TokenBucket:
+    """
+    Token-Bucket mit Zustand in einer gemeinsamen Datei.
+    """
+
+    def __init__(self, zustand_pfad: Union[str, Path], rate: float, burst: int):
+        """
+        Args:
+            zustand_pfad: Pfad zur gemeinsamen Zustandsdatei
+            rate: Nachgefüllte Tokens pro Sekunde
+            burst: Maximale Anzahl Tokens (erlaubte Spitze)
+        """
+        if rate <= 0:
+            raise ValueError("Die Rate muss grösser als 0 sein")
+
+        self.zustand_pfad = Path(zustand_pfad)
+        self.rate = rate
+        self.burst = max(1, burst)
+
+        # flock schützt nur zwischen Prozessen, Threads desselben Prozesses brauchen eine eigene Sperre
+        self._thread_lock = threading.Lock()
+
+        self._metriken_lock = threading.Lock()
+        self._metriken = {"anfragen": 0, "gewartet": 0, "wartezeit_gesamt": 0.0, "wartezeit_max": 0.0}
+
+        if fcntl is None:
+            logger.warning("fcntl nicht verfügbar, Rate-Limit gilt nur innerhalb dieses Prozesses")
+
+        self.zustand_pfad.parent.mkdir(exist_ok=True, parents=True)
+
+    def erwerbe(self) -> float:
+        """
+        Erwirbt einen Token und wartet bei Bedarf, bis er verfügbar ist.
+
+        Returns:
+            float: Wartezeit in Sekunden
+        """
+        wartezeit = self._reserviere()
+        if wartezeit > 0:
+            logger.debug(f"Rate-Limit erreicht, warte {wartezeit:.2f}s auf Flight-API-Token")
+            time.sleep(wartezeit)
+
+        with self._metriken_lock:
+            self._metriken["anfragen"] += 1
+            if wartezeit > 0:
+                self._metriken["gewartet"] += 1
+                self._metriken["wartezeit_gesamt"] += wartezeit
+                self._metriken["wartezeit_max"] = max(self._metriken["wartezeit_max"], wartezeit)
+        return wartezeit
+
+    def _reserviere(self) -> float:
+        """
+        Reserviert unter Sperre einen Token und berechnet die nötige Wartezeit.
+
+        Returns:
+            float: Sekunden, bis der reservierte Token verfügbar ist
+        """
+        with self._thread_lock:
+            fd = os.open(str(self.zustand_pfad), os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+
+                jetzt = time.time()
+                daten = os.pread(fd, _ZUSTAND_GROESSE, 0)
+                if len(daten) == _ZUSTAND_GROESSE:
+                    tokens, zeitpunkt = struct.unpack(_ZUSTAND_FORMAT, daten)
+                    tokens = min(float(self.burst), tokens + max(0.0, jetzt - zeitpunkt) * self.rate)
+                else:
+                    tokens = float(self.burst)
+
+                tokens -= 1
+                os.pwrite(fd, struct.pack(_ZUSTAND_FORMAT, tokens, jetzt), 0)
+            finally:
+                # Schliessen gibt auch die Dateisperre frei
+                os.close(fd)
+
+        return -tokens / self.rate if tokens < 0 else 0.0
+
+    def metriken(self) -> Dict[str, float]:
+        """
+        Liefert die Wartezeit-Metriken dieses Prozesses.
+
+        Returns:
+            Dict[str, float]: Anzahl Anfragen, davon gewartet, gesamte und maximale Wartezeit in Sekunden
+        """
+        with self._metriken_lock:
+            metriken = dict(self._metriken)
+        metriken["wartezeit_gesamt"] = round(metriken["wartezeit_gesamt"], 3)
+        metriken["wartezeit_max"] = round(metriken["wartezeit_max"], 3)
+        return metriken
+
+
+_flight_api_buckets: Dict[str, TokenBucket] = {}
+_bucket_lock = threading.Lock()
+
+# Provider, dessen Bucket die bisherige Zustandsdatei ohne Namenszusatz verwendet
+_STANDARD_PROVIDER = "aviationstack"
+
+
+def flight_api_bucket(provider: str = _STANDARD_PROVIDER) -> Optional[TokenBucket]:
+    """
+    Liefert den gemeinsamen Token-Bucket eines Flugdaten-Providers.
+
+    Jeder Provider hat ein eigenes Kontingent und damit eine eigene Zustandsdatei.
+
+    Args:
+        provider: Name des Providers
+
+    Returns:
+        Optional[TokenBucket]: Token-Bucket oder None, wenn kein Rate-Limit konfiguriert ist
+    """
+    if FLIGHT_API_RATE <= 0:
+        return None
+    with _bucket_lock:
+        if provider not in _flight_api_buckets:
+            pfad = FLIGHT_API_RATE_FILE
+            if provider != _STANDARD_PROVIDER:
+                pfad = pfad.with_name(f"{pfad.stem}.{provider}{pfad.suffix}")
+            _flight_api_buckets[provider] = TokenBucket(pfad, FLIGHT_API_RATE, FLIGHT_API_BURST)
+        return _flight_api_buckets[provider]
+
+
+def flight_api_metriken() -> Optional[Dict[str, Dict[str, float]]]:
+    """
+    Liefert die Wartezeit-Metriken der Rate-Limiter aller bisher verwendeten Provider.
+
+    Returns:
+        Optional[Dict[str, Dict[str, float]]]: Metriken pro Provider oder None,
+        wenn kein Rate-Limit konfiguriert ist
+    """
+    if FLIGHT_API_RATE <= 0:
+        return None
+    with _bucket_lock:
+        buckets = dict(_flight_api_buckets)
+    return {name: bucket.metriken() for name, bucket in buckets.items()}
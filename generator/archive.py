@@ -0,0 +1,159 @@
+"""
+Archiv-Ausgabe für Batch-Läufe.
+
+Statt einer Datei pro Reiseplan im Ausgabeverzeichnis werden die PDFs im
+Speicher gerendert und direkt nacheinander in ein ZIP- oder TAR-Archiv
+(oder nach stdout) geschrieben. Das Manifest des Batches wird als letzter
+Eintrag ins Archiv aufgenommen. Ein Batch ergibt so ein einziges,
+sequentiell geschriebenes Artefakt.
+"""
+
+import io
+import json
+import logging
+import sys
+import tarfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional, Union
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Unterstützte Formate und ihre Dateiendungen
+ARCHIV_FORMATE = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz",
+}
+
+# Name des Manifests im Archiv
+MANIFEST_NAME = "manifest.json"
+
+
+def archiv_format(ziel: Union[str, Path]) -> str:
+    """
+    Bestimmt das Archivformat anhand der Dateiendung ('-' für stdout ergibt TAR).
+
+    Args:
+        ziel: Zielpfad des Archivs oder '-'
+
+    Returns:
+        str: 'zip', 'tar' oder 'tar.gz'
+
+    Raises:
+        ValueError: Bei einer unbekannten Dateiendung
+    """
+    if str(ziel) == "-":
+        return "tar"
+    name = Path(ziel).name.lower()
+    for endung, format_name in ARCHIV_FORMATE.items():
+        if name.endswith(endung):
+            return format_name
+    raise ValueError(f"Unbekanntes Archivformat für '{ziel}', erwartet {', '.join(ARCHIV_FORMATE)}")
+
+
+class ReiseplanArchiv:
+    """
+    Schreibt PDFs fortlaufend in ein ZIP- oder TAR-Archiv.
+
+    Einträge werden in der Reihenfolge geschrieben, in der sie fertig
+    werden; ZIP-Archive speichern die bereits komprimierten PDFs
+    unkomprimiert, TAR-Archive werden im Stream-Modus geschrieben und
+    funktionieren daher auch mit Pipes. Dateien werden unter einem
+    temporären Namen geschrieben und erst nach dem Manifest umbenannt.
+    """
+
+    def __init__(self, ziel: Union[str, Path, BinaryIO], format_name: Optional[str] = None):
+        """
+        Args:
+            ziel: Zielpfad, '-' für stdout oder beschreibbares Binär-Dateiobjekt
+            format_name: 'zip', 'tar' oder 'tar.gz' (Standard: aus der Dateiendung)
+
+        Raises:
+            ValueError: Bei einem unbekannten Archivformat
+        """
+        datei_ziel = not hasattr(ziel, "write")
+        self.format = format_name or (archiv_format(ziel) if datei_ziel else "tar")
+        if self.format not in ARCHIV_FORMATE.values():
+            raise ValueError(f"Unbekanntes Archivformat: {self.format}")
+
+        self.pfad: Optional[Path] = None
+        self._temp_pfad: Optional[Path] = None
+        if not datei_ziel:
+            datei = ziel
+        elif str(ziel) == "-":
+            datei = sys.stdout.buffer
+        else:
+            self.pfad = Path(ziel)
+            self.pfad.parent.mkdir(exist_ok=True, parents=True)
+            self._temp_pfad = self.pfad.with_name(self.pfad.name + ".tmp")
+            datei = open(self._temp_pfad, "wb")
+
+        self._datei = datei
+        self._eigene_datei = self._temp_pfad is not None
+        if self.format == "zip":
+            self._zip = zipfile.ZipFile(datei, "w", compression=zipfile.ZIP_STORED)
+            self._tar = None
+        else:
+            self._zip = None
+            self._tar = tarfile.open(fileobj=datei, mode="w|gz" if self.format == "tar.gz" else "w|")
+        self.eintraege = 0
+
+    def schreibe(self, name: str, daten: bytes) -> None:
+        """
+        Fügt eine Datei zum Archiv hinzu.
+
+        Args:
+            name: Pfad der Datei im Archiv
+            daten: Inhalt der Datei
+        """
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED if name == MANIFEST_NAME else zipfile.ZIP_STORED
+            info.external_attr = 0o644 << 16
+            self._zip.writestr(info, daten)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(daten)
+            info.mtime = int(time.time())
+            info.mode = 0o644
+            self._tar.addfile(info, io.BytesIO(daten))
+        self.eintraege += 1
+
+    def schliesse(self, manifest: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Schreibt das Manifest als letzten Eintrag und schliesst das Archiv.
+
+        Args:
+            manifest: Manifest des Batches (None = ohne Manifest)
+        """
+        if manifest is not None:
+            self.schreibe(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+        if self._zip is not None:
+            self._zip.close()
+        else:
+            self._tar.close()
+
+        if self._eigene_datei:
+            self._datei.close()
+            self._temp_pfad.replace(self.pfad)
+        else:
+            self._datei.flush()
+        logger.info(f"Archiv mit {self.eintraege} Einträgen geschrieben: {self.pfad or 'stdout'}")
+
+    def verwerfe(self) -> None:
+        """
+        Bricht das Archiv ab und entfernt die unvollständige Datei.
+        """
+        if self._eigene_datei:
+            # Zuerst das Archiv schliessen, sonst schreibt es beim Aufräumen in die geschlossene Datei
+            try:
+                (self._zip if self._zip is not None else self._tar).close()
+            except (OSError, ValueError, tarfile.TarError):
+                # Die Datei wird ohnehin verworfen
+                pass
+            self._datei.close()
+            self._temp_pfad.unlink(missing_ok=True)
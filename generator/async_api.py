@@ -0,0 +1,234 @@
+"""
+Asynchrone API des Reiseplan-Generators für asyncio-basierte Dienste.
+
+Die Flugdaten-Ergänzung läuft in einem eigenen I/O-Threadpool, die
+CPU-lastige PDF-Erstellung in einem konfigurierbaren Executor (Threads oder
+Prozesse). Der Event-Loop wird dadurch nie blockiert. Semaphoren begrenzen
+die gleichzeitigen Flugabfragen und PDF-Erstellungen; wird eine Anfrage
+abgebrochen, bricht auch eine bereits laufende PDF-Erstellung nach dem
+aktuellen Element ab (nur im Thread-Executor).
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Union
+
+from .config import ASYNC_MAX_RENDERS, FLIGHT_API_MAX_PARALLEL
+from .core import ReiseplanGenerator
+from .themes import ThemeFehler
+from .utils.json_schema import lade_json_reiseplan
+from .apis.flight_api import FlightAPIException
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Generatoren in den Prozessen eines ProcessPoolExecutors, pro Einstellungen des aufrufenden Generators
+_render_generatoren: Dict[Tuple[Any, ...], ReiseplanGenerator] = {}
+_render_lock = threading.Lock()
+
+
+def _einstellungen(generator: ReiseplanGenerator) -> Dict[str, Any]:
+    """
+    Liefert die Einstellungen, mit denen ein Render-Prozess denselben Generator erstellt.
+    """
+    return {
+        "profil": generator.profil,
+        "linearisiert": generator.linearisiert,
+        "theme": generator.theme,
+        "parallel_prozesse": generator.parallel_prozesse,
+    }
+
+
+def _render_generator(einstellungen: Dict[str, Any]) -> ReiseplanGenerator:
+    """
+    Liefert den Generator dieses Render-Prozesses für die Einstellungen und erstellt ihn beim ersten Aufruf.
+    """
+    schluessel = tuple(sorted(einstellungen.items()))
+    generator = _render_generatoren.get(schluessel)
+    if generator is None:
+        with _render_lock:
+            generator = _render_generatoren.get(schluessel)
+            if generator is None:
+                generator = ReiseplanGenerator(**einstellungen)
+                _render_generatoren[schluessel] = generator
+    return generator
+
+
+def _rendere_im_prozess(einstellungen: Dict[str, Any], reiseplan_daten: Dict[str, Any]) -> Optional[str]:
+    """
+    Erstellt das PDF in einem Render-Prozess (auf Modulebene, damit sie übertragen werden kann).
+    """
+    return _render_generator(einstellungen).rendere_reiseplan(reiseplan_daten)
+
+
+class AsyncReiseplanGenerator:
+    """
+    Asynchrone Hülle um den ReiseplanGenerator.
+    """
+
+    def __init__(self, generator: Optional[ReiseplanGenerator] = None,
+                 render_executor: Optional[Executor] = None,
+                 max_renders: int = ASYNC_MAX_RENDERS,
+                 max_flugabfragen: int = FLIGHT_API_MAX_PARALLEL):
+        """
+        Args:
+            generator: Generator für die Flugdaten-Ergänzung (Flugplan, Speicher, Cache) und die PDF-Erstellung
+            render_executor: Executor für die PDF-Erstellung (Standard: Threadpool mit max_renders Threads).
+                Ein ProcessPoolExecutor umgeht den GIL, erlaubt aber keinen Abbruch laufender Erstellungen;
+                seine Prozesse erstellen einen eigenen Generator mit Profil, Theme, Linearisierung
+                und Prozesszahl des übergebenen Generators.
+            max_renders: Maximale Anzahl gleichzeitiger PDF-Erstellungen
+            max_flugabfragen: Maximale Anzahl gleichzeitiger Flugabfragen
+        """
+        self.generator = generator or ReiseplanGenerator()
+        self._eigener_executor = render_executor is None
+        self.render_executor = render_executor or ThreadPoolExecutor(
+            max_workers=max_renders, thread_name_prefix="reiseplan-render"
+        )
+        self._io_executor = ThreadPoolExecutor(max_workers=max_flugabfragen, thread_name_prefix="reiseplan-io")
+        self._render_semaphore = asyncio.Semaphore(max_renders)
+        self._flug_semaphore = asyncio.Semaphore(max_flugabfragen)
+
+    async def generiere_reiseplan(self, reiseplan_pfad: Union[str, Path],
+                                  flugdaten_erforderlich: bool = False) -> Optional[str]:
+        """
+        Generiert einen PDF-Reiseplan aus einer JSON-Datei, ohne den Event-Loop zu blockieren.
+
+        Args:
+            reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+            flugdaten_erforderlich: Bricht ab, wenn minimale Flüge nicht ergänzt werden können
+
+        Returns:
+            Optional[str]: Pfad zur generierten PDF-Datei oder None bei Fehler
+
+        Raises:
+            FlightAPIException: Wenn flugdaten_erforderlich gesetzt ist und die Ergänzung fehlschlägt
+            asyncio.CancelledError: Wenn die Anfrage abgebrochen wurde
+        """
+        reiseplan_daten = await self.lade_reiseplan(reiseplan_pfad, flugdaten_erforderlich)
+        if not reiseplan_daten:
+            return None
+
+        pdf_pfad = await self.rendere_reiseplan(reiseplan_daten)
+        if pdf_pfad and self.generator.flug_speicher:
+            await self._im_io_thread(self.generator.flug_speicher.quittiere, str(Path(reiseplan_pfad).resolve()))
+        return pdf_pfad
+
+    async def lade_reiseplan(self, reiseplan_pfad: Union[str, Path],
+                             flugdaten_erforderlich: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Lädt und validiert einen Reiseplan und ergänzt alle minimalen Flüge gleichzeitig.
+
+        Args:
+            reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+            flugdaten_erforderlich: Bricht ab, wenn minimale Flüge nicht ergänzt werden können
+
+        Returns:
+            Optional[Dict[str, Any]]: Ergänzte Reiseplan-Daten oder None bei Fehler
+
+        Raises:
+            FlightAPIException: Wenn flugdaten_erforderlich gesetzt ist und die Ergänzung fehlschlägt
+        """
+        reiseplan_pfad = Path(reiseplan_pfad)
+        reiseplan_daten = await self._im_io_thread(lade_json_reiseplan, reiseplan_pfad)
+        if not reiseplan_daten:
+            logger.error(f"Konnte Reiseplan-Daten nicht laden: {reiseplan_pfad}")
+            return None
+
+        # Theme vor dem Ergänzen der Flüge prüfen, wie im synchronen Generator
+        try:
+            await self._im_io_thread(self.generator.vorlagen_fuer, reiseplan_daten)
+        except ThemeFehler as e:
+            logger.error(f"{e}: {reiseplan_pfad}")
+            return None
+
+        # Alle minimalen Flüge gleichzeitig abfragen
+        schluessel = list(dict.fromkeys(
+            (flug["flugNr"], flug["flugDatum"])
+            for flug in reiseplan_daten.get("fluege") or []
+            if self.generator._ist_minimal_flug(flug)
+        ))
+        ergebnisse = await asyncio.gather(
+            *(self._hole_flugdaten(flug_nr, flug_datum) for flug_nr, flug_datum in schluessel),
+            return_exceptions=True
+        )
+        abgerufen = dict(zip(schluessel, ergebnisse))
+        for ergebnis in ergebnisse:
+            if not isinstance(ergebnis, FlightAPIException) and isinstance(ergebnis, BaseException):
+                raise ergebnis
+
+        def hole_abgerufene(flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+            ergebnis = abgerufen[(flug_nr, flug_datum)]
+            if isinstance(ergebnis, FlightAPIException):
+                raise ergebnis
+            return dict(ergebnis)
+
+        await self._im_io_thread(
+            self.generator._ergaenze_fluege, reiseplan_daten, flugdaten_erforderlich,
+            str(reiseplan_pfad.resolve()), hole_abgerufene
+        )
+        return reiseplan_daten
+
+    async def rendere_reiseplan(self, reiseplan_daten: Dict[str, Any]) -> Optional[str]:
+        """
+        Erstellt das PDF aus ergänzten Reiseplan-Daten im Render-Executor.
+
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten (siehe lade_reiseplan)
+
+        Returns:
+            Optional[str]: Pfad zur generierten PDF-Datei oder None bei Fehler
+
+        Raises:
+            asyncio.CancelledError: Wenn die Anfrage abgebrochen wurde
+        """
+        async with self._render_semaphore:
+            loop = asyncio.get_running_loop()
+
+            # Prozesse teilen kein threading.Event, dort werden nur wartende Erstellungen abgebrochen
+            abbruch = None
+            if isinstance(self.render_executor, ProcessPoolExecutor):
+                future = loop.run_in_executor(self.render_executor, _rendere_im_prozess,
+                                              _einstellungen(self.generator), reiseplan_daten)
+            else:
+                # Der Generator ist threadsicher und wird von allen Render-Threads geteilt
+                abbruch = threading.Event()
+                future = loop.run_in_executor(
+                    self.render_executor, self.generator.rendere_reiseplan, reiseplan_daten, abbruch
+                )
+            try:
+                return await future
+            except asyncio.CancelledError:
+                if abbruch is not None:
+                    abbruch.set()
+                raise
+
+    async def _hole_flugdaten(self, flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+        """
+        Fragt die Daten eines minimalen Flugs im I/O-Threadpool ab.
+        """
+        async with self._flug_semaphore:
+            return await self._im_io_thread(self.generator._hole_flugdaten, flug_nr, flug_datum)
+
+    async def _im_io_thread(self, funktion, *args):
+        """
+        Führt eine blockierende Funktion im I/O-Threadpool aus.
+        """
+        return await asyncio.get_running_loop().run_in_executor(self._io_executor, funktion, *args)
+
+    def schliessen(self) -> None:
+        """
+        Beendet den I/O-Threadpool und den eigenen Render-Executor.
+        """
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
+        if self._eigener_executor:
+            self.render_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> "AsyncReiseplanGenerator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.schliessen()
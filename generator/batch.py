@@ -0,0 +1,432 @@
+"""
+Batch-Verarbeitung mehrerer Reisepläne.
+
+Unterstützt die deterministische Aufteilung der Eingaben auf mehrere
+Maschinen (Shards) ohne zentrale Koordination: Jede Maschine berechnet für
+jede Eingabedatei einen stabilen Hash und bearbeitet nur die Dateien ihres
+Shards. Die Manifeste der einzelnen Shards können anschliessend zu einem
+Gesamtbericht zusammengeführt werden.
+
+Innerhalb eines Batches bzw. Shards werden die Reisepläne nach Priorität und
+Abreise bearbeitet (siehe scheduling); das Manifest meldet PDFs, die erst
+nach ihrer Frist fertig wurden.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
+
+from .apis.flight_api import FlightAPIException
+from .apis.rate_limiter import flight_api_metriken
+from .archive import ReiseplanArchiv
+from .config import OUTPUT_DIR, FLIGHT_API_MAX_PARALLEL
+from .core import ReisendeFehlen
+from .scheduling import als_iso, plane_reiseplaene
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    Liest eine Shard-Angabe im Format 'i/n' (i von 0 bis n-1).
+
+    Args:
+        shard: Shard-Angabe, z.B. '0/4'
+
+    Returns:
+        Tuple[int, int]: Index und Anzahl der Shards
+
+    Raises:
+        ValueError: Bei ungültiger Angabe
+    """
+    try:
+        index_text, anzahl_text = shard.split("/")
+        index, anzahl = int(index_text), int(anzahl_text)
+    except ValueError:
+        raise ValueError(f"Ungültige Shard-Angabe '{shard}', erwartet 'i/n'")
+
+    if anzahl < 1 or not 0 <= index < anzahl:
+        raise ValueError(f"Ungültige Shard-Angabe '{shard}', i muss zwischen 0 und n-1 liegen")
+    return index, anzahl
+
+
+def sammle_reiseplaene(pfade: List[Union[str, Path]]) -> List[Tuple[Path, str]]:
+    """
+    Sammelt alle Reiseplan-Dateien aus Dateien und Verzeichnissen.
+
+    Args:
+        pfade: Pfade zu JSON-Dateien oder Verzeichnissen mit JSON-Dateien
+
+    Returns:
+        List[Tuple[Path, str]]: Dateipfad und stabile Kennung (Pfad relativ zum
+        angegebenen Verzeichnis bzw. Dateiname), sortiert nach Kennung
+    """
+    reiseplaene = []
+    for pfad in map(Path, pfade):
+        if pfad.is_dir():
+            for datei in pfad.rglob("*.json"):
+                reiseplaene.append((datei, datei.relative_to(pfad).as_posix()))
+        else:
+            reiseplaene.append((pfad, pfad.name))
+    return sorted(reiseplaene, key=lambda eintrag: eintrag[1])
+
+
+def shard_von(kennung: str, anzahl: int) -> int:
+    """
+    Bestimmt den Shard einer Eingabe über einen stabilen Hash ihrer Kennung.
+
+    Der Hash hängt nicht vom Prozess oder der Maschine ab (im Gegensatz zu hash()).
+
+    Args:
+        kennung: Stabile Kennung der Eingabe
+        anzahl: Anzahl der Shards
+
+    Returns:
+        int: Shard-Index von 0 bis anzahl-1
+    """
+    digest = hashlib.sha256(kennung.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % anzahl
+
+
+def filtere_shard(reiseplaene: List[Tuple[Path, str]], index: int, anzahl: int) -> List[Tuple[Path, str]]:
+    """
+    Behält nur die Eingaben des angegebenen Shards.
+
+    Args:
+        reiseplaene: Eingaben aus sammle_reiseplaene
+        index: Index des eigenen Shards
+        anzahl: Anzahl der Shards
+
+    Returns:
+        List[Tuple[Path, str]]: Eingaben des Shards
+    """
+    return [eintrag for eintrag in reiseplaene if shard_von(eintrag[1], anzahl) == index]
+
+
+def sammle_minimale_fluege(generator, dateien: List[Path]) -> Set[Tuple[str, str]]:
+    """
+    Sammelt die eindeutigen minimalen Flüge aller Reisepläne.
+
+    Args:
+        generator: ReiseplanGenerator (für die Erkennung minimaler Flüge)
+        dateien: Pfade zu JSON-Dateien mit Reisedaten
+
+    Returns:
+        Set[Tuple[str, str]]: Eindeutige Paare aus Flugnummer und Flugdatum
+    """
+    fluege = set()
+    for datei in dateien:
+        try:
+            with open(datei, 'r', encoding='utf-8') as f:
+                reiseplan_daten = json.load(f)
+        except (OSError, ValueError) as e:
+            # Fehler werden beim Generieren des Reiseplans gemeldet
+            logger.debug(f"Überspringe {datei} beim Vorabruf: {e}")
+            continue
+
+        if not isinstance(reiseplan_daten, dict):
+            continue
+        for flug in reiseplan_daten.get("fluege") or []:
+            if isinstance(flug, dict) and generator._ist_minimal_flug(flug):
+                fluege.add((flug["flugNr"], flug["flugDatum"]))
+    return fluege
+
+
+def rufe_fluege_vorab_ab(generator, dateien: List[Path],
+                         max_parallel: int = FLIGHT_API_MAX_PARALLEL) -> Dict[str, int]:
+    """
+    Ruft alle minimalen Flüge eines Batches einmalig und parallel ab.
+
+    Die Ergebnisse werden im flug_cache des Generators abgelegt, sodass jeder
+    Flug unabhängig von der Anzahl Reisepläne nur einmal nachgeschlagen wird
+    (lokaler Flugplan, sonst Flight-API).
+    Fehlgeschlagene Abrufe werden als None gespeichert und nicht wiederholt.
+
+    Args:
+        generator: ReiseplanGenerator, dessen flug_cache befüllt wird
+        dateien: Pfade zu JSON-Dateien mit Reisedaten
+        max_parallel: Maximale Anzahl gleichzeitiger API-Anfragen
+
+    Returns:
+        Dict[str, int]: Anzahl abgerufener und fehlgeschlagener Flüge
+    """
+    fluege = sorted(sammle_minimale_fluege(generator, dateien) - set(generator.flug_cache))
+    if not fluege:
+        return {"abgerufen": 0, "fehlgeschlagen": 0}
+
+    logger.info(f"Rufe {len(fluege)} eindeutige Flüge vorab ab")
+
+    def abrufen(schluessel: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        try:
+            return generator._hole_flugdaten(*schluessel)
+        except FlightAPIException as e:
+            logger.warning(f"Vorabruf für Flug {schluessel[0]} am {schluessel[1]} fehlgeschlagen: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_parallel, len(fluege)))) as executor:
+        ergebnisse = list(executor.map(abrufen, fluege))
+
+    generator.flug_cache.update(zip(fluege, ergebnisse))
+    fehlgeschlagen = sum(1 for ergebnis in ergebnisse if ergebnis is None)
+    return {"abgerufen": len(fluege) - fehlgeschlagen, "fehlgeschlagen": fehlgeschlagen}
+
+
+def fuehre_batch_aus(generator, pfade: List[Union[str, Path]], shard: Optional[Tuple[int, int]] = None,
+                     manifest_pfad: Optional[Union[str, Path]] = None,
+                     pro_reisendem: bool = False, vorabruf: bool = True,
+                     archiv: Optional[Union[str, Path]] = None,
+                     nach_abreise: bool = True) -> Dict[str, Any]:
+    """
+    Generiert alle Reisepläne eines Batches (bzw. eines Shards) und schreibt ein Manifest.
+
+    Args:
+        generator: ReiseplanGenerator
+        pfade: Pfade zu JSON-Dateien oder Verzeichnissen
+        shard: Optionaler Shard als (Index, Anzahl)
+        manifest_pfad: Zielpfad des Manifests (Standard: im Ausgabeverzeichnis,
+            mit Archiv nur, wenn angegeben)
+        pro_reisendem: Erstellt ein PDF pro Reisendem
+        vorabruf: Ruft alle minimalen Flüge vor dem Rendern einmalig ab
+        archiv: Schreibt die PDFs und das Manifest in dieses ZIP-/TAR-Archiv ('-' für stdout)
+            statt ins Ausgabeverzeichnis
+        nach_abreise: Bearbeitet die Reisepläne nach Priorität und Abreise statt nach Kennung
+
+    Returns:
+        Dict[str, Any]: Manifest des Batches
+
+    Raises:
+        ValueError: Bei einem unbekannten Archivformat oder Archiv zusammen mit pro_reisendem
+    """
+    if archiv is not None and pro_reisendem:
+        raise ValueError("Ein PDF pro Reisendem wird mit Archiv-Ausgabe nicht unterstützt")
+
+    reiseplaene = sammle_reiseplaene(pfade)
+    if shard:
+        gesamt = len(reiseplaene)
+        reiseplaene = filtere_shard(reiseplaene, *shard)
+        logger.info(f"Shard {shard[0]}/{shard[1]}: {len(reiseplaene)} von {gesamt} Reiseplänen")
+
+    planung = {}
+    if nach_abreise:
+        reiseplaene, planung = plane_reiseplaene(reiseplaene)
+
+    start = time.time()
+    vorabruf_statistik = None
+    if vorabruf:
+        vorabruf_statistik = rufe_fluege_vorab_ab(generator, [datei for datei, _ in reiseplaene])
+
+    ziel_archiv = ReiseplanArchiv(archiv) if archiv is not None else None
+    try:
+        eintraege = _bearbeite_reiseplaene(generator, reiseplaene, pro_reisendem, ziel_archiv, planung)
+    except BaseException:
+        if ziel_archiv:
+            ziel_archiv.verwerfe()
+        raise
+
+    manifest = {
+        "shard": f"{shard[0]}/{shard[1]}" if shard else None,
+        "host": socket.gethostname(),
+        "gestartet": datetime.datetime.fromtimestamp(start).isoformat(timespec="seconds"),
+        "dauer": round(time.time() - start, 3),
+        "vorabruf": vorabruf_statistik,
+        "rate_limit": flight_api_metriken(),
+        "eintraege": eintraege,
+        "verpasste_fristen": _verpasste_fristen(eintraege),
+        "zusammenfassung": _zusammenfassung(eintraege)
+    }
+    if manifest["verpasste_fristen"]:
+        logger.warning(f"{len(manifest['verpasste_fristen'])} Reisepläne erst nach ihrer Frist fertig")
+
+    if ziel_archiv:
+        ziel_archiv.schliesse(manifest)
+        if manifest_pfad is None:
+            return manifest
+
+    if manifest_pfad is None:
+        name = f"manifest-shard-{shard[0]}-von-{shard[1]}.json" if shard else "manifest.json"
+        manifest_pfad = OUTPUT_DIR / name
+    schreibe_json(manifest, manifest_pfad)
+    logger.info(f"Manifest geschrieben: {manifest_pfad}")
+
+    return manifest
+
+
+def archiv_name(kennung: str) -> str:
+    """
+    Bestimmt den Namen eines PDFs im Archiv aus der Kennung des Reiseplans.
+
+    Die Kennung ist innerhalb eines Batches eindeutig (anders als der Titel).
+
+    Args:
+        kennung: Stabile Kennung des Reiseplans (siehe sammle_reiseplaene)
+
+    Returns:
+        str: Pfad im Archiv, z.B. 'team/london.pdf' für 'team/london.json'
+    """
+    return Path(kennung).with_suffix(".pdf").as_posix()
+
+
+def _bearbeite_reiseplaene(generator, reiseplaene: List[Tuple[Path, str]], pro_reisendem: bool,
+                           archiv: Optional[ReiseplanArchiv],
+                           planung: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Generiert die Reisepläne eines Batches in der gegebenen Reihenfolge und liefert die Manifest-Einträge.
+    """
+    eintraege = []
+    for datei, kennung in reiseplaene:
+        eintrag_start = time.perf_counter()
+        bericht = {}
+        try:
+            if archiv:
+                pdf_daten = generator.generiere_pdf_daten(datei, bericht=bericht)
+                pdf_pfade = []
+                if pdf_daten:
+                    archiv.schreibe(archiv_name(kennung), pdf_daten)
+                    pdf_pfade = [archiv_name(kennung)]
+            elif pro_reisendem:
+                pdf_pfade = generator.generiere_reiseplaene_pro_reisendem(datei)
+            else:
+                pdf_pfad = generator.generiere_reiseplan(datei, bericht=bericht)
+                pdf_pfade = [pdf_pfad] if pdf_pfad else []
+            fehler = None if pdf_pfade else "PDF konnte nicht erstellt werden"
+        except ReisendeFehlen as e:
+            # Die erstellten PDFs bleiben im Manifest aufgeführt
+            logger.error(f"{datei}: {e}")
+            pdf_pfade, fehler = e.pdf_pfade, str(e)
+        except Exception as e:
+            logger.error(f"Unerwarteter Fehler bei {datei}: {e}")
+            pdf_pfade, fehler = [], str(e)
+
+        fertig = time.time()
+        eintrag_planung = planung.get(kennung, {})
+        frist = eintrag_planung.get("frist")
+        eintraege.append({
+            "reiseplan": kennung,
+            "status": "fehler" if fehler else "ok",
+            "pdfs": pdf_pfade,
+            "fehler": fehler,
+            "dauer": round(time.perf_counter() - eintrag_start, 3),
+            "groesse": bericht or None,
+            "abreise": als_iso(eintrag_planung.get("abreise")),
+            "frist": als_iso(frist),
+            "fertig": als_iso(fertig),
+            "frist_verpasst": frist is not None and fertig > frist
+        })
+    return eintraege
+
+
+def merge_manifeste(manifest_pfade: List[Union[str, Path]], ziel_pfad: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Führt die Manifeste mehrerer Shards zu einem Gesamtbericht zusammen.
+
+    Prüft dabei, ob alle Shards vorhanden sind und ob Reisepläne in mehreren
+    Shards bearbeitet wurden.
+
+    Args:
+        manifest_pfade: Pfade zu den Shard-Manifesten
+        ziel_pfad: Zielpfad des Gesamtberichts
+
+    Returns:
+        Dict[str, Any]: Zusammengeführter Bericht
+    """
+    manifeste = []
+    for pfad in manifest_pfade:
+        with open(pfad, 'r', encoding='utf-8') as f:
+            manifeste.append(json.load(f))
+
+    eintraege = {}
+    doppelt = set()
+    for manifest in manifeste:
+        for eintrag in manifest["eintraege"]:
+            kennung = eintrag["reiseplan"]
+            if kennung in eintraege:
+                doppelt.add(kennung)
+            eintraege[kennung] = dict(eintrag, shard=manifest.get("shard"))
+
+    # Fehlende Shards ermitteln
+    shards = {m["shard"] for m in manifeste if m.get("shard")}
+    anzahlen = {int(s.split("/")[1]) for s in shards}
+    fehlende_shards = []
+    if len(anzahlen) > 1:
+        logger.warning(f"Manifeste mit unterschiedlicher Shard-Anzahl: {sorted(anzahlen)}")
+    elif anzahlen:
+        anzahl = anzahlen.pop()
+        fehlende_shards = [f"{i}/{anzahl}" for i in range(anzahl) if f"{i}/{anzahl}" not in shards]
+
+    for kennung in sorted(doppelt):
+        logger.warning(f"Reiseplan in mehreren Shards bearbeitet: {kennung}")
+    for shard in fehlende_shards:
+        logger.warning(f"Manifest für Shard {shard} fehlt")
+
+    bericht_eintraege = [eintraege[kennung] for kennung in sorted(eintraege)]
+    bericht = {
+        "shards": sorted(shards),
+        "fehlende_shards": fehlende_shards,
+        "doppelt": sorted(doppelt),
+        "hosts": sorted({m.get("host") for m in manifeste if m.get("host")}),
+        "eintraege": bericht_eintraege,
+        "verpasste_fristen": _verpasste_fristen(bericht_eintraege),
+        "zusammenfassung": _zusammenfassung(bericht_eintraege)
+    }
+
+    schreibe_json(bericht, ziel_pfad)
+    logger.info(f"Gesamtbericht geschrieben: {ziel_pfad}")
+    return bericht
+
+
+def _zusammenfassung(eintraege: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Zählt erfolgreiche und fehlgeschlagene Einträge.
+    """
+    ok = sum(1 for eintrag in eintraege if eintrag["status"] == "ok")
+    zusammenfassung = {
+        "reiseplaene": len(eintraege),
+        "ok": ok,
+        "fehler": len(eintraege) - ok,
+        "pdfs": sum(len(eintrag["pdfs"]) for eintrag in eintraege)
+    }
+
+    # PDFs, die erst nach ihrer Frist fertig wurden
+    if any("frist_verpasst" in eintrag for eintrag in eintraege):
+        zusammenfassung["frist_verpasst"] = sum(1 for eintrag in eintraege if eintrag.get("frist_verpasst"))
+
+    # Gesparte Bytes im Kompaktprofil
+    berichte = [eintrag["groesse"] for eintrag in eintraege if eintrag.get("groesse")]
+    if berichte:
+        zusammenfassung["bytes_gespart"] = sum(bericht["bytes_gespart"] for bericht in berichte)
+    return zusammenfassung
+
+
+def _verpasste_fristen(eintraege: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Listet die Reisepläne, die erst nach ihrer Frist fertig wurden, nach Frist geordnet.
+    """
+    verpasst = [
+        {"reiseplan": eintrag["reiseplan"], "abreise": eintrag["abreise"], "frist": eintrag["frist"],
+         "fertig": eintrag["fertig"], "status": eintrag["status"]}
+        for eintrag in eintraege if eintrag.get("frist_verpasst")
+    ]
+    return sorted(verpasst, key=lambda eintrag: eintrag["frist"])
+
+
+def schreibe_json(daten: Dict[str, Any], pfad: Union[str, Path]) -> None:
+    """
+    Schreibt JSON atomar (über eine temporäre Datei), damit andere Knoten nie halbe Dateien lesen.
+
+    Args:
+        daten: Zu schreibende Daten
+        pfad: Zielpfad
+    """
+    pfad = Path(pfad)
+    pfad.parent.mkdir(exist_ok=True, parents=True)
+    temp_pfad = pfad.with_name(pfad.name + ".tmp")
+    with open(temp_pfad, 'w', encoding='utf-8') as f:
+        json.dump(daten, f, ensure_ascii=False, indent=2)
+    temp_pfad.replace(pfad)
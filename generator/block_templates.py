@@ -0,0 +1,288 @@
+"""
+Vorlagen für die wiederkehrenden Bausteine der PDF-Blöcke.
+
+Tabellen-Styles und Spaltenbreiten sind für alle Flug-, Hotel-, Aktivitäts-,
+Agenda- und Zusatzinfo-Blöcke identisch. Sie werden hier einmal pro
+Generator erstellt und von den Element-Funktionen per Referenz
+wiederverwendet; sie werden nur gelesen und von allen Threads geteilt.
+
+Trennlinien und Abstände sind Flowables, auf denen ReportLab beim Rendern
+Layout-Zustand ablegt (z.B. _postponed) und nie zurücksetzt. Sie werden
+daher bei jedem Zugriff neu erstellt, was günstig ist.
+"""
+
+import io
+import logging
+import threading
+from pathlib import Path
+from typing import Mapping, Optional, Union
+
+from reportlab.lib import colors
+from reportlab.lib.styles import PropertySet
+from reportlab.lib.units import cm
+from reportlab.platypus import Flowable, Image, Spacer, Table, TableStyle
+from svglib.svglib import svg2rlg
+
+from .config import LOGO_DPI
+from .logo_cache import LogoCache, skaliere_svg, standard_logo_cache
+from .themes import Theme, standard_theme_registry
+from .utils.bild_utils import verkleinere_bild
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Breite des Inhaltsbereichs (A4 abzüglich der Ränder)
+INHALT_BREITE = 17*cm
+
+# Hintergrund für Termine mit Überschneidungen
+KONFLIKT_FARBE = colors.HexColor("#fde2e1")
+
+
+class BlockVorlagen:
+    """
+    Sammlung der vorgefertigten Styles und Flowables für die PDF-Blöcke.
+    """
+
+    def __init__(self, bild_dpi: Optional[int] = None, logo_cache: Optional[LogoCache] = None,
+                 theme: Optional[Theme] = None):
+        """
+        Erstellt alle Vorlagen einmalig.
+
+        Args:
+            bild_dpi: Verkleinert Logos auf ihre Anzeigegrösse bei dieser Auflösung
+                (None = Originalbilder einbetten)
+            logo_cache: Cache für vorbereitete Logo-Derivate (None = Logos bei jedem Render verkleinern)
+            theme: Schriften, Farben und Logo (Standard: Standard-Theme)
+        """
+        self.bild_dpi = bild_dpi
+        self.logo_cache = logo_cache
+        self.theme = theme or standard_theme_registry().theme()
+        schrift, schrift_fett, farben = self.theme.schrift, self.theme.schrift_fett, self.theme.farben
+
+        # Style für Detailtabellen (Label-Spalte links, Inhalt rechts)
+        self.detail_stil = TableStyle([
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
+            ('BACKGROUND', (0, 0), (0, -1), farben["label"]),
+            ('FONTNAME', (0, 0), (0, -1), schrift_fett),  # Fette Schrift für Labels
+            ('FONTNAME', (1, 0), (1, -1), schrift),       # Grundschrift für Inhalte
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+        ])
+
+        # Style für die Notfallkontakte
+        self.kontakt_stil = TableStyle([
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
+            ('FONTNAME', (0, 0), (-1, -1), schrift),  # Grundschrift für Kontakte
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('LEFTPADDING', (0, 0), (-1, -1), 12),
+            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 6),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ])
+
+        # Style für die Agenda und die Konfliktübersicht (Kopfzeile, feine Zeilenlinien)
+        self.agenda_stil = TableStyle([
+            ('FONTNAME', (0, 0), (-1, 0), schrift_fett),
+            ('FONTNAME', (0, 1), (-1, -1), schrift),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('LINEBELOW', (0, 0), (-1, 0), 1, farben["linie"]),
+            ('LINEBELOW', (0, 1), (-1, -1), 0.25, colors.lightgrey),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ])
+
+        # Spaltenbreiten
+        self.detail_spalten = [4*cm, 13*cm]
+        self.kontakt_spalten = [8.5*cm, 8.5*cm]
+        self.agenda_spalten = [3*cm, 2.5*cm, 11.5*cm]
+        self.konflikt_spalten = [8.5*cm, 8.5*cm]
+
+        # Trennlinie über die gesamte Inhaltsbreite
+        self.trennlinien_stil = TableStyle([
+            ('LINEBELOW', (0, 0), (0, 0), 1, farben["linie"])
+        ])
+        self.trennlinien_spalten = [INHALT_BREITE]
+
+    @property
+    def styles(self) -> Mapping[str, PropertySet]:
+        """Stylesheet des Themes."""
+        return self.theme.styles
+
+    @property
+    def trennlinie(self) -> Table:
+        """Neue Trennlinie über die gesamte Inhaltsbreite."""
+        return Table([['']], colWidths=self.trennlinien_spalten, style=self.trennlinien_stil)
+
+    @property
+    def abstand_klein(self) -> Spacer:
+        """Neuer kleiner Abstand (0.2 cm)."""
+        return Spacer(1, 0.2*cm)
+
+    @property
+    def abstand_mittel(self) -> Spacer:
+        """Neuer mittlerer Abstand (0.3 cm)."""
+        return Spacer(1, 0.3*cm)
+
+    @property
+    def abstand_gross(self) -> Spacer:
+        """Neuer grosser Abstand (0.5 cm)."""
+        return Spacer(1, 0.5*cm)
+
+    def logo(self, pfad: Union[str, Path], breite: float, hoehe: float) -> Image:
+        """
+        Erstellt ein Logo in der angegebenen Anzeigegrösse.
+
+        Ist bild_dpi gesetzt, wird das Bild auf die Pixelgrösse der Anzeige
+        bei dieser Auflösung verkleinert: mit Logo-Cache als vorbereitetes
+        Derivat, sonst bei jedem Aufruf mit Pillow im Speicher. Kleinere
+        Bilder werden unverändert übernommen.
+
+        Args:
+            pfad: Pfad zur Bilddatei
+            breite: Anzeigebreite in Punkten
+            hoehe: Anzeigehöhe in Punkten
+
+        Returns:
+            Image: Bild-Flowable
+        """
+        if self.bild_dpi:
+            try:
+                if self.logo_cache:
+                    return Image(str(self.logo_cache.bild(pfad, breite, hoehe, self.bild_dpi)),
+                                 width=breite, height=hoehe)
+                verkleinert = verkleinere_bild(pfad, breite, hoehe, self.bild_dpi)
+                if verkleinert is not None:
+                    puffer = io.BytesIO()
+                    verkleinert.save(puffer, format="PNG", optimize=True)
+                    puffer.seek(0)
+                    return Image(puffer, width=breite, height=hoehe)
+            except OSError as e:
+                logger.warning(f"Konnte Logo {pfad} nicht verkleinern: {e}")
+        return Image(str(pfad), width=breite, height=hoehe)
+
+    def svg_logo(self, pfad: Union[str, Path], breite: float, hoehe: float) -> Optional[Flowable]:
+        """
+        Erstellt ein SVG-Logo, skaliert in die angegebene Anzeigefläche.
+
+        Langsam zu verarbeitende SVGs werden aus dem Logo-Cache als
+        gerastertes PNG geladen, sofern dort eines vorliegt.
+
+        Args:
+            pfad: Pfad zur SVG-Datei
+            breite: Maximale Anzeigebreite in Punkten
+            hoehe: Maximale Anzeigehöhe in Punkten
+
+        Returns:
+            Optional[Flowable]: Bild oder Zeichnung, None wenn das SVG nicht gelesen werden konnte
+        """
+        if self.logo_cache and self.bild_dpi:
+            try:
+                raster = self.logo_cache.svg_raster(pfad, breite, hoehe, self.bild_dpi)
+                if raster is not None:
+                    img = Image(str(raster))
+                    scale = min(breite / img.imageWidth, hoehe / img.imageHeight)
+                    img.drawWidth = img.imageWidth * scale
+                    img.drawHeight = img.imageHeight * scale
+                    return img
+            except OSError as e:
+                logger.warning(f"Konnte gerastertes SVG-Logo {pfad} nicht laden: {e}")
+
+        drawing = svg2rlg(str(pfad))
+        if drawing is None:
+            return None
+        return skaliere_svg(drawing, breite, hoehe)
+
+    def detail_tabelle(self, zeilen: list) -> Table:
+        """
+        Erstellt eine Detailtabelle mit Label-Spalte.
+
+        Args:
+            zeilen: Tabellenzeilen als [Label, Inhalt]
+
+        Returns:
+            Table: Tabelle mit dem gemeinsamen Detail-Style
+        """
+        return Table(zeilen, colWidths=self.detail_spalten, style=self.detail_stil)
+
+    def kontakt_tabelle(self, zeilen: list) -> Table:
+        """
+        Erstellt eine Tabelle für Notfallkontakte.
+
+        Args:
+            zeilen: Tabellenzeilen als [Name, Telefon]
+
+        Returns:
+            Table: Tabelle mit dem gemeinsamen Kontakt-Style
+        """
+        return Table(zeilen, colWidths=self.kontakt_spalten, style=self.kontakt_stil)
+
+    def agenda_tabelle(self, zeilen: list, markierte_zeilen: Optional[list] = None) -> Table:
+        """
+        Erstellt die Agenda-Tabelle eines Tages.
+
+        Args:
+            zeilen: Kopfzeile und Tabellenzeilen als [Zeit, Ereignis, Beschreibung]
+            markierte_zeilen: Indizes der Zeilen, die farbig hervorgehoben werden (Konflikte)
+
+        Returns:
+            Table: Tabelle mit dem gemeinsamen Agenda-Style, teilbar über Seitenumbrüche
+        """
+        tabelle = Table(zeilen, colWidths=self.agenda_spalten, style=self.agenda_stil, repeatRows=1)
+        if markierte_zeilen:
+            tabelle.setStyle([('BACKGROUND', (0, zeile), (-1, zeile), KONFLIKT_FARBE) for zeile in markierte_zeilen])
+        return tabelle
+
+    def konflikt_tabelle(self, zeilen: list) -> Table:
+        """
+        Erstellt die Tabelle der Terminkonflikte.
+
+        Args:
+            zeilen: Kopfzeile und Tabellenzeilen als [Termin, Überschneidung]
+
+        Returns:
+            Table: Tabelle mit dem gemeinsamen Agenda-Style
+        """
+        return Table(zeilen, colWidths=self.konflikt_spalten, style=self.agenda_stil, repeatRows=1)
+
+
+def standard_profil_vorlagen(theme: Optional[Theme] = None) -> BlockVorlagen:
+    """
+    Erstellt Vorlagen für das Standardprofil.
+
+    Mit aktivem Logo-Cache werden Logos als Derivate mit LOGO_DPI
+    eingebettet, sonst als Originalbilder.
+
+    Args:
+        theme: Theme der Vorlagen (Standard: Standard-Theme)
+
+    Returns:
+        BlockVorlagen: Neue Vorlagen-Instanz
+    """
+    logo_cache = standard_logo_cache()
+    return BlockVorlagen(bild_dpi=LOGO_DPI if logo_cache else None, logo_cache=logo_cache, theme=theme)
+
+
+_standard_vorlagen: Optional[BlockVorlagen] = None
+_vorlagen_lock = threading.Lock()
+
+
+def standard_vorlagen() -> BlockVorlagen:
+    """
+    Liefert die modulweit geteilten Vorlagen, falls der Aufrufer keine eigenen übergibt.
+
+    Returns:
+        BlockVorlagen: Geteilte Vorlagen-Instanz
+    """
+    global _standard_vorlagen
+    if _standard_vorlagen is None:
+        with _vorlagen_lock:
+            if _standard_vorlagen is None:
+                _standard_vorlagen = standard_profil_vorlagen()
+    return _standard_vorlagen
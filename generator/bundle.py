@@ -0,0 +1,184 @@
+"""
+Sammeldokument mit vielen Reiseplänen für den Druck.
+
+Jeder Reiseplan wird einzeln gerendert und sofort als Teildokument auf die
+Festplatte geschrieben, sodass ReportLab nie mehr als einen Reiseplan im
+Speicher hält. Anschliessend wird ein Inhaltsverzeichnis erstellt, und
+PdfSammler hängt Inhaltsverzeichnis und Teile nacheinander an das
+Sammeldokument an. Der Speicherbedarf hängt dadurch nicht von der Anzahl
+der Reisepläne ab.
+"""
+
+import datetime
+import io
+import logging
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from reportlab.lib.units import cm
+from reportlab.platypus import Paragraph, Table
+
+from .batch import filtere_shard, rufe_fluege_vorab_ab, sammle_reiseplaene
+from .utils.date_utils import formatiere_datum
+from .utils.pdf_utils import PdfSammler, PdfTeil
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Spalten des Inhaltsverzeichnisses (Style aus den Agenda-Vorlagen des Themes)
+INHALT_SPALTEN = [6*cm, 4.5*cm, 5*cm, 1.5*cm]
+INHALT_STIL = [
+    ('ALIGN', (3, 0), (3, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+]
+
+
+class SammeldokumentFehler(Exception):
+    """Ausnahme, wenn das Sammeldokument nicht erstellt werden kann."""
+    pass
+
+
+def erstelle_sammeldokument(generator, pfade: List[Union[str, Path]], ziel_pfad: Union[str, Path],
+                            shard: Optional[Tuple[int, int]] = None, vorabruf: bool = True) -> Dict[str, Any]:
+    """
+    Erstellt ein PDF mit Inhaltsverzeichnis und Lesezeichen aus vielen Reiseplänen.
+
+    Jeder Reiseplan beginnt auf einer neuen Seite und behält seine eigene
+    Kopf- und Fusszeile. Reisepläne, die nicht erstellt werden können,
+    werden übersprungen und im Ergebnis aufgeführt.
+
+    Args:
+        generator: ReiseplanGenerator
+        pfade: Pfade zu JSON-Dateien oder Verzeichnissen
+        ziel_pfad: Zielpfad des Sammeldokuments
+        shard: Optionaler Shard als (Index, Anzahl)
+        vorabruf: Ruft alle minimalen Flüge vor dem Rendern einmalig ab
+
+    Returns:
+        Dict[str, Any]: Pfad, Seitenzahl und ein Eintrag pro Reiseplan
+        (Status, erste Seite, Seitenzahl, Fehler)
+
+    Raises:
+        SammeldokumentFehler: Wenn kein Reiseplan erstellt werden konnte
+    """
+    ziel_pfad = Path(ziel_pfad)
+    ziel_pfad.parent.mkdir(exist_ok=True, parents=True)
+
+    reiseplaene = sammle_reiseplaene(pfade)
+    if shard:
+        reiseplaene = filtere_shard(reiseplaene, *shard)
+    if vorabruf:
+        rufe_fluege_vorab_ab(generator, [datei for datei, _ in reiseplaene])
+
+    # Teildokumente neben dem Ziel ablegen, damit sie auf demselben Dateisystem liegen
+    with tempfile.TemporaryDirectory(prefix=".sammel-", dir=ziel_pfad.parent) as temp_verzeichnis:
+        eintraege, teile = _rendere_teile(generator, reiseplaene, Path(temp_verzeichnis))
+        if not teile:
+            raise SammeldokumentFehler("Kein Reiseplan konnte erstellt werden")
+
+        for eintrag, teil_pfad in teile:
+            eintrag["seiten"] = PdfTeil(teil_pfad.read_bytes()).seiten
+        inhalt = _erstelle_inhaltsverzeichnis(generator, [eintrag for eintrag, _ in teile])
+
+        # Atomar schreiben, damit nie ein halbes Sammeldokument gedruckt wird
+        temp_pfad = ziel_pfad.with_name(ziel_pfad.name + ".tmp")
+        try:
+            with open(temp_pfad, 'wb') as f:
+                sammler = PdfSammler(f)
+                sammler.fuege_hinzu(inhalt, "Inhaltsverzeichnis")
+                for eintrag, teil_pfad in teile:
+                    sammler.fuege_hinzu(teil_pfad.read_bytes(), eintrag["titel"])
+                seiten = sammler.schliesse()
+            temp_pfad.replace(ziel_pfad)
+        finally:
+            temp_pfad.unlink(missing_ok=True)
+
+    logger.info(f"Sammeldokument mit {len(teile)} Reiseplänen und {seiten} Seiten erstellt: {ziel_pfad}")
+    return {"pdf": str(ziel_pfad), "seiten": seiten, "eintraege": eintraege}
+
+
+def _rendere_teile(generator, reiseplaene: List[Tuple[Path, str]],
+                   temp_verzeichnis: Path) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Path]]]:
+    """
+    Rendert jeden Reiseplan in ein eigenes Teildokument.
+
+    Returns:
+        Tuple: Alle Einträge und die erfolgreich erstellten Teile als (Eintrag, Pfad)
+    """
+    eintraege, teile = [], []
+    for nummer, (datei, kennung) in enumerate(reiseplaene):
+        eintrag = {"reiseplan": kennung, "status": "fehler", "seite": None, "seiten": 0, "fehler": None}
+        eintraege.append(eintrag)
+        try:
+            reiseplan_daten = generator.lade_reiseplan(datei)
+            pdf_pfad = None
+            if reiseplan_daten:
+                pdf_pfad = generator.rendere_reiseplan(reiseplan_daten, pdf_pfad=temp_verzeichnis / f"{nummer:06d}.pdf")
+        except Exception as e:
+            logger.error(f"Unerwarteter Fehler bei {datei}: {e}")
+            eintrag["fehler"] = str(e)
+            continue
+
+        if not pdf_pfad:
+            eintrag["fehler"] = "PDF konnte nicht erstellt werden"
+            continue
+
+        if generator.flug_speicher:
+            generator.flug_speicher.quittiere(str(Path(datei).resolve()))
+        eintrag.update({
+            "status": "ok",
+            "titel": reiseplan_daten["titel"],
+            "zeitraum": f"{formatiere_datum(reiseplan_daten['startdatum'])} - "
+                        f"{formatiere_datum(reiseplan_daten['enddatum'])}",
+            "reiseziel": reiseplan_daten.get("reiseziel", "")
+        })
+        teile.append((eintrag, Path(pdf_pfad)))
+    return eintraege, teile
+
+
+def _erstelle_inhaltsverzeichnis(generator, eintraege: List[Dict[str, Any]]) -> bytes:
+    """
+    Erstellt das Inhaltsverzeichnis und trägt die erste Seite jedes Reiseplans ein.
+
+    Die Seitenzahlen hängen von der Länge des Inhaltsverzeichnisses ab. Es
+    wird daher so lange neu erstellt, bis seine Seitenzahl stabil ist (in
+    der Regel beim zweiten Durchlauf, es ist klein im Vergleich zu den Reiseplänen).
+
+    Args:
+        generator: ReiseplanGenerator (Theme und Dokumentvorlage)
+        eintraege: Erfolgreich erstellte Reisepläne mit Seitenzahl, werden um die erste Seite ergänzt
+
+    Returns:
+        bytes: Inhaltsverzeichnis als PDF
+    """
+    vorlagen = generator.vorlagen
+    styles = vorlagen.styles
+    inhalt_seiten = 1
+    while True:
+        seite = inhalt_seiten + 1
+        for eintrag in eintraege:
+            eintrag["seite"] = seite
+            seite += eintrag["seiten"]
+
+        zeilen = [["Reiseplan", "Zeitraum", "Reiseziel", "Seite"]]
+        zeilen.extend(
+            [Paragraph(eintrag["titel"], styles["Tabelle"]), eintrag["zeitraum"],
+             Paragraph(eintrag["reiseziel"], styles["Tabelle"]), str(eintrag["seite"])]
+            for eintrag in eintraege
+        )
+        tabelle = Table(zeilen, colWidths=INHALT_SPALTEN, style=vorlagen.agenda_stil, repeatRows=1)
+        tabelle.setStyle(INHALT_STIL)
+        elemente = [
+            Paragraph("Reisepläne", styles["Titel"]),
+            Paragraph(f"{len(eintraege)} Reisepläne, erstellt am "
+                      f"{datetime.date.today().strftime('%d.%m.%Y')}", styles["Normal"]),
+            tabelle
+        ]
+
+        puffer = io.BytesIO()
+        doc = generator._dokument(puffer, generator.profil)
+        doc.build(elemente)
+        if doc.page == inhalt_seiten:
+            return puffer.getvalue()
+        inhalt_seiten = doc.page
@@ -3,6 +3,7 @@ Konfigurationseinstellungen für den Reiseplan-Generator.
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 # Basis-Verzeichnisse
@@ -16,10 +17,93 @@ HOTELS_DIR = ASSETS_DIR / 'hotels'
 # API Konfiguration
 FLIGHT_API_KEY = os.getenv('FLIGHT_API_KEY')
 FLIGHT_API_URL = 'http://api.aviationstack.com/v1/flights'
+FLIGHT_API_MAX_PARALLEL = int(os.getenv('FLIGHT_API_MAX_PARALLEL', '8'))
+FLIGHT_API_NEGATIVE_TTL = int(os.getenv('FLIGHT_API_NEGATIVE_TTL', '300'))  # in Sekunden
+FLIGHT_API_TIMEOUT = float(os.getenv('FLIGHT_API_TIMEOUT', '10'))  # in Sekunden
+
+# Weitere Flugdaten-Provider
+AIRLABS_API_KEY = os.getenv('AIRLABS_API_KEY')
+AIRLABS_API_URL = os.getenv('AIRLABS_API_URL', 'https://airlabs.co/api/v9/schedules')
+
+# Provider in der Reihenfolge ihrer Priorität, nur Provider mit API-Schlüssel werden verwendet
+FLIGHT_API_PROVIDERS = [p.strip() for p in os.getenv('FLIGHT_API_PROVIDERS', 'aviationstack').split(',') if p.strip()]
+# Verzögerung bis zur Absicherungsanfrage beim nächsten Provider, solange keine p95-Schätzung vorliegt
+FLIGHT_API_HEDGE_DELAY = float(os.getenv('FLIGHT_API_HEDGE_DELAY', '1.0'))  # in Sekunden
+
+# Lokaler Flugplan-Index (wird vor der Flight-API abgefragt)
+FLUGPLAN_DB = Path(os.getenv('REISEPLAN_FLUGPLAN_DB', BASE_DIR / 'flugplan.sqlite'))
+
+# Gespeicherte Flugdaten-Ergänzungen (stale-while-revalidate)
+FLUGDATEN_SWR = os.getenv('REISEPLAN_FLUGDATEN_SWR', '').lower() in ('1', 'true', 'ja')
+FLUGDATEN_DB = Path(os.getenv('REISEPLAN_FLUGDATEN_DB', BASE_DIR / 'flugdaten.sqlite'))
+FLUGDATEN_REVALIDIERUNG_TAGE = int(os.getenv('REISEPLAN_REVALIDIERUNG_TAGE', '7'))
+FLUGDATEN_REVALIDIERUNG_INTERVALL = int(os.getenv('REISEPLAN_REVALIDIERUNG_INTERVALL', '900'))  # in Sekunden
+
+# Rate-Limit pro Flugdaten-Provider, gilt für alle Prozesse mit derselben Zustandsdatei (Rate 0 = kein Limit)
+FLIGHT_API_RATE = float(os.getenv('FLIGHT_API_RATE', '5'))  # Anfragen pro Sekunde
+FLIGHT_API_BURST = int(os.getenv('FLIGHT_API_BURST', '10'))
+FLIGHT_API_RATE_FILE = Path(os.getenv('FLIGHT_API_RATE_FILE', Path(tempfile.gettempdir()) / 'reiseplan_flight_api.bucket'))
+
+# Job-Warteschlange
+QUEUE_DB = Path(os.getenv('REISEPLAN_QUEUE_DB', BASE_DIR / 'reiseplan_jobs.sqlite'))
+QUEUE_LEASE_SEKUNDEN = int(os.getenv('REISEPLAN_QUEUE_LEASE', '300'))
+QUEUE_MAX_VERSUCHE = int(os.getenv('REISEPLAN_QUEUE_MAX_VERSUCHE', '5'))
+QUEUE_BACKOFF_SEKUNDEN = int(os.getenv('REISEPLAN_QUEUE_BACKOFF', '30'))
+
+# Planung nach Abreise: ein PDF muss so viele Stunden vor der Abreise fertig sein
+FRIST_VORLAUF_STUNDEN = float(os.getenv('REISEPLAN_FRIST_VORLAUF', '24'))
+
+# Asynchrone API: gleichzeitige PDF-Erstellungen pro Prozess
+ASYNC_MAX_RENDERS = int(os.getenv('REISEPLAN_ASYNC_MAX_RENDERS', str(os.cpu_count() or 4)))
+
+# Worker-Prozesse
+WORKER_MAX_DOKUMENTE = int(os.getenv('REISEPLAN_WORKER_MAX_DOKUMENTE', '500'))
+WORKER_MAX_RSS_MB = int(os.getenv('REISEPLAN_WORKER_MAX_RSS_MB', '512'))
+# Abgestürzte Worker: Wartezeit vor dem ersten Neustart (verdoppelt sich) und maximale Fehlstarts in Folge
+WORKER_NEUSTART_BACKOFF = float(os.getenv('REISEPLAN_WORKER_NEUSTART_BACKOFF', '1'))
+WORKER_MAX_NEUSTARTS = int(os.getenv('REISEPLAN_WORKER_MAX_NEUSTARTS', '5'))
 
 # PDF Einstellungen
 PDF_MARGIN = 2  # in cm
 
+# Ausgabeprofil: 'standard' oder 'kompakt' (verkleinerte Logos, maximale Kompression)
+PDF_PROFIL = os.getenv('REISEPLAN_PDF_PROFIL', 'standard')
+KOMPAKT_BILD_DPI = int(os.getenv('REISEPLAN_KOMPAKT_DPI', '150'))
+
+# PDFs für die schnelle Anzeige im Browser linearisieren ("Fast Web View", benötigt pikepdf oder qpdf)
+PDF_LINEARISIERT = os.getenv('REISEPLAN_PDF_LINEARISIERT', '').lower() in ('1', 'true', 'ja')
+
+# Chronologischer Ablauf pro Tag mit Prüfung auf Terminkonflikte
+AGENDA = os.getenv('REISEPLAN_AGENDA', '1').lower() in ('1', 'true', 'ja')
+
+# Themes der Firmenkunden (<id>.json) und Theme für Reisepläne ohne Angabe
+THEMES_DIR = Path(os.getenv('REISEPLAN_THEMES_DIR', BASE_DIR / 'themes'))
+THEME = os.getenv('REISEPLAN_THEME', 'standard')
+
+# Sehr grosse Reisepläne in Abschnitten auf mehreren Prozessen erstellen (0 = aus)
+PARALLEL_PROZESSE = int(os.getenv('REISEPLAN_PARALLEL_PROZESSE', '0'))
+PARALLEL_MIN_BLOECKE = int(os.getenv('REISEPLAN_PARALLEL_MIN_BLOECKE', '150'))
+
+# Grösse der Caches für geparste und formatierte Zeitangaben (Einträge pro Funktion)
+DATUM_CACHE_GROESSE = int(os.getenv('REISEPLAN_DATUM_CACHE', '4096'))
+
+# Aufbereitete Dokumente für HTML- und Kalender-Ausgabe (Zwischendarstellung als JSON, standardmässig aus)
+DOKUMENT_CACHE = os.getenv('REISEPLAN_DOKUMENT_CACHE', '0').lower() in ('1', 'true', 'ja')
+DOKUMENT_CACHE_DIR = Path(os.getenv('REISEPLAN_DOKUMENT_CACHE_DIR', BASE_DIR / 'dokument_cache'))
+# Höchstzahl abgelegter Dokumente; die am längsten nicht verwendeten werden entfernt
+DOKUMENT_CACHE_MAX = int(os.getenv('REISEPLAN_DOKUMENT_CACHE_MAX', '1000'))
+
+# Cache-Verzeichnis des Benutzers (unabhängig vom Arbeitsverzeichnis)
+CACHE_DIR = Path(os.getenv('REISEPLAN_CACHE_DIR',
+                           Path(os.getenv('XDG_CACHE_HOME') or Path.home() / '.cache') / 'reiseplan'))
+
+# Vorbereitete Logo-Derivate in Anzeigegrösse (Auflösung im Standardprofil)
+LOGO_CACHE = os.getenv('REISEPLAN_LOGO_CACHE', '1').lower() in ('1', 'true', 'ja')
+LOGO_CACHE_DIR = Path(os.getenv('REISEPLAN_LOGO_CACHE_DIR', CACHE_DIR / 'logo_cache'))
+LOGO_DPI = int(os.getenv('REISEPLAN_LOGO_DPI', '300'))
+# SVG-Logos, deren Verarbeitung mit svglib länger dauert, werden gerastert (benötigt rlPyCairo)
+LOGO_SVG_RASTER_MS = float(os.getenv('REISEPLAN_LOGO_SVG_RASTER_MS', '50'))
+
 # Debug-Modus
 DEBUG = os.getenv('REISEPLAN_DEBUG', 'False').lower() in ('true', '1', 't')
 
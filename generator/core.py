@@ -2,87 +2,547 @@
 Hauptmodul des Reiseplan-Generators.
 """
 
+import datetime
+import io
 import logging
+import re
+import threading
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
+from typing import Callable, Dict, Any, List, Optional, Tuple, Union
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
 from reportlab.platypus import SimpleDocTemplate, KeepTogether
 
-from .config import OUTPUT_DIR, PDF_MARGIN
-from .utils.font_manager import setup_fonts, check_fonts_availability
+from .config import (OUTPUT_DIR, PDF_MARGIN, PDF_PROFIL, PDF_LINEARISIERT, KOMPAKT_BILD_DPI, AGENDA, THEME,
+                     PARALLEL_PROZESSE)
+from .utils.date_utils import bereite_zeiten_vor
 from .utils.json_schema import lade_json_reiseplan
+from .utils.pdf_utils import linearisiere, linearisierung_verfuegbar, nicht_subset_fonts
+from .block_templates import BlockVorlagen, standard_vorlagen, standard_profil_vorlagen
+from .logo_cache import standard_logo_cache
+from .page_templates import Seitenrahmen
+from .themes import STANDARD_THEME, ThemeFehler, standard_theme_registry
 from .elements import (
     erstelle_header, erstelle_uebersicht, erstelle_flug_block, 
-    erstelle_hotel_block, erstelle_aktivitaet_block, erstelle_zusatzinfo_block
+    erstelle_hotel_block, erstelle_aktivitaet_block, erstelle_zusatzinfo_block,
+    erstelle_agenda_block, erstelle_konflikt_block
 )
+from .document import erstelle_dokument, standard_dokument_cache
+from .html_export import erstelle_html
+from .ics_export import erstelle_ics
+from .sections import lohnt_abschnitte, rendere_in_abschnitten
+from .timeline import agenda_nach_tagen, erstelle_zeitplan, finde_konflikte
 from .apis.flight_api import hole_fluginformationen, FlightAPIException
+from .apis.flugplan import standard_flugplan
+from .apis.flugdaten_speicher import standard_flugdaten_speicher
 
 # Logger konfigurieren
 logger = logging.getLogger(__name__)
 
+# Ausgabeprofile
+PROFIL_STANDARD = "standard"
+PROFIL_KOMPAKT = "kompakt"
+
+# Ausgabeformate und ihre Dateiendungen
+FORMATE = ("pdf", "html", "ics")
+
+# Zeichen, die nicht in Dateinamen vorkommen dürfen (Pfadtrenner, Steuerzeichen, unter Windows reserviert)
+UNZULAESSIGE_ZEICHEN = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+class RenderAbgebrochen(Exception):
+    """Exception, mit der eine laufende PDF-Erstellung abgebrochen wird."""
+    pass
+
+
+class UngueltigerReiseplan(Exception):
+    """Exception für Reisepläne, die nicht gelesen oder validiert werden konnten (eine Wiederholung hilft nicht)."""
+    pass
+
+
+class ReisendeFehlen(Exception):
+    """Exception, wenn nicht für alle Reisenden ein persönliches PDF erstellt werden konnte."""
+
+    def __init__(self, meldung: str, pdf_pfade: List[str]):
+        """
+        Args:
+            meldung: Fehlermeldung
+            pdf_pfade: Pfade der trotzdem erstellten PDFs
+        """
+        super().__init__(meldung)
+        self.pdf_pfade = pdf_pfade
+
+
+def dateiname(text: str) -> str:
+    """
+    Macht aus einem Titel oder Namen einen sicheren Dateinamen ohne Verzeichnisanteil.
+
+    Args:
+        text: Titel oder Name
+
+    Returns:
+        str: Dateiname ohne Endung, Leerzeichen und unzulässige Zeichen durch '-' ersetzt
+    """
+    name = UNZULAESSIGE_ZEICHEN.sub("-", text.replace(" ", "-")).lstrip(".")
+    return name or "Reiseplan"
+
 
 class ReiseplanGenerator:
     """
     Hauptklasse für die Generierung von Reiseplänen.
+    
+    Eine Instanz kann von mehreren Threads gleichzeitig verwendet werden:
+    Styles und Vorlagen werden nur gelesen, Flowables mit Layout-Zustand
+    werden pro Dokument neu erstellt, und die Flugdaten-Quellen sind selbst threadsicher.
     """
     
-    def __init__(self):
+    def __init__(self, profil: str = PDF_PROFIL, linearisiert: bool = PDF_LINEARISIERT, theme: str = THEME,
+                 parallel_prozesse: int = PARALLEL_PROZESSE):
         """
         Initialisiert den ReiseplanGenerator.
+        
+        Args:
+            profil: Ausgabeprofil, 'standard' oder 'kompakt' (Logos auf Anzeigegrösse
+                verkleinert, maximale Kompression)
+            linearisiert: Linearisiert die PDFs nach der Erstellung ("Fast Web View"),
+                sofern pikepdf oder qpdf verfügbar ist
+            theme: Theme für Reisepläne ohne eigenes Feld 'theme'
+            parallel_prozesse: Erstellt sehr grosse Reisepläne in Abschnitten auf so vielen
+                Prozessen (siehe sections, 0 = immer in einem Durchlauf)
+            
+        Raises:
+            ValueError: Bei einem unbekannten Ausgabeprofil
+            ThemeFehler: Wenn das Theme nicht geladen werden kann
         """
+        if profil not in (PROFIL_STANDARD, PROFIL_KOMPAKT):
+            raise ValueError(f"Unbekanntes Ausgabeprofil: {profil}")
+        self.profil = profil
+        self.parallel_prozesse = parallel_prozesse
+        
+        # Linearisierung nur, wenn ein Werkzeug dafür installiert ist
+        self.linearisiert = linearisiert and linearisierung_verfuegbar()
+        if linearisiert and not self.linearisiert:
+            logger.warning("Weder pikepdf noch qpdf gefunden, PDFs werden nicht linearisiert")
+        
         # Stelle sicher, dass die Verzeichnisse existieren
         OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
         
-        # Überprüfe, ob die benötigten Fonts verfügbar sind
-        if not check_fonts_availability():
-            logger.warning("Nicht alle benötigten Fonts sind verfügbar!")
+        # Themes (Fonts und Styles) werden einmal pro Prozess kompiliert und geteilt
+        self.themes = standard_theme_registry()
+        self.theme = theme
+        
+        # Vorlagen für Tabellen, Trennlinien, Abstände und Logos (einmal pro Generator und Theme)
+        self._vorlagen: Dict[str, BlockVorlagen] = {}
+        self._vorlagen_lock = threading.Lock()
+        self.vorlagen = self.vorlagen_fuer({})
+        self.styles = self.vorlagen.styles
         
-        # Registriere Fonts
-        if not setup_fonts():
-            logger.warning("Nicht alle Fonts konnten registriert werden!")
+        # Vorab abgerufene Flugdaten je (Flugnummer, Datum), None bei fehlgeschlagenem Abruf
+        self.flug_cache: Dict[Tuple[str, str], Optional[Dict[str, Any]]] = {}
         
-        # Styles für PDF
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
+        # Lokaler Flugplan für regelmässige Linienflüge (falls importiert)
+        self.flugplan = standard_flugplan()
+        
+        # Zuletzt bekannte Flugdaten, werden ohne Warten auf die Flight-API verwendet (falls aktiviert)
+        self.flug_speicher = standard_flugdaten_speicher()
     
-    def _setup_styles(self):
+    def generiere_reiseplan(self, reiseplan_pfad: Union[str, Path],
+                            flugdaten_erforderlich: bool = False,
+                            bericht: Optional[Dict[str, Any]] = None,
+                            eingabefehler_ausloesen: bool = False) -> Optional[str]:
         """
-        Richtet die Styles für das PDF ein.
+        Generiert einen PDF-Reiseplan aus einer JSON-Datei.
+        
+        Args:
+            reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+            flugdaten_erforderlich: Bricht ab, wenn minimale Flüge nicht ergänzt werden können
+            bericht: Wird im Kompaktprofil mit dem Grössenbericht befüllt (siehe groessenbericht)
+            eingabefehler_ausloesen: Löst bei ungültiger Eingabe UngueltigerReiseplan aus,
+                statt None zu liefern
+            
+        Returns:
+            Optional[str]: Pfad zur generierten PDF-Datei oder None bei Fehler
+            
+        Raises:
+            FlightAPIException: Wenn flugdaten_erforderlich gesetzt ist und die Ergänzung fehlschlägt
+            UngueltigerReiseplan: Wenn eingabefehler_ausloesen gesetzt ist und der Reiseplan
+                nicht gelesen oder validiert werden kann
+        """
+        return self._generiere(reiseplan_pfad, flugdaten_erforderlich, bericht, self.rendere_reiseplan,
+                               eingabefehler_ausloesen)
+    
+    def generiere_pdf_daten(self, reiseplan_pfad: Union[str, Path],
+                            flugdaten_erforderlich: bool = False,
+                            bericht: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
         """
-        # Titel-Style
-        self.styles.add(ParagraphStyle(
-            name='Titel',
-            fontName='OpenSans-Bold',
-            fontSize=24,
-            spaceAfter=12
-        ))
+        Generiert einen PDF-Reiseplan im Speicher, ohne eine Datei anzulegen (z.B. für Archive).
         
-        # Untertitel-Style
-        self.styles.add(ParagraphStyle(
-            name='Untertitel',
-            fontName='OpenSans-Bold',
-            fontSize=16,
-            spaceAfter=8
-        ))
+        Args:
+            reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+            flugdaten_erforderlich: Bricht ab, wenn minimale Flüge nicht ergänzt werden können
+            bericht: Wird im Kompaktprofil mit dem Grössenbericht befüllt (siehe groessenbericht)
+            
+        Returns:
+            Optional[bytes]: Inhalt der PDF-Datei oder None bei Fehler
+            
+        Raises:
+            FlightAPIException: Wenn flugdaten_erforderlich gesetzt ist und die Ergänzung fehlschlägt
+        """
+        return self._generiere(reiseplan_pfad, flugdaten_erforderlich, bericht, self.rendere_pdf_daten)
+    
+    def _generiere(self, reiseplan_pfad: Union[str, Path], flugdaten_erforderlich: bool,
+                   bericht: Optional[Dict[str, Any]], rendere: Callable[[Dict[str, Any]], Any],
+                   eingabefehler_ausloesen: bool = False):
+        """
+        Lädt, ergänzt und rendert einen Reiseplan und quittiert die verwendeten Flugdaten.
+        """
+        reiseplan_daten = self.lade_reiseplan(reiseplan_pfad, flugdaten_erforderlich)
+        if not reiseplan_daten:
+            if eingabefehler_ausloesen:
+                raise UngueltigerReiseplan(f"Reiseplan ungültig oder nicht lesbar: {reiseplan_pfad}")
+            return None
         
-        # Modifiziere existierenden 'Normal' Style
-        self.styles['Normal'].fontName = 'OpenSans'
-        self.styles['Normal'].fontSize = 11
-        self.styles['Normal'].spaceAfter = 6
+        pdf = rendere(reiseplan_daten)
+        if pdf and self.flug_speicher:
+            self.flug_speicher.quittiere(str(Path(reiseplan_pfad).resolve()))
+        if pdf and bericht is not None and self.profil == PROFIL_KOMPAKT:
+            bericht.update(self.groessenbericht(reiseplan_daten, pdf))
+        return pdf
     
-    def generiere_reiseplan(self, reiseplan_pfad: Union[str, Path]) -> Optional[str]:
+    def generiere_formate(self, reiseplan_pfad: Union[str, Path], formate: Tuple[str, ...] = FORMATE,
+                          flugdaten_erforderlich: bool = False) -> Dict[str, str]:
         """
-        Generiert einen PDF-Reiseplan aus einer JSON-Datei.
+        Generiert einen Reiseplan in mehreren Formaten (PDF, HTML, iCalendar).
+        
+        Der Reiseplan wird einmal geladen und ergänzt; HTML und iCalendar entstehen
+        aus dem Dokument (siehe dokument) ohne ReportLab.
         
         Args:
             reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+            formate: Gewünschte Formate aus FORMATE
+            flugdaten_erforderlich: Bricht ab, wenn minimale Flüge nicht ergänzt werden können
             
         Returns:
-            Optional[str]: Pfad zur generierten PDF-Datei oder None bei Fehler
+            Dict[str, str]: Pfade der erstellten Dateien pro Format (leer bei Fehler)
+            
+        Raises:
+            ValueError: Bei einem unbekannten Format
+            FlightAPIException: Wenn flugdaten_erforderlich gesetzt ist und die Ergänzung fehlschlägt
+        """
+        unbekannt = [format_ for format_ in formate if format_ not in FORMATE]
+        if unbekannt:
+            raise ValueError(f"Unbekannte Formate: {', '.join(unbekannt)} (erlaubt: {', '.join(FORMATE)})")
+        
+        reiseplan_daten = self.lade_reiseplan(reiseplan_pfad, flugdaten_erforderlich)
+        if not reiseplan_daten:
+            return {}
+        
+        pfade = {}
+        if "pdf" in formate:
+            pdf_pfad = self.rendere_reiseplan(reiseplan_daten)
+            if not pdf_pfad:
+                return {}
+            pfade["pdf"] = pdf_pfad
+        
+        leichte_formate = [format_ for format_ in formate if format_ != "pdf"]
+        if leichte_formate:
+            dokument = self.dokument(reiseplan_daten)
+            basis = self._pdf_pfad(reiseplan_daten["titel"])
+            for format_ in leichte_formate:
+                inhalt = erstelle_html(dokument) if format_ == "html" else erstelle_ics(dokument)
+                ziel = basis.with_suffix(f".{format_}")
+                # iCalendar verlangt CRLF-Zeilenenden, daher ohne Übersetzung schreiben
+                with open(ziel, "w", encoding="utf-8", newline="") as f:
+                    f.write(inhalt)
+                pfade[format_] = str(ziel)
+                logger.info(f"{format_.upper()} erstellt: {ziel}")
+        
+        if self.flug_speicher:
+            self.flug_speicher.quittiere(str(Path(reiseplan_pfad).resolve()))
+        return pfade
+    
+    def dokument(self, reiseplan_daten: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Liefert die Zwischendarstellung eines ergänzten Reiseplans für HTML und iCalendar.
+        
+        Das Dokument wird mit den Farben des Themes erstellt und im Dokument-Cache
+        abgelegt, sofern dieser aktiviert ist.
+        
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten (siehe lade_reiseplan)
+            
+        Returns:
+            Dict[str, Any]: Dokument (siehe document.erstelle_dokument)
+        """
+        theme = self.vorlagen_fuer(reiseplan_daten).theme
+        farben = {name: f"#{farbe.hexval()[2:]}" for name, farbe in theme.farben.items()}
+        cache = standard_dokument_cache()
+        if cache is None:
+            return erstelle_dokument(reiseplan_daten, farben)
+        return cache.dokument(reiseplan_daten, farben)
+    
+    def rendere_reiseplan(self, reiseplan_daten: Dict[str, Any],
+                          abbruch: Optional[threading.Event] = None,
+                          pdf_pfad: Optional[Union[str, Path]] = None) -> Optional[str]:
+        """
+        Erstellt das PDF aus bereits geladenen und ergänzten Reiseplan-Daten.
+        
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten (siehe lade_reiseplan)
+            abbruch: Bricht die Erstellung nach dem aktuellen Element ab, sobald das Event gesetzt ist
+            pdf_pfad: Zielpfad der PDF-Datei (Standard: Titel im Ausgabeverzeichnis)
+            
+        Returns:
+            Optional[str]: Pfad zur generierten PDF-Datei oder None bei Fehler oder Abbruch
+        """
+        pdf_pfad = Path(pdf_pfad) if pdf_pfad else self._pdf_pfad(reiseplan_daten["titel"])
+        if self._in_abschnitten(reiseplan_daten, abbruch):
+            return self._rendere_in_abschnitten(reiseplan_daten, pdf_pfad)
+        vorlagen = self.vorlagen_fuer(reiseplan_daten)
+        elemente = self._erstelle_elemente(reiseplan_daten, vorlagen)
+        return self._baue_pdf(pdf_pfad, elemente, abbruch, Seitenrahmen(reiseplan_daten, vorlagen))
+    
+    def rendere_pdf_daten(self, reiseplan_daten: Dict[str, Any],
+                          abbruch: Optional[threading.Event] = None) -> Optional[bytes]:
+        """
+        Erstellt das PDF aus bereits geladenen und ergänzten Reiseplan-Daten im Speicher.
+        
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten (siehe lade_reiseplan)
+            abbruch: Bricht die Erstellung nach dem aktuellen Element ab, sobald das Event gesetzt ist
+            
+        Returns:
+            Optional[bytes]: Inhalt der PDF-Datei oder None bei Fehler oder Abbruch
+        """
+        puffer = io.BytesIO()
+        if self._in_abschnitten(reiseplan_daten, abbruch):
+            if not self._rendere_in_abschnitten(reiseplan_daten, puffer):
+                return None
+            return puffer.getvalue()
+        vorlagen = self.vorlagen_fuer(reiseplan_daten)
+        elemente = self._erstelle_elemente(reiseplan_daten, vorlagen)
+        if not self._baue_pdf(puffer, elemente, abbruch, Seitenrahmen(reiseplan_daten, vorlagen)):
+            return None
+        return puffer.getvalue()
+    
+    def _in_abschnitten(self, reiseplan_daten: Dict[str, Any], abbruch: Optional[threading.Event]) -> bool:
+        """
+        Prüft, ob ein Reiseplan in parallelen Abschnitten erstellt wird.
+        
+        Erstellungen mit Abbruch-Event bleiben in einem Durchlauf, da laufende
+        Prozesse nicht abgebrochen werden können.
+        """
+        return self.parallel_prozesse > 1 and abbruch is None and lohnt_abschnitte(reiseplan_daten)
+    
+    def _rendere_in_abschnitten(self, reiseplan_daten: Dict[str, Any],
+                                pdf_pfad: Union[Path, io.BytesIO]) -> Optional[str]:
+        """
+        Erstellt das PDF in parallelen Abschnitten (siehe sections.rendere_in_abschnitten).
+        
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten
+            pdf_pfad: Zielpfad der PDF-Datei oder Puffer im Speicher
+            
+        Returns:
+            Optional[str]: Pfad zur generierten PDF-Datei (bei einem Puffer eine Beschreibung)
+            oder None bei Fehler
+        """
+        im_speicher = isinstance(pdf_pfad, io.BytesIO)
+        name = "PDF im Speicher" if im_speicher else str(pdf_pfad)
+        try:
+            rendere_in_abschnitten(self, reiseplan_daten, pdf_pfad, self.parallel_prozesse)
+            if self.linearisiert:
+                self._linearisiere(pdf_pfad)
+        except Exception as e:
+            logger.error(f"Fehler beim Erstellen des PDFs in Abschnitten: {e}")
+            return None
+        logger.info(f"Reiseplan erfolgreich erstellt: {name}")
+        if self.profil == PROFIL_KOMPAKT:
+            self._pruefe_fonts(pdf_pfad.getvalue() if im_speicher else pdf_pfad, name)
+        return name
+    
+    def rendere_abschnitt(self, reiseplan_daten: Dict[str, Any], abschnitt: Dict[str, Any],
+                          erster: bool = False) -> Optional[bytes]:
+        """
+        Erstellt einen Abschnitt eines Reiseplans als eigenes PDF im Speicher.
+        
+        Die Seitenzahlen bleiben Platzhalter, die beim Zusammenfügen ersetzt werden.
+        
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten
+            abschnitt: Abschnitt (siehe sections.teile_in_abschnitte)
+            erster: Der Abschnitt steht am Anfang des Dokuments (erste Seite ohne Kopfzeile)
+            
+        Returns:
+            Optional[bytes]: Inhalt der PDF-Datei oder None bei Fehler
+        """
+        vorlagen = self.vorlagen_fuer(reiseplan_daten)
+        bereite_zeiten_vor(reiseplan_daten)
+        
+        art = abschnitt["art"]
+        if art == "kopf":
+            elemente = self._erstelle_kopf(reiseplan_daten, vorlagen)
+            erstelle_uebersicht(elemente, reiseplan_daten, vorlagen.styles, vorlagen)
+            if AGENDA:
+                elemente.extend(self._erstelle_ablauf(reiseplan_daten, vorlagen, agenda_zeigen=False))
+        elif art == "ablauf":
+            tage = (datetime.date.fromisoformat(abschnitt["von"]), datetime.date.fromisoformat(abschnitt["bis"]))
+            elemente = self._erstelle_ablauf(reiseplan_daten, vorlagen, konflikte_zeigen=False, tage=tage)
+        else:
+            # Nur die Blöcke dieses Abschnitts, alle übrigen Felder bleiben für Titel und Zeitraum
+            teil = {feld: wert for feld, wert in reiseplan_daten.items()
+                    if feld not in ("fluege", "hotels", "aktivitaeten", "zusatzinfo")}
+            if art == "zusatzinfo":
+                teil["zusatzinfo"] = reiseplan_daten["zusatzinfo"]
+            else:
+                teil[art] = [reiseplan_daten[art][index] for index in abschnitt["indizes"]]
+            elemente = self._erstelle_detailbloecke(teil, vorlagen)
+        
+        puffer = io.BytesIO()
+        seitenrahmen = Seitenrahmen(reiseplan_daten, vorlagen, abschnitt=True, kopfzeile_auf_erster_seite=not erster)
+        if not self._baue_pdf(puffer, elemente, seitenrahmen=seitenrahmen):
+            return None
+        return puffer.getvalue()
+    
+    def groessenbericht(self, reiseplan_daten: Dict[str, Any], pdf: Union[str, Path, bytes]) -> Dict[str, Any]:
+        """
+        Vergleicht ein erstelltes PDF mit der Grösse im Standardprofil.
+        
+        Dazu wird der Reiseplan zusätzlich im Standardprofil im Speicher erstellt.
+        
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten des PDFs
+            pdf: Pfad zum erstellten PDF oder dessen Inhalt
+            
+        Returns:
+            Dict[str, Any]: Grösse in Bytes, Grösse im Standardprofil, gesparte Bytes
+            und eingebettete Fonts ohne Subset
+        """
+        puffer = io.BytesIO()
+        theme = self.vorlagen_fuer(reiseplan_daten).theme
+        vorlagen = standard_vorlagen() if theme.id == STANDARD_THEME else standard_profil_vorlagen(theme)
+        Seitenrahmen(reiseplan_daten, vorlagen).baue(
+            self._dokument(puffer, PROFIL_STANDARD), self._erstelle_elemente(reiseplan_daten, vorlagen)
+        )
+        
+        pdf_daten = pdf if isinstance(pdf, bytes) else Path(pdf).read_bytes()
+        groesse = len(pdf_daten)
+        standard_groesse = len(puffer.getvalue())
+        fonts = nicht_subset_fonts(pdf_daten)
+        
+        logger.info(f"{reiseplan_daten['titel']}: {groesse} Bytes, {standard_groesse - groesse} Bytes gespart")
+        return {
+            "bytes": groesse,
+            "bytes_standard": standard_groesse,
+            "bytes_gespart": standard_groesse - groesse,
+            "fonts_ohne_subset": fonts
+        }
+    
+    def _erstelle_elemente(self, reiseplan_daten: Dict[str, Any], vorlagen: BlockVorlagen) -> List:
+        """
+        Erstellt alle PDF-Elemente eines Reiseplans.
+        
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten
+            vorlagen: Block-Vorlagen für Tabellen, Abstände und Logos
+            
+        Returns:
+            List: PDF-Elemente des Dokuments
+        """
+        # Alle Zeitangaben in einem Durchlauf parsen, die Blöcke lesen aus den Caches
+        bereite_zeiten_vor(reiseplan_daten)
+        elemente = self._erstelle_kopf(reiseplan_daten, vorlagen)
+        erstelle_uebersicht(elemente, reiseplan_daten, vorlagen.styles, vorlagen)
+        elemente.extend(self._erstelle_bloecke(reiseplan_daten, vorlagen))
+        return elemente
+    
+    def generiere_reiseplaene_pro_reisendem(self, reiseplan_pfad: Union[str, Path]) -> List[str]:
+        """
+        Generiert für jeden Reisenden eines gemeinsamen Reiseplans ein eigenes PDF.
+        
+        Laden, Validierung, Flugdaten-Ergänzung, die Aufbereitung der Zeiten sowie
+        Zeitplan und Terminkonflikte werden nur einmal berechnet. Die Flowables
+        werden pro Dokument neu erstellt, da ReportLab beim Rendern Layout-Zustand
+        auf ihnen ablegt. Ohne Reisende wird ein gemeinsames PDF aus den bereits
+        geladenen Daten erstellt. Reisende mit
+        gleichem Namen erhalten einen fortlaufenden Zusatz ("-2", "-3", ...).
+        
+        Args:
+            reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+            
+        Returns:
+            List[str]: Pfade zu den generierten PDF-Dateien (leer, wenn der Reiseplan
+            nicht geladen werden konnte)
+            
+        Raises:
+            ReisendeFehlen: Wenn nicht für alle Reisenden ein PDF erstellt werden konnte
+        """
+        reiseplan_daten = self.lade_reiseplan(reiseplan_pfad)
+        if not reiseplan_daten:
+            return []
+        
+        reisende = reiseplan_daten.get("reisende") or []
+        if not reisende:
+            logger.warning("Keine Reisenden im Reiseplan, erstelle ein gemeinsames PDF")
+            pdf_pfad = self.rendere_reiseplan(reiseplan_daten)
+            if pdf_pfad and self.flug_speicher:
+                self.flug_speicher.quittiere(str(Path(reiseplan_pfad).resolve()))
+            return [pdf_pfad] if pdf_pfad else []
+        
+        vorlagen = self.vorlagen_fuer(reiseplan_daten)
+        bereite_zeiten_vor(reiseplan_daten)
+        seitenrahmen = Seitenrahmen(reiseplan_daten, vorlagen)
+        zeitplan = self._zeitplan(reiseplan_daten) if AGENDA else None
+        
+        pdf_pfade = []
+        vergeben = set()
+        for reisender in reisende:
+            # Eindeutiger Dateiname auch bei gleichnamigen Reisenden (ohne Gross-/Kleinschreibung)
+            zusatz, nummer = dateiname(reisender), 1
+            while zusatz.lower() in vergeben:
+                nummer += 1
+                zusatz = f"{dateiname(reisender)}-{nummer}"
+            vergeben.add(zusatz.lower())
+            
+            # Nur die Übersicht wird personalisiert
+            persoenliche_daten = dict(reiseplan_daten, reisende=[reisender])
+            uebersicht = []
+            erstelle_uebersicht(uebersicht, persoenliche_daten, vorlagen.styles, vorlagen)
+            
+            pdf_pfad = self._baue_pdf(
+                self._pdf_pfad(reiseplan_daten["titel"], zusatz),
+                (self._erstelle_kopf(reiseplan_daten, vorlagen) + uebersicht
+                 + self._erstelle_bloecke(reiseplan_daten, vorlagen, zeitplan)),
+                seitenrahmen=seitenrahmen
+            )
+            if pdf_pfad:
+                pdf_pfade.append(pdf_pfad)
+        
+        logger.info(f"{len(pdf_pfade)} von {len(reisende)} persönlichen Reiseplänen erstellt")
+        if len(pdf_pfade) < len(reisende):
+            raise ReisendeFehlen(f"Nur {len(pdf_pfade)} von {len(reisende)} persönlichen Reiseplänen erstellt",
+                                 pdf_pfade)
+        
+        if self.flug_speicher:
+            self.flug_speicher.quittiere(str(Path(reiseplan_pfad).resolve()))
+        return pdf_pfade
+    
+    def lade_reiseplan(self, reiseplan_pfad: Union[str, Path],
+                       flugdaten_erforderlich: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Lädt und validiert einen Reiseplan und ergänzt minimale Flugdaten.
+        
+        Args:
+            reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+            flugdaten_erforderlich: Bricht ab, wenn minimale Flüge nicht ergänzt werden können
+            
+        Returns:
+            Optional[Dict[str, Any]]: Ergänzte Reiseplan-Daten oder None bei Fehler
+            
+        Raises:
+            FlightAPIException: Wenn flugdaten_erforderlich gesetzt ist und die Ergänzung fehlschlägt
         """
         # Lade Reiseplan-Daten
         reiseplan_pfad = Path(reiseplan_pfad)
@@ -92,49 +552,236 @@ class ReiseplanGenerator:
             logger.error(f"Konnte Reiseplan-Daten nicht laden: {reiseplan_pfad}")
             return None
         
-        # Ergänze Flugdaten, falls minimal
+        # Theme vor dem Ergänzen der Flüge prüfen, damit Fehler früh gemeldet werden
+        try:
+            self.vorlagen_fuer(reiseplan_daten)
+        except ThemeFehler as e:
+            logger.error(f"{e}: {reiseplan_pfad}")
+            return None
+        
+        self._ergaenze_fluege(reiseplan_daten, flugdaten_erforderlich, str(reiseplan_pfad.resolve()))
+        return reiseplan_daten
+    
+    def _ergaenze_fluege(self, reiseplan_daten: Dict[str, Any], flugdaten_erforderlich: bool = False,
+                         reiseplan_kennung: Optional[str] = None,
+                         hole_flugdaten: Optional[Callable[[str, str], Dict[str, Any]]] = None) -> None:
+        """
+        Ergänzt minimale Flüge des Reiseplans mit Daten der Flight-API.
+        
+        Args:
+            reiseplan_daten: Reiseplan-Daten, werden direkt angepasst
+            flugdaten_erforderlich: Gibt Fehler der Flight-API weiter, statt die minimalen Daten zu behalten
+            reiseplan_kennung: Kennung des Reiseplans, unter der die Verwendung der Flüge
+                im Flugdaten-Speicher vermerkt wird
+            hole_flugdaten: Liefert die Daten eines minimalen Flugs (Standard: _hole_flugdaten)
+        """
+        hole_flugdaten = hole_flugdaten or self._hole_flugdaten
         if "fluege" in reiseplan_daten and reiseplan_daten["fluege"]:
             for i, flug in enumerate(reiseplan_daten["fluege"]):
                 if self._ist_minimal_flug(flug):
                     logger.info(f"Minimal Flug gefunden: {flug['flugNr']} am {flug['flugDatum']}")
+                    if self.flug_speicher and reiseplan_kennung:
+                        self.flug_speicher.merke_verwendung(reiseplan_kennung, flug["flugNr"], flug["flugDatum"])
                     try:
-                        ergaenzte_flugdaten = hole_fluginformationen(flug["flugNr"], flug["flugDatum"])
+                        ergaenzte_flugdaten = hole_flugdaten(flug["flugNr"], flug["flugDatum"])
                         # Bewahre die Buchungsnummer, falls vorhanden
                         if "buchungsNr" in flug and flug["buchungsNr"]:
                             ergaenzte_flugdaten["buchungsNr"] = flug["buchungsNr"]
                         reiseplan_daten["fluege"][i] = ergaenzte_flugdaten
                         logger.info(f"Flugdaten erfolgreich ergänzt für Flug {flug['flugNr']}")
                     except FlightAPIException as e:
+                        if flugdaten_erforderlich:
+                            raise
                         logger.warning(f"Konnte Flugdaten nicht ergänzen: {e}")
                         # Beibehalten der minimalen Flugdaten
                         continue
+    
+    def _hole_flugdaten(self, flug_nr: str, flug_datum: str) -> Dict[str, Any]:
+        """
+        Liefert die vollständigen Daten eines minimalen Flugs.
         
-        # Erstelle PDF-Dateiname
-        pdf_dateiname = f"{reiseplan_daten['titel'].replace(' ', '-')}.pdf"
-        pdf_pfad = OUTPUT_DIR / pdf_dateiname
+        Reihenfolge: vorab abgerufene Flüge (siehe flug_cache), zuletzt bekannte
+        Flugdaten im Flugdaten-Speicher, lokaler Flugplan, Flight-API. Neu
+        abgerufene Flüge werden im Flugdaten-Speicher abgelegt.
         
-        # Erstelle PDF-Dokument
-        doc = SimpleDocTemplate(
-            str(pdf_pfad),
-            pagesize=A4,
-            rightMargin=PDF_MARGIN*cm,
-            leftMargin=PDF_MARGIN*cm,
-            topMargin=PDF_MARGIN*cm,
-            bottomMargin=PDF_MARGIN*cm
-        )
+        Args:
+            flug_nr: Flugnummer
+            flug_datum: Datum des Fluges im Format 'YYYY-MM-DD'
+            
+        Returns:
+            Dict[str, Any]: Vollständige Flugdaten (eigene Kopie, darf verändert werden)
+            
+        Raises:
+            FlightAPIException: Wenn keine Flugdaten verfügbar sind
+        """
+        schluessel = (flug_nr, flug_datum)
+        if schluessel in self.flug_cache:
+            flugdaten = self.flug_cache[schluessel]
+            if flugdaten is None:
+                raise FlightAPIException(f"Keine Daten für Flug {flug_nr} (Vorabruf fehlgeschlagen)")
+            return dict(flugdaten)
+        
+        if self.flug_speicher:
+            flugdaten = self.flug_speicher.lade(flug_nr, flug_datum)
+            if flugdaten:
+                logger.debug(f"Flug {flug_nr} am {flug_datum} im Flugdaten-Speicher gefunden")
+                return flugdaten
+        
+        flugdaten = None
+        if self.flugplan:
+            flugdaten = self.flugplan.suche(flug_nr, flug_datum)
+            if flugdaten:
+                logger.debug(f"Flug {flug_nr} am {flug_datum} im lokalen Flugplan gefunden")
+        
+        if not flugdaten:
+            flugdaten = hole_fluginformationen(flug_nr, flug_datum)
+        
+        if self.flug_speicher:
+            self.flug_speicher.speichere(flug_nr, flug_datum, flugdaten)
+        return flugdaten
+    
+    def vorlagen_fuer(self, reiseplan_daten: Dict[str, Any]) -> BlockVorlagen:
+        """
+        Liefert die Block-Vorlagen für das Theme eines Reiseplans.
+        
+        Das Theme steht im Feld 'theme' des Reiseplans, sonst gilt das Theme des
+        Generators. Die Vorlagen werden pro Theme einmal erstellt und für alle
+        weiteren Reisepläne wiederverwendet.
+        
+        Args:
+            reiseplan_daten: Reiseplan-Daten
+            
+        Returns:
+            BlockVorlagen: Vorlagen für Profil und Theme
+            
+        Raises:
+            ThemeFehler: Wenn das Theme nicht geladen werden kann
+        """
+        theme_id = reiseplan_daten.get("theme") or self.theme
+        vorlagen = self._vorlagen.get(theme_id)
+        if vorlagen is None:
+            theme = self.themes.theme(theme_id)
+            with self._vorlagen_lock:
+                vorlagen = self._vorlagen.get(theme_id)
+                if vorlagen is None:
+                    if self.profil == PROFIL_KOMPAKT:
+                        vorlagen = BlockVorlagen(bild_dpi=KOMPAKT_BILD_DPI, logo_cache=standard_logo_cache(),
+                                                 theme=theme)
+                    else:
+                        vorlagen = standard_profil_vorlagen(theme)
+                    self._vorlagen[theme_id] = vorlagen
+        return vorlagen
+    
+    def _erstelle_kopf(self, reiseplan_daten: Dict[str, Any], vorlagen: Optional[BlockVorlagen] = None) -> List:
+        """
+        Erstellt die Header-Elemente des Reiseplans.
+        
+        Args:
+            reiseplan_daten: Reiseplan-Daten
+            vorlagen: Block-Vorlagen (Standard: Vorlagen für das Theme des Reiseplans)
+            
+        Returns:
+            List: PDF-Elemente des Headers
+        """
+        vorlagen = vorlagen or self.vorlagen_fuer(reiseplan_daten)
+        elemente = []
+        erstelle_header(elemente, reiseplan_daten, vorlagen.styles, vorlagen)
+        return elemente
+    
+    def _erstelle_bloecke(self, reiseplan_daten: Dict[str, Any], vorlagen: Optional[BlockVorlagen] = None,
+                          zeitplan: Optional[Tuple[List, List]] = None) -> List:
+        """
+        Erstellt den Ablauf sowie die Flug-, Hotel-, Aktivitäts- und Zusatzinfo-Blöcke.
+        
+        Args:
+            reiseplan_daten: Reiseplan-Daten
+            vorlagen: Block-Vorlagen (Standard: Vorlagen für das Theme des Reiseplans)
+            zeitplan: Bereits berechnete Termine und Konflikte (siehe _zeitplan)
+            
+        Returns:
+            List: PDF-Elemente aller Blöcke
+        """
+        vorlagen = vorlagen or self.vorlagen_fuer(reiseplan_daten)
+        elemente = []
+        
+        # Chronologischer Ablauf mit Terminkonflikten
+        if AGENDA:
+            elemente.extend(self._erstelle_ablauf(reiseplan_daten, vorlagen, zeitplan=zeitplan))
         
-        # Erstelle Inhalt
+        elemente.extend(self._erstelle_detailbloecke(reiseplan_daten, vorlagen))
+        return elemente
+    
+    def _zeitplan(self, reiseplan_daten: Dict[str, Any]) -> Tuple[List, List]:
+        """
+        Berechnet die Termine und Terminkonflikte eines Reiseplans.
+        
+        Args:
+            reiseplan_daten: Reiseplan-Daten
+            
+        Returns:
+            Tuple[List, List]: Termine (siehe timeline.erstelle_zeitplan) und Konflikte
+        """
+        termine = erstelle_zeitplan(reiseplan_daten)
+        return termine, finde_konflikte(termine)
+    
+    def _erstelle_ablauf(self, reiseplan_daten: Dict[str, Any], vorlagen: BlockVorlagen,
+                         konflikte_zeigen: bool = True, agenda_zeigen: bool = True,
+                         tage: Optional[Tuple[datetime.date, datetime.date]] = None,
+                         zeitplan: Optional[Tuple[List, List]] = None) -> List:
+        """
+        Erstellt die Übersicht der Terminkonflikte und den Ablauf pro Tag.
+        
+        Konflikte werden immer über den ganzen Reiseplan gesucht, auch wenn nur
+        ein Teil der Tage ausgegeben wird.
+        
+        Args:
+            reiseplan_daten: Reiseplan-Daten
+            vorlagen: Block-Vorlagen
+            konflikte_zeigen: Übersicht der Terminkonflikte ausgeben
+            agenda_zeigen: Ablauf pro Tag ausgeben
+            tage: Nur die Tage von bis (einschliesslich) ausgeben
+            zeitplan: Bereits berechnete Termine und Konflikte (Standard: neu berechnen)
+            
+        Returns:
+            List: PDF-Elemente
+        """
         elemente = []
+        termine, konflikte = zeitplan or self._zeitplan(reiseplan_daten)
+        if not termine:
+            return elemente
+        
+        if konflikte and konflikte_zeigen:
+            logger.warning(f"{reiseplan_daten['titel']}: {len(konflikte)} Terminkonflikte gefunden")
+            konflikt_elemente = []
+            erstelle_konflikt_block(konflikt_elemente, konflikte, vorlagen.styles, vorlagen)
+            elemente.append(KeepTogether(konflikt_elemente))
+        
+        agenda = agenda_nach_tagen(termine)
+        if tage:
+            agenda = [(tag, eintraege) for tag, eintraege in agenda if tage[0] <= tag <= tage[1]]
+        if agenda and agenda_zeigen:
+            erstelle_agenda_block(elemente, agenda, konflikte, vorlagen.styles, vorlagen)
+        return elemente
+    
+    def _erstelle_detailbloecke(self, reiseplan_daten: Dict[str, Any], vorlagen: BlockVorlagen) -> List:
+        """
+        Erstellt die Flug-, Hotel-, Aktivitäts- und Zusatzinfo-Blöcke.
         
-        # Header und Übersicht
-        erstelle_header(elemente, reiseplan_daten, self.styles)
-        erstelle_uebersicht(elemente, reiseplan_daten, self.styles)
+        Args:
+            reiseplan_daten: Reiseplan-Daten
+            vorlagen: Block-Vorlagen
+            
+        Returns:
+            List: PDF-Elemente der Blöcke
+        """
+        styles = vorlagen.styles
+        elemente = []
         
         # Flüge
         if "fluege" in reiseplan_daten and reiseplan_daten["fluege"]:
             for flug in reiseplan_daten["fluege"]:
                 flug_elemente = []
-                erstelle_flug_block(flug_elemente, flug, self.styles)
+                erstelle_flug_block(flug_elemente, flug, styles, vorlagen)
                 # Verwende KeepTogether, um zu verhindern, dass Flug-Blöcke geteilt werden
                 elemente.append(KeepTogether(flug_elemente))
         
@@ -142,7 +789,7 @@ class ReiseplanGenerator:
         if "hotels" in reiseplan_daten and reiseplan_daten["hotels"]:
             for hotel in reiseplan_daten["hotels"]:
                 hotel_elemente = []
-                erstelle_hotel_block(hotel_elemente, hotel, self.styles)
+                erstelle_hotel_block(hotel_elemente, hotel, styles, vorlagen)
                 # Verwende KeepTogether, um zu verhindern, dass Hotel-Blöcke geteilt werden
                 elemente.append(KeepTogether(hotel_elemente))
         
@@ -150,26 +797,139 @@ class ReiseplanGenerator:
         if "aktivitaeten" in reiseplan_daten and reiseplan_daten["aktivitaeten"]:
             for aktivitaet in reiseplan_daten["aktivitaeten"]:
                 aktivitaet_elemente = []
-                erstelle_aktivitaet_block(aktivitaet_elemente, aktivitaet, self.styles)
+                erstelle_aktivitaet_block(aktivitaet_elemente, aktivitaet, styles, vorlagen)
                 # Verwende KeepTogether, um zu verhindern, dass Aktivitäts-Blöcke geteilt werden
                 elemente.append(KeepTogether(aktivitaet_elemente))
         
         # Zusatzinformationen
         if "zusatzinfo" in reiseplan_daten:
             zusatzinfo_elemente = []
-            erstelle_zusatzinfo_block(zusatzinfo_elemente, reiseplan_daten["zusatzinfo"], self.styles)
+            erstelle_zusatzinfo_block(zusatzinfo_elemente, reiseplan_daten["zusatzinfo"], styles, vorlagen)
             # Verwende KeepTogether, um zu verhindern, dass Zusatzinfo-Blöcke geteilt werden
             elemente.append(KeepTogether(zusatzinfo_elemente))
         
-        # Erstelle das PDF
+        return elemente
+    
+    def _pdf_pfad(self, titel: str, zusatz: Optional[str] = None) -> Path:
+        """
+        Bestimmt den Ausgabepfad für ein PDF.
+        
+        Args:
+            titel: Titel des Reiseplans
+            zusatz: Optionaler Namenszusatz (z.B. Name des Reisenden)
+            
+        Returns:
+            Path: Pfad der PDF-Datei im Ausgabeverzeichnis
+        """
+        name = f"{titel}-{zusatz}" if zusatz else titel
+        return OUTPUT_DIR / f"{dateiname(name)}.pdf"
+    
+    def _baue_pdf(self, pdf_pfad: Union[Path, io.BytesIO], elemente: List,
+                  abbruch: Optional[threading.Event] = None,
+                  seitenrahmen: Optional[Seitenrahmen] = None) -> Optional[str]:
+        """
+        Erstellt das PDF-Dokument aus den übergebenen Elementen.
+        
+        Args:
+            pdf_pfad: Zielpfad der PDF-Datei oder Puffer im Speicher
+            elemente: PDF-Elemente des Dokuments
+            abbruch: Bricht die Erstellung nach dem aktuellen Element ab, sobald das Event gesetzt ist
+            seitenrahmen: Laufende Kopf- und Fusszeile (None = Seiten ohne Rahmen)
+            
+        Returns:
+            Optional[str]: Pfad zur generierten PDF-Datei (bei einem Puffer eine Beschreibung)
+            oder None bei Fehler oder Abbruch
+        """
+        im_speicher = isinstance(pdf_pfad, io.BytesIO)
+        name = "PDF im Speicher" if im_speicher else str(pdf_pfad)
+        
+        # Erstelle PDF-Dokument
+        doc = self._dokument(pdf_pfad if im_speicher else name, self.profil)
+        
+        # Abbruch nach jedem gesetzten Element prüfen, die Datei wird erst am Ende geschrieben
+        if abbruch is not None:
+            def pruefe_abbruch(flowable):
+                if abbruch.is_set():
+                    raise RenderAbgebrochen(name)
+            doc.afterFlowable = pruefe_abbruch
+        
+        # Erstelle das PDF (doc.build verbraucht die Liste, daher eine Kopie übergeben)
         try:
-            doc.build(elemente)
-            logger.info(f"Reiseplan erfolgreich erstellt: {pdf_pfad}")
-            return str(pdf_pfad)
+            if seitenrahmen:
+                seitenrahmen.baue(doc, list(elemente))
+            else:
+                doc.build(list(elemente))
+            if self.linearisiert:
+                self._linearisiere(pdf_pfad)
+            logger.info(f"Reiseplan erfolgreich erstellt: {name}")
+            if self.profil == PROFIL_KOMPAKT:
+                self._pruefe_fonts(pdf_pfad.getvalue() if im_speicher else pdf_pfad, name)
+            return name
+        except RenderAbgebrochen:
+            logger.info(f"Erstellung abgebrochen: {name}")
+            return None
         except Exception as e:
             logger.error(f"Fehler beim Erstellen des PDFs: {e}")
             return None
     
+    def _linearisiere(self, pdf_pfad: Union[Path, io.BytesIO]) -> None:
+        """
+        Linearisiert ein fertiges PDF an Ort und Stelle.
+        
+        Args:
+            pdf_pfad: Pfad zur PDF-Datei oder Puffer im Speicher
+        """
+        if isinstance(pdf_pfad, io.BytesIO):
+            linearisiert = linearisiere(pdf_pfad.getvalue())
+            pdf_pfad.seek(0)
+            pdf_pfad.truncate()
+            pdf_pfad.write(linearisiert)
+            return
+        
+        # Über eine temporäre Datei ersetzen, damit nie ein halbes PDF sichtbar ist
+        pdf_pfad = Path(pdf_pfad)
+        temp_pfad = pdf_pfad.with_name(pdf_pfad.name + ".tmp")
+        temp_pfad.write_bytes(linearisiere(pdf_pfad.read_bytes()))
+        temp_pfad.replace(pdf_pfad)
+    
+    def _dokument(self, ziel, profil: str) -> SimpleDocTemplate:
+        """
+        Erstellt die Dokumentvorlage für ein PDF.
+        
+        Args:
+            ziel: Dateipfad oder beschreibbares Dateiobjekt
+            profil: Ausgabeprofil
+            
+        Returns:
+            SimpleDocTemplate: Dokumentvorlage mit den Rändern des Reiseplans
+        """
+        optionen = {}
+        if profil == PROFIL_KOMPAKT:
+            # Seiteninhalte, Bilder und Fonts unabhängig von rl_config komprimieren
+            optionen["pageCompression"] = 1
+        
+        return SimpleDocTemplate(
+            ziel,
+            pagesize=A4,
+            rightMargin=PDF_MARGIN*cm,
+            leftMargin=PDF_MARGIN*cm,
+            topMargin=PDF_MARGIN*cm,
+            bottomMargin=PDF_MARGIN*cm,
+            **optionen
+        )
+    
+    def _pruefe_fonts(self, pdf: Union[Path, bytes], name: str) -> None:
+        """
+        Warnt, wenn ein PDF vollständig eingebettete Fonts statt Subsets enthält.
+        
+        Args:
+            pdf: Pfad zur PDF-Datei oder deren Inhalt
+            name: Bezeichnung des PDFs für die Warnung
+        """
+        fonts = nicht_subset_fonts(pdf if isinstance(pdf, bytes) else Path(pdf).read_bytes())
+        if fonts:
+            logger.warning(f"Fonts ohne Subset in {name}: {', '.join(fonts)}")
+    
     def _ist_minimal_flug(self, flug: Dict[str, Any]) -> bool:
         """
         Überprüft, ob ein Flug nur minimal Daten enthält.
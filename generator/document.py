@@ -0,0 +1,384 @@
+"""
+Zwischendarstellung eines Reiseplans für alle Ausgabeformate.
+
+Aus den ergänzten Reiseplan-Daten wird einmal ein Dokument erstellt, das
+alle formatierten Texte, den Ablauf pro Tag, die Terminkonflikte und die
+Kalendertermine enthält. Das Dokument besteht nur aus Dictionaries, Listen
+und Strings, lässt sich als JSON ablegen und wird von den Ausgaben für HTML
+(html_export) und iCalendar (ics_export) ohne ReportLab verarbeitet. Die
+PDF-Blöcke verwenden dieselben Detailzeilen, sodass alle Formate dieselben
+Angaben zeigen.
+
+Der DokumentCache legt Dokumente unter einem Hash der ergänzten Daten ab;
+unveränderte Reisepläne werden so nicht erneut aufbereitet. Der Zeitstempel
+"erstellt" (DTSTAMP im Kalender) wird bei jeder Ausgabe neu gesetzt, und der
+Cache behält höchstens DOKUMENT_CACHE_MAX Dokumente.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .config import AGENDA, DOKUMENT_CACHE, DOKUMENT_CACHE_DIR, DOKUMENT_CACHE_MAX
+from .timeline import agenda_nach_tagen, erstelle_zeitplan, finde_konflikte
+from .utils.date_utils import (flug_zeitzonen, formatiere_datum, formatiere_datum_zeit, formatiere_tag,
+                               formatiere_zeit)
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Version des Dokumentformats; ältere Dokumente im Cache werden neu erstellt
+DOKUMENT_VERSION = 1
+
+
+def zeitstempel() -> str:
+    """
+    Liefert die aktuelle Zeit in UTC im Format von iCalendar (z.B. "20250515T063000Z").
+    """
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def flug_details(flug: Dict[str, Any]) -> List[List[str]]:
+    """
+    Erstellt die Detailzeilen eines Flugs (Zeiten in Ortszeit des Flughafens).
+
+    Args:
+        flug: Flugdaten
+
+    Returns:
+        List[List[str]]: Zeilen aus Bezeichnung und Wert
+    """
+    details = [["Flugnummer:", flug["flugNr"]]]
+
+    # Flugdatum hinzufügen (für minimale Flüge)
+    if "flugDatum" in flug:
+        details.append(["Datum:", flug["flugDatum"]])
+
+    abflug_zone, ankunft_zone = flug_zeitzonen(flug)
+    if "abflugOrt" in flug and "abflugCode" in flug:
+        details.append(["Abflug:", f"{flug['abflugOrt']} ({flug['abflugCode']})"])
+    if "abflugZeit" in flug:
+        details.append(["Abflugzeit:", formatiere_datum_zeit(flug["abflugZeit"], abflug_zone)])
+    if "ankunftOrt" in flug and "ankunftCode" in flug:
+        details.append(["Ankunft:", f"{flug['ankunftOrt']} ({flug['ankunftCode']})"])
+    if "ankunftZeit" in flug:
+        details.append(["Ankunftszeit:", formatiere_datum_zeit(flug["ankunftZeit"], ankunft_zone)])
+    if "buchungsNr" in flug and flug["buchungsNr"]:
+        details.append(["Buchungsnummer:", flug["buchungsNr"]])
+    return details
+
+
+def hotel_details(hotel: Dict[str, Any]) -> List[List[str]]:
+    """
+    Erstellt die Detailzeilen eines Hotels.
+
+    Args:
+        hotel: Hoteldaten
+
+    Returns:
+        List[List[str]]: Zeilen aus Bezeichnung und Wert
+    """
+    details = [
+        ["Name:", hotel["name"]],
+        ["Adresse:", hotel["adresse"]],
+        ["Check-in:", formatiere_datum_zeit(hotel["checkin"])],
+        ["Check-out:", formatiere_datum_zeit(hotel["checkout"])],
+    ]
+    if "buchungsNr" in hotel and hotel["buchungsNr"]:
+        details.append(["Buchungsnummer:", hotel["buchungsNr"]])
+    return details
+
+
+def aktivitaet_details(aktivitaet: Dict[str, Any]) -> List[List[str]]:
+    """
+    Erstellt die Detailzeilen einer Aktivität.
+
+    Args:
+        aktivitaet: Aktivitätsdaten
+
+    Returns:
+        List[List[str]]: Zeilen aus Bezeichnung und Wert
+    """
+    details = [
+        ["Name:", aktivitaet["name"]],
+        ["Datum:", formatiere_datum(aktivitaet["datum"])],
+        ["Zeit:", f"{formatiere_zeit(aktivitaet['startzeit'])} - {formatiere_zeit(aktivitaet['endzeit'])}"],
+    ]
+    if "ort" in aktivitaet and aktivitaet["ort"]:
+        details.append(["Ort:", aktivitaet["ort"]])
+    if "buchungsNr" in aktivitaet and aktivitaet["buchungsNr"]:
+        details.append(["Buchungsnummer:", aktivitaet["buchungsNr"]])
+    return details
+
+
+def zusatzinfo_details(zusatzinfo: Dict[str, Any]) -> List[List[str]]:
+    """
+    Erstellt die Detailzeilen der Zusatzinformationen (Währung, Zeitzone).
+
+    Args:
+        zusatzinfo: Zusatzinformationen
+
+    Returns:
+        List[List[str]]: Zeilen aus Bezeichnung und Wert
+    """
+    details = []
+    if "waehrung" in zusatzinfo and zusatzinfo["waehrung"]:
+        details.append(["Währung:", zusatzinfo["waehrung"]])
+    if "zeitzone" in zusatzinfo and zusatzinfo["zeitzone"]:
+        details.append(["Zeitzone:", zusatzinfo["zeitzone"]])
+    return details
+
+
+def termin_zeit(termin: Dict[str, Any]) -> str:
+    """
+    Formatiert die Uhrzeit eines Termins, mit "(+N)" bei einem Ende N Tage später.
+
+    Args:
+        termin: Termin (siehe timeline.erstelle_zeitplan)
+
+    Returns:
+        str: Uhrzeit (z.B. "22:10 - 06:45 (+1)") oder "-" ohne Uhrzeit
+    """
+    if termin["ohne_uhrzeit"]:
+        return "-"
+    text = termin["beginn"].strftime("%H:%M")
+    if termin["ende"] is not None:
+        text += f" - {termin['ende'].strftime('%H:%M')}"
+        tage = (termin["ende"].date() - termin["beginn"].date()).days
+        if tage:
+            text += f" (+{tage})"
+    return text
+
+
+def _kalender_termin(termin: Dict[str, Any], reiseplan_titel: str) -> Dict[str, Any]:
+    """
+    Erstellt einen Kalendertermin; Flüge tragen die Zeitzonen ihrer Flughäfen.
+    """
+    if termin["art"] == "flug":
+        zone_beginn, zone_ende = flug_zeitzonen(termin["daten"])
+        details = flug_details(termin["daten"])
+    elif termin["art"] == "hotel":
+        zone_beginn = zone_ende = None
+        details = hotel_details(termin["daten"])
+    else:
+        zone_beginn = zone_ende = None
+        details = aktivitaet_details(termin["daten"])
+
+    beginn = termin["beginn"]
+    schluessel = f"{reiseplan_titel}|{termin['art']}|{termin['nr']}|{beginn.isoformat()}"
+    return {
+        "uid": hashlib.sha256(schluessel.encode("utf-8")).hexdigest()[:32],
+        "art": termin["art"],
+        "titel": termin["titel"],
+        "ort": termin["ort"],
+        "ganztags": termin["ohne_uhrzeit"],
+        "beginn": beginn.date().isoformat() if termin["ohne_uhrzeit"] else beginn.isoformat(),
+        "ende": termin["ende"].isoformat() if termin["ende"] is not None else None,
+        "zeitzone_beginn": zone_beginn,
+        "zeitzone_ende": zone_ende,
+        "beschreibung": "\n".join(f"{bezeichnung} {wert}" for bezeichnung, wert in details),
+    }
+
+
+def erstelle_dokument(reiseplan_daten: Dict[str, Any], farben: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Erstellt die Zwischendarstellung eines ergänzten Reiseplans.
+
+    Args:
+        reiseplan_daten: Ergänzte Reiseplan-Daten (siehe ReiseplanGenerator.lade_reiseplan)
+        farben: Farben des Themes als Hex-Werte (z.B. {"titel": "#003366"})
+
+    Returns:
+        Dict[str, Any]: JSON-serialisierbares Dokument mit Kopf, Ablauf, Konflikten,
+        Detailblöcken, Zusatzinformationen, Kalenderterminen und den Quelldaten
+    """
+    termine = erstelle_zeitplan(reiseplan_daten)
+    konflikte = finde_konflikte(termine) if AGENDA else []
+    im_konflikt = {termin["nr"] for konflikt in konflikte for termin in konflikt}
+
+    def beschreibe(termin: Dict[str, Any]) -> str:
+        return f"{termin['titel']}, {termin['beginn'].strftime('%d.%m.%Y')}, {termin_zeit(termin)}"
+
+    agenda = []
+    if AGENDA:
+        for tag, eintraege in agenda_nach_tagen(termine):
+            zeilen = []
+            for eintrag in eintraege:
+                termin = eintrag["termin"]
+                zeit = eintrag["zeitpunkt"].strftime("%H:%M") if termin["art"] == "hotel" else termin_zeit(termin)
+                zeilen.append({"zeit": zeit, "ereignis": eintrag["ereignis"], "titel": termin["titel"],
+                               "ort": termin["ort"], "konflikt": termin["nr"] in im_konflikt})
+            agenda.append({"datum": tag.isoformat(), "titel": formatiere_tag(tag), "eintraege": zeilen})
+
+    bloecke = []
+    for flug in reiseplan_daten.get("fluege") or []:
+        bloecke.append({"art": "flug", "titel": "Flight", "details": flug_details(flug)})
+    for hotel in reiseplan_daten.get("hotels") or []:
+        bloecke.append({"art": "hotel", "titel": "Hotel", "details": hotel_details(hotel)})
+    for aktivitaet in reiseplan_daten.get("aktivitaeten") or []:
+        bloecke.append({"art": "aktivitaet", "titel": "Aktivität", "details": aktivitaet_details(aktivitaet)})
+
+    zusatzinfo = None
+    if "zusatzinfo" in reiseplan_daten:
+        info = reiseplan_daten["zusatzinfo"]
+        zusatzinfo = {
+            "notfallkontakte": [[kontakt["name"], kontakt["telefon"]] for kontakt in info.get("notfallkontakte") or []],
+            "details": zusatzinfo_details(info),
+            "notizen": info.get("notizen") or "",
+        }
+
+    return {
+        "version": DOKUMENT_VERSION,
+        "erstellt": zeitstempel(),
+        "titel": reiseplan_daten["titel"],
+        "zeitraum": f"{formatiere_datum(reiseplan_daten['startdatum'])} - "
+                    f"{formatiere_datum(reiseplan_daten['enddatum'])}",
+        "reiseziel": reiseplan_daten["reiseziel"],
+        "reisende": list(reiseplan_daten.get("reisende") or []),
+        "theme": reiseplan_daten.get("theme"),
+        "farben": dict(farben or {}),
+        "konflikte": [[beschreibe(frueher), beschreibe(spaeter)] for frueher, spaeter in konflikte],
+        "agenda": agenda,
+        "bloecke": bloecke,
+        "zusatzinfo": zusatzinfo,
+        "termine": [_kalender_termin(termin, reiseplan_daten["titel"]) for termin in termine],
+        "daten": reiseplan_daten,
+    }
+
+
+def dokument_als_json(dokument: Dict[str, Any]) -> str:
+    """
+    Serialisiert ein Dokument als JSON.
+
+    Args:
+        dokument: Dokument (siehe erstelle_dokument)
+
+    Returns:
+        str: JSON-Text
+    """
+    return json.dumps(dokument, ensure_ascii=False)
+
+
+def dokument_aus_json(text: str) -> Dict[str, Any]:
+    """
+    Liest ein als JSON abgelegtes Dokument.
+
+    Args:
+        text: JSON-Text (siehe dokument_als_json)
+
+    Returns:
+        Dict[str, Any]: Dokument
+
+    Raises:
+        ValueError: Wenn der Text kein Dokument der aktuellen Version enthält
+    """
+    dokument = json.loads(text)
+    if not isinstance(dokument, dict) or dokument.get("version") != DOKUMENT_VERSION:
+        raise ValueError("Kein Dokument der aktuellen Version")
+    return dokument
+
+
+class DokumentCache:
+    """
+    Verzeichnis mit Dokumenten, adressiert über einen Hash der ergänzten Reiseplan-Daten.
+    """
+
+    def __init__(self, verzeichnis: Union[str, Path] = DOKUMENT_CACHE_DIR, max_dokumente: int = DOKUMENT_CACHE_MAX):
+        """
+        Args:
+            verzeichnis: Verzeichnis der abgelegten Dokumente
+            max_dokumente: Höchstzahl abgelegter Dokumente (0 = unbegrenzt)
+        """
+        self.verzeichnis = Path(verzeichnis)
+        self.max_dokumente = max_dokumente
+
+    def _schluessel(self, reiseplan_daten: Dict[str, Any], farben: Optional[Dict[str, str]]) -> str:
+        """
+        Hash über Daten, Farben, Ablauf-Einstellung und Dokumentversion.
+        """
+        inhalt = json.dumps([DOKUMENT_VERSION, AGENDA, farben or {}, reiseplan_daten],
+                            sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(inhalt.encode("utf-8")).hexdigest()[:32]
+
+    def dokument(self, reiseplan_daten: Dict[str, Any], farben: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Liefert das Dokument aus dem Cache oder erstellt und legt es ab.
+
+        Args:
+            reiseplan_daten: Ergänzte Reiseplan-Daten
+            farben: Farben des Themes als Hex-Werte
+
+        Returns:
+            Dict[str, Any]: Dokument (siehe erstelle_dokument) mit aktuellem Zeitstempel "erstellt"
+        """
+        ziel = self.verzeichnis / f"{self._schluessel(reiseplan_daten, farben)}.json"
+        try:
+            dokument = dokument_aus_json(ziel.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Dokument {ziel} im Cache unbrauchbar, wird neu erstellt: {e}")
+        else:
+            # Zuletzt verwendet: schützt das Dokument vor dem Aufräumen
+            try:
+                os.utime(ziel)
+            except OSError:
+                pass
+            dokument["erstellt"] = zeitstempel()
+            return dokument
+
+        dokument = erstelle_dokument(reiseplan_daten, farben)
+        # Atomar schreiben, damit parallele Aufträge nie halbe Dateien lesen
+        self.verzeichnis.mkdir(exist_ok=True, parents=True)
+        temp_pfad = ziel.with_name(f"{ziel.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temp_pfad.write_text(dokument_als_json(dokument), encoding="utf-8")
+            temp_pfad.replace(ziel)
+        except OSError as e:
+            logger.warning(f"Dokument konnte nicht im Cache abgelegt werden: {e}")
+        finally:
+            temp_pfad.unlink(missing_ok=True)
+        self._raeume_auf()
+        return dokument
+
+    def _raeume_auf(self) -> None:
+        """
+        Entfernt die am längsten nicht verwendeten Dokumente über max_dokumente.
+        """
+        if not self.max_dokumente:
+            return
+        dokumente = []
+        for pfad in self.verzeichnis.glob("*.json"):
+            try:
+                dokumente.append((pfad.stat().st_mtime, pfad))
+            except FileNotFoundError:
+                # Von einem parallelen Aufruf bereits entfernt
+                continue
+        dokumente.sort()
+        for _, pfad in dokumente[:max(0, len(dokumente) - self.max_dokumente)]:
+            pfad.unlink(missing_ok=True)
+
+
+_standard_cache: Optional[DokumentCache] = None
+_cache_lock = threading.Lock()
+
+
+def standard_dokument_cache() -> Optional[DokumentCache]:
+    """
+    Liefert den konfigurierten Dokument-Cache.
+
+    Returns:
+        Optional[DokumentCache]: Dokument-Cache oder None, wenn REISEPLAN_DOKUMENT_CACHE deaktiviert ist
+    """
+    global _standard_cache
+    if not DOKUMENT_CACHE:
+        return None
+    with _cache_lock:
+        if _standard_cache is None:
+            _standard_cache = DokumentCache(DOKUMENT_CACHE_DIR)
+    return _standard_cache
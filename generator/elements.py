@@ -2,24 +2,28 @@
 Funktionen zum Erstellen von PDF-Elementen für den Reiseplan-Generator.
 """
 
-import datetime
-from typing import Dict, Any, List
-from pathlib import Path
-from reportlab.graphics import renderPDF
-from svglib.svglib import svg2rlg
-import io
+from typing import Dict, Any, List, Optional
 import logging
+from xml.sax.saxutils import escape
 
-from reportlab.lib import colors
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import cm
-from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import KeepTogether, Paragraph
 
-from .config import AIRLINES_DIR, HOTELS_DIR, ASSETS_DIR
-from .utils.date_utils import formatiere_datum_zeit, formatiere_zeit
+from .config import AIRLINES_DIR, HOTELS_DIR
+from .block_templates import BlockVorlagen, standard_vorlagen
+from .logo_cache import LOGO_GROESSE, KOPF_LOGO_GROESSE
+from .document import aktivitaet_details, flug_details, hotel_details, termin_zeit, zusatzinfo_details
+from .utils.date_utils import formatiere_datum, formatiere_tag
 
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
 
-def erstelle_header(elemente: List, reiseplan_daten: Dict[str, Any], styles: Dict[str, ParagraphStyle]) -> None:
+# Höchstzahl der Konflikte, die einzeln aufgeführt werden
+KONFLIKTE_MAX_ZEILEN = 100
+
+
+def erstelle_header(elemente: List, reiseplan_daten: Dict[str, Any], styles: Dict[str, ParagraphStyle],
+                    vorlagen: Optional[BlockVorlagen] = None) -> None:
     """
     Erstellt den Header des Reiseplans.
     
@@ -27,39 +31,32 @@ def erstelle_header(elemente: List, reiseplan_daten: Dict[str, Any], styles: Dic
         elemente: Liste der PDF-Elemente
         reiseplan_daten: Reiseplan-Daten aus JSON
         styles: Styles für die PDF-Formatierung
+        vorlagen: Geteilte Block-Vorlagen (Standard: modulweite Vorlagen)
     """
-    # Logo (falls vorhanden)
-    logo_pfad = ASSETS_DIR / "logo.png"
-    if logo_pfad.exists():
-        img = Image(str(logo_pfad), width=1.5*cm, height=1.5*cm)
+    vorlagen = vorlagen or standard_vorlagen()
+    
+    # Logo des Themes (falls vorhanden)
+    if vorlagen.theme.logo:
+        img = vorlagen.logo(vorlagen.theme.logo, *KOPF_LOGO_GROESSE)
         elemente.append(img)
     
     # Titel
     elemente.append(Paragraph(reiseplan_daten["titel"], styles["Titel"]))
     
     # Datum
-    start_datum = datetime.datetime.fromisoformat(reiseplan_daten["startdatum"]).strftime("%d.%m.%Y")
-    end_datum = datetime.datetime.fromisoformat(reiseplan_daten["enddatum"]).strftime("%d.%m.%Y")
-    datum_text = f"{start_datum} - {end_datum}"
+    datum_text = f"{formatiere_datum(reiseplan_daten['startdatum'])} - {formatiere_datum(reiseplan_daten['enddatum'])}"
     elemente.append(Paragraph(datum_text, styles["Normal"]))
     
     # Abstand
-    elemente.append(Spacer(1, 0.5*cm))
+    elemente.append(vorlagen.abstand_gross)
     
     # Trennlinie
-    elemente.append(
-        Table(
-            [['']], 
-            colWidths=[17*cm], 
-            style=TableStyle([
-                ('LINEBELOW', (0, 0), (0, 0), 1, colors.black)
-            ])
-        )
-    )
-    elemente.append(Spacer(1, 0.5*cm))
+    elemente.append(vorlagen.trennlinie)
+    elemente.append(vorlagen.abstand_gross)
 
 
-def erstelle_uebersicht(elemente: List, reiseplan_daten: Dict[str, Any], styles: Dict[str, ParagraphStyle]) -> None:
+def erstelle_uebersicht(elemente: List, reiseplan_daten: Dict[str, Any], styles: Dict[str, ParagraphStyle],
+                        vorlagen: Optional[BlockVorlagen] = None) -> None:
     """
     Erstellt die Übersicht des Reiseplans.
     
@@ -67,9 +64,12 @@ def erstelle_uebersicht(elemente: List, reiseplan_daten: Dict[str, Any], styles:
         elemente: Liste der PDF-Elemente
         reiseplan_daten: Reiseplan-Daten aus JSON
         styles: Styles für die PDF-Formatierung
+        vorlagen: Geteilte Block-Vorlagen (Standard: modulweite Vorlagen)
     """
+    vorlagen = vorlagen or standard_vorlagen()
+    
     elemente.append(Paragraph("Übersicht", styles["Untertitel"]))
-    elemente.append(Spacer(1, 0.2*cm))
+    elemente.append(vorlagen.abstand_klein)
     
     elemente.append(Paragraph(f"Reiseziel: {reiseplan_daten['reiseziel']}", styles["Normal"]))
     
@@ -77,10 +77,11 @@ def erstelle_uebersicht(elemente: List, reiseplan_daten: Dict[str, Any], styles:
         reisende_text = f"Reisende: {', '.join(reiseplan_daten['reisende'])}"
         elemente.append(Paragraph(reisende_text, styles["Normal"]))
     
-    elemente.append(Spacer(1, 0.5*cm))
+    elemente.append(vorlagen.abstand_gross)
 
 
-def erstelle_flug_block(elemente: List, flug: Dict[str, Any], styles: Dict[str, ParagraphStyle]) -> None:
+def erstelle_flug_block(elemente: List, flug: Dict[str, Any], styles: Dict[str, ParagraphStyle],
+                        vorlagen: Optional[BlockVorlagen] = None) -> None:
     """
     Erstellt einen Flugblock im PDF.
     
@@ -88,80 +89,36 @@ def erstelle_flug_block(elemente: List, flug: Dict[str, Any], styles: Dict[str,
         elemente: Liste der PDF-Elemente
         flug: Flugdaten aus JSON
         styles: Styles für die PDF-Formatierung
+        vorlagen: Geteilte Block-Vorlagen (Standard: modulweite Vorlagen)
     """
+    vorlagen = vorlagen or standard_vorlagen()
+    
     # Airline-Logo (falls vorhanden)
     if "airline" in flug:
         airline_name = flug["airline"].lower().replace(' ', '-')
         airline_logo_pfad = AIRLINES_DIR / f"{airline_name}.png"
         if airline_logo_pfad.exists():
-            img = Image(str(airline_logo_pfad), width=3*cm, height=1.5*cm)
+            img = vorlagen.logo(airline_logo_pfad, *LOGO_GROESSE)
             elemente.append(img)
-            elemente.append(Spacer(1, 0.2*cm))
+            elemente.append(vorlagen.abstand_klein)
     
     # Trennlinie
-    elemente.append(
-        Table(
-            [['']], 
-            colWidths=[17*cm], 
-            style=TableStyle([
-                ('LINEBELOW', (0, 0), (0, 0), 1, colors.black)
-            ])
-        )
-    )
-    elemente.append(Spacer(1, 0.2*cm))
+    elemente.append(vorlagen.trennlinie)
+    elemente.append(vorlagen.abstand_klein)
     
     # Titel: Flight
     elemente.append(Paragraph("Flight", styles["Untertitel"]))
-    elemente.append(Spacer(1, 0.2*cm))
-    
-    # Flugdetails als Tabelle
-    flug_details = [
-        ["Flugnummer:", flug["flugNr"]]
-    ]
+    elemente.append(vorlagen.abstand_klein)
     
-    # Flugdatum hinzufügen (für minimale Flüge)
-    if "flugDatum" in flug:
-        flug_details.append(["Datum:", flug["flugDatum"]])
-    
-    # Füge optionale Felder hinzu, falls vorhanden
-    if "abflugOrt" in flug and "abflugCode" in flug:
-        flug_details.append(["Abflug:", f"{flug['abflugOrt']} ({flug['abflugCode']})"])
-    
-    if "abflugZeit" in flug:
-        flug_details.append(["Abflugzeit:", formatiere_datum_zeit(flug["abflugZeit"])])
-    
-    if "ankunftOrt" in flug and "ankunftCode" in flug:
-        flug_details.append(["Ankunft:", f"{flug['ankunftOrt']} ({flug['ankunftCode']})"])
-    
-    if "ankunftZeit" in flug:
-        flug_details.append(["Ankunftszeit:", formatiere_datum_zeit(flug["ankunftZeit"])])
-    
-    if "buchungsNr" in flug and flug["buchungsNr"]:
-        flug_details.append(["Buchungsnummer:", flug["buchungsNr"]])
-    
-    flug_tabelle = Table(
-        flug_details,
-        colWidths=[4*cm, 13*cm],
-        style=TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('FONTNAME', (0, 0), (0, -1), 'OpenSans-Bold'),  # Open Sans Bold für Labels
-            ('FONTNAME', (1, 0), (1, -1), 'OpenSans'),      # Open Sans für Inhalte
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ])
-    )
+    # Flugdetails als Tabelle (Zeiten in Ortszeit des Flughafens)
+    flug_tabelle = vorlagen.detail_tabelle(flug_details(flug))
     
     elemente.append(flug_tabelle)
-    elemente.append(Spacer(1, 0.5*cm))
+    elemente.append(vorlagen.abstand_gross)
 
 
-def erstelle_hotel_block(elemente: List, hotel: Dict[str, Any], styles: Dict[str, ParagraphStyle]) -> None:
+def erstelle_hotel_block(elemente: List, hotel: Dict[str, Any], styles: Dict[str, ParagraphStyle],
+                         vorlagen: Optional[BlockVorlagen] = None) -> None:
     """
     Erstellt einen Hotelblock im PDF.
     
@@ -169,7 +126,10 @@ def erstelle_hotel_block(elemente: List, hotel: Dict[str, Any], styles: Dict[str
         elemente: Liste der PDF-Elemente
         hotel: Hoteldaten aus JSON
         styles: Styles für die PDF-Formatierung
+        vorlagen: Geteilte Block-Vorlagen (Standard: modulweite Vorlagen)
     """
+    vorlagen = vorlagen or standard_vorlagen()
+    
     try:
         # Hotel-Logo Matching verbessern
         hotel_name = hotel['name']
@@ -199,26 +159,19 @@ def erstelle_hotel_block(elemente: List, hotel: Dict[str, Any], styles: Dict[str
             if logo_path.exists():
                 try:
                     if filetype == "svg":
-                        # SVG-Datei mit svglib verarbeiten
-                        drawing = svg2rlg(str(logo_path))
-                        if drawing:
-                            # Skaliere das SVG auf die gewünschte Größe
-                            xscale = 3*cm / drawing.width
-                            yscale = 1.5*cm / drawing.height
-                            scale = min(xscale, yscale)
-                            drawing.width = drawing.width * scale
-                            drawing.height = drawing.height * scale
-                            drawing.scale(scale, scale)
-                            elemente.append(drawing)
+                        # SVG-Datei mit svglib verarbeiten (oder gerastert aus dem Logo-Cache)
+                        logo = vorlagen.svg_logo(logo_path, *LOGO_GROESSE)
+                        if logo:
+                            elemente.append(logo)
                             found_logo = True
                     else:
                         # PNG direkt verwenden
-                        img = Image(str(logo_path), width=3*cm, height=1.5*cm)
+                        img = vorlagen.logo(logo_path, *LOGO_GROESSE)
                         elemente.append(img)
                         found_logo = True
                     
                     if found_logo:
-                        elemente.append(Spacer(1, 0.2*cm))
+                        elemente.append(vorlagen.abstand_klein)
                         break
                 except Exception as e:
                     logger.warning(f"Fehler beim Laden des Logos {filename}: {e}")
@@ -227,267 +180,147 @@ def erstelle_hotel_block(elemente: List, hotel: Dict[str, Any], styles: Dict[str
         logger.warning(f"Fehler beim Verarbeiten des Hotel-Logos: {e}")
     
     # Trennlinie
-    elemente.append(
-        Table(
-            [['']], 
-            colWidths=[17*cm], 
-            style=TableStyle([
-                ('LINEBELOW', (0, 0), (0, 0), 1, colors.black)
-            ])
-        )
-    )
-    elemente.append(Spacer(1, 0.2*cm))
+    elemente.append(vorlagen.trennlinie)
+    elemente.append(vorlagen.abstand_klein)
     
     # Titel: Hotel
     elemente.append(Paragraph("Hotel", styles["Untertitel"]))
-    elemente.append(Spacer(1, 0.2*cm))
+    elemente.append(vorlagen.abstand_klein)
     
     # Hoteldetails als Tabelle
-    hotel_details = [
-        ["Name:", hotel["name"]],
-        ["Adresse:", hotel["adresse"]],
-        ["Check-in:", formatiere_datum_zeit(hotel["checkin"])],
-        ["Check-out:", formatiere_datum_zeit(hotel["checkout"])],
-    ]
-    
-    if "buchungsNr" in hotel and hotel["buchungsNr"]:
-        hotel_details.append(["Buchungsnummer:", hotel["buchungsNr"]])
-    
-    hotel_tabelle = Table(
-        hotel_details,
-        colWidths=[4*cm, 13*cm],
-        style=TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('FONTNAME', (0, 0), (0, -1), 'OpenSans-Bold'),  # Open Sans Bold für Labels
-            ('FONTNAME', (1, 0), (1, -1), 'OpenSans'),      # Open Sans für Inhalte
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ])
-    )
+    hotel_tabelle = vorlagen.detail_tabelle(hotel_details(hotel))
     
     elemente.append(hotel_tabelle)
-    elemente.append(Spacer(1, 0.5*cm))
+    elemente.append(vorlagen.abstand_gross)
+
+
+def erstelle_aktivitaet_block(elemente: List, aktivitaet: Dict[str, Any], styles: Dict[str, ParagraphStyle],
+                              vorlagen: Optional[BlockVorlagen] = None) -> None:
     """
-    Erstellt einen Hotelblock im PDF.
+    Erstellt einen Aktivitätsblock im PDF.
     
     Args:
         elemente: Liste der PDF-Elemente
-        hotel: Hoteldaten aus JSON
+        aktivitaet: Aktivitätsdaten aus JSON
         styles: Styles für die PDF-Formatierung
+        vorlagen: Geteilte Block-Vorlagen (Standard: modulweite Vorlagen)
     """
-    # Hotel-Logo Matching verbessern
-    hotel_name = hotel['name']
-    normalized_hotel_name = hotel_name.lower()
-    
-    # Entferne häufige Artikel und Präfixe
-    for prefix in ['the ', 'hotel ', 'das ', 'der ', 'die ']:
-        if normalized_hotel_name.startswith(prefix):
-            normalized_hotel_name = normalized_hotel_name[len(prefix):]
-    
-    # Entferne Sonderzeichen und ersetze Leerzeichen
-    normalized_hotel_name = ''.join(c for c in normalized_hotel_name if c.isalnum() or c.isspace())
-    normalized_hotel_name = normalized_hotel_name.replace(' ', '-')
-    
-    # Versuche verschiedene Varianten des Namens für Logo-Suche
-    logo_variants = [
-        f"{normalized_hotel_name}.png",
-        f"{normalized_hotel_name}.svg",
-        f"{hotel_name.lower().replace(' ', '-')}.png",
-        f"{hotel_name.lower().replace(' ', '-')}.svg"
-    ]
-    
-    # Suche nach allen möglichen Logo-Dateivarianten
-    found_logo = None
-    for variant in logo_variants:
-        logo_path = HOTELS_DIR / variant
-        if logo_path.exists():
-            found_logo = logo_path
-            break
-    
-    # Logo anzeigen, wenn gefunden
-    if found_logo:
-        img = Image(str(found_logo), width=3*cm, height=1.5*cm)
-        elemente.append(img)
-        elemente.append(Spacer(1, 0.2*cm))
+    vorlagen = vorlagen or standard_vorlagen()
     
     # Trennlinie
-    elemente.append(
-        Table(
-            [['']], 
-            colWidths=[17*cm], 
-            style=TableStyle([
-                ('LINEBELOW', (0, 0), (0, 0), 1, colors.black)
-            ])
-        )
-    )
-    elemente.append(Spacer(1, 0.2*cm))
+    elemente.append(vorlagen.trennlinie)
+    elemente.append(vorlagen.abstand_klein)
     
-    # Titel: Hotel
-    elemente.append(Paragraph("Hotel", styles["Untertitel"]))
-    elemente.append(Spacer(1, 0.2*cm))
-    
-    # Hoteldetails als Tabelle
-    hotel_details = [
-        ["Name:", hotel["name"]],
-        ["Adresse:", hotel["adresse"]],
-        ["Check-in:", formatiere_datum_zeit(hotel["checkin"])],
-        ["Check-out:", formatiere_datum_zeit(hotel["checkout"])],
-    ]
+    # Titel: Aktivität
+    elemente.append(Paragraph("Aktivität", styles["Untertitel"]))
+    elemente.append(vorlagen.abstand_klein)
     
-    if "buchungsNr" in hotel and hotel["buchungsNr"]:
-        hotel_details.append(["Buchungsnummer:", hotel["buchungsNr"]])
-    
-    hotel_tabelle = Table(
-        hotel_details,
-        colWidths=[4*cm, 13*cm],
-        style=TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('FONTNAME', (0, 0), (0, -1), 'OpenSans-Bold'),  # Open Sans Bold für Labels
-            ('FONTNAME', (1, 0), (1, -1), 'OpenSans'),      # Open Sans für Inhalte
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ])
-    )
+    # Aktivitätsdetails als Tabelle
+    aktivitaet_tabelle = vorlagen.detail_tabelle(aktivitaet_details(aktivitaet))
     
-    elemente.append(hotel_tabelle)
-    elemente.append(Spacer(1, 0.5*cm))
+    elemente.append(aktivitaet_tabelle)
+    elemente.append(vorlagen.abstand_gross)
+
+
+def erstelle_agenda_block(elemente: List, agenda: List, konflikte: List, styles: Dict[str, ParagraphStyle],
+                          vorlagen: Optional[BlockVorlagen] = None) -> None:
     """
-    Erstellt einen Hotelblock im PDF.
+    Erstellt den chronologischen Ablauf mit einer Tabelle pro Tag.
+    
+    Termine mit Überschneidungen werden farbig hervorgehoben. Jeder Tag
+    beginnt nach Möglichkeit auf derselben Seite wie seine Tabelle; Tage,
+    die länger als eine Seite sind, werden bei Seitenumbrüchen geteilt.
     
     Args:
         elemente: Liste der PDF-Elemente
-        hotel: Hoteldaten aus JSON
+        agenda: Agenda pro Tag (siehe timeline.agenda_nach_tagen)
+        konflikte: Konflikte (siehe timeline.finde_konflikte)
         styles: Styles für die PDF-Formatierung
+        vorlagen: Geteilte Block-Vorlagen (Standard: modulweite Vorlagen)
     """
-    # Hotel-Logo (falls vorhanden)
-    hotel_logo_pfad = HOTELS_DIR / f"{hotel['name'].lower().replace(' ', '-')}.png"
-    if hotel_logo_pfad.exists():
-        img = Image(str(hotel_logo_pfad), width=3*cm, height=1.5*cm)
-        elemente.append(img)
-        elemente.append(Spacer(1, 0.2*cm))
-    
-    # Trennlinie
-    elemente.append(
-        Table(
-            [['']], 
-            colWidths=[17*cm], 
-            style=TableStyle([
-                ('LINEBELOW', (0, 0), (0, 0), 1, colors.black)
-            ])
-        )
-    )
-    elemente.append(Spacer(1, 0.2*cm))
-    
-    # Titel: Hotel
-    elemente.append(Paragraph("Hotel", styles["Untertitel"]))
-    elemente.append(Spacer(1, 0.2*cm))
-    
-    # Hoteldetails als Tabelle
-    hotel_details = [
-        ["Name:", hotel["name"]],
-        ["Adresse:", hotel["adresse"]],
-        ["Check-in:", formatiere_datum_zeit(hotel["checkin"])],
-        ["Check-out:", formatiere_datum_zeit(hotel["checkout"])],
+    vorlagen = vorlagen or standard_vorlagen()
+    im_konflikt = {termin["nr"] for konflikt in konflikte for termin in konflikt}
+    
+    # Trennlinie und Titel bleiben beim ersten Tag
+    tag_elemente = [
+        vorlagen.trennlinie,
+        vorlagen.abstand_klein,
+        Paragraph("Ablauf", styles["Untertitel"]),
+        vorlagen.abstand_klein
     ]
     
-    if "buchungsNr" in hotel and hotel["buchungsNr"]:
-        hotel_details.append(["Buchungsnummer:", hotel["buchungsNr"]])
-    
-    hotel_tabelle = Table(
-        hotel_details,
-        colWidths=[4*cm, 13*cm],
-        style=TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('FONTNAME', (0, 0), (0, -1), 'OpenSans-Bold'),  # Open Sans Bold für Labels
-            ('FONTNAME', (1, 0), (1, -1), 'OpenSans'),      # Open Sans für Inhalte
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ])
-    )
-    
-    elemente.append(hotel_tabelle)
-    elemente.append(Spacer(1, 0.5*cm))
+    tage = []
+    for tag, eintraege in agenda:
+        zeilen = [["Zeit", "Ereignis", "Beschreibung"]]
+        markierte_zeilen = []
+        for eintrag in eintraege:
+            termin = eintrag["termin"]
+            if termin["art"] == "hotel":
+                zeit = eintrag["zeitpunkt"].strftime("%H:%M")
+            else:
+                zeit = termin_zeit(termin)
+            
+            beschreibung = f'<font name="{vorlagen.theme.schrift_fett}">{escape(termin["titel"])}</font>'
+            if termin["ort"]:
+                beschreibung += f"<br/>{escape(termin['ort'])}"
+            
+            if termin["nr"] in im_konflikt:
+                markierte_zeilen.append(len(zeilen))
+            zeilen.append([zeit, eintrag["ereignis"], Paragraph(beschreibung, styles["Tabelle"])])
+        
+        tag_elemente.append(Paragraph(formatiere_tag(tag), styles["Tag"]))
+        tag_elemente.append(vorlagen.agenda_tabelle(zeilen, markierte_zeilen))
+        tage.append(tag_elemente)
+        tag_elemente = []
+    
+    tage[-1].append(vorlagen.abstand_gross)
+    # KeepTogether pro Tag, geteilte Abstände und Trennlinien stehen so nie allein im Dokument
+    elemente.extend(KeepTogether(tag_elemente) for tag_elemente in tage)
 
 
-def erstelle_aktivitaet_block(elemente: List, aktivitaet: Dict[str, Any], styles: Dict[str, ParagraphStyle]) -> None:
+def erstelle_konflikt_block(elemente: List, konflikte: List, styles: Dict[str, ParagraphStyle],
+                            vorlagen: Optional[BlockVorlagen] = None) -> None:
     """
-    Erstellt einen Aktivitätsblock im PDF.
+    Erstellt die Übersicht der sich überschneidenden Termine.
+    
+    Es werden höchstens KONFLIKTE_MAX_ZEILEN Konflikte einzeln aufgeführt.
     
     Args:
         elemente: Liste der PDF-Elemente
-        aktivitaet: Aktivitätsdaten aus JSON
+        konflikte: Konflikte als (früherer, späterer Termin), siehe timeline.finde_konflikte
         styles: Styles für die PDF-Formatierung
+        vorlagen: Geteilte Block-Vorlagen (Standard: modulweite Vorlagen)
     """
+    vorlagen = vorlagen or standard_vorlagen()
+    
     # Trennlinie
-    elemente.append(
-        Table(
-            [['']], 
-            colWidths=[17*cm], 
-            style=TableStyle([
-                ('LINEBELOW', (0, 0), (0, 0), 1, colors.black)
-            ])
-        )
-    )
-    elemente.append(Spacer(1, 0.2*cm))
+    elemente.append(vorlagen.trennlinie)
+    elemente.append(vorlagen.abstand_klein)
     
-    # Titel: Aktivität
-    elemente.append(Paragraph("Aktivität", styles["Untertitel"]))
-    elemente.append(Spacer(1, 0.2*cm))
+    # Titel: Terminkonflikte
+    elemente.append(Paragraph("Terminkonflikte", styles["Untertitel"]))
+    elemente.append(vorlagen.abstand_klein)
+    elemente.append(Paragraph(f"{len(konflikte)} Überschneidungen gefunden.", styles["Normal"]))
     
-    # Aktivitätsdetails als Tabelle
-    aktivitaet_details = [
-        ["Name:", aktivitaet["name"]],
-        ["Datum:", datetime.datetime.fromisoformat(aktivitaet["datum"]).strftime("%d.%m.%Y")],
-        ["Zeit:", f"{formatiere_zeit(aktivitaet['startzeit'])} - {formatiere_zeit(aktivitaet['endzeit'])}"],
-    ]
+    def beschreibe(termin: Dict[str, Any]) -> Paragraph:
+        zeit = termin_zeit(termin)
+        text = f"{escape(termin['titel'])}<br/>{termin['beginn'].strftime('%d.%m.%Y')}, {zeit}"
+        return Paragraph(text, styles["Tabelle"])
     
-    if "ort" in aktivitaet and aktivitaet["ort"]:
-        aktivitaet_details.append(["Ort:", aktivitaet["ort"]])
-    
-    if "buchungsNr" in aktivitaet and aktivitaet["buchungsNr"]:
-        aktivitaet_details.append(["Buchungsnummer:", aktivitaet["buchungsNr"]])
-    
-    aktivitaet_tabelle = Table(
-        aktivitaet_details,
-        colWidths=[4*cm, 13*cm],
-        style=TableStyle([
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('FONTNAME', (0, 0), (0, -1), 'OpenSans-Bold'),  # Open Sans Bold für Labels
-            ('FONTNAME', (1, 0), (1, -1), 'OpenSans'),      # Open Sans für Inhalte
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-        ])
-    )
+    zeilen = [["Termin", "Überschneidet sich mit"]]
+    zeilen.extend([beschreibe(frueher), beschreibe(spaeter)] for frueher, spaeter in konflikte[:KONFLIKTE_MAX_ZEILEN])
+    elemente.append(vorlagen.konflikt_tabelle(zeilen))
     
-    elemente.append(aktivitaet_tabelle)
-    elemente.append(Spacer(1, 0.5*cm))
+    if len(konflikte) > KONFLIKTE_MAX_ZEILEN:
+        elemente.append(vorlagen.abstand_klein)
+        elemente.append(Paragraph(f"... und {len(konflikte) - KONFLIKTE_MAX_ZEILEN} weitere Überschneidungen "
+                                  f"(im Ablauf markiert).", styles["Normal"]))
+    
+    elemente.append(vorlagen.abstand_gross)
 
 
-def erstelle_zusatzinfo_block(elemente: List, zusatzinfo: Dict[str, Any], styles: Dict[str, ParagraphStyle]) -> None:
+def erstelle_zusatzinfo_block(elemente: List, zusatzinfo: Dict[str, Any], styles: Dict[str, ParagraphStyle],
+                              vorlagen: Optional[BlockVorlagen] = None) -> None:
     """
     Erstellt einen Zusatzinfo-Block im PDF.
     
@@ -495,22 +328,17 @@ def erstelle_zusatzinfo_block(elemente: List, zusatzinfo: Dict[str, Any], styles
         elemente: Liste der PDF-Elemente
         zusatzinfo: Zusatzinformationen aus JSON
         styles: Styles für die PDF-Formatierung
+        vorlagen: Geteilte Block-Vorlagen (Standard: modulweite Vorlagen)
     """
+    vorlagen = vorlagen or standard_vorlagen()
+    
     # Trennlinie
-    elemente.append(
-        Table(
-            [['']], 
-            colWidths=[17*cm], 
-            style=TableStyle([
-                ('LINEBELOW', (0, 0), (0, 0), 1, colors.black)
-            ])
-        )
-    )
-    elemente.append(Spacer(1, 0.2*cm))
+    elemente.append(vorlagen.trennlinie)
+    elemente.append(vorlagen.abstand_klein)
     
     # Titel: Zusätzliche Informationen
     elemente.append(Paragraph("Zusätzliche Informationen", styles["Untertitel"]))
-    elemente.append(Spacer(1, 0.2*cm))
+    elemente.append(vorlagen.abstand_klein)
     
     # Notfallkontakte
     if "notfallkontakte" in zusatzinfo and zusatzinfo["notfallkontakte"]:
@@ -520,58 +348,23 @@ def erstelle_zusatzinfo_block(elemente: List, zusatzinfo: Dict[str, Any], styles
         for kontakt in zusatzinfo["notfallkontakte"]:
             notfallkontakte_data.append([kontakt["name"], kontakt["telefon"]])
         
-        notfallkontakte_tabelle = Table(
-            notfallkontakte_data,
-            colWidths=[8.5*cm, 8.5*cm],
-            style=TableStyle([
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.lightgrey),
-                ('FONTNAME', (0, 0), (-1, -1), 'OpenSans'),  # Open Sans für Kontakte
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('LEFTPADDING', (0, 0), (-1, -1), 12),
-                ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-                ('TOPPADDING', (0, 0), (-1, -1), 6),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-            ])
-        )
+        notfallkontakte_tabelle = vorlagen.kontakt_tabelle(notfallkontakte_data)
         
         elemente.append(notfallkontakte_tabelle)
-        elemente.append(Spacer(1, 0.3*cm))
+        elemente.append(vorlagen.abstand_mittel)
     
     # Weitere Informationen in Tabelle
     if any(key in zusatzinfo for key in ["waehrung", "zeitzone", "notizen"]):
-        weitere_infos = []
-        
-        if "waehrung" in zusatzinfo and zusatzinfo["waehrung"]:
-            weitere_infos.append(["Währung:", zusatzinfo["waehrung"]])
-        
-        if "zeitzone" in zusatzinfo and zusatzinfo["zeitzone"]:
-            weitere_infos.append(["Zeitzone:", zusatzinfo["zeitzone"]])
+        weitere_infos = zusatzinfo_details(zusatzinfo)
         
         if weitere_infos:
-            weitere_infos_tabelle = Table(
-                weitere_infos,
-                colWidths=[4*cm, 13*cm],
-                style=TableStyle([
-                    ('GRID', (0, 0), (-1, -1), 0.5, colors.white),
-                    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-                    ('FONTNAME', (0, 0), (0, -1), 'OpenSans-Bold'),  # Open Sans Bold für Labels
-                    ('FONTNAME', (1, 0), (1, -1), 'OpenSans'),      # Open Sans für Inhalte
-                    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-                    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                    ('LEFTPADDING', (0, 0), (-1, -1), 12),
-                    ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-                    ('TOPPADDING', (0, 0), (-1, -1), 8),
-                    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ])
-            )
+            weitere_infos_tabelle = vorlagen.detail_tabelle(weitere_infos)
             
             elemente.append(weitere_infos_tabelle)
-            elemente.append(Spacer(1, 0.3*cm))
+            elemente.append(vorlagen.abstand_mittel)
     
     # Notizen
     if "notizen" in zusatzinfo and zusatzinfo["notizen"]:
         elemente.append(Paragraph("Notizen:", styles["Normal"]))
         elemente.append(Paragraph(zusatzinfo["notizen"], styles["Normal"]))
-        elemente.append(Spacer(1, 0.3*cm))
\ No newline at end of file
+        elemente.append(vorlagen.abstand_mittel)
\ No newline at end of file
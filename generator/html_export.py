@@ -0,0 +1,114 @@
+"""
+HTML-Ausgabe eines Reiseplans aus der Zwischendarstellung (siehe document).
+
+Erstellt eine eigenständige HTML-Seite mit eingebettetem Stylesheet, z.B.
+für die Vorschau im Portal. Die Farben stammen aus dem Theme des Dokuments;
+die Klassen (reiseplan, ablauf, konflikt, block, details) erlauben eigenes
+Styling.
+"""
+
+from html import escape
+from typing import Any, Dict, List
+
+# Farben ohne Theme-Angabe (entsprechen dem Standard-Theme)
+STANDARD_FARBEN = {
+    "titel": "#000000",
+    "label": "#d3d3d3",
+    "linie": "#000000",
+    "rahmen": "#808080",
+}
+
+STYLESHEET = """
+body {{ font-family: "Open Sans", Arial, sans-serif; font-size: 11pt; margin: 2em auto; max-width: 48em; }}
+h1, h2 {{ color: {titel}; }}
+h1 {{ margin-bottom: 0.2em; }}
+h2 {{ border-top: 1px solid {linie}; padding-top: 0.6em; font-size: 14pt; }}
+h3 {{ font-size: 11pt; margin: 1em 0 0.3em; }}
+table {{ border-collapse: collapse; width: 100%; margin-bottom: 1em; }}
+th, td {{ text-align: left; vertical-align: top; padding: 0.2em 0.4em; }}
+table.details th {{ background: {label}; width: 30%; }}
+table.ablauf th {{ border-bottom: 1px solid {linie}; }}
+tr.konflikt td {{ background: #fde2e2; }}
+.zeitraum, .fusszeile {{ color: {rahmen}; }}
+"""
+
+
+def _tabelle(zeilen: List[List[str]], klasse: str = "details") -> str:
+    """
+    Erstellt eine Tabelle aus Bezeichnung und Wert.
+    """
+    inhalt = "".join(f"<tr><th>{escape(bezeichnung)}</th><td>{escape(str(wert))}</td></tr>"
+                     for bezeichnung, wert in zeilen)
+    return f'<table class="{klasse}">{inhalt}</table>'
+
+
+def erstelle_html(dokument: Dict[str, Any]) -> str:
+    """
+    Erstellt die HTML-Seite eines Reiseplans.
+
+    Args:
+        dokument: Dokument (siehe document.erstelle_dokument)
+
+    Returns:
+        str: Vollständige HTML-Seite
+    """
+    farben = dict(STANDARD_FARBEN, **(dokument.get("farben") or {}))
+    teile = [
+        '<!DOCTYPE html>',
+        '<html lang="de"><head><meta charset="utf-8">',
+        f'<title>{escape(dokument["titel"])}</title>',
+        f'<style>{STYLESHEET.format(**farben)}</style>',
+        '</head><body><main class="reiseplan">',
+        f'<h1>{escape(dokument["titel"])}</h1>',
+        f'<p class="zeitraum">{escape(dokument["zeitraum"])}</p>',
+        '<h2>Übersicht</h2>',
+        f'<p>Reiseziel: {escape(dokument["reiseziel"])}</p>',
+    ]
+    if dokument["reisende"]:
+        teile.append(f'<p>Reisende: {escape(", ".join(dokument["reisende"]))}</p>')
+
+    # Terminkonflikte
+    if dokument["konflikte"]:
+        teile.append('<h2>Terminkonflikte</h2>')
+        teile.append(f'<p>{len(dokument["konflikte"])} Überschneidungen gefunden.</p>')
+        zeilen = "".join(f"<tr><td>{escape(termin)}</td><td>{escape(mit)}</td></tr>"
+                         for termin, mit in dokument["konflikte"])
+        teile.append(f'<table class="ablauf konflikte"><tr><th>Termin</th><th>Überschneidet sich mit</th></tr>'
+                     f'{zeilen}</table>')
+
+    # Ablauf pro Tag
+    if dokument["agenda"]:
+        teile.append('<h2>Ablauf</h2>')
+        for tag in dokument["agenda"]:
+            teile.append(f'<h3>{escape(tag["titel"])}</h3>')
+            zeilen = []
+            for eintrag in tag["eintraege"]:
+                klasse = ' class="konflikt"' if eintrag["konflikt"] else ""
+                beschreibung = f'<strong>{escape(eintrag["titel"])}</strong>'
+                if eintrag["ort"]:
+                    beschreibung += f'<br>{escape(eintrag["ort"])}'
+                zeilen.append(f'<tr{klasse}><td>{escape(eintrag["zeit"])}</td><td>{escape(eintrag["ereignis"])}</td>'
+                              f'<td>{beschreibung}</td></tr>')
+            teile.append(f'<table class="ablauf"><tr><th>Zeit</th><th>Ereignis</th><th>Beschreibung</th></tr>'
+                         f'{"".join(zeilen)}</table>')
+
+    # Flug-, Hotel- und Aktivitätsblöcke
+    for block in dokument["bloecke"]:
+        teile.append(f'<section class="block {escape(block["art"])}"><h2>{escape(block["titel"])}</h2>'
+                     f'{_tabelle(block["details"])}</section>')
+
+    # Zusatzinformationen
+    zusatzinfo = dokument["zusatzinfo"]
+    if zusatzinfo is not None:
+        teile.append('<section class="block zusatzinfo"><h2>Zusätzliche Informationen</h2>')
+        if zusatzinfo["notfallkontakte"]:
+            teile.append('<p>Notfallkontakte:</p>')
+            teile.append(_tabelle(zusatzinfo["notfallkontakte"], "kontakte"))
+        if zusatzinfo["details"]:
+            teile.append(_tabelle(zusatzinfo["details"]))
+        if zusatzinfo["notizen"]:
+            teile.append(f'<p>Notizen:</p><p>{escape(zusatzinfo["notizen"])}</p>')
+        teile.append('</section>')
+
+    teile.append('</main></body></html>')
+    return "\n".join(teile)
@@ -0,0 +1,103 @@
+"""
+iCalendar-Ausgabe (RFC 5545) eines Reiseplans aus der Zwischendarstellung (siehe document).
+
+Jeder Flug, jedes Hotel und jede Aktivität wird ein VEVENT. Zeiten mit
+bekannter Zeitzone (Flüge) werden in UTC angegeben, alle übrigen als
+"floating" Ortszeit, die der Kalender in der Zeitzone des Geräts anzeigt.
+Termine ohne Uhrzeit werden ganztägig eingetragen.
+"""
+
+import datetime
+from typing import Any, Dict, List, Optional
+
+from .utils.date_utils import zeitzone
+
+# Produktkennung im Kalender
+PRODID = "-//Reiseplan-Generator//Reiseplan//DE"
+
+
+def _text(wert: str) -> str:
+    """
+    Maskiert einen TEXT-Wert (Backslash, Semikolon, Komma, Zeilenumbruch).
+    """
+    return (wert.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _falte(zeile: str) -> str:
+    """
+    Faltet eine Zeile nach höchstens 75 Oktetten, ohne UTF-8-Zeichen zu teilen.
+    """
+    teile = []
+    aktuell, laenge = "", 0
+    for zeichen in zeile:
+        groesse = len(zeichen.encode("utf-8"))
+        # Folgezeilen beginnen mit einem Leerzeichen, das mitzählt
+        if laenge + groesse > (75 if not teile else 74):
+            teile.append(aktuell)
+            aktuell, laenge = "", 0
+        aktuell += zeichen
+        laenge += groesse
+    teile.append(aktuell)
+    return "\r\n ".join(teile)
+
+
+def _zeitwert(wert: str, zeitzone_name: Optional[str]) -> str:
+    """
+    Formatiert einen Zeitpunkt in Ortszeit als DATE-TIME (UTC mit Zeitzone, sonst floating).
+    """
+    zeitpunkt = datetime.datetime.fromisoformat(wert)
+    ort = zeitzone(zeitzone_name)
+    if ort is not None:
+        return zeitpunkt.replace(tzinfo=ort).astimezone(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return zeitpunkt.strftime("%Y%m%dT%H%M%S")
+
+
+def _vevent(termin: Dict[str, Any], erstellt: str) -> List[str]:
+    """
+    Erstellt die Zeilen eines VEVENT.
+    """
+    zeilen = [
+        "BEGIN:VEVENT",
+        f"UID:{termin['uid']}@reiseplan",
+        f"DTSTAMP:{erstellt}",
+    ]
+    if termin["ganztags"]:
+        tag = datetime.date.fromisoformat(termin["beginn"])
+        zeilen.append(f"DTSTART;VALUE=DATE:{tag.strftime('%Y%m%d')}")
+        zeilen.append(f"DTEND;VALUE=DATE:{(tag + datetime.timedelta(days=1)).strftime('%Y%m%d')}")
+    else:
+        zeilen.append(f"DTSTART:{_zeitwert(termin['beginn'], termin['zeitzone_beginn'])}")
+        if termin["ende"]:
+            zeilen.append(f"DTEND:{_zeitwert(termin['ende'], termin['zeitzone_ende'])}")
+    zeilen.append(f"SUMMARY:{_text(termin['titel'])}")
+    if termin["ort"]:
+        zeilen.append(f"LOCATION:{_text(termin['ort'])}")
+    if termin["beschreibung"]:
+        zeilen.append(f"DESCRIPTION:{_text(termin['beschreibung'])}")
+    zeilen.append("END:VEVENT")
+    return zeilen
+
+
+def erstelle_ics(dokument: Dict[str, Any]) -> str:
+    """
+    Erstellt den Kalender eines Reiseplans.
+
+    Args:
+        dokument: Dokument (siehe document.erstelle_dokument)
+
+    Returns:
+        str: iCalendar-Text mit CRLF-Zeilenenden
+    """
+    zeilen = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{_text(dokument['titel'])}",
+    ]
+    for termin in dokument["termine"]:
+        zeilen.extend(_vevent(termin, dokument["erstellt"]))
+    zeilen.append("END:VCALENDAR")
+    return "".join(f"{_falte(zeile)}\r\n" for zeile in zeilen)
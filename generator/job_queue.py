@@ -0,0 +1,622 @@
+"""
+Dauerhafte Job-Warteschlange für die PDF-Generierung.
+
+Render-Aufträge werden in einer lokalen SQLite-Datei gespeichert und von
+Worker-Prozessen mit einem zeitlich begrenzten Lease beansprucht, den der
+Worker während der Bearbeitung regelmässig verlängert. Läuft ein Lease ab
+(z.B. weil ein Worker abgestürzt ist), wird der Job erneut vergeben.
+Fehlgeschlagene Jobs werden mit exponentiellem Backoff wiederholt und nach
+der maximalen Anzahl Versuche als "tot" markiert. Ungültige Eingaben (nicht
+lesbar, Schema- oder Theme-Fehler) werden ohne Wiederholung als tot markiert.
+
+Bei gleicher Priorität werden Jobs mit früherer Abreise zuerst vergeben
+(siehe scheduling). Jobs, die erst nach ihrer Frist erledigt werden oder
+deren Frist offen verstrichen ist, meldet verpasste_fristen().
+
+Im Speichermodus (REISEPLAN_FLUGDATEN_SWR) startet der Worker-Pool
+zusätzlich einen Prozess, der die gespeicherten Flugdaten periodisch
+revalidiert und Reisepläne mit geänderten Flugzeiten neu einreiht.
+"""
+
+import logging
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+
+from .config import (
+    QUEUE_DB, QUEUE_LEASE_SEKUNDEN, QUEUE_MAX_VERSUCHE, QUEUE_BACKOFF_SEKUNDEN, FLUGDATEN_DB, FLUGDATEN_SWR,
+    FLUGDATEN_REVALIDIERUNG_INTERVALL
+)
+from .scheduling import als_iso, lies_planung
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Status eines Jobs
+STATUS_WARTEND = "wartend"
+STATUS_IN_ARBEIT = "in_arbeit"
+STATUS_ERLEDIGT = "erledigt"
+STATUS_TOT = "tot"
+
+# Maximale Wartezeit zwischen zwei Versuchen
+MAX_BACKOFF_SEKUNDEN = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    reiseplan_pfad TEXT NOT NULL,
+    status TEXT NOT NULL,
+    prioritaet INTEGER NOT NULL DEFAULT 0,
+    versuche INTEGER NOT NULL DEFAULT 0,
+    verfuegbar_ab REAL NOT NULL,
+    lease_bis REAL,
+    worker TEXT,
+    ergebnis TEXT,
+    fehler TEXT,
+    abreise REAL,
+    frist REAL,
+    erstellt REAL NOT NULL,
+    aktualisiert REAL NOT NULL
+);
+"""
+
+# Spalten, die Warteschlangen älterer Versionen beim Öffnen ergänzt werden
+SPALTEN_PLANUNG = {
+    "abreise": "REAL",
+    "frist": "REAL",
+}
+
+
+class JobWarteschlange:
+    """
+    Job-Warteschlange auf Basis einer lokalen SQLite-Datei.
+    """
+
+    def __init__(self, db_pfad: Union[str, Path] = QUEUE_DB,
+                 lease_sekunden: int = QUEUE_LEASE_SEKUNDEN,
+                 max_versuche: int = QUEUE_MAX_VERSUCHE,
+                 backoff_sekunden: int = QUEUE_BACKOFF_SEKUNDEN):
+        """
+        Öffnet die Warteschlange und legt das Schema bei Bedarf an.
+
+        Args:
+            db_pfad: Pfad zur SQLite-Datei
+            lease_sekunden: Dauer, für die ein Worker einen Job exklusiv hält
+            max_versuche: Anzahl Versuche, bevor ein Job als tot markiert wird
+            backoff_sekunden: Basis-Wartezeit vor einer Wiederholung (verdoppelt sich pro Versuch)
+        """
+        self.db_pfad = Path(db_pfad)
+        self.lease_sekunden = lease_sekunden
+        self.max_versuche = max_versuche
+        self.backoff_sekunden = backoff_sekunden
+
+        self.db_pfad.parent.mkdir(exist_ok=True, parents=True)
+        self._verbindung = sqlite3.connect(str(self.db_pfad), timeout=30, isolation_level=None)
+        self._verbindung.row_factory = sqlite3.Row
+        self._verbindung.execute("PRAGMA journal_mode=WAL")
+        self._verbindung.executescript(SCHEMA)
+        self._migriere()
+
+    def _migriere(self) -> None:
+        """
+        Ergänzt fehlende Spalten für die Planung nach Abreise und ersetzt den Index für die Vergabe.
+        """
+        vorhanden = {zeile["name"] for zeile in self._verbindung.execute("PRAGMA table_info(jobs)")}
+        for spalte, typ in SPALTEN_PLANUNG.items():
+            if spalte not in vorhanden:
+                try:
+                    self._verbindung.execute(f"ALTER TABLE jobs ADD COLUMN {spalte} {typ}")
+                except sqlite3.OperationalError:
+                    # Ein anderer Prozess hat die Spalte gleichzeitig ergänzt
+                    pass
+        self._verbindung.executescript(
+            "DROP INDEX IF EXISTS jobs_vergabe;"
+            "CREATE INDEX IF NOT EXISTS jobs_planung ON jobs (status, prioritaet DESC, abreise, verfuegbar_ab, id);"
+        )
+
+    def schliessen(self) -> None:
+        """
+        Schliesst die Datenbankverbindung.
+        """
+        self._verbindung.close()
+
+    def einreihen(self, reiseplan_pfad: Union[str, Path], prioritaet: Optional[int] = None) -> int:
+        """
+        Reiht einen Render-Auftrag ein.
+
+        Abreise und Frist werden beim Einreihen aus der Reiseplan-Datei gelesen.
+
+        Args:
+            reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+            prioritaet: Höhere Werte werden zuerst bearbeitet (Standard: Feld 'prioritaet'
+                des Reiseplans, sonst 0)
+
+        Returns:
+            int: ID des neuen Jobs
+        """
+        planung = lies_planung(reiseplan_pfad)
+        if prioritaet is None:
+            prioritaet = planung["prioritaet"]
+
+        jetzt = time.time()
+        cursor = self._verbindung.execute(
+            "INSERT INTO jobs (reiseplan_pfad, status, prioritaet, verfuegbar_ab, abreise, frist, "
+            "erstellt, aktualisiert) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (str(Path(reiseplan_pfad).resolve()), STATUS_WARTEND, prioritaet, jetzt,
+             planung["abreise"], planung["frist"], jetzt, jetzt)
+        )
+        logger.info(f"Job {cursor.lastrowid} eingereiht: {reiseplan_pfad} (Abreise {als_iso(planung['abreise'])})")
+        return cursor.lastrowid
+
+    def status(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Liefert den aktuellen Zustand eines Jobs.
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            Optional[Dict[str, Any]]: Job-Daten oder None, wenn der Job nicht existiert
+        """
+        zeile = self._verbindung.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(zeile) if zeile else None
+
+    def ergebnis(self, job_id: int) -> Optional[str]:
+        """
+        Liefert den PDF-Pfad eines erledigten Jobs.
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            Optional[str]: Pfad zur PDF-Datei oder None, wenn der Job nicht erledigt ist
+        """
+        job = self.status(job_id)
+        if job and job["status"] == STATUS_ERLEDIGT:
+            return job["ergebnis"]
+        return None
+
+    def zaehle(self) -> Dict[str, int]:
+        """
+        Zählt die Jobs pro Status.
+
+        Returns:
+            Dict[str, int]: Anzahl Jobs pro Status
+        """
+        zeilen = self._verbindung.execute("SELECT status, COUNT(*) AS anzahl FROM jobs GROUP BY status")
+        return {zeile["status"]: zeile["anzahl"] for zeile in zeilen}
+
+    def tote_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Liefert alle Jobs, die die maximale Anzahl Versuche überschritten haben.
+
+        Returns:
+            List[Dict[str, Any]]: Tote Jobs
+        """
+        zeilen = self._verbindung.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (STATUS_TOT,))
+        return [dict(zeile) for zeile in zeilen]
+
+    def verpasste_fristen(self) -> List[Dict[str, Any]]:
+        """
+        Liefert alle Jobs, deren Frist verpasst wurde.
+
+        Das sind erledigte Jobs, die erst nach ihrer Frist fertig wurden, sowie
+        offene und tote Jobs, deren Frist bereits verstrichen ist.
+
+        Returns:
+            List[Dict[str, Any]]: Jobs nach Frist geordnet
+        """
+        zeilen = self._verbindung.execute(
+            "SELECT * FROM jobs WHERE frist IS NOT NULL "
+            "AND ((status = ? AND aktualisiert > frist) OR (status != ? AND frist < ?)) ORDER BY frist, id",
+            (STATUS_ERLEDIGT, STATUS_ERLEDIGT, time.time())
+        )
+        return [dict(zeile) for zeile in zeilen]
+
+    def beanspruche(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Beansprucht den nächsten verfügbaren Job mit einem Lease.
+
+        Verfügbar sind wartende Jobs, deren Backoff abgelaufen ist, sowie Jobs,
+        deren Lease abgelaufen ist. Vergeben wird nach Priorität, dann nach
+        frühester Abreise; Jobs ohne Abreise kommen zuletzt.
+
+        Args:
+            worker: Kennung des Workers
+
+        Returns:
+            Optional[Dict[str, Any]]: Beanspruchter Job oder None, wenn keiner verfügbar ist
+        """
+        jetzt = time.time()
+        self._verbindung.execute("BEGIN IMMEDIATE")
+        try:
+            # Abgelaufene Leases mit ausgeschöpften Versuchen gelten als tot
+            self._verbindung.execute(
+                "UPDATE jobs SET status = ?, fehler = COALESCE(fehler, 'Lease abgelaufen'), aktualisiert = ? "
+                "WHERE status = ? AND lease_bis < ? AND versuche >= ?",
+                (STATUS_TOT, jetzt, STATUS_IN_ARBEIT, jetzt, self.max_versuche)
+            )
+
+            zeile = self._verbindung.execute(
+                "SELECT * FROM jobs "
+                "WHERE (status = ? AND verfuegbar_ab <= ?) OR (status = ? AND lease_bis < ?) "
+                "ORDER BY prioritaet DESC, abreise IS NULL, abreise, verfuegbar_ab, id LIMIT 1",
+                (STATUS_WARTEND, jetzt, STATUS_IN_ARBEIT, jetzt)
+            ).fetchone()
+
+            if zeile is None:
+                self._verbindung.execute("COMMIT")
+                return None
+
+            if zeile["status"] == STATUS_IN_ARBEIT:
+                logger.warning(f"Lease von Job {zeile['id']} ({zeile['worker']}) abgelaufen, vergebe neu")
+
+            self._verbindung.execute(
+                "UPDATE jobs SET status = ?, versuche = versuche + 1, lease_bis = ?, worker = ?, aktualisiert = ? "
+                "WHERE id = ?",
+                (STATUS_IN_ARBEIT, jetzt + self.lease_sekunden, worker, jetzt, zeile["id"])
+            )
+            self._verbindung.execute("COMMIT")
+        except Exception:
+            self._verbindung.execute("ROLLBACK")
+            raise
+
+        return self.status(zeile["id"])
+
+    def verlaengere(self, job_id: int, worker: str) -> bool:
+        """
+        Verlängert den Lease eines beanspruchten Jobs um lease_sekunden ab jetzt.
+
+        Args:
+            job_id: ID des Jobs
+            worker: Kennung des Workers, der den Lease hält
+
+        Returns:
+            bool: True, wenn der Worker den Lease noch hielt, sonst False
+        """
+        jetzt = time.time()
+        cursor = self._verbindung.execute(
+            "UPDATE jobs SET lease_bis = ?, aktualisiert = ? WHERE id = ? AND worker = ? AND status = ?",
+            (jetzt + self.lease_sekunden, jetzt, job_id, worker, STATUS_IN_ARBEIT)
+        )
+        return cursor.rowcount == 1
+
+    def abschliessen(self, job_id: int, worker: str, pdf_pfad: str) -> bool:
+        """
+        Markiert einen beanspruchten Job als erledigt.
+
+        Args:
+            job_id: ID des Jobs
+            worker: Kennung des Workers, der den Lease hält
+            pdf_pfad: Pfad zur generierten PDF-Datei
+
+        Returns:
+            bool: True, wenn der Worker den Lease noch hielt, sonst False
+        """
+        cursor = self._verbindung.execute(
+            "UPDATE jobs SET status = ?, ergebnis = ?, fehler = NULL, lease_bis = NULL, aktualisiert = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (STATUS_ERLEDIGT, pdf_pfad, time.time(), job_id, worker, STATUS_IN_ARBEIT)
+        )
+        return cursor.rowcount == 1
+
+    def fehlgeschlagen(self, job_id: int, worker: str, fehler: str) -> bool:
+        """
+        Meldet einen fehlgeschlagenen Versuch.
+
+        Der Job wird mit exponentiellem Backoff erneut eingereiht oder nach der
+        maximalen Anzahl Versuche als tot markiert.
+
+        Args:
+            job_id: ID des Jobs
+            worker: Kennung des Workers, der den Lease hält
+            fehler: Fehlermeldung
+
+        Returns:
+            bool: True, wenn der Worker den Lease noch hielt, sonst False
+        """
+        job = self.status(job_id)
+        if not job or job["worker"] != worker or job["status"] != STATUS_IN_ARBEIT:
+            return False
+
+        jetzt = time.time()
+        if job["versuche"] >= self.max_versuche:
+            logger.error(f"Job {job_id} nach {job['versuche']} Versuchen aufgegeben: {fehler}")
+            neuer_status = STATUS_TOT
+            verfuegbar_ab = job["verfuegbar_ab"]
+        else:
+            wartezeit = min(self.backoff_sekunden * 2 ** (job["versuche"] - 1), MAX_BACKOFF_SEKUNDEN)
+            logger.warning(f"Job {job_id} fehlgeschlagen (Versuch {job['versuche']}), "
+                           f"neuer Versuch in {wartezeit}s: {fehler}")
+            neuer_status = STATUS_WARTEND
+            verfuegbar_ab = jetzt + wartezeit
+
+        cursor = self._verbindung.execute(
+            "UPDATE jobs SET status = ?, verfuegbar_ab = ?, fehler = ?, lease_bis = NULL, aktualisiert = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (neuer_status, verfuegbar_ab, fehler, jetzt, job_id, worker, STATUS_IN_ARBEIT)
+        )
+        return cursor.rowcount == 1
+
+    def aufgeben(self, job_id: int, worker: str, fehler: str) -> bool:
+        """
+        Markiert einen beanspruchten Job ohne weitere Versuche als tot.
+
+        Für Fehler, bei denen eine Wiederholung nichts ändert (z.B. ungültige Eingabe).
+
+        Args:
+            job_id: ID des Jobs
+            worker: Kennung des Workers, der den Lease hält
+            fehler: Fehlermeldung
+
+        Returns:
+            bool: True, wenn der Worker den Lease noch hielt, sonst False
+        """
+        cursor = self._verbindung.execute(
+            "UPDATE jobs SET status = ?, fehler = ?, lease_bis = NULL, aktualisiert = ? "
+            "WHERE id = ? AND worker = ? AND status = ?",
+            (STATUS_TOT, fehler, time.time(), job_id, worker, STATUS_IN_ARBEIT)
+        )
+        if cursor.rowcount == 1:
+            logger.error(f"Job {job_id} ohne Wiederholung aufgegeben: {fehler}")
+        return cursor.rowcount == 1
+
+    def ist_leer(self) -> bool:
+        """
+        Prüft, ob keine offenen Jobs (wartend oder in Arbeit) mehr vorhanden sind.
+
+        Returns:
+            bool: True, wenn alle Jobs erledigt oder tot sind
+        """
+        zeile = self._verbindung.execute(
+            "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (STATUS_WARTEND, STATUS_IN_ARBEIT)
+        ).fetchone()
+        return zeile[0] == 0
+
+
+def bearbeite_job(warteschlange: JobWarteschlange, generator, job: Dict[str, Any], worker: str) -> None:
+    """
+    Rendert einen beanspruchten Job und meldet das Ergebnis an die Warteschlange.
+
+    Fehlgeschlagene Flugdaten-Ergänzungen werden wiederholt. Beim letzten Versuch
+    wird das PDF mit den minimalen Flugdaten erstellt, wie beim direkten Aufruf.
+    Ungültige Reisepläne werden sofort als tot markiert.
+
+    Args:
+        warteschlange: Warteschlange, aus der der Job stammt
+        generator: ReiseplanGenerator des Workers
+        job: Beanspruchter Job
+        worker: Kennung des Workers
+    """
+    from .apis.flight_api import FlightAPIException, flight_api_konfiguriert
+    from .core import UngueltigerReiseplan
+
+    # Ohne API-Schlüssel bringt eine Wiederholung keine neuen Flugdaten
+    letzter_versuch = job["versuche"] >= warteschlange.max_versuche
+    flugdaten_erforderlich = flight_api_konfiguriert() and not letzter_versuch
+    try:
+        pdf_pfad = generator.generiere_reiseplan(
+            job["reiseplan_pfad"], flugdaten_erforderlich=flugdaten_erforderlich, eingabefehler_ausloesen=True
+        )
+    except UngueltigerReiseplan as e:
+        warteschlange.aufgeben(job["id"], worker, f"Ungültige Eingabe: {e}")
+        return
+    except FlightAPIException as e:
+        warteschlange.fehlgeschlagen(job["id"], worker, f"Flugdaten nicht verfügbar: {e}")
+        return
+    except Exception as e:
+        warteschlange.fehlgeschlagen(job["id"], worker, f"Unerwarteter Fehler: {e}")
+        return
+
+    if pdf_pfad:
+        if not warteschlange.abschliessen(job["id"], worker, pdf_pfad):
+            # Der Job wurde inzwischen neu vergeben; das Ergebnis meldet der neue Worker
+            logger.warning(f"Job {job['id']}: Lease verloren, Ergebnis {pdf_pfad} wird nicht gemeldet")
+            return
+        logger.info(f"Job {job['id']} erledigt: {pdf_pfad}")
+        if job["frist"] is not None and time.time() > job["frist"]:
+            logger.warning(f"Job {job['id']} erst nach seiner Frist ({als_iso(job['frist'])}) erledigt")
+    else:
+        warteschlange.fehlgeschlagen(job["id"], worker, "PDF konnte nicht erstellt werden")
+
+
+class LeaseVerlaengerung:
+    """
+    Verlängert den Lease eines Jobs in einem Hintergrund-Thread, solange er bearbeitet wird.
+
+    Der Thread öffnet eine eigene Verbindung, da SQLite-Verbindungen an ihren Thread gebunden sind.
+    """
+
+    def __init__(self, warteschlange: JobWarteschlange, job_id: int, worker: str,
+                 intervall: Optional[float] = None):
+        """
+        Args:
+            warteschlange: Warteschlange, aus der der Job stammt
+            job_id: ID des Jobs
+            worker: Kennung des Workers, der den Lease hält
+            intervall: Sekunden zwischen zwei Verlängerungen (Standard: ein Drittel des Leases)
+        """
+        self.warteschlange = warteschlange
+        self.job_id = job_id
+        self.worker = worker
+        self.intervall = intervall if intervall is not None else warteschlange.lease_sekunden / 3
+        self._stopp = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "LeaseVerlaengerung":
+        self._thread = threading.Thread(target=self._schleife, name=f"lease-{self.job_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopp.set()
+        self._thread.join()
+
+    def _schleife(self) -> None:
+        """
+        Hauptschleife des Hintergrund-Threads.
+        """
+        warteschlange = JobWarteschlange(self.warteschlange.db_pfad,
+                                         lease_sekunden=self.warteschlange.lease_sekunden)
+        try:
+            while not self._stopp.wait(self.intervall):
+                try:
+                    gehalten = warteschlange.verlaengere(self.job_id, self.worker)
+                except sqlite3.Error as e:
+                    logger.warning(f"Job {self.job_id}: Lease konnte nicht verlängert werden: {e}")
+                    continue
+                if not gehalten:
+                    logger.warning(f"Job {self.job_id}: Lease verloren, Verlängerung beendet")
+                    return
+        finally:
+            warteschlange.schliessen()
+
+
+class QueueArbeit:
+    """
+    Arbeitsfunktion für den Worker-Pool, die Jobs aus der Warteschlange bearbeitet.
+    
+    Die Datenbankverbindung wird erst im Worker-Prozess geöffnet, da SQLite-Verbindungen
+    nicht über einen fork hinweg geteilt werden dürfen.
+    """
+
+    def __init__(self, db_pfad: Union[str, Path] = QUEUE_DB, bis_leer: bool = False,
+                 poll_sekunden: float = 1.0):
+        """
+        Args:
+            db_pfad: Pfad zur SQLite-Datei der Warteschlange
+            bis_leer: Beendet den Worker, sobald keine offenen Jobs mehr vorhanden sind
+            poll_sekunden: Wartezeit, wenn aktuell kein Job verfügbar ist
+        """
+        self.db_pfad = str(db_pfad)
+        self.bis_leer = bis_leer
+        self.poll_sekunden = poll_sekunden
+        self._warteschlange: Optional[JobWarteschlange] = None
+        self._worker: Optional[str] = None
+
+    def __call__(self, generator) -> Optional[bool]:
+        """
+        Bearbeitet höchstens einen Job.
+
+        Args:
+            generator: Vorgeladener ReiseplanGenerator des Workers
+
+        Returns:
+            Optional[bool]: True nach einem bearbeiteten Job, False wenn keiner verfügbar war,
+            None wenn die Warteschlange leer ist und bis_leer gesetzt ist
+        """
+        if self._warteschlange is None:
+            self._warteschlange = JobWarteschlange(self.db_pfad)
+            self._worker = f"{socket.gethostname()}:{os.getpid()}"
+            logger.info(f"Worker {self._worker} gestartet")
+
+        job = self._warteschlange.beanspruche(self._worker)
+        if job is None:
+            if self.bis_leer and self._warteschlange.ist_leer():
+                self._warteschlange.schliessen()
+                return None
+            time.sleep(self.poll_sekunden)
+            return False
+
+        # Lange Erstellungen behalten ihren Lease, statt ein zweites Mal vergeben zu werden
+        with LeaseVerlaengerung(self._warteschlange, job["id"], self._worker):
+            bearbeite_job(self._warteschlange, generator, job, self._worker)
+        return True
+
+
+def reihe_betroffene_ein(speicher, warteschlange: JobWarteschlange) -> List[int]:
+    """
+    Reiht die Reisepläne mit geänderten Flugzeiten zur Neuerstellung ein.
+
+    Eingereihte Reisepläne werden im Speicher quittiert; die Warteschlange
+    übernimmt die Neuerstellung inklusive Wiederholungen.
+
+    Args:
+        speicher: Flugdaten-Speicher mit den betroffenen Reiseplänen
+        warteschlange: Warteschlange für die Neuerstellung
+
+    Returns:
+        List[int]: IDs der eingereihten Jobs
+    """
+    job_ids = []
+    for eintrag in speicher.betroffene_reiseplaene():
+        job_ids.append(warteschlange.einreihen(eintrag["reiseplan"]))
+        speicher.quittiere(eintrag["reiseplan"])
+    return job_ids
+
+
+def _revalidierung(db_pfad: Union[str, Path], intervall: float) -> None:
+    """
+    Hauptschleife des Revalidierungs-Prozesses im Worker-Pool.
+
+    Args:
+        db_pfad: Pfad zur SQLite-Datei der Warteschlange
+        intervall: Sekunden zwischen zwei Durchläufen
+    """
+    from .apis.flugdaten_speicher import FlugdatenAktualisierer, FlugdatenSpeicher
+
+    speicher = FlugdatenSpeicher(FLUGDATEN_DB)
+    aktualisierer = FlugdatenAktualisierer(speicher, intervall=intervall)
+    warteschlange = JobWarteschlange(db_pfad)
+    while True:
+        try:
+            aktualisierer.revalidiere()
+            job_ids = reihe_betroffene_ein(speicher, warteschlange)
+            if job_ids:
+                logger.info(f"{len(job_ids)} Reisepläne mit geänderten Flugzeiten eingereiht")
+        except Exception as e:
+            logger.error(f"Fehler bei der Revalidierung der Flugdaten: {e}")
+        time.sleep(intervall)
+
+
+def starte_worker_pool(anzahl: int, db_pfad: Union[str, Path] = QUEUE_DB, bis_leer: bool = False,
+                       max_dokumente: Optional[int] = None, max_rss_mb: Optional[int] = None,
+                       revalidieren: bool = FLUGDATEN_SWR,
+                       revalidierung_intervall: float = FLUGDATEN_REVALIDIERUNG_INTERVALL) -> None:
+    """
+    Startet mehrere vorgeladene Worker-Prozesse und wartet auf deren Ende.
+
+    Die Revalidierung läuft in einem eigenen Prozess statt in einem Thread des
+    Elternprozesses, da dieser laufend Worker forkt und ein Fork während einer
+    gehaltenen Sperre den Worker blockieren würde.
+
+    Args:
+        anzahl: Anzahl Worker-Prozesse
+        db_pfad: Pfad zur SQLite-Datei der Warteschlange
+        bis_leer: Beendet die Worker, sobald keine offenen Jobs mehr vorhanden sind
+        max_dokumente: Anzahl Dokumente, nach denen ein Worker ersetzt wird
+        max_rss_mb: Speichergrenze pro Worker in MB
+        revalidieren: Revalidiert gespeicherte Flugdaten, solange der Pool läuft
+            (Standard: im Speichermodus)
+        revalidierung_intervall: Sekunden zwischen zwei Revalidierungen
+    """
+    from .worker_pool import VorgeladenerWorkerPool
+
+    optionen = {}
+    if max_dokumente is not None:
+        optionen["max_dokumente"] = max_dokumente
+    if max_rss_mb is not None:
+        optionen["max_rss_mb"] = max_rss_mb
+
+    revalidierung = None
+    if revalidieren:
+        # Vor den Workern starten, solange der Elternprozess noch keine Threads hat
+        revalidierung = multiprocessing.Process(target=_revalidierung, args=(db_pfad, revalidierung_intervall),
+                                                name="flugdaten-revalidierung", daemon=True)
+        revalidierung.start()
+        logger.info(f"Revalidierung der Flugdaten alle {revalidierung_intervall:.0f}s gestartet")
+
+    pool = VorgeladenerWorkerPool(anzahl, QueueArbeit(db_pfad, bis_leer), **optionen)
+    try:
+        pool.starten()
+        pool.warten()
+    finally:
+        if revalidierung is not None:
+            revalidierung.terminate()
+            revalidierung.join()
+    logger.info(f"Worker-Pool beendet ({pool.ersetzt} Worker ersetzt)")
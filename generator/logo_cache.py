@@ -0,0 +1,242 @@
+"""
+Cache für vorbereitete Logo-Derivate.
+
+Airline- und Hotel-Logos werden einmalig auf ihre Anzeigegrösse verkleinert
+und als PNG abgelegt, benannt nach dem SHA-256 der Quelldatei und der
+Pixelgrösse. Renders laden dadurch nur noch kleine, direkt einbettbare
+Bilder. SVG-Logos, deren Verarbeitung mit svglib langsam ist, werden
+zusätzlich gerastert, sofern ein renderPM-Backend (rlPyCairo) installiert ist.
+
+Derivate werden beim ersten Bedarf erstellt oder vorab mit
+bereite_logos_vor (CLI: --logos-vorbereiten).
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from reportlab.lib.units import cm
+from svglib.svglib import svg2rlg
+
+from .config import (
+    ASSETS_DIR, AIRLINES_DIR, HOTELS_DIR, LOGO_CACHE, LOGO_CACHE_DIR, LOGO_DPI,
+    KOMPAKT_BILD_DPI, LOGO_SVG_RASTER_MS
+)
+from .utils.bild_utils import pixelgroesse, verkleinere_bild
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Anzeigegrössen der Logos (Breite, Höhe in Punkten)
+LOGO_GROESSE = (3*cm, 1.5*cm)
+KOPF_LOGO_GROESSE = (1.5*cm, 1.5*cm)
+
+
+def skaliere_svg(drawing, breite: float, hoehe: float):
+    """
+    Skaliert eine SVG-Zeichnung unter Beibehaltung des Seitenverhältnisses in eine Anzeigefläche.
+
+    Args:
+        drawing: Zeichnung aus svg2rlg
+        breite: Maximale Breite in Punkten
+        hoehe: Maximale Höhe in Punkten
+
+    Returns:
+        Drawing: Die skalierte Zeichnung
+    """
+    scale = min(breite / drawing.width, hoehe / drawing.height)
+    drawing.width = drawing.width * scale
+    drawing.height = drawing.height * scale
+    drawing.scale(scale, scale)
+    return drawing
+
+
+class LogoCache:
+    """
+    Verzeichnis mit Logo-Derivaten, adressiert über Quell-Hash und Zielgrösse.
+    """
+
+    def __init__(self, verzeichnis: Union[str, Path] = LOGO_CACHE_DIR, svg_raster_ms: float = LOGO_SVG_RASTER_MS):
+        """
+        Args:
+            verzeichnis: Verzeichnis der Derivate
+            svg_raster_ms: SVGs, deren Verarbeitung länger dauert, werden gerastert
+        """
+        self.verzeichnis = Path(verzeichnis)
+        self.svg_raster_ms = svg_raster_ms
+        self._lock = threading.Lock()
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+
+    def _quell_hash(self, pfad: Path) -> str:
+        """
+        Liefert den Hash einer Quelldatei, pro Pfad, Änderungszeit und Grösse nur einmal berechnet.
+        """
+        stat = pfad.stat()
+        schluessel = (str(pfad), stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            quell_hash = self._hashes.get(schluessel)
+        if quell_hash is None:
+            with open(pfad, 'rb') as f:
+                quell_hash = hashlib.sha256(f.read()).hexdigest()[:32]
+            with self._lock:
+                self._hashes[schluessel] = quell_hash
+        return quell_hash
+
+    def _ablegen(self, ziel: Path, schreibe) -> None:
+        """
+        Schreibt ein Derivat atomar, damit parallele Renders nie halbe Dateien lesen.
+        """
+        self.verzeichnis.mkdir(exist_ok=True, parents=True)
+        temp_pfad = ziel.with_name(f"{ziel.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            schreibe(temp_pfad)
+            temp_pfad.replace(ziel)
+        finally:
+            temp_pfad.unlink(missing_ok=True)
+
+    def bild(self, pfad: Union[str, Path], breite: float, hoehe: float, dpi: int) -> Path:
+        """
+        Liefert ein Derivat eines Rasterbilds in Anzeigegrösse.
+
+        Args:
+            pfad: Pfad zum Originalbild
+            breite: Anzeigebreite in Punkten
+            hoehe: Anzeigehöhe in Punkten
+            dpi: Zielauflösung
+
+        Returns:
+            Path: Pfad zum Derivat oder zum Original, wenn dieses bereits klein genug ist
+        """
+        pfad = Path(pfad)
+        breite_px, hoehe_px = pixelgroesse(breite, hoehe, dpi)
+        quell_hash = self._quell_hash(pfad)
+        ziel = self.verzeichnis / f"{quell_hash}-{breite_px}x{hoehe_px}.png"
+        original = self.verzeichnis / f"{quell_hash}-{breite_px}x{hoehe_px}.original"
+
+        if ziel.exists():
+            return ziel
+        if original.exists():
+            return pfad
+
+        verkleinert = verkleinere_bild(pfad, breite, hoehe, dpi)
+        if verkleinert is None:
+            # Merken, dass das Original bereits klein genug ist
+            self._ablegen(original, lambda temp: temp.touch())
+            return pfad
+
+        self._ablegen(ziel, lambda temp: verkleinert.save(temp, format="PNG", optimize=True))
+        logger.debug(f"Logo-Derivat erstellt: {ziel}")
+        return ziel
+
+    def svg_raster(self, pfad: Union[str, Path], breite: float, hoehe: float, dpi: int) -> Optional[Path]:
+        """
+        Liefert eine gerasterte Fassung eines langsam zu verarbeitenden SVG-Logos.
+
+        Beim ersten Aufruf wird die Verarbeitungszeit mit svglib gemessen. Nur
+        wenn sie svg_raster_ms überschreitet und ein renderPM-Backend verfügbar
+        ist, wird ein PNG erstellt; andernfalls wird vermerkt, dass das SVG
+        als Vektorgrafik verwendet wird.
+
+        Args:
+            pfad: Pfad zum SVG
+            breite: Maximale Anzeigebreite in Punkten
+            hoehe: Maximale Anzeigehöhe in Punkten
+            dpi: Zielauflösung
+
+        Returns:
+            Optional[Path]: Pfad zum PNG oder None, wenn das SVG direkt verwendet werden soll
+        """
+        pfad = Path(pfad)
+        breite_px, hoehe_px = pixelgroesse(breite, hoehe, dpi)
+        basis = f"{self._quell_hash(pfad)}-{breite_px}x{hoehe_px}"
+        ziel = self.verzeichnis / f"{basis}.png"
+        vektor = self.verzeichnis / f"{basis}.vektor"
+
+        if ziel.exists():
+            return ziel
+        if vektor.exists():
+            return None
+
+        start = time.perf_counter()
+        drawing = svg2rlg(str(pfad))
+        dauer_ms = (time.perf_counter() - start) * 1000
+        if drawing is None or dauer_ms <= self.svg_raster_ms:
+            self._ablegen(vektor, lambda temp: temp.touch())
+            return None
+
+        try:
+            from reportlab.graphics import renderPM
+            skaliere_svg(drawing, breite, hoehe)
+            self._ablegen(ziel, lambda temp: renderPM.drawToFile(drawing, str(temp), fmt="PNG", dpi=dpi))
+        except Exception as e:
+            # Ohne renderPM-Backend (rlPyCairo) bleibt das SVG eine Vektorgrafik
+            logger.warning(f"Konnte SVG {pfad} nicht rastern ({dauer_ms:.0f} ms mit svglib): {e}")
+            self._ablegen(vektor, lambda temp: temp.touch())
+            return None
+
+        logger.debug(f"SVG-Logo gerastert ({dauer_ms:.0f} ms mit svglib): {ziel}")
+        return ziel
+
+
+_standard_cache: Optional[LogoCache] = None
+_cache_lock = threading.Lock()
+
+
+def standard_logo_cache() -> Optional[LogoCache]:
+    """
+    Liefert den konfigurierten Logo-Cache.
+
+    Returns:
+        Optional[LogoCache]: Logo-Cache oder None, wenn REISEPLAN_LOGO_CACHE deaktiviert ist
+    """
+    global _standard_cache
+    if not LOGO_CACHE:
+        return None
+    with _cache_lock:
+        if _standard_cache is None:
+            _standard_cache = LogoCache(LOGO_CACHE_DIR)
+    return _standard_cache
+
+
+def _logo_dateien(pfade: Iterable[Union[str, Path]]) -> List[Path]:
+    """
+    Sammelt PNG- und SVG-Dateien aus Dateien und Verzeichnissen (nicht rekursiv).
+    """
+    dateien = []
+    for pfad in map(Path, pfade):
+        kandidaten = sorted(pfad.iterdir()) if pfad.is_dir() else [pfad]
+        dateien.extend(datei for datei in kandidaten if datei.suffix.lower() in (".png", ".svg"))
+    return dateien
+
+
+def bereite_logos_vor(pfade: Optional[Iterable[Union[str, Path]]] = None,
+                      cache: Optional[LogoCache] = None) -> int:
+    """
+    Erstellt die Derivate aller Logos für das Standard- und das Kompaktprofil.
+
+    Args:
+        pfade: Logo-Dateien oder Verzeichnisse (Standard: Airline- und Hotel-Logos sowie logo.png)
+        cache: Logo-Cache (Standard: konfigurierter Cache)
+
+    Returns:
+        int: Anzahl verarbeiteter Logos
+    """
+    cache = cache or standard_logo_cache() or LogoCache(LOGO_CACHE_DIR)
+    if pfade is None:
+        pfade = [p for p in (AIRLINES_DIR, HOTELS_DIR, ASSETS_DIR / "logo.png") if p.exists()]
+
+    dateien = _logo_dateien(pfade)
+    for datei in dateien:
+        breite, hoehe = KOPF_LOGO_GROESSE if datei.name == "logo.png" else LOGO_GROESSE
+        for dpi in sorted({LOGO_DPI, KOMPAKT_BILD_DPI}):
+            if datei.suffix.lower() == ".svg":
+                cache.svg_raster(datei, breite, hoehe, dpi)
+            else:
+                cache.bild(datei, breite, hoehe, dpi)
+
+    logger.info(f"{len(dateien)} Logos in {cache.verzeichnis} vorbereitet")
+    return len(dateien)
@@ -0,0 +1,246 @@
+"""
+Laufende Kopf- und Fusszeile der Reiseplan-Seiten.
+
+Kopfzeile (Logo, Titel) und Fusszeile (Reisezeitraum) werden pro Dokument
+einmal als Form-XObject gezeichnet und auf jeder Seite nur referenziert.
+Die Gesamtseitenzahl in "Seite X von Y" ist ebenfalls ein Form-XObject:
+Die Seiten verweisen darauf, bevor es existiert, und SeitenrahmenCanvas
+definiert es beim Speichern, wenn die Seitenzahl feststeht. Ein zweiter
+Layout-Durchlauf ist dadurch nicht nötig.
+
+Bei der Erstellung in Abschnitten (siehe sections) kennt ein Abschnitt
+weder seine erste Seitenzahl noch die Gesamtzahl. Jede Seite verweist dann
+auf ein eigenes Form-XObject "Seite X von Y", das im Abschnitt leer
+bleibt und beim Zusammenfügen durch die Seitenzahlen des Gesamtdokuments
+ersetzt wird (siehe erstelle_seitenzahlen).
+"""
+
+import io
+from functools import partial
+from typing import Any, Dict, List
+
+from reportlab.lib.colors import Color
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import cm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import SimpleDocTemplate
+
+from .block_templates import BlockVorlagen
+from .logo_cache import KOPF_LOGO_GROESSE
+from .utils.date_utils import formatiere_datum
+
+# Namen der Form-XObjects
+FORM_KOPFZEILE = "ReiseplanKopfzeile"
+FORM_FUSSZEILE = "ReiseplanFusszeile"
+FORM_SEITENZAHL = "ReiseplanSeitenzahl"
+FORM_SEITE = "ReiseplanSeite"  # + Seitennummer, nur bei Erstellung in Abschnitten
+
+# Schriftgrösse von Kopf- und Fusszeile (Schrift und Farbe aus dem Theme)
+RAHMEN_FONT_GROESSE = 8
+
+# Höhe des Logos in der Kopfzeile
+KOPFZEILE_LOGO_HOEHE = 0.8*cm
+
+
+class SeitenrahmenCanvas(Canvas):
+    """
+    Canvas, das beim Speichern die Gesamtseitenzahl als Form-XObject definiert.
+    """
+
+    def __init__(self, *args, schrift: str, farbe: Color, seiten_platzhalter: bool = False, **kwargs):
+        """
+        Args:
+            schrift: Schrift der Gesamtseitenzahl
+            farbe: Farbe der Gesamtseitenzahl
+            seiten_platzhalter: Definiert statt der Gesamtseitenzahl leere Seitenzahlen pro Seite
+            *args, **kwargs: Argumente für Canvas
+        """
+        super().__init__(*args, **kwargs)
+        self._rahmen_schrift = schrift
+        self._rahmen_farbe = farbe
+        self._seiten_platzhalter = seiten_platzhalter
+
+    def save(self):
+        """
+        Definiert die Gesamtseitenzahl und speichert das Dokument.
+        """
+        if len(self._code):
+            self.showPage()
+
+        if self._seiten_platzhalter:
+            for seite in range(1, self.getPageNumber()):
+                self.beginForm(f"{FORM_SEITE}{seite}")
+                self.endForm()
+            super().save()
+            return
+
+        # Nach der letzten Seite zeigt die Seitennummer bereits auf die nächste Seite
+        self.beginForm(FORM_SEITENZAHL)
+        self.setFont(self._rahmen_schrift, RAHMEN_FONT_GROESSE)
+        self.setFillColor(self._rahmen_farbe)
+        self.drawString(0, 0, str(self.getPageNumber() - 1))
+        self.endForm()
+
+        super().save()
+
+
+class Seitenrahmen:
+    """
+    Kopf- und Fusszeile eines Reiseplans für die Seitenvorlagen von ReportLab.
+
+    Die erste Seite enthält bereits den grossen Header des Reiseplans und
+    erhält daher nur die Fusszeile, alle weiteren Seiten zusätzlich die
+    Kopfzeile.
+    """
+
+    def __init__(self, reiseplan_daten: Dict[str, Any], vorlagen: BlockVorlagen, abschnitt: bool = False,
+                 kopfzeile_auf_erster_seite: bool = False):
+        """
+        Args:
+            reiseplan_daten: Reiseplan-Daten (Titel, Start- und Enddatum)
+            vorlagen: Block-Vorlagen für Logo, Schrift und Farbe (aus dem Theme)
+            abschnitt: Seitenzahlen als Platzhalter für das spätere Zusammenfügen
+            kopfzeile_auf_erster_seite: Auch die erste Seite erhält die Kopfzeile
+                (Abschnitte, die nicht am Anfang des Dokuments stehen)
+        """
+        self.titel = reiseplan_daten["titel"]
+        self.zeitraum = (f"{formatiere_datum(reiseplan_daten['startdatum'])} - "
+                         f"{formatiere_datum(reiseplan_daten['enddatum'])}")
+        self.vorlagen = vorlagen
+        self.schrift = vorlagen.theme.schrift
+        self.farbe = vorlagen.theme.farben["rahmen"]
+        self.abschnitt = abschnitt
+        self.kopfzeile_auf_erster_seite = kopfzeile_auf_erster_seite
+
+    def baue(self, doc: SimpleDocTemplate, elemente: List) -> None:
+        """
+        Erstellt das Dokument mit Kopf- und Fusszeile.
+
+        Args:
+            doc: Dokumentvorlage
+            elemente: PDF-Elemente (die Liste wird von ReportLab verbraucht)
+        """
+        canvasmaker = partial(SeitenrahmenCanvas, schrift=self.schrift, farbe=self.farbe)
+        if self.abschnitt:
+            canvasmaker = partial(canvasmaker, seiten_platzhalter=True)
+        erste_seite = self.folgeseite if self.kopfzeile_auf_erster_seite else self.erste_seite
+        doc.build(elemente, onFirstPage=erste_seite, onLaterPages=self.folgeseite, canvasmaker=canvasmaker)
+
+    def erste_seite(self, canvas: Canvas, doc: SimpleDocTemplate) -> None:
+        """
+        Stempelt die Fusszeile auf die erste Seite.
+        """
+        self._fusszeile(canvas, doc)
+
+    def folgeseite(self, canvas: Canvas, doc: SimpleDocTemplate) -> None:
+        """
+        Stempelt Kopf- und Fusszeile auf alle weiteren Seiten.
+        """
+        if not canvas.hasForm(FORM_KOPFZEILE):
+            self._zeichne_kopfzeile(canvas, doc)
+        canvas.doForm(FORM_KOPFZEILE)
+        self._fusszeile(canvas, doc)
+
+    def _fusszeile(self, canvas: Canvas, doc: SimpleDocTemplate) -> None:
+        """
+        Stempelt die Fusszeile und die Seitenzahl der aktuellen Seite.
+        """
+        if not canvas.hasForm(FORM_FUSSZEILE):
+            self._zeichne_fusszeile(canvas, doc)
+        canvas.doForm(FORM_FUSSZEILE)
+
+        # "Seite X von " endet vor dem Platz für die noch unbekannte Gesamtseitenzahl
+        breite, _ = doc.pagesize
+        anker = breite - doc.rightMargin - stringWidth("999", self.schrift, RAHMEN_FONT_GROESSE)
+        if self.abschnitt:
+            canvas.saveState()
+            canvas.translate(anker, 1*cm)
+            canvas.doForm(f"{FORM_SEITE}{doc.page}")
+            canvas.restoreState()
+            return
+        canvas.saveState()
+        canvas.setFont(self.schrift, RAHMEN_FONT_GROESSE)
+        canvas.setFillColor(self.farbe)
+        canvas.drawRightString(anker, 1*cm, f"Seite {doc.page} von ")
+        canvas.translate(anker, 1*cm)
+        canvas.doForm(FORM_SEITENZAHL)
+        canvas.restoreState()
+
+    def _zeichne_kopfzeile(self, canvas: Canvas, doc: SimpleDocTemplate) -> None:
+        """
+        Zeichnet die Kopfzeile (Logo, Titel, Linie) einmalig als Form-XObject.
+        """
+        breite, hoehe = doc.pagesize
+        links, rechts = doc.leftMargin, breite - doc.rightMargin
+
+        canvas.beginForm(FORM_KOPFZEILE)
+        if self.vorlagen.theme.logo:
+            # Dasselbe Bild wie im Header, nur kleiner gezeichnet (wird nur einmal eingebettet)
+            logo = self.vorlagen.logo(self.vorlagen.theme.logo, *KOPF_LOGO_GROESSE)
+            faktor = KOPFZEILE_LOGO_HOEHE / logo.drawHeight
+            canvas.saveState()
+            canvas.translate(links, hoehe - 1.5*cm)
+            canvas.scale(faktor, faktor)
+            logo.drawOn(canvas, 0, 0)
+            canvas.restoreState()
+
+        canvas.setFont(self.schrift, RAHMEN_FONT_GROESSE)
+        canvas.setFillColor(self.farbe)
+        canvas.drawRightString(rechts, hoehe - 1.3*cm, self.titel)
+        canvas.setStrokeColor(self.farbe)
+        canvas.setLineWidth(0.5)
+        canvas.line(links, hoehe - 1.6*cm, rechts, hoehe - 1.6*cm)
+        canvas.endForm()
+
+    def _zeichne_fusszeile(self, canvas: Canvas, doc: SimpleDocTemplate) -> None:
+        """
+        Zeichnet die Fusszeile (Linie, Reisezeitraum) einmalig als Form-XObject.
+        """
+        breite, _ = doc.pagesize
+        links, rechts = doc.leftMargin, breite - doc.rightMargin
+
+        canvas.beginForm(FORM_FUSSZEILE)
+        canvas.setStrokeColor(self.farbe)
+        canvas.setLineWidth(0.5)
+        canvas.line(links, 1.4*cm, rechts, 1.4*cm)
+        canvas.setFont(self.schrift, RAHMEN_FONT_GROESSE)
+        canvas.setFillColor(self.farbe)
+        canvas.drawString(links, 1*cm, self.zeitraum)
+        canvas.endForm()
+
+
+def erstelle_seitenzahlen(seiten: int, schrift: str, farbe: Color) -> bytes:
+    """
+    Erstellt ein PDF mit den Seitenzahlen "Seite X von Y" eines zusammengefügten Dokuments.
+
+    Das PDF enthält pro Seite des Gesamtdokuments ein Form-XObject
+    (FORM_SEITE + Seitennummer), gezeichnet wie die Seitenzahl eines in einem
+    Durchlauf erstellten Reiseplans. Seine eigene Seite wird beim
+    Zusammenfügen nicht übernommen.
+
+    Args:
+        seiten: Anzahl Seiten des Gesamtdokuments
+        schrift: Schrift von Kopf- und Fusszeile
+        farbe: Farbe von Kopf- und Fusszeile
+
+    Returns:
+        bytes: Inhalt der PDF-Datei
+    """
+    puffer = io.BytesIO()
+    breite, hoehe = A4
+    canvas = Canvas(puffer, pagesize=A4)
+    for seite in range(1, seiten + 1):
+        # "Seite X von " steht links vom Ursprung, der Rahmen des Formulars muss es einschliessen
+        canvas.beginForm(f"{FORM_SEITE}{seite}", lowerx=-breite, upperx=breite, uppery=hoehe)
+        canvas.setFont(schrift, RAHMEN_FONT_GROESSE)
+        canvas.setFillColor(farbe)
+        canvas.drawRightString(0, 0, f"Seite {seite} von ")
+        canvas.drawString(0, 0, str(seiten))
+        canvas.endForm()
+    # Auf der eigenen Seite verwenden, damit die Ressourcen die Objekte der Formulare nennen
+    for seite in range(1, seiten + 1):
+        canvas.doForm(f"{FORM_SEITE}{seite}")
+    canvas.showPage()
+    canvas.save()
+    return puffer.getvalue()
@@ -0,0 +1,167 @@
+"""
+Planung von Render-Aufträgen nach Abreise.
+
+Batch- und Queue-Modus bearbeiten Reisepläne mit früherer Abreise zuerst,
+damit ein Reiseplan mit Abflug in zwei Stunden nicht hinter hunderten
+Reiseplänen für den nächsten Monat wartet. Eine explizite Priorität (Feld
+'prioritaet' im Reiseplan bzw. beim Einreihen) geht der Abreise vor.
+
+Die Abreise ist die früheste Abflugzeit (in der Zeitzone des
+Abflughafens), ohne Flüge der Beginn des Startdatums. Jedes PDF muss
+REISEPLAN_FRIST_VORLAUF Stunden vor der Abreise fertig sein; PDFs, die
+später fertig werden, werden als verpasste Frist gemeldet.
+"""
+
+import datetime
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .config import FRIST_VORLAUF_STUNDEN
+from .utils.date_utils import flug_zeitzonen, zeitzone
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+
+def _zeitstempel(wert: Any, zeitzone_name: Optional[str]) -> Optional[float]:
+    """
+    Rechnet einen ISO-Zeitpunkt in einen Unix-Zeitstempel um.
+
+    Zeitpunkte ohne Zeitzonen-Angabe gelten als Ortszeit der angegebenen Zeitzone,
+    ohne bekannte Zeitzone als lokale Zeit des Rechners.
+    """
+    if not isinstance(wert, str):
+        return None
+    try:
+        zeitpunkt = datetime.datetime.fromisoformat(wert)
+    except ValueError:
+        return None
+    if zeitpunkt.tzinfo is None:
+        ort = zeitzone(zeitzone_name)
+        if ort is not None:
+            zeitpunkt = zeitpunkt.replace(tzinfo=ort)
+    return zeitpunkt.timestamp()
+
+
+def abreise(reiseplan_daten: Dict[str, Any]) -> Optional[float]:
+    """
+    Bestimmt die Abreise eines Reiseplans.
+
+    Args:
+        reiseplan_daten: Reiseplan-Daten (auch ungeprüft)
+
+    Returns:
+        Optional[float]: Früheste Abflugzeit (bei Flügen ohne Abflugzeit der Flugtag),
+        ohne Flüge der Beginn des Startdatums, als Unix-Zeitstempel; None, wenn
+        kein Datum lesbar ist
+    """
+    abfluege = []
+    for flug in reiseplan_daten.get("fluege") or []:
+        if isinstance(flug, dict):
+            zeitpunkt = _zeitstempel(flug.get("abflugZeit") or flug.get("flugDatum"), flug_zeitzonen(flug)[0])
+            if zeitpunkt is not None:
+                abfluege.append(zeitpunkt)
+    if abfluege:
+        return min(abfluege)
+    return _zeitstempel(reiseplan_daten.get("startdatum"), None)
+
+
+def frist(abreise_zeit: Optional[float], vorlauf_stunden: float = FRIST_VORLAUF_STUNDEN) -> Optional[float]:
+    """
+    Bestimmt den Zeitpunkt, zu dem das PDF spätestens fertig sein muss.
+
+    Args:
+        abreise_zeit: Abreise als Unix-Zeitstempel
+        vorlauf_stunden: Stunden zwischen Frist und Abreise
+
+    Returns:
+        Optional[float]: Frist als Unix-Zeitstempel oder None ohne Abreise
+    """
+    return abreise_zeit - vorlauf_stunden * 3600 if abreise_zeit is not None else None
+
+
+def lies_planung(reiseplan_pfad: Union[str, Path],
+                 vorlauf_stunden: float = FRIST_VORLAUF_STUNDEN) -> Dict[str, Any]:
+    """
+    Liest Priorität, Abreise und Frist einer Reiseplan-Datei.
+
+    Unlesbare Dateien werden ohne Abreise eingeplant; ihre Fehler werden beim
+    Generieren gemeldet.
+
+    Args:
+        reiseplan_pfad: Pfad zur JSON-Datei mit Reisedaten
+        vorlauf_stunden: Stunden zwischen Frist und Abreise
+
+    Returns:
+        Dict[str, Any]: Priorität (Standard 0), Abreise und Frist (Unix-Zeitstempel oder None)
+    """
+    try:
+        with open(reiseplan_pfad, 'r', encoding='utf-8') as f:
+            reiseplan_daten = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.debug(f"Plane {reiseplan_pfad} ohne Abreise ein: {e}")
+        reiseplan_daten = None
+
+    if not isinstance(reiseplan_daten, dict):
+        return {"prioritaet": 0, "abreise": None, "frist": None}
+
+    prioritaet = reiseplan_daten.get("prioritaet")
+    abreise_zeit = abreise(reiseplan_daten)
+    return {
+        "prioritaet": prioritaet if isinstance(prioritaet, int) else 0,
+        "abreise": abreise_zeit,
+        "frist": frist(abreise_zeit, vorlauf_stunden)
+    }
+
+
+def planungs_schluessel(prioritaet: int, abreise_zeit: Optional[float]) -> Tuple[int, bool, float]:
+    """
+    Sortierschlüssel: höhere Priorität zuerst, dann früheste Abreise, Reisepläne ohne Abreise zuletzt.
+
+    Args:
+        prioritaet: Explizite Priorität
+        abreise_zeit: Abreise als Unix-Zeitstempel oder None
+
+    Returns:
+        Tuple[int, bool, float]: Schlüssel für sorted()
+    """
+    return -prioritaet, abreise_zeit is None, abreise_zeit or 0.0
+
+
+def plane_reiseplaene(reiseplaene: List[Tuple[Path, str]],
+                      vorlauf_stunden: float = FRIST_VORLAUF_STUNDEN
+                      ) -> Tuple[List[Tuple[Path, str]], Dict[str, Dict[str, Any]]]:
+    """
+    Ordnet die Eingaben eines Batches nach Priorität und Abreise.
+
+    Bei gleicher Priorität und Abreise bleibt die Reihenfolge der Eingabe erhalten.
+
+    Args:
+        reiseplaene: Eingaben aus batch.sammle_reiseplaene
+        vorlauf_stunden: Stunden zwischen Frist und Abreise
+
+    Returns:
+        Tuple[List[Tuple[Path, str]], Dict[str, Dict[str, Any]]]: Geordnete Eingaben und
+        die Planung (siehe lies_planung) pro Kennung
+    """
+    planung = {kennung: lies_planung(datei, vorlauf_stunden) for datei, kennung in reiseplaene}
+    geordnet = sorted(reiseplaene, key=lambda eintrag: planungs_schluessel(planung[eintrag[1]]["prioritaet"],
+                                                                          planung[eintrag[1]]["abreise"]))
+    return geordnet, planung
+
+
+def als_iso(zeitstempel: Optional[float]) -> Optional[str]:
+    """
+    Formatiert einen Unix-Zeitstempel als lokale ISO-Zeit für Manifeste und Berichte.
+
+    Args:
+        zeitstempel: Unix-Zeitstempel oder None
+
+    Returns:
+        Optional[str]: ISO-Zeit auf Sekunden genau oder None
+    """
+    if zeitstempel is None:
+        return None
+    return datetime.datetime.fromtimestamp(zeitstempel).isoformat(timespec="seconds")
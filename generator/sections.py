@@ -0,0 +1,204 @@
+"""
+Parallele Erstellung sehr grosser Reisepläne in Abschnitten.
+
+Ein einzelner doc.build-Aufruf nutzt nur einen Kern. Sehr grosse Reisepläne
+(z.B. eine Roadshow über einen Monat) werden daher in unabhängige Abschnitte
+geteilt: Übersicht mit Terminkonflikten, Ablauf pro Woche, Flüge, Hotels und
+Aktivitäten pro Woche sowie die Zusatzinformationen. Die Abschnitte werden in
+parallelen Prozessen erstellt und mit dem PdfSammler zu einem PDF mit einem
+Lesezeichen pro Abschnitt zusammengefügt.
+
+Die Seitenzahlen "Seite X von Y" stehen erst nach dem Erstellen aller
+Abschnitte fest. Jeder Abschnitt verweist pro Seite auf ein leeres
+Form-XObject (siehe page_templates); beim Zusammenfügen werden diese
+Verweise auf die Form-XObjects eines kleinen PDFs mit den endgültigen
+Seitenzahlen umgelenkt. Kein Abschnitt muss dafür neu erstellt werden.
+
+Jeder Abschnitt beginnt auf einer neuen Seite.
+"""
+
+import datetime
+import logging
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+from .config import AGENDA, PARALLEL_MIN_BLOECKE
+from .page_templates import FORM_SEITE, erstelle_seitenzahlen
+from .timeline import agenda_nach_tagen, erstelle_zeitplan
+from .utils.date_utils import formatiere_datum, parse_zeitpunkt
+from .utils.pdf_utils import PdfSammler, PdfTeil
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Detailblöcke, die pro Woche aufgeteilt werden: Feld, Datumsfeld, Titel
+WOCHEN_BLOECKE = (
+    ("fluege", "flugDatum", "Flüge"),
+    ("hotels", "checkin", "Hotels"),
+    ("aktivitaeten", "datum", "Aktivitäten"),
+)
+
+
+class AbschnittFehler(Exception):
+    """Ausnahme, wenn ein Abschnitt nicht erstellt werden konnte."""
+    pass
+
+
+def lohnt_abschnitte(reiseplan_daten: Dict[str, Any], min_bloecke: int = PARALLEL_MIN_BLOECKE) -> bool:
+    """
+    Prüft, ob ein Reiseplan gross genug für die Erstellung in Abschnitten ist.
+
+    Args:
+        reiseplan_daten: Reiseplan-Daten
+        min_bloecke: Mindestanzahl Flüge, Hotels und Aktivitäten
+
+    Returns:
+        bool: True, wenn der Reiseplan mindestens min_bloecke Detailblöcke hat
+    """
+    return sum(len(reiseplan_daten.get(feld) or []) for feld, _, _ in WOCHEN_BLOECKE) >= min_bloecke
+
+
+def _woche(tag: datetime.date) -> datetime.date:
+    """
+    Liefert den Montag der Woche eines Tages.
+    """
+    return tag - datetime.timedelta(days=tag.weekday())
+
+
+def _wochen_titel(titel: str, woche: datetime.date) -> str:
+    """
+    Titel eines Wochenabschnitts, z.B. "Flüge 14.04.2025 - 20.04.2025".
+    """
+    ende = woche + datetime.timedelta(days=6)
+    return f"{titel} {formatiere_datum(woche.isoformat())} - {formatiere_datum(ende.isoformat())}"
+
+
+def teile_in_abschnitte(reiseplan_daten: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Teilt einen Reiseplan in unabhängig erstellbare Abschnitte.
+
+    Args:
+        reiseplan_daten: Ergänzte Reiseplan-Daten
+
+    Returns:
+        List[Dict[str, Any]]: Abschnitte in Dokumentreihenfolge mit Art, Titel (für das
+        Lesezeichen) und je nach Art den Tagen (von, bis) oder den Indizes der Blöcke
+    """
+    abschnitte = [{"art": "kopf", "titel": "Übersicht"}]
+
+    if AGENDA:
+        wochen = sorted({_woche(tag) for tag, _ in agenda_nach_tagen(erstelle_zeitplan(reiseplan_daten))})
+        for woche in wochen:
+            abschnitte.append({"art": "ablauf", "titel": _wochen_titel("Ablauf", woche),
+                               "von": woche.isoformat(), "bis": (woche + datetime.timedelta(days=6)).isoformat()})
+
+    # Blöcke ohne lesbares Datum kommen in die Woche des Reisebeginns
+    start = parse_zeitpunkt(reiseplan_daten["startdatum"])
+    standard_woche = _woche(start.date()) if start else datetime.date.min
+    for feld, datum_feld, titel in WOCHEN_BLOECKE:
+        wochen: Dict[datetime.date, List[int]] = {}
+        for index, block in enumerate(reiseplan_daten.get(feld) or []):
+            datum = parse_zeitpunkt(block.get(datum_feld) or "")
+            wochen.setdefault(_woche(datum.date()) if datum else standard_woche, []).append(index)
+        for woche in sorted(wochen):
+            abschnitte.append({"art": feld, "titel": _wochen_titel(titel, woche), "indizes": wochen[woche]})
+
+    if "zusatzinfo" in reiseplan_daten:
+        abschnitte.append({"art": "zusatzinfo", "titel": "Zusätzliche Informationen"})
+    return abschnitte
+
+
+# Generatoren der Abschnitt-Prozesse pro Ausgabeprofil und Theme
+_abschnitt_generatoren: Dict[Tuple[str, str], Any] = {}
+_generator_lock = threading.Lock()
+
+
+def _abschnitt_generator(profil: str, theme: str):
+    """
+    Liefert den Generator dieses Prozesses für Profil und Theme und erstellt ihn beim ersten Aufruf.
+    """
+    from .core import ReiseplanGenerator
+
+    with _generator_lock:
+        generator = _abschnitt_generatoren.get((profil, theme))
+        if generator is None:
+            generator = ReiseplanGenerator(profil, linearisiert=False, theme=theme)
+            _abschnitt_generatoren[(profil, theme)] = generator
+    return generator
+
+
+def _rendere_abschnitt_im_prozess(profil: str, theme: str, reiseplan_daten: Dict[str, Any],
+                                  abschnitt: Dict[str, Any], erster: bool) -> Optional[bytes]:
+    """
+    Erstellt einen Abschnitt in einem Render-Prozess (auf Modulebene, damit sie übertragen werden kann).
+    """
+    return _abschnitt_generator(profil, theme).rendere_abschnitt(reiseplan_daten, abschnitt, erster)
+
+
+def rendere_in_abschnitten(generator, reiseplan_daten: Dict[str, Any], ziel: Union[str, Path, BinaryIO],
+                           prozesse: int, executor: Optional[Executor] = None) -> int:
+    """
+    Erstellt einen Reiseplan in parallel erstellten Abschnitten und fügt sie zu einem PDF zusammen.
+
+    Args:
+        generator: ReiseplanGenerator (Profil und Theme gelten auch für die Abschnitte)
+        reiseplan_daten: Ergänzte Reiseplan-Daten
+        ziel: Pfad der PDF-Datei oder binär beschreibbares Dateiobjekt
+        prozesse: Anzahl paralleler Prozesse (wird ignoriert, wenn ein Executor übergeben wird)
+        executor: Vorhandener Executor, z.B. ein vorgewärmter ProcessPoolExecutor
+
+    Returns:
+        int: Anzahl Seiten des Gesamtdokuments
+
+    Raises:
+        AbschnittFehler: Wenn ein Abschnitt nicht erstellt werden konnte
+    """
+    abschnitte = teile_in_abschnitte(reiseplan_daten)
+    theme = generator.vorlagen_fuer(reiseplan_daten).theme
+    eigener_executor = executor is None
+    if eigener_executor:
+        executor = ProcessPoolExecutor(max_workers=max(1, min(prozesse, len(abschnitte))))
+
+    try:
+        futures = [
+            executor.submit(_rendere_abschnitt_im_prozess, generator.profil, generator.theme,
+                            reiseplan_daten, abschnitt, index == 0)
+            for index, abschnitt in enumerate(abschnitte)
+        ]
+        teile = []
+        for abschnitt, future in zip(abschnitte, futures):
+            pdf_daten = future.result()
+            if not pdf_daten:
+                raise AbschnittFehler(f"Abschnitt '{abschnitt['titel']}' konnte nicht erstellt werden")
+            teile.append(PdfTeil(pdf_daten))
+    finally:
+        if eigener_executor:
+            executor.shutdown(cancel_futures=True)
+
+    seiten = sum(teil.seiten for teil in teile)
+    seitenzahlen = PdfTeil(erstelle_seitenzahlen(seiten, theme.schrift, theme.farben["rahmen"]))
+
+    datei = open(ziel, "wb") if isinstance(ziel, (str, Path)) else ziel
+    try:
+        sammler = PdfSammler(datei)
+
+        # Zuerst nur die Form-XObjects der Seitenzahlen, auf die die Abschnitte verweisen
+        basis = sammler.naechste_nummer
+        sammler.fuege_hinzu(seitenzahlen, seiten=False)
+        zahlen = {name: nummer + basis for name, nummer in seitenzahlen.formulare().items()}
+
+        erste_seite = 0
+        for abschnitt, teil in zip(abschnitte, teile):
+            platzhalter = teil.formulare()
+            ersetze = {platzhalter[f"{FORM_SEITE}{seite}"]: zahlen[f"{FORM_SEITE}{erste_seite + seite}"]
+                       for seite in range(1, teil.seiten + 1)}
+            erste_seite += sammler.fuege_hinzu(teil, abschnitt["titel"], ersetze)
+        sammler.schliesse()
+    finally:
+        if datei is not ziel:
+            datei.close()
+
+    logger.info(f"{reiseplan_daten['titel']}: {len(abschnitte)} Abschnitte mit {seiten} Seiten zusammengefügt")
+    return seiten
@@ -0,0 +1,114 @@
+"""
+Gemeinsames, unveränderliches Stylesheet des Reiseplan-Generators.
+
+Fonts und Paragraph-Styles werden einmal pro Prozess (und pro Theme, siehe
+themes.py) aufgebaut und von allen Generatoren und Threads geteilt.
+getSampleStyleSheet() wird dabei nicht verändert: angepasste Styles sind
+eigene Objekte, die von den Beispiel-Styles erben.
+"""
+
+import logging
+import threading
+from types import MappingProxyType
+from typing import Mapping, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.colors import Color
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, PropertySet
+
+from .utils.font_manager import setup_fonts, check_fonts_availability
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_standard_styles: Optional[Mapping[str, PropertySet]] = None
+
+
+def erstelle_styles(schrift: str = 'OpenSans', schrift_fett: str = 'OpenSans-Bold',
+                    titel_farbe: Color = colors.black) -> Mapping[str, PropertySet]:
+    """
+    Erstellt das Stylesheet für das PDF.
+
+    Args:
+        schrift: Registrierte Grundschrift
+        schrift_fett: Registrierte fette Schrift für Titel und Überschriften
+        titel_farbe: Farbe von Titel und Untertitel
+
+    Returns:
+        Mapping[str, PropertySet]: Schreibgeschützte Zuordnung von Style-Namen und Aliasen zu Styles
+    """
+    basis = getSampleStyleSheet()
+    styles = dict(basis.byName)
+    styles.update(basis.byAlias)
+
+    # Titel-Style
+    styles['Titel'] = ParagraphStyle(
+        name='Titel',
+        fontName=schrift_fett,
+        fontSize=24,
+        textColor=titel_farbe,
+        spaceAfter=12
+    )
+
+    # Untertitel-Style
+    styles['Untertitel'] = ParagraphStyle(
+        name='Untertitel',
+        fontName=schrift_fett,
+        fontSize=16,
+        textColor=titel_farbe,
+        spaceAfter=8
+    )
+
+    # Eigener 'Normal' Style, erbt vom Beispiel-Style statt ihn zu verändern
+    styles['Normal'] = ParagraphStyle(
+        name='Normal',
+        parent=basis['Normal'],
+        fontName=schrift,
+        fontSize=11,
+        spaceAfter=6
+    )
+
+    # Tagesüberschrift im Ablauf
+    styles['Tag'] = ParagraphStyle(
+        name='Tag',
+        parent=styles['Normal'],
+        fontName=schrift_fett,
+        spaceBefore=8
+    )
+
+    # Style für Textzellen in Tabellen (Agenda, Konflikte)
+    styles['Tabelle'] = ParagraphStyle(
+        name='Tabelle',
+        fontName=schrift,
+        fontSize=10,
+        leading=12
+    )
+
+    return MappingProxyType(styles)
+
+
+def standard_styles() -> Mapping[str, PropertySet]:
+    """
+    Liefert das geteilte Stylesheet und registriert beim ersten Aufruf die Fonts.
+
+    Die Styles dürfen nicht verändert werden, da sie von allen Generatoren
+    und Threads des Prozesses gemeinsam verwendet werden.
+
+    Returns:
+        Mapping[str, PropertySet]: Schreibgeschütztes Stylesheet
+    """
+    global _standard_styles
+    if _standard_styles is None:
+        with _lock:
+            if _standard_styles is None:
+                # Überprüfe, ob die benötigten Fonts verfügbar sind
+                if not check_fonts_availability():
+                    logger.warning("Nicht alle benötigten Fonts sind verfügbar!")
+
+                # Registriere Fonts
+                if not setup_fonts():
+                    logger.warning("Nicht alle Fonts konnten registriert werden!")
+
+                _standard_styles = erstelle_styles()
+    return _standard_styles
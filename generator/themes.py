@@ -0,0 +1,255 @@
+"""
+Themes für Reisepläne verschiedener Firmenkunden.
+
+Ein Theme legt Schriften, Farben und Logo eines Kunden fest. Themes werden
+als JSON-Dateien im Theme-Verzeichnis abgelegt (<id>.json) und beim ersten
+Zugriff einmal kompiliert: Fonts werden registriert, Stylesheet und Farben
+erstellt. Die ThemeRegistry hält die kompilierten Themes pro ID, sodass ein
+Prozess Reisepläne aller Kunden erstellen kann, ohne Fonts oder Styles pro
+Auftrag neu aufzubauen.
+
+Beispiel (themes/acme.json, Pfade relativ zur Theme-Datei):
+
+    {
+        "schrift": "fonts/Lato-Regular.ttf",
+        "schrift_fett": "fonts/Lato-Bold.ttf",
+        "farben": {"titel": "#003366", "label": "#dce6f0", "linie": "#003366", "rahmen": "#5a6e82"},
+        "logo": "acme-logo.png"
+    }
+
+Fehlende Angaben werden aus dem Standard-Theme übernommen. Fonts werden
+prozessweit unter ihrem Dateinamen ohne Endung registriert, Logos müssen
+Rasterbilder sein.
+"""
+
+import json
+import logging
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+from reportlab.lib import colors
+from reportlab.lib.styles import PropertySet
+from reportlab.pdfbase import pdfmetrics
+
+from .config import ASSETS_DIR, FONTS_DIR, THEMES_DIR
+from .styles import erstelle_styles, standard_styles
+from .utils.font_manager import register_font
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# ID des eingebauten Themes
+STANDARD_THEME = "standard"
+
+# Erlaubte Theme-IDs (stammen aus Auftragsdaten und werden zu Dateinamen)
+_THEME_ID = re.compile(r"^[a-z0-9][a-z0-9_-]*$")
+
+# Farben als Hex-Wert "#RRGGBB" (HexColor akzeptiert auch Zahlen und kürzere Werte)
+_FARBE = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+# Farben des Standard-Themes
+STANDARD_FARBEN = {
+    "titel": colors.black,       # Titel und Untertitel
+    "label": colors.lightgrey,   # Label-Spalte der Detailtabellen
+    "linie": colors.black,       # Trennlinien und Tabellenköpfe
+    "rahmen": colors.grey,       # Kopf- und Fusszeile
+}
+
+
+class ThemeFehler(Exception):
+    """Ausnahme, wenn ein Theme nicht gefunden oder nicht kompiliert werden kann."""
+    pass
+
+
+class Theme:
+    """
+    Kompiliertes Theme: registrierte Fonts, Stylesheet, Farben und Logo.
+
+    Wird nur gelesen und von allen Generatoren und Threads geteilt.
+    """
+
+    def __init__(self, theme_id: str, schrift: str = "OpenSans", schrift_fett: str = "OpenSans-Bold",
+                 farben: Optional[Dict[str, colors.Color]] = None, logo: Optional[Path] = None,
+                 styles: Optional[Mapping[str, PropertySet]] = None):
+        """
+        Args:
+            theme_id: ID des Themes
+            schrift: Name der registrierten Grundschrift
+            schrift_fett: Name der registrierten fetten Schrift
+            farben: Farben, fehlende Einträge aus dem Standard-Theme
+            logo: Logo für Header und Kopfzeile (None = ohne Logo)
+            styles: Fertiges Stylesheet (Standard: aus Schriften und Titelfarbe erstellt)
+        """
+        self.id = theme_id
+        self.schrift = schrift
+        self.schrift_fett = schrift_fett
+        self.farben = dict(STANDARD_FARBEN, **(farben or {}))
+        self.logo = logo
+        self.styles = styles or erstelle_styles(schrift, schrift_fett, self.farben["titel"])
+
+
+def _standard_theme() -> Theme:
+    """
+    Erstellt das eingebaute Theme (OpenSans, Graustufen, assets/logo.png).
+    """
+    logo = ASSETS_DIR / "logo.png"
+    return Theme(STANDARD_THEME, logo=logo if logo.exists() else None, styles=standard_styles())
+
+
+def _registriere_schrift(pfad: Path) -> str:
+    """
+    Registriert eine Font-Datei unter ihrem Dateinamen, falls noch nicht geschehen.
+
+    Raises:
+        ThemeFehler: Wenn die Datei fehlt oder nicht gelesen werden kann
+    """
+    name = pfad.stem
+    if name in pdfmetrics.getRegisteredFontNames():
+        return name
+    if not register_font(name, str(pfad)):
+        raise ThemeFehler(f"Font {pfad} konnte nicht registriert werden")
+    return name
+
+
+def lade_theme(theme_id: str, verzeichnis: Path) -> Theme:
+    """
+    Lädt und kompiliert ein Theme aus seiner JSON-Datei.
+
+    Schriften werden relativ zur Theme-Datei gesucht, danach im Fonts-Verzeichnis.
+
+    Args:
+        theme_id: ID des Themes
+        verzeichnis: Theme-Verzeichnis
+
+    Returns:
+        Theme: Kompiliertes Theme
+
+    Raises:
+        ThemeFehler: Wenn das Theme nicht existiert oder ungültig ist
+    """
+    datei = verzeichnis / f"{theme_id}.json"
+    try:
+        with open(datei, "r", encoding="utf-8") as f:
+            definition: Dict[str, Any] = json.load(f)
+    except FileNotFoundError:
+        raise ThemeFehler(f"Unbekanntes Theme: {theme_id}")
+    except (OSError, json.JSONDecodeError) as e:
+        raise ThemeFehler(f"Theme {theme_id} konnte nicht gelesen werden: {e}")
+
+    def pfad(wert: str, *alternativen: Path) -> Path:
+        for basis in (datei.parent, *alternativen):
+            kandidat = basis / wert
+            if kandidat.exists():
+                return kandidat
+        return datei.parent / wert
+
+    # Standard-Fonts als Rückfall registrieren
+    standard_styles()
+
+    # Ohne fette Schrift wird die Grundschrift auch für Labels und Titel verwendet
+    schrift, schrift_fett = "OpenSans", "OpenSans-Bold"
+    if definition.get("schrift"):
+        schrift = schrift_fett = _registriere_schrift(pfad(definition["schrift"], FONTS_DIR))
+    if definition.get("schrift_fett"):
+        schrift_fett = _registriere_schrift(pfad(definition["schrift_fett"], FONTS_DIR))
+
+    farben = {}
+    for name, wert in (definition.get("farben") or {}).items():
+        if name not in STANDARD_FARBEN:
+            logger.warning(f"Theme {theme_id}: unbekannte Farbe '{name}' ignoriert")
+            continue
+        if not isinstance(wert, str) or not _FARBE.match(wert):
+            raise ThemeFehler(f"Ungültige Farbe '{name}' in Theme {theme_id}: {wert!r} (erwartet #RRGGBB)")
+        farben[name] = colors.HexColor(wert)
+
+    # Ohne Angabe gilt das Standard-Logo, "logo": null erstellt Reisepläne ohne Logo
+    logo = ASSETS_DIR / "logo.png" if "logo" not in definition else None
+    if definition.get("logo"):
+        logo = pfad(definition["logo"], ASSETS_DIR)
+    if logo is not None and not logo.exists():
+        if "logo" in definition:
+            logger.warning(f"Theme {theme_id}: Logo {logo} nicht gefunden, erstelle ohne Logo")
+        logo = None
+
+    logger.info(f"Theme {theme_id} kompiliert")
+    return Theme(theme_id, schrift, schrift_fett, farben, logo)
+
+
+class ThemeRegistry:
+    """
+    Kompiliert Themes beim ersten Zugriff und hält sie pro ID.
+
+    Threadsicher: Jedes Theme wird genau einmal kompiliert, auch wenn
+    mehrere Threads gleichzeitig danach fragen.
+    """
+
+    def __init__(self, verzeichnis: Path = THEMES_DIR):
+        """
+        Args:
+            verzeichnis: Verzeichnis mit den Theme-Dateien (<id>.json)
+        """
+        self.verzeichnis = Path(verzeichnis)
+        self._themes: Dict[str, Theme] = {}
+        self._lock = threading.Lock()
+
+    def theme(self, theme_id: Optional[str] = None) -> Theme:
+        """
+        Liefert das kompilierte Theme.
+
+        Args:
+            theme_id: ID des Themes (None = Standard-Theme)
+
+        Returns:
+            Theme: Kompiliertes Theme
+
+        Raises:
+            ThemeFehler: Bei einer ungültigen ID oder einem fehlerhaften Theme
+        """
+        theme_id = theme_id or STANDARD_THEME
+        theme = self._themes.get(theme_id)
+        if theme is not None:
+            return theme
+
+        if not _THEME_ID.match(theme_id):
+            raise ThemeFehler(f"Ungültige Theme-ID: {theme_id!r}")
+
+        with self._lock:
+            if theme_id not in self._themes:
+                if theme_id == STANDARD_THEME:
+                    self._themes[theme_id] = _standard_theme()
+                else:
+                    self._themes[theme_id] = lade_theme(theme_id, self.verzeichnis)
+            return self._themes[theme_id]
+
+    def verfuegbare_themes(self) -> List[str]:
+        """
+        Listet die IDs aller Themes im Theme-Verzeichnis (und das Standard-Theme).
+
+        Returns:
+            List[str]: Sortierte Theme-IDs
+        """
+        ids = {STANDARD_THEME}
+        if self.verzeichnis.exists():
+            ids.update(datei.stem for datei in self.verzeichnis.glob("*.json") if _THEME_ID.match(datei.stem))
+        return sorted(ids)
+
+
+_standard_registry: Optional[ThemeRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def standard_theme_registry() -> ThemeRegistry:
+    """
+    Liefert die prozessweit geteilte Theme-Registry.
+
+    Returns:
+        ThemeRegistry: Geteilte Registry für THEMES_DIR
+    """
+    global _standard_registry
+    if _standard_registry is None:
+        with _registry_lock:
+            if _standard_registry is None:
+                _standard_registry = ThemeRegistry()
+    return _standard_registry
@@ -0,0 +1,182 @@
+"""
+Chronologischer Ablauf eines Reiseplans.
+
+Flüge, Hotels und Aktivitäten werden zu einer gemeinsamen, nach Beginn
+sortierten Terminliste zusammengeführt. Daraus entstehen die Agenda pro
+Tag und die Liste der Überschneidungen.
+
+Überschneidungen werden in einem Durchlauf über die sortierten Termine
+gefunden: Ein Heap hält die noch laufenden Termine nach ihrem Ende, sodass
+abgeschlossene Termine in O(log n) entfernt werden und jeder neue Termin
+nur mit tatsächlich überlappenden verglichen wird. Insgesamt O(n log n + k)
+für n Termine und k Konflikte, auch bei Tausenden von Einträgen.
+"""
+
+import datetime
+import heapq
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utils.date_utils import flug_zeitzonen, parse_zeitpunkt
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Terminarten und ihre Konfliktgruppe: Flüge und Aktivitäten schliessen sich
+# gegenseitig aus, Hotels nur untereinander (doppelt gebuchte Nächte)
+KONFLIKT_GRUPPEN = {
+    "flug": "anwesenheit",
+    "aktivitaet": "anwesenheit",
+    "hotel": "unterkunft",
+}
+
+
+def _zeitpunkt(wert: Optional[str], datum: Optional[str] = None,
+               zeitzone_name: Optional[str] = None) -> Optional[datetime.datetime]:
+    """
+    Liest einen ISO-Zeitpunkt; reine Uhrzeiten werden mit dem Datum kombiniert.
+
+    Zeitpunkte mit Zeitzonen-Angabe werden in die Ortszeit umgerechnet und die
+    Zeitzone danach entfernt, damit alle Termine in Ortszeit vergleichbar sind.
+
+    Args:
+        wert: ISO-Datum-Zeit-String oder Uhrzeit ("14:30")
+        datum: ISO-Datum für reine Uhrzeiten
+        zeitzone_name: Zeitzone des Orts (z.B. des Abflughafens)
+
+    Returns:
+        Optional[datetime.datetime]: Zeitpunkt oder None, wenn er nicht gelesen werden kann
+    """
+    if not wert:
+        return None
+    zeitpunkt = parse_zeitpunkt(wert, zeitzone_name)
+    if zeitpunkt is None:
+        if not datum:
+            return None
+        try:
+            zeitpunkt = datetime.datetime.combine(datetime.date.fromisoformat(datum),
+                                                  datetime.time.fromisoformat(wert))
+        except (ValueError, TypeError):
+            return None
+    return zeitpunkt.replace(tzinfo=None)
+
+
+def _termin(nr: int, art: str, titel: str, beginn: Optional[datetime.datetime],
+            ende: Optional[datetime.datetime], ort: str, daten: Dict[str, Any],
+            ohne_uhrzeit: bool = False) -> Dict[str, Any]:
+    """
+    Erstellt einen Termin; ein Ende vor dem Beginn wird verworfen.
+    """
+    if beginn and ende and ende < beginn:
+        logger.debug(f"Ende vor Beginn bei {titel}, Termin wird nicht auf Konflikte geprüft")
+        ende = None
+    return {"nr": nr, "art": art, "titel": titel, "beginn": beginn, "ende": ende, "ort": ort,
+            "ohne_uhrzeit": ohne_uhrzeit, "daten": daten}
+
+
+def erstelle_zeitplan(reiseplan_daten: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Führt Flüge, Hotels und Aktivitäten zu einer chronologischen Terminliste zusammen.
+
+    Args:
+        reiseplan_daten: Reiseplan-Daten
+
+    Returns:
+        List[Dict[str, Any]]: Termine mit Art, Titel, Beginn, Ende, Ort und den
+        Originaldaten, sortiert nach Beginn. Termine ohne lesbaren Beginn fehlen.
+    """
+    termine = []
+    for flug in reiseplan_daten.get("fluege") or []:
+        abflug_zone, ankunft_zone = flug_zeitzonen(flug)
+        beginn = _zeitpunkt(flug.get("abflugZeit"), flug.get("flugDatum"), abflug_zone)
+        ende = _zeitpunkt(flug.get("ankunftZeit"), flug.get("flugDatum"), ankunft_zone)
+        strecke = " - ".join(filter(None, [flug.get("abflugCode") or flug.get("abflugOrt"),
+                                           flug.get("ankunftCode") or flug.get("ankunftOrt")]))
+        ohne_uhrzeit = beginn is None
+        if ohne_uhrzeit:
+            # Ohne Abflugzeit nur am Flugtag aufführen, ohne Konfliktprüfung
+            beginn, ende = _zeitpunkt(flug.get("flugDatum")), None
+        termine.append(_termin(len(termine), "flug", f"Flug {flug['flugNr']}", beginn, ende, strecke, flug,
+                               ohne_uhrzeit))
+
+    for hotel in reiseplan_daten.get("hotels") or []:
+        termine.append(_termin(len(termine), "hotel", hotel["name"], _zeitpunkt(hotel.get("checkin")),
+                               _zeitpunkt(hotel.get("checkout")), hotel.get("adresse", ""), hotel))
+
+    for aktivitaet in reiseplan_daten.get("aktivitaeten") or []:
+        datum = aktivitaet.get("datum")
+        beginn = _zeitpunkt(aktivitaet.get("startzeit"), datum)
+        ende = _zeitpunkt(aktivitaet.get("endzeit"), datum)
+        ohne_uhrzeit = beginn is None
+        if ohne_uhrzeit:
+            beginn, ende = _zeitpunkt(datum), None
+        termine.append(_termin(len(termine), "aktivitaet", aktivitaet["name"], beginn, ende,
+                               aktivitaet.get("ort", ""), aktivitaet, ohne_uhrzeit))
+
+    ohne_zeit = [termin["titel"] for termin in termine if termin["beginn"] is None]
+    if ohne_zeit:
+        logger.warning(f"Termine ohne lesbaren Beginn nicht im Ablauf: {', '.join(ohne_zeit)}")
+
+    termine = [termin for termin in termine if termin["beginn"] is not None]
+    termine.sort(key=lambda termin: (termin["beginn"], termin["nr"]))
+    return termine
+
+
+def finde_konflikte(termine: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Findet alle überlappenden Termine derselben Konfliktgruppe.
+
+    Termine, die genau dann beginnen, wenn ein anderer endet, überlappen nicht.
+
+    Args:
+        termine: Nach Beginn sortierte Termine (siehe erstelle_zeitplan)
+
+    Returns:
+        List[Tuple[Dict[str, Any], Dict[str, Any]]]: Konflikte als (früherer, späterer Termin)
+    """
+    konflikte = []
+    laufend: Dict[str, List[Tuple[datetime.datetime, int, Dict[str, Any]]]] = {}
+    for termin in termine:
+        if termin["ende"] is None:
+            continue
+        heap = laufend.setdefault(KONFLIKT_GRUPPEN[termin["art"]], [])
+
+        # Alles, was vor diesem Termin endet, kann mit keinem späteren mehr überlappen
+        while heap and heap[0][0] <= termin["beginn"]:
+            heapq.heappop(heap)
+        konflikte.extend((anderer, termin) for _, _, anderer in heap)
+        heapq.heappush(heap, (termin["ende"], termin["nr"], termin))
+    return konflikte
+
+
+def agenda_nach_tagen(termine: List[Dict[str, Any]]) -> List[Tuple[datetime.date, List[Dict[str, Any]]]]:
+    """
+    Teilt die Termine in eine Agenda pro Tag auf.
+
+    Hotels erscheinen zweimal, am Tag des Check-ins und am Tag des Check-outs.
+
+    Args:
+        termine: Nach Beginn sortierte Termine (siehe erstelle_zeitplan)
+
+    Returns:
+        List[Tuple[datetime.date, List[Dict[str, Any]]]]: Tage in chronologischer
+        Reihenfolge mit ihren Einträgen (Zeitpunkt, Ereignis, Termin)
+    """
+    eintraege = []
+    for termin in termine:
+        if termin["art"] == "hotel":
+            eintraege.append({"zeitpunkt": termin["beginn"], "ereignis": "Check-in", "termin": termin})
+            if termin["ende"] is not None:
+                eintraege.append({"zeitpunkt": termin["ende"], "ereignis": "Check-out", "termin": termin})
+        else:
+            ereignis = "Flug" if termin["art"] == "flug" else "Aktivität"
+            eintraege.append({"zeitpunkt": termin["beginn"], "ereignis": ereignis, "termin": termin})
+    eintraege.sort(key=lambda eintrag: (eintrag["zeitpunkt"], eintrag["termin"]["nr"]))
+
+    tage: List[Tuple[datetime.date, List[Dict[str, Any]]]] = []
+    for eintrag in eintraege:
+        tag = eintrag["zeitpunkt"].date()
+        if not tage or tage[-1][0] != tag:
+            tage.append((tag, []))
+        tage[-1][1].append(eintrag)
+    return tage
@@ -0,0 +1,50 @@
+"""
+Hilfsfunktionen für die Verarbeitung von Logo-Bildern.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from PIL import Image as PILImage
+from reportlab.lib.units import inch
+
+
+def pixelgroesse(breite: float, hoehe: float, dpi: int) -> Tuple[int, int]:
+    """
+    Berechnet die Pixelgrösse einer Anzeigefläche bei einer Auflösung.
+
+    Args:
+        breite: Anzeigebreite in Punkten
+        hoehe: Anzeigehöhe in Punkten
+        dpi: Auflösung
+
+    Returns:
+        Tuple[int, int]: Breite und Höhe in Pixeln
+    """
+    return max(1, round(breite / inch * dpi)), max(1, round(hoehe / inch * dpi))
+
+
+def verkleinere_bild(pfad: Union[str, Path], breite: float, hoehe: float, dpi: int) -> Optional[PILImage.Image]:
+    """
+    Verkleinert ein Bild auf seine Anzeigegrösse bei einer Zielauflösung.
+
+    Args:
+        pfad: Pfad zur Bilddatei
+        breite: Anzeigebreite in Punkten
+        hoehe: Anzeigehöhe in Punkten
+        dpi: Zielauflösung
+
+    Returns:
+        Optional[PILImage.Image]: Verkleinertes Bild oder None, wenn das Bild bereits klein genug ist
+    """
+    with PILImage.open(pfad) as bild:
+        # Nur verkleinern, nie vergrössern
+        ziel_breite, ziel_hoehe = pixelgroesse(breite, hoehe, dpi)
+        ziel = (min(bild.width, ziel_breite), min(bild.height, ziel_hoehe))
+        if ziel == bild.size:
+            return None
+
+        # Paletten und andere Modi vor dem Skalieren in RGB(A) umwandeln
+        if bild.mode not in ("RGB", "RGBA", "L", "LA"):
+            bild = bild.convert("RGBA" if "transparency" in bild.info else "RGB")
+        return bild.resize(ziel, PILImage.LANCZOS)
@@ -1,70 +1,193 @@
 """
 Dienstprogramme für die Datumsformatierung und -konvertierung.
+
+Jeder ISO-String wird nur einmal geparst und jede Formatierung nur einmal
+berechnet: Parsen, Formatieren und Zeitzonen-Lookups sind über begrenzte
+LRU-Caches memoisiert, die alle Reisepläne und Threads eines Prozesses
+teilen. Zeitpunkte mit Zeitzonen-Angabe (z.B. UTC aus einer API) werden in
+die Ortszeit des Flughafens umgerechnet; Zeitpunkte ohne Angabe gelten
+bereits als Ortszeit und bleiben unverändert.
 """
 
 import datetime
-from typing import Optional
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..config import DATUM_CACHE_GROESSE
+from .zeitzonen import FLUGHAFEN_ZEITZONEN
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
 
+# Deutsche Wochentage (unabhängig von der Locale des Systems)
+WOCHENTAGE = ("Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag")
 
-def formatiere_datum_zeit(iso_datum_zeit: str) -> str:
+
+@lru_cache(maxsize=256)
+def zeitzone(name: Optional[str]) -> Optional[ZoneInfo]:
     """
-    Formatiert einen ISO-Datum-Zeit-String in ein lesbares Format.
-    
+    Liefert eine Zeitzone anhand ihres IANA-Namens.
+
+    Args:
+        name: IANA-Name (z.B. "Europe/Zurich")
+
+    Returns:
+        Optional[ZoneInfo]: Zeitzone oder None, wenn sie unbekannt ist
+    """
+    if not name:
+        return None
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unbekannte Zeitzone: {name}")
+        return None
+
+
+def flug_zeitzonen(flug: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Bestimmt die Zeitzonen von Abflug- und Ankunftsflughafen eines Flugs.
+
+    Angaben im Flug (abflugZeitzone, ankunftZeitzone) haben Vorrang vor der
+    Zuordnung der IATA-Codes.
+
+    Args:
+        flug: Flugdaten
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: IANA-Namen für Abflug und Ankunft (None = unbekannt)
+    """
+    return (flug.get("abflugZeitzone") or FLUGHAFEN_ZEITZONEN.get(flug.get("abflugCode")),
+            flug.get("ankunftZeitzone") or FLUGHAFEN_ZEITZONEN.get(flug.get("ankunftCode")))
+
+
+@lru_cache(maxsize=DATUM_CACHE_GROESSE)
+def parse_zeitpunkt(iso_datum_zeit: str, zeitzone_name: Optional[str] = None) -> Optional[datetime.datetime]:
+    """
+    Parst einen ISO-Datum-Zeit-String und rechnet ihn in die Ortszeit um.
+
     Args:
         iso_datum_zeit: ISO-formatierter Datum-Zeit-String
-        
+        zeitzone_name: Zeitzone des Orts; nur für Zeitpunkte mit Zeitzonen-Angabe verwendet
+
     Returns:
-        str: Formatierter Datum-Zeit-String (z.B. "01.01.2025, 14:30")
+        Optional[datetime.datetime]: Zeitpunkt in Ortszeit oder None bei Fehler
     """
     try:
         dt = datetime.datetime.fromisoformat(iso_datum_zeit)
-        return dt.strftime("%d.%m.%Y, %H:%M")
     except (ValueError, TypeError):
-        return iso_datum_zeit
+        return None
+    if dt.tzinfo is not None:
+        ort = zeitzone(zeitzone_name)
+        if ort is not None:
+            dt = dt.astimezone(ort)
+    return dt
+
+
+@lru_cache(maxsize=DATUM_CACHE_GROESSE)
+def formatiere_datum_zeit(iso_datum_zeit: str, zeitzone_name: Optional[str] = None) -> str:
+    """
+    Formatiert einen ISO-Datum-Zeit-String in ein lesbares Format.
+
+    Args:
+        iso_datum_zeit: ISO-formatierter Datum-Zeit-String
+        zeitzone_name: Zeitzone des Orts (siehe parse_zeitpunkt)
 
+    Returns:
+        str: Formatierter Datum-Zeit-String (z.B. "01.01.2025, 14:30")
+    """
+    dt = parse_zeitpunkt(iso_datum_zeit, zeitzone_name)
+    return dt.strftime("%d.%m.%Y, %H:%M") if dt else iso_datum_zeit
 
-def formatiere_zeit(iso_datum_zeit: str) -> str:
+
+@lru_cache(maxsize=DATUM_CACHE_GROESSE)
+def formatiere_zeit(iso_datum_zeit: str, zeitzone_name: Optional[str] = None) -> str:
     """
     Extrahiert und formatiert die Uhrzeit aus einem ISO-Datum-Zeit-String.
-    
+
     Args:
         iso_datum_zeit: ISO-formatierter Datum-Zeit-String
-        
+        zeitzone_name: Zeitzone des Orts (siehe parse_zeitpunkt)
+
     Returns:
         str: Formatierter Zeit-String (z.B. "14:30")
     """
-    try:
-        dt = datetime.datetime.fromisoformat(iso_datum_zeit)
-        return dt.strftime("%H:%M")
-    except (ValueError, TypeError):
-        return iso_datum_zeit
+    dt = parse_zeitpunkt(iso_datum_zeit, zeitzone_name)
+    return dt.strftime("%H:%M") if dt else iso_datum_zeit
 
 
+@lru_cache(maxsize=DATUM_CACHE_GROESSE)
 def formatiere_datum(iso_datum: str) -> str:
     """
     Formatiert ein ISO-Datum in ein lesbares Format.
-    
+
     Args:
         iso_datum: ISO-formatierter Datum-String
-        
+
     Returns:
         str: Formatierter Datum-String (z.B. "01.01.2025")
     """
-    try:
-        dt = datetime.datetime.fromisoformat(iso_datum)
-        return dt.strftime("%d.%m.%Y")
-    except (ValueError, TypeError):
-        return iso_datum
+    dt = parse_zeitpunkt(iso_datum)
+    return dt.strftime("%d.%m.%Y") if dt else iso_datum
+
+
+def formatiere_tag(tag: datetime.date) -> str:
+    """
+    Formatiert ein Datum mit Wochentag.
+
+    Args:
+        tag: Datum
+
+    Returns:
+        str: Formatierter Tag (z.B. "Mittwoch, 01.01.2025")
+    """
+    return f"{WOCHENTAGE[tag.weekday()]}, {tag.strftime('%d.%m.%Y')}"
+
+
+def bereite_zeiten_vor(reiseplan_daten: Dict[str, Any]) -> None:
+    """
+    Parst und formatiert alle Zeitangaben eines Reiseplans in einem Durchlauf.
+
+    Jeder Zeitpunkt wird genau einmal mit der Zeitzone seines Flughafens
+    geparst; Header, Blöcke, Ablauf und Seitenrahmen lesen danach nur noch
+    aus den Caches.
+
+    Args:
+        reiseplan_daten: Reiseplan-Daten
+    """
+    for feld in ("startdatum", "enddatum"):
+        if reiseplan_daten.get(feld):
+            formatiere_datum(reiseplan_daten[feld])
+
+    for flug in reiseplan_daten.get("fluege") or []:
+        abflug_zone, ankunft_zone = flug_zeitzonen(flug)
+        if flug.get("abflugZeit"):
+            formatiere_datum_zeit(flug["abflugZeit"], abflug_zone)
+        if flug.get("ankunftZeit"):
+            formatiere_datum_zeit(flug["ankunftZeit"], ankunft_zone)
+
+    for hotel in reiseplan_daten.get("hotels") or []:
+        for feld in ("checkin", "checkout"):
+            if hotel.get(feld):
+                formatiere_datum_zeit(hotel[feld])
+
+    for aktivitaet in reiseplan_daten.get("aktivitaeten") or []:
+        if aktivitaet.get("datum"):
+            formatiere_datum(aktivitaet["datum"])
+        for feld in ("startzeit", "endzeit"):
+            if aktivitaet.get(feld):
+                formatiere_zeit(aktivitaet[feld])
 
 
 def datum_zu_iso(datum: str, format_str: str = "%d.%m.%Y") -> Optional[str]:
     """
     Konvertiert einen formatierten Datum-String in einen ISO-Datum-String.
-    
+
     Args:
         datum: Formatierter Datum-String
         format_str: Format des Eingabe-Strings
-        
+
     Returns:
         Optional[str]: ISO-formatierter Datum-String oder None bei Fehler
     """
@@ -72,4 +195,4 @@ def datum_zu_iso(datum: str, format_str: str = "%d.%m.%Y") -> Optional[str]:
         dt = datetime.datetime.strptime(datum, format_str)
         return dt.date().isoformat()
     except (ValueError, TypeError):
-        return None
\ No newline at end of file
+        return None
@@ -14,7 +14,8 @@ logger = logging.getLogger(__name__)
 FLUG_SCHEMA = {
     "required": ["flugNr", "flugDatum"],
     "optional": ["airline", "abflugOrt", "abflugCode", "abflugZeit", 
-                 "ankunftOrt", "ankunftCode", "ankunftZeit", "buchungsNr"]
+                 "ankunftOrt", "ankunftCode", "ankunftZeit", "buchungsNr",
+                 "abflugZeitzone", "ankunftZeitzone"]
 }
 
 # Definiere das Schema für ein Hotel
@@ -32,7 +33,7 @@ AKTIVITAET_SCHEMA = {
 # Definiere das Schema für den gesamten Reiseplan
 REISEPLAN_SCHEMA = {
     "required": ["titel", "startdatum", "enddatum", "reiseziel"],
-    "optional": ["reisende", "fluege", "hotels", "aktivitaeten", "zusatzinfo"]
+    "optional": ["reisende", "fluege", "hotels", "aktivitaeten", "zusatzinfo", "theme", "prioritaet"]
 }
 
 
@@ -9,9 +9,12 @@ from pathlib import Path
 from ..config import LOG_LEVEL, LOG_FILE, DEBUG
 
 
-def setup_logging():
+def setup_logging(konsole=None):
     """
     Konfiguriert das Logging für den Reiseplan-Generator.
+    
+    Args:
+        konsole: Stream für die Konsolenausgabe (Standard: stdout)
     """
     # Bestimme das Log-Level
     level_map = {
@@ -38,7 +41,7 @@ def setup_logging():
     )
     
     # Füge einen Handler für die Konsole hinzu
-    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler = logging.StreamHandler(konsole or sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
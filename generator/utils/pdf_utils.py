@@ -0,0 +1,304 @@
+"""
+Hilfsfunktionen für die Prüfung, Nachbearbeitung und das Zusammenfügen erzeugter PDF-Dateien.
+"""
+
+import io
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+# Standard-14-Fonts werden nicht eingebettet und brauchen kein Subset
+STANDARD_FONTS = {
+    "Courier", "Courier-Bold", "Courier-Oblique", "Courier-BoldOblique",
+    "Helvetica", "Helvetica-Bold", "Helvetica-Oblique", "Helvetica-BoldOblique",
+    "Times-Roman", "Times-Bold", "Times-Italic", "Times-BoldItalic",
+    "Symbol", "ZapfDingbats"
+}
+
+# Subset-Fonts tragen ein Präfix aus sechs Grossbuchstaben, z.B. 'AAAAAA+OpenSans'
+_SUBSET_PRAEFIX = re.compile(r"^[A-Z]{6}\+")
+_BASE_FONT = re.compile(rb"/BaseFont\s*/([^\s/<>\[\]()]+)")
+
+
+def nicht_subset_fonts(pdf_daten: bytes) -> List[str]:
+    """
+    Ermittelt die Fonts eines PDFs, die nicht als Subset eingebettet sind.
+
+    Args:
+        pdf_daten: Inhalt der PDF-Datei
+
+    Returns:
+        List[str]: Namen der Fonts ohne Subset-Präfix (ohne Standard-14-Fonts)
+    """
+    fonts = {name.decode("latin-1") for name in _BASE_FONT.findall(pdf_daten)}
+    return sorted(
+        name for name in fonts
+        if name not in STANDARD_FONTS and not _SUBSET_PRAEFIX.match(name)
+    )
+
+
+def _pikepdf():
+    """
+    Importiert pikepdf, falls installiert.
+    """
+    try:
+        import pikepdf
+    except ImportError:
+        return None
+    return pikepdf
+
+
+def linearisierung_verfuegbar() -> bool:
+    """
+    Prüft, ob PDFs linearisiert werden können (pikepdf oder das qpdf-Programm).
+
+    Returns:
+        bool: True, wenn pikepdf installiert oder qpdf im PATH ist
+    """
+    return _pikepdf() is not None or shutil.which("qpdf") is not None
+
+
+def linearisiere(pdf_daten: bytes) -> bytes:
+    """
+    Linearisiert ein PDF ("Fast Web View").
+
+    Die Objekte der ersten Seite und die Hint-Tabellen stehen danach am
+    Anfang der Datei, sodass Viewer die erste Seite anzeigen können, bevor
+    der Rest geladen ist. Verwendet pikepdf, sonst das qpdf-Programm.
+
+    Args:
+        pdf_daten: Inhalt der PDF-Datei
+
+    Returns:
+        bytes: Linearisiertes PDF
+
+    Raises:
+        RuntimeError: Wenn weder pikepdf noch qpdf verfügbar sind oder qpdf fehlschlägt
+    """
+    pikepdf = _pikepdf()
+    if pikepdf is not None:
+        ausgabe = io.BytesIO()
+        with pikepdf.open(io.BytesIO(pdf_daten)) as pdf:
+            pdf.save(ausgabe, linearize=True)
+        return ausgabe.getvalue()
+
+    qpdf = shutil.which("qpdf")
+    if qpdf is None:
+        raise RuntimeError("Zum Linearisieren wird pikepdf oder qpdf benötigt")
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        eingabe, ausgabe_pfad = Path(verzeichnis) / "ein.pdf", Path(verzeichnis) / "aus.pdf"
+        eingabe.write_bytes(pdf_daten)
+        ergebnis = subprocess.run([qpdf, "--linearize", str(eingabe), str(ausgabe_pfad)],
+                                  capture_output=True, text=True)
+        # qpdf meldet Warnungen mit Exit-Code 3, die Ausgabe ist dann trotzdem gültig
+        if ergebnis.returncode not in (0, 3):
+            raise RuntimeError(f"qpdf fehlgeschlagen: {ergebnis.stderr.strip()}")
+        return ausgabe_pfad.read_bytes()
+
+
+# Bausteine für das Zusammenfügen von ReportLab-PDFs (ohne Objekt- und Xref-Streams)
+_STARTXREF = re.compile(rb"startxref\s+(\d+)\s+%%EOF\s*$")
+_XREF_ABSCHNITT = re.compile(rb"xref\s+(\d+)\s+(\d+)\s+")
+_ROOT = re.compile(rb"/Root\s+(\d+)\s+0\s+R")
+_OBJ_KOPF = re.compile(rb"(\d+)\s+0\s+obj\s*")
+_REFERENZ = re.compile(rb"(?<![\d.])(\d+) 0 R(?![A-Za-z0-9])")
+_REFERENZ_WERT = r"/{}\s+(\d+)\s+0\s+R"
+_KIDS = re.compile(rb"/Kids\s*\[([^\]]*)\]")
+_COUNT = re.compile(rb"/Count\s+(\d+)")
+_TYPE_PAGES = re.compile(rb"/Type\s*/Pages(?![A-Za-z])")
+_FORMULAR = re.compile(rb"/FormXob\.([A-Za-z0-9_]+)\s+(\d+)\s+0\s+R")
+
+
+class PdfTeil:
+    """
+    Ein von ReportLab erzeugtes PDF, zerlegt in seine Objekte.
+    """
+
+    def __init__(self, pdf_daten: bytes):
+        """
+        Args:
+            pdf_daten: Inhalt der PDF-Datei
+
+        Raises:
+            ValueError: Wenn die Xref-Tabelle nicht gelesen werden kann
+        """
+        ende = _STARTXREF.search(pdf_daten)
+        abschnitt = _XREF_ABSCHNITT.match(pdf_daten, int(ende.group(1))) if ende else None
+        if not abschnitt or int(abschnitt.group(1)) != 0:
+            raise ValueError("PDF ohne lesbare Xref-Tabelle")
+
+        # Einträge der Xref-Tabelle: 'oooooooooo ggggg n' (20 Bytes pro Zeile)
+        anzahl = int(abschnitt.group(2))
+        zeilen = pdf_daten[abschnitt.end():].split(None, anzahl * 3)
+        positionen = {}
+        for nummer in range(anzahl):
+            position, _, art = zeilen[nummer * 3:nummer * 3 + 3]
+            if art == b"n":
+                positionen[nummer] = int(position)
+
+        # Ein Objekt reicht bis zum Beginn des nächsten (oder der Xref-Tabelle)
+        grenzen = sorted(positionen.values()) + [int(ende.group(1))]
+        naechste = dict(zip(grenzen, grenzen[1:]))
+        self.anzahl = anzahl
+        self.objekte = {nummer: pdf_daten[position:naechste[position]] for nummer, position in positionen.items()}
+
+        root = _ROOT.search(pdf_daten, pdf_daten.rfind(b"trailer"))
+        katalog = self.objekte[int(root.group(1))] if root else b""
+        pages = re.search(_REFERENZ_WERT.format("Pages").encode(), katalog)
+        if not pages:
+            raise ValueError("PDF ohne Seitenbaum")
+        self.seitenbaum = int(pages.group(1))
+
+    @property
+    def seiten(self) -> int:
+        """Anzahl Seiten laut Seitenbaum."""
+        return int(_COUNT.search(self.objekte[self.seitenbaum]).group(1))
+
+    def formulare(self) -> Dict[str, int]:
+        """
+        Liefert die Objektnummern der Form-XObjects nach ihrem Namen (beginForm).
+        """
+        formulare = {}
+        for objekt in self.objekte.values():
+            stream = objekt.find(b"stream\n")
+            for treffer in _FORMULAR.finditer(objekt if stream < 0 else objekt[:stream]):
+                formulare[treffer.group(1).decode("ascii")] = int(treffer.group(2))
+        return formulare
+
+    def erste_seite(self) -> int:
+        """
+        Liefert die Objektnummer der ersten Seite.
+        """
+        knoten = self.seitenbaum
+        while _TYPE_PAGES.search(self.objekte[knoten]):
+            kinder = _KIDS.search(self.objekte[knoten])
+            knoten = int(_REFERENZ.search(kinder.group(1)).group(1))
+        return knoten
+
+
+class PdfSammler:
+    """
+    Fügt ReportLab-PDFs fortlaufend zu einem Dokument mit Lesezeichen zusammen.
+
+    Jedes Teil-PDF wird sofort mit verschobenen Objektnummern in die
+    Zieldatei geschrieben; im Speicher bleiben nur das aktuelle Teil und
+    die Positionen der Objekte für die Xref-Tabelle. Die Seitenbäume der
+    Teile werden unverändert unter einen gemeinsamen Seitenbaum gehängt,
+    Katalog und Info der Teile bleiben als unbenutzte Objekte erhalten.
+    """
+
+    # Reservierte Objektnummern für Seitenbaum und Katalog des Gesamtdokuments
+    _SEITENBAUM = 1
+    _KATALOG = 2
+
+    def __init__(self, ziel: BinaryIO):
+        """
+        Args:
+            ziel: Binär beschreibbares Dateiobjekt
+        """
+        self.ziel = ziel
+        self.positionen: Dict[int, int] = {}
+        self.naechste_nummer = 3
+        self.seitenbaeume: List[int] = []
+        self.lesezeichen: List[Tuple[str, int]] = []
+        self.seiten = 0
+        self._schreibe(b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n")
+
+    def _schreibe(self, daten: bytes) -> None:
+        self.ziel.write(daten)
+
+    def _schreibe_objekt(self, nummer: int, inhalt: bytes) -> None:
+        self.positionen[nummer] = self.ziel.tell()
+        self._schreibe(b"%d 0 obj\n" % nummer + inhalt + b"\nendobj\n")
+
+    def fuege_hinzu(self, teil: Union[bytes, PdfTeil], lesezeichen: Optional[str] = None,
+                    ersetze: Optional[Dict[int, int]] = None, seiten: bool = True) -> int:
+        """
+        Hängt die Seiten eines PDFs an.
+
+        Args:
+            teil: Inhalt der PDF-Datei oder bereits zerlegtes PdfTeil
+            lesezeichen: Titel des Lesezeichens auf der ersten Seite des Teils
+            ersetze: Verweise auf Objekte des Teils, die stattdessen auf bereits
+                geschriebene Objekte des Gesamtdokuments zeigen (Objektnummer im Teil ->
+                Objektnummer im Gesamtdokument)
+            seiten: False übernimmt nur die Objekte (z.B. Form-XObjects), nicht die Seiten
+
+        Returns:
+            int: Anzahl angehängter Seiten
+        """
+        if not isinstance(teil, PdfTeil):
+            teil = PdfTeil(teil)
+        basis = self.naechste_nummer
+        ersetze = ersetze or {}
+
+        def verschiebe(treffer: "re.Match") -> bytes:
+            nummer = int(treffer.group(1))
+            return b"%d 0 R" % (ersetze[nummer] if nummer in ersetze else nummer + basis)
+
+        for nummer, objekt in teil.objekte.items():
+            kopf = _OBJ_KOPF.match(objekt)
+            rumpf = objekt[kopf.end():].rstrip()
+            if rumpf.endswith(b"endobj"):
+                rumpf = rumpf[:-len(b"endobj")].rstrip()
+
+            # Referenzen nur im Objekt-Dictionary verschieben, nie in Stream-Daten
+            stream = rumpf.find(b"stream\n")
+            dictionary, daten = (rumpf, b"") if stream < 0 else (rumpf[:stream], rumpf[stream:])
+            dictionary = _REFERENZ.sub(verschiebe, dictionary)
+            if nummer == teil.seitenbaum and seiten:
+                dictionary = dictionary.replace(b"<<", b"<<\n/Parent %d 0 R" % self._SEITENBAUM, 1)
+            self._schreibe_objekt(nummer + basis, dictionary + daten)
+
+        self.naechste_nummer = basis + teil.anzahl
+        if not seiten:
+            return 0
+        self.seitenbaeume.append(teil.seitenbaum + basis)
+        if lesezeichen is not None:
+            self.lesezeichen.append((lesezeichen, teil.erste_seite() + basis))
+        self.seiten += teil.seiten
+        return teil.seiten
+
+    def schliesse(self) -> int:
+        """
+        Schreibt Seitenbaum, Lesezeichen, Katalog und Xref-Tabelle.
+
+        Returns:
+            int: Anzahl Seiten des Gesamtdokuments
+        """
+        kinder = b" ".join(b"%d 0 R" % nummer for nummer in self.seitenbaeume)
+        self._schreibe_objekt(self._SEITENBAUM, b"<<\n/Type /Pages /Count %d /Kids [ %s ]\n>>" % (self.seiten, kinder))
+
+        katalog = b"<<\n/Type /Catalog /Pages %d 0 R" % self._SEITENBAUM
+        if self.lesezeichen:
+            outlines = self.naechste_nummer
+            erstes, letztes = outlines + 1, outlines + len(self.lesezeichen)
+            self._schreibe_objekt(outlines, b"<<\n/Type /Outlines /Count %d /First %d 0 R /Last %d 0 R\n>>"
+                                  % (len(self.lesezeichen), erstes, letztes))
+            for index, (titel, seite) in enumerate(self.lesezeichen):
+                nummer = erstes + index
+                eintrag = b"<<\n/Title <%s> /Parent %d 0 R /Dest [ %d 0 R /Fit ]" % (
+                    ("\ufeff" + titel).encode("utf-16-be").hex().encode(), outlines, seite)
+                if nummer > erstes:
+                    eintrag += b" /Prev %d 0 R" % (nummer - 1)
+                if nummer < letztes:
+                    eintrag += b" /Next %d 0 R" % (nummer + 1)
+                self._schreibe_objekt(nummer, eintrag + b"\n>>")
+            self.naechste_nummer = letztes + 1
+            katalog += b" /Outlines %d 0 R /PageMode /UseOutlines" % outlines
+        self._schreibe_objekt(self._KATALOG, katalog + b"\n>>")
+
+        # Xref-Tabelle über alle Objektnummern, fehlende als frei markiert
+        xref = self.ziel.tell()
+        zeilen = [b"xref\n0 %d\n0000000000 65535 f \n" % self.naechste_nummer]
+        for nummer in range(1, self.naechste_nummer):
+            position = self.positionen.get(nummer)
+            zeilen.append(b"%010d 00000 n \n" % position if position is not None else b"0000000000 65535 f \n")
+        self._schreibe(b"".join(zeilen))
+        self._schreibe(b"trailer\n<<\n/Root %d 0 R /Size %d\n>>\nstartxref\n%d\n%%%%EOF\n"
+                       % (self._KATALOG, self.naechste_nummer, xref))
+        return self.seiten
@@ -0,0 +1,103 @@
+"""
+Zeitzonen der häufigsten Flughäfen.
+
+Wird verwendet, um Zeitpunkte mit Zeitzonen-Angabe (z.B. UTC aus einer
+Flug-API) in die Ortszeit des Abflug- bzw. Ankunftsflughafens umzurechnen.
+Flughäfen, die hier fehlen, können im Flug über abflugZeitzone und
+ankunftZeitzone angegeben werden.
+"""
+
+# IATA-Code -> IANA-Zeitzone
+FLUGHAFEN_ZEITZONEN = {
+    # Schweiz
+    "ZRH": "Europe/Zurich",
+    "GVA": "Europe/Zurich",
+    "BSL": "Europe/Zurich",
+    "BRN": "Europe/Zurich",
+    "LUG": "Europe/Zurich",
+    # Deutschland und Österreich
+    "FRA": "Europe/Berlin",
+    "MUC": "Europe/Berlin",
+    "BER": "Europe/Berlin",
+    "DUS": "Europe/Berlin",
+    "HAM": "Europe/Berlin",
+    "STR": "Europe/Berlin",
+    "CGN": "Europe/Berlin",
+    "VIE": "Europe/Vienna",
+    "SZG": "Europe/Vienna",
+    "INN": "Europe/Vienna",
+    # Übriges Europa
+    "LHR": "Europe/London",
+    "LGW": "Europe/London",
+    "LCY": "Europe/London",
+    "STN": "Europe/London",
+    "MAN": "Europe/London",
+    "EDI": "Europe/London",
+    "DUB": "Europe/Dublin",
+    "CDG": "Europe/Paris",
+    "ORY": "Europe/Paris",
+    "NCE": "Europe/Paris",
+    "LYS": "Europe/Paris",
+    "AMS": "Europe/Amsterdam",
+    "BRU": "Europe/Brussels",
+    "LUX": "Europe/Luxembourg",
+    "CPH": "Europe/Copenhagen",
+    "ARN": "Europe/Stockholm",
+    "OSL": "Europe/Oslo",
+    "HEL": "Europe/Helsinki",
+    "MAD": "Europe/Madrid",
+    "BCN": "Europe/Madrid",
+    "PMI": "Europe/Madrid",
+    "LIS": "Europe/Lisbon",
+    "FCO": "Europe/Rome",
+    "MXP": "Europe/Rome",
+    "LIN": "Europe/Rome",
+    "VCE": "Europe/Rome",
+    "ATH": "Europe/Athens",
+    "PRG": "Europe/Prague",
+    "WAW": "Europe/Warsaw",
+    "BUD": "Europe/Budapest",
+    "IST": "Europe/Istanbul",
+    # Nordamerika
+    "JFK": "America/New_York",
+    "EWR": "America/New_York",
+    "BOS": "America/New_York",
+    "IAD": "America/New_York",
+    "MIA": "America/New_York",
+    "ATL": "America/New_York",
+    "ORD": "America/Chicago",
+    "DFW": "America/Chicago",
+    "DEN": "America/Denver",
+    "LAX": "America/Los_Angeles",
+    "SFO": "America/Los_Angeles",
+    "SEA": "America/Los_Angeles",
+    "YYZ": "America/Toronto",
+    "YUL": "America/Toronto",
+    "YVR": "America/Vancouver",
+    "MEX": "America/Mexico_City",
+    # Südamerika
+    "GRU": "America/Sao_Paulo",
+    "EZE": "America/Argentina/Buenos_Aires",
+    # Naher Osten und Afrika
+    "DXB": "Asia/Dubai",
+    "AUH": "Asia/Dubai",
+    "DOH": "Asia/Qatar",
+    "TLV": "Asia/Jerusalem",
+    "CAI": "Africa/Cairo",
+    "JNB": "Africa/Johannesburg",
+    "CPT": "Africa/Johannesburg",
+    # Asien und Ozeanien
+    "DEL": "Asia/Kolkata",
+    "BOM": "Asia/Kolkata",
+    "SIN": "Asia/Singapore",
+    "BKK": "Asia/Bangkok",
+    "HKG": "Asia/Hong_Kong",
+    "PEK": "Asia/Shanghai",
+    "PVG": "Asia/Shanghai",
+    "NRT": "Asia/Tokyo",
+    "HND": "Asia/Tokyo",
+    "ICN": "Asia/Seoul",
+    "SYD": "Australia/Sydney",
+    "MEL": "Australia/Melbourne",
+    "AKL": "Pacific/Auckland",
+}
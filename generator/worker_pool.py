@@ -0,0 +1,244 @@
+"""
+Vorgeladener Worker-Pool für die PDF-Generierung.
+
+Der Elternprozess importiert ReportLab, registriert die Fonts und baut das
+Stylesheet einmal auf. Die Worker werden anschliessend per fork aus diesem
+vorgewärmten Prozessabbild erzeugt und müssen nichts davon wiederholen.
+
+Da ReportLab über lange Laufzeiten Speicher ansammelt, beendet sich ein
+Worker nach einer festen Anzahl Dokumente oder bei Überschreiten einer
+RSS-Grenze und wird vom Elternprozess durch einen frischen Fork ersetzt.
+Abgestürzte Worker werden mit wachsender Wartezeit neu gestartet; nach
+WORKER_MAX_NEUSTARTS Abstürzen in Folge bleibt ihr Platz leer. Abstürze und
+Wartezeit werden pro Platz gezählt, ein fehlerhafter Worker verzögert also
+nicht die Neustarts der übrigen.
+"""
+
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import resource
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+from PIL import Image as PILImage
+
+from .config import WORKER_MAX_DOKUMENTE, WORKER_MAX_RSS_MB, WORKER_NEUSTART_BACKOFF, WORKER_MAX_NEUSTARTS
+from .core import ReiseplanGenerator
+
+# Logger konfigurieren
+logger = logging.getLogger(__name__)
+
+# Exit-Code, mit dem ein Worker seine Ersetzung anfordert
+EXIT_RECYCLING = 75
+
+# Obergrenze der Wartezeit vor dem Neustart eines abgestürzten Workers in Sekunden
+MAX_NEUSTART_WARTEZEIT = 60.0
+
+# Im Elternprozess vorgeladener Generator, wird von den Workern geerbt
+_vorgeladener_generator: Optional[ReiseplanGenerator] = None
+
+
+def vorladen() -> ReiseplanGenerator:
+    """
+    Lädt Fonts, Stylesheet und Bild-Plugins im aktuellen Prozess vor.
+
+    Returns:
+        ReiseplanGenerator: Vorgeladener Generator
+    """
+    global _vorgeladener_generator
+    if _vorgeladener_generator is None:
+        # Bild-Plugins von Pillow registrieren, bevor geforkt wird
+        PILImage.init()
+        _vorgeladener_generator = ReiseplanGenerator()
+        logger.info("Generator für Worker vorgeladen")
+    return _vorgeladener_generator
+
+
+def aktueller_rss_mb() -> float:
+    """
+    Ermittelt den aktuellen Speicherverbrauch (RSS) des Prozesses.
+
+    Returns:
+        float: RSS in Megabyte
+    """
+    try:
+        # Linux: aktueller RSS aus /proc
+        with open("/proc/self/statm") as f:
+            seiten = int(f.read().split()[1])
+        return seiten * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Andere Systeme: Spitzenwert, macOS in Bytes, sonst in Kilobytes
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform.startswith('darwin'):
+            return max_rss / (1024 * 1024)
+        return max_rss / 1024
+
+
+def _worker_main(arbeit: Callable[[ReiseplanGenerator], Optional[bool]],
+                 max_dokumente: int, max_rss_mb: float) -> None:
+    """
+    Hauptschleife eines Workers.
+
+    Args:
+        arbeit: Wird wiederholt mit dem Generator aufgerufen. Liefert True, wenn ein
+            Dokument erstellt wurde, False, wenn gerade nichts zu tun war, und None,
+            wenn der Worker endgültig beendet werden soll.
+        max_dokumente: Anzahl Dokumente, nach denen der Worker ersetzt wird
+        max_rss_mb: Speichergrenze, ab der der Worker ersetzt wird
+    """
+    generator = vorladen()
+    dokumente = 0
+
+    while True:
+        ergebnis = arbeit(generator)
+        if ergebnis is None:
+            sys.exit(0)
+        if not ergebnis:
+            continue
+
+        dokumente += 1
+        if max_dokumente and dokumente >= max_dokumente:
+            logger.info(f"Worker {os.getpid()} ersetzt nach {dokumente} Dokumenten")
+            sys.exit(EXIT_RECYCLING)
+
+        rss_mb = aktueller_rss_mb()
+        if max_rss_mb and rss_mb > max_rss_mb:
+            logger.info(f"Worker {os.getpid()} ersetzt bei {rss_mb:.0f} MB RSS nach {dokumente} Dokumenten")
+            sys.exit(EXIT_RECYCLING)
+
+
+class VorgeladenerWorkerPool:
+    """
+    Startet Worker per fork aus einem vorgeladenen Elternprozess und ersetzt sie bei Bedarf.
+    """
+
+    def __init__(self, anzahl: int, arbeit: Callable[[ReiseplanGenerator], Optional[bool]],
+                 max_dokumente: int = WORKER_MAX_DOKUMENTE, max_rss_mb: float = WORKER_MAX_RSS_MB,
+                 neustart_backoff: float = WORKER_NEUSTART_BACKOFF, max_neustarts: int = WORKER_MAX_NEUSTARTS):
+        """
+        Initialisiert den Pool.
+
+        Args:
+            anzahl: Anzahl gleichzeitiger Worker
+            arbeit: Arbeitsfunktion der Worker (siehe _worker_main)
+            max_dokumente: Anzahl Dokumente, nach denen ein Worker ersetzt wird (0 = unbegrenzt)
+            max_rss_mb: Speichergrenze pro Worker in MB (0 = unbegrenzt)
+            neustart_backoff: Wartezeit vor dem ersten Neustart eines abgestürzten Workers in Sekunden
+            max_neustarts: Abstürze in Folge, nach denen ein Worker nicht mehr neu gestartet wird
+        """
+        self.anzahl = anzahl
+        self.arbeit = arbeit
+        self.max_dokumente = max_dokumente
+        self.max_rss_mb = max_rss_mb
+        self.neustart_backoff = neustart_backoff
+        self.max_neustarts = max_neustarts
+        self.ersetzt = 0
+        # Abstürze in Folge pro Platz
+        self.abstuerze: List[int] = [0] * anzahl
+        self._prozesse: Dict[int, multiprocessing.Process] = {}
+        # Platz der laufenden Worker, nach Sentinel
+        self._plaetze: Dict[int, int] = {}
+        # Fällige Neustarts abgestürzter Worker pro Platz (time.monotonic)
+        self._neustarts: Dict[int, float] = {}
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            self._kontext = multiprocessing.get_context("fork")
+        else:
+            logger.warning("fork wird nicht unterstützt, Worker laden Fonts und Styles selbst")
+            self._kontext = multiprocessing.get_context("spawn")
+
+    def _starte_worker(self, platz: int) -> None:
+        """
+        Forkt einen neuen Worker aus dem vorgeladenen Elternprozess.
+
+        Args:
+            platz: Platz des Workers im Pool (0 bis anzahl - 1)
+        """
+        prozess = self._kontext.Process(
+            target=_worker_main,
+            args=(self.arbeit, self.max_dokumente, self.max_rss_mb)
+        )
+        prozess.start()
+        self._prozesse[prozess.sentinel] = prozess
+        self._plaetze[prozess.sentinel] = platz
+
+    def starten(self) -> None:
+        """
+        Lädt den Generator vor und startet alle Worker.
+        """
+        vorladen()
+        for platz in range(self.anzahl):
+            self._starte_worker(platz)
+
+    def warten(self) -> None:
+        """
+        Überwacht die Worker, bis alle regulär beendet sind.
+
+        Worker, die sich zum Recycling beenden, werden sofort ersetzt. Abgestürzte
+        Worker werden nach einer sich verdoppelnden Wartezeit neu gestartet, damit
+        ein Fehler beim Start nicht zu einer Fork-Schleife führt. Nach max_neustarts
+        Abstürzen in Folge auf einem Platz wird dort kein Ersatz mehr gestartet.
+        Ein Recycling oder ein reguläres Ende setzt die Abstürze des Platzes zurück.
+        """
+        try:
+            while self._prozesse or self._neustarts:
+                jetzt = time.monotonic()
+                for platz in [platz for platz, zeitpunkt in self._neustarts.items() if zeitpunkt <= jetzt]:
+                    del self._neustarts[platz]
+                    self._starte_worker(platz)
+
+                timeout = max(0.0, min(self._neustarts.values()) - jetzt) if self._neustarts else None
+                if not self._prozesse:
+                    time.sleep(timeout)
+                    continue
+
+                for sentinel in multiprocessing.connection.wait(list(self._prozesse), timeout):
+                    prozess = self._prozesse.pop(sentinel)
+                    platz = self._plaetze.pop(sentinel)
+                    prozess.join()
+                    if prozess.exitcode == EXIT_RECYCLING:
+                        self.ersetzt += 1
+                        self.abstuerze[platz] = 0
+                        self._starte_worker(platz)
+                    elif prozess.exitcode == 0:
+                        self.abstuerze[platz] = 0
+                    else:
+                        self._plane_neustart(platz, prozess)
+        except KeyboardInterrupt:
+            logger.info("Beende Worker...")
+            self.beenden()
+
+    def _plane_neustart(self, platz: int, prozess: multiprocessing.Process) -> None:
+        """
+        Plant den Neustart eines abgestürzten Workers mit exponentieller Wartezeit.
+
+        Args:
+            platz: Platz des Workers im Pool
+            prozess: Beendeter Worker
+        """
+        self.abstuerze[platz] += 1
+        abstuerze = self.abstuerze[platz]
+        if abstuerze > self.max_neustarts:
+            logger.error(f"Worker {prozess.pid} (Platz {platz}) mit Exit-Code {prozess.exitcode} beendet; "
+                         f"{abstuerze} Abstürze in Folge, Worker wird nicht mehr neu gestartet")
+            return
+
+        wartezeit = min(MAX_NEUSTART_WARTEZEIT, self.neustart_backoff * 2 ** (abstuerze - 1))
+        logger.error(f"Worker {prozess.pid} (Platz {platz}) mit Exit-Code {prozess.exitcode} beendet, "
+                     f"starte in {wartezeit:.1f}s neu ({abstuerze}/{self.max_neustarts})")
+        self._neustarts[platz] = time.monotonic() + wartezeit
+
+    def beenden(self) -> None:
+        """
+        Beendet alle laufenden Worker.
+        """
+        for prozess in self._prozesse.values():
+            prozess.terminate()
+        for prozess in self._prozesse.values():
+            prozess.join()
+        self._prozesse.clear()
+        self._plaetze.clear()
+        self._neustarts.clear()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Reiseplan-Generator Job-Queue CLI
+Command Line Interface für die dauerhafte Job-Warteschlange.
+"""
+
+import sys
+import time
+import argparse
+import logging
+
+from generator.apis.flugdaten_speicher import FlugdatenSpeicher, FlugdatenAktualisierer
+from generator.config import QUEUE_DB, FLUGDATEN_DB, FLUGDATEN_SWR, FLUGDATEN_REVALIDIERUNG_TAGE
+from generator.job_queue import JobWarteschlange, reihe_betroffene_ein, starte_worker_pool, STATUS_ERLEDIGT
+from generator.scheduling import als_iso
+from generator.utils.logging_setup import setup_logging
+
+
+def main():
+    """
+    Hauptfunktion für die Job-Queue-CLI.
+    """
+    # Logger konfigurieren
+    logger = setup_logging()
+    
+    # Parser für Kommandozeilenargumente
+    parser = argparse.ArgumentParser(
+        description="Verwaltet die Job-Warteschlange für die PDF-Generierung."
+    )
+    
+    parser.add_argument(
+        "--db",
+        help=f"Pfad zur SQLite-Datei der Warteschlange (Standard: {QUEUE_DB})",
+        default=str(QUEUE_DB)
+    )
+    
+    parser.add_argument(
+        "--debug",
+        help="Aktiviert den Debug-Modus mit ausführlicher Protokollierung",
+        action="store_true"
+    )
+    
+    befehle = parser.add_subparsers(dest="befehl", required=True)
+    
+    enqueue = befehle.add_parser("enqueue", help="Reiht Reisepläne zur Generierung ein")
+    enqueue.add_argument("reiseplan_pfade", nargs="+", help="Pfade zu JSON-Dateien mit Reisedaten")
+    enqueue.add_argument(
+        "--prioritaet",
+        type=int,
+        help="Höhere Werte werden zuerst bearbeitet (Standard: Feld 'prioritaet' des Reiseplans, sonst 0)"
+    )
+    
+    status = befehle.add_parser("status", help="Zeigt den Status eines Jobs oder der Warteschlange")
+    status.add_argument("job_id", nargs="?", type=int, help="ID des Jobs (ohne: Übersicht)")
+    
+    befehle.add_parser("fristen", help="Listet Jobs, die ihre Frist verpasst haben")
+    
+    result = befehle.add_parser("result", help="Gibt den PDF-Pfad eines erledigten Jobs aus")
+    result.add_argument("job_id", type=int, help="ID des Jobs")
+    
+    worker = befehle.add_parser("worker", help="Startet Worker-Prozesse")
+    worker.add_argument("--anzahl", type=int, default=1, help="Anzahl Worker-Prozesse")
+    worker.add_argument(
+        "--bis-leer",
+        help="Beendet die Worker, sobald keine offenen Jobs mehr vorhanden sind",
+        action="store_true"
+    )
+    worker.add_argument(
+        "--max-dokumente",
+        type=int,
+        help="Ersetzt einen Worker nach dieser Anzahl Dokumente"
+    )
+    worker.add_argument(
+        "--max-rss-mb",
+        type=int,
+        help="Ersetzt einen Worker, sobald sein Speicherverbrauch diese Grenze überschreitet"
+    )
+    worker.add_argument(
+        "--ohne-revalidierung",
+        help="Startet im Speichermodus (REISEPLAN_FLUGDATEN_SWR) keine Revalidierung der Flugdaten",
+        action="store_true"
+    )
+    
+    revalidate = befehle.add_parser(
+        "revalidate",
+        help="Prüft gespeicherte Flugdaten erneut und listet Reisepläne mit geänderten Flugzeiten"
+    )
+    revalidate.add_argument(
+        "--tage",
+        type=int,
+        default=FLUGDATEN_REVALIDIERUNG_TAGE,
+        help="Revalidiert Flüge mit Abflug in den nächsten so vielen Tagen"
+    )
+    revalidate.add_argument(
+        "--intervall",
+        type=int,
+        default=0,
+        help="Wiederholt die Prüfung alle so vielen Sekunden (0 = einmalig)"
+    )
+    revalidate.add_argument(
+        "--einreihen",
+        help="Reiht die betroffenen Reisepläne zur Neuerstellung ein",
+        action="store_true"
+    )
+    revalidate.add_argument(
+        "--flugdaten-db",
+        help=f"Pfad zur SQLite-Datei des Flugdaten-Speichers (Standard: {FLUGDATEN_DB})",
+        default=str(FLUGDATEN_DB)
+    )
+    
+    args = parser.parse_args()
+    
+    # Debug-Modus
+    if args.debug:
+        logger.setLevel(logging.DEBUG)
+        logger.debug("Debug-Modus wurde aktiviert")
+    
+    if args.befehl == "worker":
+        starte_worker_pool(args.anzahl, args.db, args.bis_leer, args.max_dokumente, args.max_rss_mb,
+                           revalidieren=FLUGDATEN_SWR and not args.ohne_revalidierung)
+        return
+    
+    if args.befehl == "revalidate":
+        revalidiere(args)
+        return
+    
+    warteschlange = JobWarteschlange(args.db)
+    try:
+        if args.befehl == "enqueue":
+            for reiseplan_pfad in args.reiseplan_pfade:
+                job_id = warteschlange.einreihen(reiseplan_pfad, args.prioritaet)
+                print(job_id)
+        
+        elif args.befehl == "status":
+            if args.job_id is None:
+                for status_name, anzahl in sorted(warteschlange.zaehle().items()):
+                    print(f"{status_name}: {anzahl}")
+                for job in warteschlange.tote_jobs():
+                    print(f"tot: Job {job['id']} ({job['reiseplan_pfad']}): {job['fehler']}")
+                verpasst = warteschlange.verpasste_fristen()
+                if verpasst:
+                    print(f"frist_verpasst: {len(verpasst)}")
+            else:
+                job = warteschlange.status(args.job_id)
+                if not job:
+                    logger.error(f"Job {args.job_id} existiert nicht.")
+                    sys.exit(1)
+                print(f"Job {job['id']}: {job['status']} (Versuche: {job['versuche']})")
+                if job["abreise"] is not None:
+                    print(f"Abreise: {als_iso(job['abreise'])}, Frist: {als_iso(job['frist'])}")
+                if job["fehler"]:
+                    print(f"Letzter Fehler: {job['fehler']}")
+        
+        elif args.befehl == "fristen":
+            for job in warteschlange.verpasste_fristen():
+                fertig = als_iso(job["aktualisiert"]) if job["status"] == STATUS_ERLEDIGT else "offen"
+                print(f"Job {job['id']} ({job['reiseplan_pfad']}): {job['status']}, "
+                      f"Frist {als_iso(job['frist'])}, fertig {fertig}")
+        
+        elif args.befehl == "result":
+            pdf_pfad = warteschlange.ergebnis(args.job_id)
+            if not pdf_pfad:
+                logger.error(f"Job {args.job_id} ist nicht erledigt.")
+                sys.exit(1)
+            print(pdf_pfad)
+    finally:
+        warteschlange.schliessen()
+
+
+def revalidiere(args: argparse.Namespace):
+    """
+    Revalidiert gespeicherte Flugdaten und meldet oder reiht die betroffenen Reisepläne ein.
+    
+    Args:
+        args: Argumente des Befehls 'revalidate'
+    """
+    speicher = FlugdatenSpeicher(args.flugdaten_db)
+    aktualisierer = FlugdatenAktualisierer(speicher, tage=args.tage, intervall=args.intervall)
+    
+    while True:
+        aktualisierer.revalidiere()
+        
+        if args.einreihen:
+            warteschlange = JobWarteschlange(args.db)
+            try:
+                for job_id in reihe_betroffene_ein(speicher, warteschlange):
+                    print(job_id)
+            finally:
+                warteschlange.schliessen()
+        else:
+            for eintrag in speicher.betroffene_reiseplaene():
+                print(f"{eintrag['reiseplan']}: {eintrag['flug_nr']} am {eintrag['flug_datum']} "
+                      f"{eintrag['alt']} -> {eintrag['neu']}")
+        
+        if not args.intervall:
+            return
+        try:
+            time.sleep(args.intervall)
+        except KeyboardInterrupt:
+            return
+
+
+if __name__ == "__main__":
+    main()
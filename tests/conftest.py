@@ -0,0 +1,29 @@
+"""
+Gemeinsame Einstellungen für die Tests.
+
+Die Konfiguration wird beim Import von generator.config aus der Umgebung
+gelesen. Ausgaben, Caches und Datenbanken der Tests landen daher in einem
+temporären Verzeichnis, das vor dem ersten Import gesetzt und nach dem
+Testlauf gelöscht wird; im Repository entstehen keine Dateien.
+"""
+
+import atexit
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+TEST_DIR = Path(tempfile.mkdtemp(prefix="reiseplan-tests-"))
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+
+os.environ["REISEPLAN_BASE_DIR"] = str(TEST_DIR)
+os.environ["REISEPLAN_ASSETS_DIR"] = str(REPO_DIR / "assets")
+os.environ["REISEPLAN_OUTPUT_DIR"] = str(TEST_DIR / "output")
+os.environ["REISEPLAN_CACHE_DIR"] = str(TEST_DIR / "cache")
+os.environ["REISEPLAN_LOG_FILE"] = str(TEST_DIR / "reiseplan_generator.log")
+os.environ["FLIGHT_API_RATE_FILE"] = str(TEST_DIR / "flight_api.bucket")
+os.environ["FLIGHT_API_KEY"] = ""
+
+sys.path.insert(0, str(REPO_DIR))
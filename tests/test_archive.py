@@ -0,0 +1,104 @@
+"""
+Tests für die Archiv-Ausgabe von Batch-Läufen.
+"""
+
+import io
+import json
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+from generator.archive import MANIFEST_NAME, ReiseplanArchiv, archiv_format
+from generator.batch import fuehre_batch_aus
+from generator.core import ReiseplanGenerator
+
+
+def lies_archiv(daten, format_name):
+    """
+    Liefert die Einträge eines Archivs als {Name: Inhalt} in Archivreihenfolge.
+    """
+    if format_name == "zip":
+        with zipfile.ZipFile(io.BytesIO(daten)) as archiv:
+            return {info.filename: archiv.read(info) for info in archiv.infolist()}
+    with tarfile.open(fileobj=io.BytesIO(daten), mode="r|*") as archiv:
+        return {info.name: archiv.extractfile(info).read() for info in archiv}
+
+
+@pytest.mark.parametrize("name, format_name", [
+    ("batch.zip", "zip"), ("batch.tar", "tar"), ("batch.tar.gz", "tar.gz"), ("batch.tgz", "tar.gz"),
+])
+def test_archiv_mit_manifest_als_letztem_eintrag(tmp_path, name, format_name):
+    ziel = tmp_path / "ausgabe" / name
+    assert archiv_format(ziel) == format_name
+
+    archiv = ReiseplanArchiv(ziel)
+    archiv.schreibe("team/london.pdf", b"%PDF-london")
+    archiv.schreibe("paris.pdf", b"%PDF-paris")
+    archiv.schliesse({"eintraege": 2})
+
+    eintraege = lies_archiv(ziel.read_bytes(), format_name)
+    assert list(eintraege) == ["team/london.pdf", "paris.pdf", MANIFEST_NAME]
+    assert eintraege["team/london.pdf"] == b"%PDF-london"
+    assert json.loads(eintraege[MANIFEST_NAME]) == {"eintraege": 2}
+    assert archiv.eintraege == 3
+    assert [pfad.name for pfad in ziel.parent.iterdir()] == [name]
+
+
+def test_zip_speichert_pdfs_unkomprimiert(tmp_path):
+    archiv = ReiseplanArchiv(tmp_path / "batch.zip")
+    archiv.schreibe("a.pdf", b"%PDF" * 100)
+    archiv.schliesse({})
+
+    with zipfile.ZipFile(tmp_path / "batch.zip") as gelesen:
+        assert [info.compress_type for info in gelesen.infolist()] == [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED]
+
+
+def test_tar_auf_stdout(monkeypatch):
+    stdout = io.TextIOWrapper(io.BytesIO())
+    monkeypatch.setattr(sys, "stdout", stdout)
+
+    archiv = ReiseplanArchiv("-")
+    archiv.schreibe("a.pdf", b"%PDF-a")
+    archiv.schliesse({"eintraege": 1})
+
+    assert archiv.pfad is None
+    eintraege = lies_archiv(stdout.buffer.getvalue(), "tar")
+    assert list(eintraege) == ["a.pdf", MANIFEST_NAME]
+
+
+def test_unbekanntes_format(tmp_path):
+    with pytest.raises(ValueError, match="Unbekanntes Archivformat"):
+        ReiseplanArchiv(tmp_path / "batch.rar")
+
+
+# Ein nicht geschlossenes Archiv schreibt beim Aufräumen in die bereits geschlossene Datei
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_verwerfen_entfernt_temporaere_datei(tmp_path):
+    archiv = ReiseplanArchiv(tmp_path / "batch.zip")
+    archiv.schreibe("a.pdf", b"%PDF-a")
+    assert (tmp_path / "batch.zip.tmp").exists()
+
+    archiv.verwerfe()
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+def test_abgebrochener_batch_hinterlaesst_kein_archiv(tmp_path, monkeypatch):
+    eingabe = tmp_path / "eingabe"
+    eingabe.mkdir()
+    (eingabe / "a.json").write_text("{}", encoding="utf-8")
+    generator = ReiseplanGenerator(linearisiert=False)
+
+    def abbrechen(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(generator, "generiere_pdf_daten", abbrechen)
+    ausgabe = tmp_path / "ausgabe"
+
+    with pytest.raises(KeyboardInterrupt):
+        fuehre_batch_aus(generator, [eingabe], vorabruf=False, archiv=ausgabe / "batch.tar.gz")
+
+    assert list(ausgabe.iterdir()) == []
@@ -0,0 +1,132 @@
+"""
+Tests für die asynchrone API: Theme-Prüfung, Abbruch, Semaphoren und Render-Prozesse.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from generator.async_api import AsyncReiseplanGenerator
+from generator.core import ReiseplanGenerator
+
+
+def schreibe_plan(pfad, **felder):
+    daten = {"titel": "Async", "startdatum": "2025-05-15", "enddatum": "2025-05-16", "reiseziel": "Berlin",
+             "reisende": ["Anna Beispiel"], **felder}
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+class Gleichzeitig:
+    """Zählt, wie viele Aufrufe höchstens gleichzeitig laufen."""
+
+    def __init__(self, dauer=0.1):
+        self.dauer = dauer
+        self.laufend = 0
+        self.maximum = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, ergebnis):
+        with self._lock:
+            self.laufend += 1
+            self.maximum = max(self.maximum, self.laufend)
+        time.sleep(self.dauer)
+        with self._lock:
+            self.laufend -= 1
+        return ergebnis
+
+
+@pytest.fixture
+def generator():
+    return ReiseplanGenerator(linearisiert=False)
+
+
+def test_unbekanntes_theme_liefert_none(generator, tmp_path):
+    plan = schreibe_plan(tmp_path / "plan.json", theme="gibtsnicht")
+
+    async def generiere():
+        async with AsyncReiseplanGenerator(generator) as async_generator:
+            return await async_generator.generiere_reiseplan(plan)
+
+    assert generator.generiere_reiseplan(plan) is None
+    assert asyncio.run(generiere()) is None
+
+
+def test_abbruch_stoppt_laufende_erstellung(generator):
+    gestartet = threading.Event()
+    abgebrochen = threading.Event()
+
+    def rendere_reiseplan(reiseplan_daten, abbruch=None):
+        gestartet.set()
+        if abbruch.wait(5):
+            abgebrochen.set()
+        return None
+
+    generator.rendere_reiseplan = rendere_reiseplan
+
+    async def abbrechen():
+        async with AsyncReiseplanGenerator(generator) as async_generator:
+            aufgabe = asyncio.create_task(async_generator.rendere_reiseplan({}))
+            while not gestartet.is_set():
+                await asyncio.sleep(0.01)
+            aufgabe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await aufgabe
+
+    asyncio.run(abbrechen())
+    assert abgebrochen.wait(5)
+
+
+def test_render_semaphore_begrenzt_erstellungen(generator):
+    zaehler = Gleichzeitig()
+    generator.rendere_reiseplan = lambda reiseplan_daten, abbruch=None: zaehler(reiseplan_daten["titel"])
+
+    async def erstelle_alle():
+        async with AsyncReiseplanGenerator(generator, max_renders=2) as async_generator:
+            return await asyncio.gather(*(async_generator.rendere_reiseplan({"titel": str(nummer)})
+                                          for nummer in range(6)))
+
+    assert asyncio.run(erstelle_alle()) == [str(nummer) for nummer in range(6)]
+    assert zaehler.maximum == 2
+
+
+def test_flug_semaphore_begrenzt_abfragen(generator, tmp_path):
+    zaehler = Gleichzeitig()
+    generator._hole_flugdaten = lambda flug_nr, flug_datum: zaehler({
+        "airline": "SWISS", "flugNr": flug_nr, "abflugOrt": "Zürich", "abflugCode": "ZRH",
+        "abflugZeit": f"{flug_datum}T07:00:00", "ankunftOrt": "Berlin", "ankunftCode": "BER",
+        "ankunftZeit": f"{flug_datum}T08:30:00", "buchungsNr": ""
+    })
+    plan = schreibe_plan(tmp_path / "plan.json",
+                         fluege=[{"flugNr": f"LX{nummer}", "flugDatum": "2025-05-15"} for nummer in range(5)])
+
+    async def lade():
+        async with AsyncReiseplanGenerator(generator, max_flugabfragen=2) as async_generator:
+            return await async_generator.lade_reiseplan(plan)
+
+    daten = asyncio.run(lade())
+    assert [flug["abflugCode"] for flug in daten["fluege"]] == ["ZRH"] * 5
+    assert zaehler.maximum == 2
+
+
+def test_render_prozess_verwendet_einstellungen_des_generators(monkeypatch):
+    # Wird per fork an die Render-Prozesse vererbt
+    monkeypatch.setattr(ReiseplanGenerator, "rendere_reiseplan",
+                        lambda self, reiseplan_daten, abbruch=None:
+                        f"{self.profil}/{self.theme}/{self.parallel_prozesse}")
+    generator = ReiseplanGenerator(profil="kompakt", linearisiert=False, parallel_prozesse=3)
+
+    async def rendere():
+        executor = ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("fork"))
+        try:
+            async with AsyncReiseplanGenerator(generator, executor) as async_generator:
+                return await async_generator.rendere_reiseplan({})
+        finally:
+            executor.shutdown()
+
+    assert asyncio.run(rendere()) == "kompakt/standard/3"
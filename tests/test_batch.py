@@ -0,0 +1,115 @@
+"""
+Tests für die stabile Aufteilung eines Batches auf Shards und den Vorabruf der Flüge.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from collections import Counter
+
+import pytest
+
+from generator import core
+from generator.apis.flight_api import FlightAPIException
+from generator.batch import (filtere_shard, parse_shard, rufe_fluege_vorab_ab, sammle_minimale_fluege,
+                             sammle_reiseplaene, shard_von)
+from generator.core import ReiseplanGenerator
+
+
+def test_shard_von_ist_stabil():
+    # Feste Werte: dieselbe Kennung muss auf jeder Maschine und in jedem Prozess im selben Shard landen
+    assert [shard_von("kunde-a/reise.json", anzahl) for anzahl in (1, 2, 4, 7)] == [0, 1, 3, 3]
+    assert [shard_von("plan.json", anzahl) for anzahl in (1, 2, 4, 7)] == [0, 0, 0, 6]
+
+
+def test_shard_von_unabhaengig_von_hash_seed():
+    befehl = "from generator.batch import shard_von; print(shard_von('2025/mai/berlin.json', 7))"
+    for seed in ("1", "2"):
+        ausgabe = subprocess.run([sys.executable, "-c", befehl], capture_output=True, text=True, check=True,
+                                 env={**os.environ, "PYTHONHASHSEED": seed})
+        assert ausgabe.stdout.strip() == "3"
+
+
+def test_shards_teilen_eingaben_vollstaendig_auf(tmp_path):
+    for nummer in range(40):
+        unterordner = tmp_path / f"kunde-{nummer % 3}"
+        unterordner.mkdir(exist_ok=True)
+        (unterordner / f"reise-{nummer}.json").write_text("{}", encoding="utf-8")
+    reiseplaene = sammle_reiseplaene([tmp_path])
+
+    shards = [filtere_shard(reiseplaene, index, 4) for index in range(4)]
+
+    assert sorted(sum(shards, [])) == sorted(reiseplaene)
+    assert all(shards)
+
+
+@pytest.mark.parametrize("angabe", ["4/4", "-1/4", "1", "a/b", "0/0"])
+def test_ungueltige_shard_angabe(angabe):
+    with pytest.raises(ValueError):
+        parse_shard(angabe)
+
+
+def schreibe_plan(pfad, fluege):
+    daten = {
+        "titel": pfad.stem, "startdatum": "2025-05-15", "enddatum": "2025-05-16",
+        "reiseziel": "London", "reisende": ["Anna Beispiel"], "fluege": fluege
+    }
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+@pytest.fixture
+def flug_api(monkeypatch):
+    """
+    Ersetzt die Flight-API und zählt die Abrufe pro Flug; LX404 ist nicht verfügbar.
+    """
+    abrufe = Counter()
+
+    def hole_fluginformationen(flug_nr, flug_datum):
+        abrufe[(flug_nr, flug_datum)] += 1
+        if flug_nr == "LX404":
+            raise FlightAPIException("nicht gefunden")
+        return {"flugNr": flug_nr, "flugDatum": flug_datum, "airline": "Testair",
+                "abflug": "FRA", "ankunft": "LHR"}
+
+    monkeypatch.setattr(core, "hole_fluginformationen", hole_fluginformationen)
+    return abrufe
+
+
+@pytest.fixture
+def generator():
+    generator = ReiseplanGenerator(linearisiert=False)
+    # Nur die Flight-API als Quelle, ohne Flugplan und Flugdaten-Speicher
+    generator.flugplan = None
+    generator.flug_speicher = None
+    return generator
+
+
+def test_vorabruf_ruft_jeden_flug_einmal_ab(tmp_path, generator, flug_api):
+    lh = {"flugNr": "LH900", "flugDatum": "2025-05-15"}
+    ba = {"flugNr": "BA901", "flugDatum": "2025-05-16", "buchungsNr": "ABC123"}
+    fehlt = {"flugNr": "LX404", "flugDatum": "2025-05-16"}
+    vollstaendig = {**lh, "airline": "Lufthansa", "abflug": "FRA", "ankunft": "LHR"}
+    dateien = [
+        schreibe_plan(tmp_path / "a.json", [lh, ba]),
+        schreibe_plan(tmp_path / "b.json", [dict(lh), fehlt]),
+        schreibe_plan(tmp_path / "c.json", [dict(ba), vollstaendig, fehlt]),
+    ]
+    (tmp_path / "kaputt.json").write_text("{", encoding="utf-8")
+    dateien.append(tmp_path / "kaputt.json")
+
+    assert sammle_minimale_fluege(generator, dateien) == {
+        ("LH900", "2025-05-15"), ("BA901", "2025-05-16"), ("LX404", "2025-05-16")
+    }
+    assert rufe_fluege_vorab_ab(generator, dateien, max_parallel=3) == {"abgerufen": 2, "fehlgeschlagen": 1}
+    assert flug_api == {("LH900", "2025-05-15"): 1, ("BA901", "2025-05-16"): 1, ("LX404", "2025-05-16"): 1}
+
+    # Die Reisepläne werden aus dem Vorabruf ergänzt, ohne die API erneut zu fragen
+    plaene = [generator.lade_reiseplan(datei) for datei in dateien[:3]]
+    assert rufe_fluege_vorab_ab(generator, dateien) == {"abgerufen": 0, "fehlgeschlagen": 0}
+    assert sum(flug_api.values()) == 3
+    assert plaene[0]["fluege"][1]["airline"] == "Testair"
+    assert plaene[2]["fluege"][0]["buchungsNr"] == "ABC123"
+    # Der fehlgeschlagene Flug behält seine minimalen Daten
+    assert plaene[1]["fluege"][1] == fehlt
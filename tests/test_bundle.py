@@ -0,0 +1,89 @@
+"""
+Tests für das Zusammenfügen von Teil-PDFs und das Sammeldokument.
+"""
+
+import io
+import json
+
+import pytest
+from reportlab.pdfgen import canvas
+
+from generator.bundle import SammeldokumentFehler, erstelle_sammeldokument
+from generator.core import ReiseplanGenerator
+from generator.utils.pdf_utils import PdfSammler
+
+# Optional, nur zum Prüfen der zusammengefügten PDFs
+pikepdf = pytest.importorskip("pikepdf")
+
+
+def teil_pdf(seiten, text):
+    """
+    Erstellt ein PDF mit der angegebenen Seitenzahl und einem Text pro Seite.
+    """
+    puffer = io.BytesIO()
+    leinwand = canvas.Canvas(puffer)
+    for seite in range(seiten):
+        leinwand.drawString(72, 720, f"{text} {seite + 1}")
+        leinwand.showPage()
+    leinwand.save()
+    return puffer.getvalue()
+
+
+def lesezeichen(pdf):
+    """
+    Liefert die Lesezeichen als (Titel, Seitenindex).
+    """
+    seiten = [seite.objgen for seite in pdf.pages]
+    with pdf.open_outline() as outline:
+        return [(eintrag.title, seiten.index(eintrag.destination[0].objgen)) for eintrag in outline.root]
+
+
+def schreibe_plan(pfad, titel, **felder):
+    daten = {"titel": titel, "startdatum": "2025-05-15", "enddatum": "2025-05-16", "reiseziel": "Berlin",
+             "reisende": ["Anna Beispiel"], **felder}
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+def test_sammler_fuegt_teile_mit_lesezeichen_zusammen():
+    ziel = io.BytesIO()
+    sammler = PdfSammler(ziel)
+    assert sammler.fuege_hinzu(teil_pdf(1, "A"), "Teil A") == 1
+    assert sammler.fuege_hinzu(teil_pdf(2, "B"), "Teil B – Übersicht") == 2
+    assert sammler.fuege_hinzu(teil_pdf(3, "C")) == 3
+    assert sammler.schliesse() == 6
+
+    with pikepdf.open(io.BytesIO(ziel.getvalue())) as pdf:
+        assert len(pdf.pages) == 6
+        assert lesezeichen(pdf) == [("Teil A", 0), ("Teil B – Übersicht", 1)]
+        inhalte = [seite.Contents.read_bytes() for seite in pdf.pages]
+        assert [b"(C 1)" in inhalt for inhalt in inhalte] == [False, False, False, True, False, False]
+        assert pdf.check_pdf_syntax() == []
+
+
+def test_sammeldokument_mit_inhaltsverzeichnis(tmp_path):
+    schreibe_plan(tmp_path / "a.json", "Reise A")
+    schreibe_plan(tmp_path / "b.json", "Reise B",
+                  aktivitaeten=[{"name": f"Termin {nummer}", "datum": "2025-05-15", "startzeit": "09:00",
+                                 "endzeit": "10:00"} for nummer in range(40)])
+    (tmp_path / "c.json").write_text("{kein json", encoding="utf-8")
+    ziel = tmp_path / "ausgabe" / "sammlung.pdf"
+
+    ergebnis = erstelle_sammeldokument(ReiseplanGenerator(linearisiert=False), [tmp_path], ziel, vorabruf=False)
+
+    assert [eintrag["status"] for eintrag in ergebnis["eintraege"]] == ["ok", "ok", "fehler"]
+    a, b, _ = ergebnis["eintraege"]
+    assert a["seite"] == 2 and b["seite"] == a["seite"] + a["seiten"]
+    with pikepdf.open(ziel) as pdf:
+        assert len(pdf.pages) == ergebnis["seiten"] == 1 + a["seiten"] + b["seiten"]
+        assert lesezeichen(pdf) == [("Inhaltsverzeichnis", 0), ("Reise A", 1), ("Reise B", b["seite"] - 1)]
+    assert sorted(pfad.name for pfad in ziel.parent.iterdir()) == ["sammlung.pdf"]
+
+
+def test_sammeldokument_ohne_erstellte_reiseplaene(tmp_path):
+    (tmp_path / "kaputt.json").write_text("{kein json", encoding="utf-8")
+    ziel = tmp_path / "sammlung.pdf"
+
+    with pytest.raises(SammeldokumentFehler):
+        erstelle_sammeldokument(ReiseplanGenerator(linearisiert=False), [tmp_path], ziel, vorabruf=False)
+    assert not ziel.exists()
@@ -0,0 +1,29 @@
+"""
+Tests für die zeitzonenbewusste Datumsformatierung.
+"""
+
+from generator.utils.date_utils import (
+    flug_zeitzonen, formatiere_datum, formatiere_datum_zeit, formatiere_zeit, parse_zeitpunkt
+)
+
+
+def test_utc_zeitpunkt_in_ortszeit_des_flughafens():
+    assert formatiere_datum_zeit("2025-04-10T14:55:00+00:00", "Europe/Zurich") == "10.04.2025, 16:55"
+    assert formatiere_zeit("2025-01-10T14:55:00+00:00", "America/New_York") == "09:55"
+
+
+def test_zeitpunkt_ohne_angabe_bleibt_ortszeit():
+    assert formatiere_datum_zeit("2025-04-10T14:55:00", "Asia/Tokyo") == "10.04.2025, 14:55"
+    assert parse_zeitpunkt("2025-04-10T14:55:00", "Asia/Tokyo").tzinfo is None
+
+
+def test_unbekannte_zeitzone_und_ungueltige_eingabe():
+    assert formatiere_zeit("2025-04-10T14:55:00+00:00", "Mars/Olympus") == "14:55"
+    assert formatiere_datum("kein Datum") == "kein Datum"
+    assert parse_zeitpunkt("kein Datum") is None
+
+
+def test_flug_zeitzonen_angabe_vor_iata_code():
+    assert flug_zeitzonen({"abflugCode": "ZRH", "ankunftCode": "JFK"}) == ("Europe/Zurich", "America/New_York")
+    assert flug_zeitzonen({"abflugCode": "ZRH", "abflugZeitzone": "Europe/Berlin", "ankunftCode": "XXX"}) == \
+        ("Europe/Berlin", None)
@@ -0,0 +1,81 @@
+"""
+Tests für die Zwischendarstellung, ihre HTML- und Kalender-Ausgabe und den Dokument-Cache.
+"""
+
+import json
+import os
+
+from generator import document
+from generator.document import DokumentCache, erstelle_dokument
+from generator.html_export import erstelle_html
+from generator.ics_export import erstelle_ics
+
+DATEN = {
+    "titel": "Reise <Berlin> & zurück",
+    "startdatum": "2025-05-15",
+    "enddatum": "2025-05-16",
+    "reiseziel": "Berlin",
+    "reisende": ["Anna <Admin>"],
+    "hotels": [{"name": "Hotel Adlon", "adresse": "Unter den Linden 77, Berlin",
+                "checkin": "2025-05-15T15:00:00", "checkout": "2025-05-16T11:00:00"}],
+    "aktivitaeten": [{"name": "Führung; Reichstag, Kuppel und Plenarsaal mit Blick über das Regierungsviertel",
+                      "datum": "2025-05-15", "startzeit": "18:00", "endzeit": "19:30",
+                      "ort": "Platz der Republik 1"}],
+    "zusatzinfo": {"notizen": "<script>alert(1)</script>"},
+}
+
+
+def test_html_maskiert_alle_angaben():
+    seite = erstelle_html(erstelle_dokument(DATEN))
+
+    assert "<title>Reise &lt;Berlin&gt; &amp; zurück</title>" in seite
+    assert "Anna &lt;Admin&gt;" in seite
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in seite
+    assert "<script>" not in seite
+
+
+def test_ics_maskiert_und_faltet_zeilen():
+    kalender = erstelle_ics(erstelle_dokument(DATEN))
+    zeilen = kalender.split("\r\n")
+
+    assert kalender.endswith("END:VCALENDAR\r\n")
+    assert all(len(zeile.encode("utf-8")) <= 75 for zeile in zeilen)
+    # Entfaltet: Folgezeilen beginnen mit einem Leerzeichen
+    entfaltet = kalender.replace("\r\n ", "")
+    assert "X-WR-CALNAME:Reise <Berlin> & zurück\r\n" in entfaltet
+    assert ("SUMMARY:Führung\\; Reichstag\\, Kuppel und Plenarsaal mit Blick über das "
+            "Regierungsviertel\r\n") in entfaltet
+    assert "LOCATION:Unter den Linden 77\\, Berlin\r\n" in entfaltet
+    assert "DESCRIPTION:Name: Hotel Adlon\\nAdresse:" in entfaltet
+    assert "DTSTART:20250515T180000\r\n" in entfaltet
+
+
+def test_cache_liefert_abgelegtes_dokument_mit_neuem_zeitstempel(tmp_path, monkeypatch):
+    cache = DokumentCache(tmp_path)
+    monkeypatch.setattr(document, "zeitstempel", lambda: "20250101T000000Z")
+    erstes = cache.dokument(DATEN, {"titel": "#003366"})
+
+    def erstelle_dokument(*args):
+        raise AssertionError("Dokument nicht aus dem Cache geladen")
+
+    monkeypatch.setattr(document, "erstelle_dokument", erstelle_dokument)
+    monkeypatch.setattr(document, "zeitstempel", lambda: "20250601T120000Z")
+    zweites = cache.dokument(DATEN, {"titel": "#003366"})
+
+    assert erstes["erstellt"] == "20250101T000000Z"
+    assert zweites["erstellt"] == "20250601T120000Z"
+    assert {**zweites, "erstellt": erstes["erstellt"]} == erstes
+    assert "DTSTAMP:20250601T120000Z" in erstelle_ics(zweites)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_cache_entfernt_am_laengsten_nicht_verwendete(tmp_path):
+    cache = DokumentCache(tmp_path, max_dokumente=2)
+    for nummer in range(3):
+        cache.dokument({**DATEN, "titel": f"Reise {nummer}"})
+        # Unterschiedliche Zeitpunkte der letzten Verwendung
+        for pfad in tmp_path.glob("*.json"):
+            os.utime(pfad, (pfad.stat().st_mtime - 10,) * 2)
+
+    titel = sorted(json.loads(pfad.read_text(encoding="utf-8"))["titel"] for pfad in tmp_path.glob("*.json"))
+    assert titel == ["Reise 1", "Reise 2"]
@@ -0,0 +1,60 @@
+"""
+Tests für gemeinsame Abrufe gleichzeitiger Anfragen zum selben Flug.
+"""
+
+import threading
+import time
+
+from generator.apis import flight_api
+from generator.apis.flight_api import FlightAPIException, hole_fluginformationen
+
+
+def _gleichzeitig(monkeypatch, abfrage):
+    """
+    Startet einen führenden und einen wartenden Abruf und liefert ihre Ergebnisse bzw. Fehler.
+    """
+    los = threading.Event()
+
+    def frage_api_ab(flug_nr, flug_datum):
+        los.wait(5)
+        return abfrage()
+
+    monkeypatch.setattr(flight_api, "_frage_api_ab", frage_api_ab)
+    ergebnisse = {}
+
+    def abrufen(rolle):
+        try:
+            ergebnisse[rolle] = hole_fluginformationen("LX1234", "2025-05-15")
+        except Exception as e:
+            ergebnisse[rolle] = e
+
+    fuehrend = threading.Thread(target=abrufen, args=("fuehrend",))
+    fuehrend.start()
+    while ("LX1234", "2025-05-15") not in flight_api._laufende_abrufe:
+        time.sleep(0.01)
+    wartend = threading.Thread(target=abrufen, args=("wartend",))
+    wartend.start()
+    time.sleep(0.1)
+    los.set()
+    fuehrend.join(5)
+    wartend.join(5)
+    return ergebnisse
+
+
+def test_wartende_erhalten_eigene_kopie(monkeypatch):
+    ergebnisse = _gleichzeitig(monkeypatch, lambda: {"flugNr": "LX1234"})
+
+    assert ergebnisse["fuehrend"] == ergebnisse["wartend"] == {"flugNr": "LX1234"}
+    assert ergebnisse["fuehrend"] is not ergebnisse["wartend"]
+
+
+def test_unerwarteter_fehler_des_fuehrenden_abrufs(monkeypatch):
+    def abfrage():
+        raise KeyError("departure")
+
+    ergebnisse = _gleichzeitig(monkeypatch, abfrage)
+
+    assert isinstance(ergebnisse["fuehrend"], KeyError)
+    assert isinstance(ergebnisse["wartend"], FlightAPIException)
+    assert not flight_api._laufende_abrufe
+
@@ -0,0 +1,102 @@
+"""
+Tests für gespeicherte Flugdaten, ihre Revalidierung und die Neuerstellung betroffener Reisepläne.
+"""
+
+import datetime
+import multiprocessing
+import time
+from pathlib import Path
+
+import pytest
+
+from generator import job_queue
+from generator.apis import flugdaten_speicher
+from generator.apis.flight_api import FlightAPIException
+from generator.apis.flugdaten_speicher import FlugdatenAktualisierer, FlugdatenSpeicher
+from generator.config import FLUGDATEN_DB
+from generator.job_queue import JobWarteschlange, reihe_betroffene_ein
+
+MORGEN = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+
+
+def flug(abflug="07:00", ankunft="08:05", **felder):
+    return {"flugNr": "LX1070", "airline": "SWISS", "abflugCode": "ZRH", "ankunftCode": "FRA",
+            "abflugZeit": f"{MORGEN}T{abflug}:00", "ankunftZeit": f"{MORGEN}T{ankunft}:00", **felder}
+
+
+@pytest.fixture
+def speicher(tmp_path):
+    speicher = FlugdatenSpeicher(tmp_path / "flugdaten.sqlite")
+    speicher.speichere("LX1070", MORGEN, flug())
+    speicher.merke_verwendung("/reisen/a.json", "LX1070", MORGEN)
+    speicher.merke_verwendung("/reisen/b.json", "LX1070", MORGEN)
+    return speicher
+
+
+def test_geaenderte_zeiten_markieren_betroffene_reiseplaene(speicher):
+    assert speicher.aktualisiere("LX1070", MORGEN, flug(abflug="07:30")) == ["/reisen/a.json", "/reisen/b.json"]
+
+    betroffen = speicher.betroffene_reiseplaene()
+    assert [eintrag["reiseplan"] for eintrag in betroffen] == ["/reisen/a.json", "/reisen/b.json"]
+    assert betroffen[0]["alt"]["abflugZeit"] == f"{MORGEN}T07:00:00"
+    assert betroffen[0]["neu"]["abflugZeit"] == f"{MORGEN}T07:30:00"
+    assert speicher.lade("LX1070", MORGEN)["abflugZeit"] == f"{MORGEN}T07:30:00"
+
+    speicher.quittiere("/reisen/a.json")
+    assert [eintrag["reiseplan"] for eintrag in speicher.betroffene_reiseplaene()] == ["/reisen/b.json"]
+
+
+def test_andere_felder_betreffen_keine_reiseplaene(speicher):
+    assert speicher.aktualisiere("LX1070", MORGEN, flug(airline="Lufthansa")) == []
+    assert speicher.aktualisiere("LX1070", MORGEN, flug(ankunft="08:20")) == ["/reisen/a.json", "/reisen/b.json"]
+
+
+def test_revalidierung_behaelt_daten_bei_fehlern(speicher):
+    def quelle(flug_nr, flug_datum):
+        raise FlightAPIException("nicht erreichbar")
+
+    assert FlugdatenAktualisierer(speicher, intervall=0, quelle=quelle).revalidiere() == []
+    assert speicher.lade("LX1070", MORGEN) == flug()
+
+    aenderungen = FlugdatenAktualisierer(speicher, intervall=0,
+                                         quelle=lambda flug_nr, flug_datum: flug(abflug="06:45")).revalidiere()
+    assert aenderungen == [{"flug_nr": "LX1070", "flug_datum": MORGEN,
+                            "reiseplaene": ["/reisen/a.json", "/reisen/b.json"]}]
+
+
+def test_betroffene_werden_eingereiht_und_quittiert(speicher, tmp_path):
+    speicher.aktualisiere("LX1070", MORGEN, flug(abflug="07:30"))
+    warteschlange = JobWarteschlange(tmp_path / "jobs.sqlite")
+    try:
+        job_ids = reihe_betroffene_ein(speicher, warteschlange)
+
+        assert [warteschlange.status(job_id)["reiseplan_pfad"] for job_id in job_ids] == [
+            str(Path("/reisen/a.json").resolve()), str(Path("/reisen/b.json").resolve())
+        ]
+        assert speicher.betroffene_reiseplaene() == []
+    finally:
+        warteschlange.schliessen()
+
+
+def test_revalidierungs_prozess_des_worker_pools(tmp_path, monkeypatch):
+    speicher = FlugdatenSpeicher(FLUGDATEN_DB)
+    speicher.speichere("LX1070", MORGEN, flug())
+    speicher.merke_verwendung(str(tmp_path / "plan.json"), "LX1070", MORGEN)
+    # Wird per fork an den Revalidierungs-Prozess vererbt
+    monkeypatch.setattr(flugdaten_speicher, "hole_fluginformationen",
+                        lambda flug_nr, flug_datum: flug(abflug="09:00"))
+
+    db_pfad = tmp_path / "jobs.sqlite"
+    prozess = multiprocessing.get_context("fork").Process(target=job_queue._revalidierung, args=(db_pfad, 0.05))
+    prozess.start()
+    warteschlange = JobWarteschlange(db_pfad)
+    try:
+        ende = time.monotonic() + 10
+        while (warteschlange.ist_leer() or speicher.betroffene_reiseplaene()) and time.monotonic() < ende:
+            time.sleep(0.05)
+        assert not warteschlange.ist_leer()
+        assert speicher.betroffene_reiseplaene() == []
+    finally:
+        prozess.terminate()
+        prozess.join()
+        warteschlange.schliessen()
@@ -0,0 +1,88 @@
+"""
+Tests für Import und Suche im lokalen Flugplan-Index.
+"""
+
+import json
+
+import pytest
+
+from generator.apis.flugplan import FlugplanFehler, FlugplanIndex
+
+EINTRAG = {
+    "flugNr": "LX 1070", "wochentage": "135", "gueltigVon": "2025-03-30", "gueltigBis": "2025-10-25",
+    "airline": "SWISS", "abflugOrt": "Zürich", "abflugCode": "ZRH", "abflugZeit": "07:00",
+    "ankunftOrt": "Frankfurt", "ankunftCode": "FRA", "ankunftZeit": "08:05"
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return FlugplanIndex(tmp_path / "flugplan.sqlite")
+
+
+def schreibe_json(pfad, daten):
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+def test_csv_import_und_suche_nach_wochentag(index, tmp_path):
+    csv_datei = tmp_path / "flugplan.csv"
+    csv_datei.write_text(",".join(EINTRAG) + "\n" + ",".join(EINTRAG.values()) + "\n", encoding="utf-8")
+
+    assert index.importiere(csv_datei) == 3
+    assert index.anzahl() == 3
+
+    # 2025-05-14 ist ein Mittwoch (3), 2025-05-15 ein Donnerstag (4)
+    flug = index.suche("lx1070", "2025-05-14")
+    assert flug == {
+        "flugNr": "lx1070", "airline": "SWISS", "abflugOrt": "Zürich", "abflugCode": "ZRH",
+        "abflugZeit": "2025-05-14T07:00:00", "ankunftOrt": "Frankfurt", "ankunftCode": "FRA",
+        "ankunftZeit": "2025-05-14T08:05:00", "buchungsNr": ""
+    }
+    assert index.suche("LX1070", "2025-05-15") is None
+
+
+def test_json_import_mit_gueltigkeit_und_versatz(index, tmp_path):
+    winter = {**EINTRAG, "flugNr": "LX16", "wochentage": "1234567", "gueltigVon": "2024-10-27",
+              "gueltigBis": "2025-03-29", "abflugZeit": "22:30", "ankunftZeit": "06:10", "ankunftTagVersatz": 1}
+    sommer = {**winter, "gueltigVon": "2025-03-30", "gueltigBis": "2025-10-25", "abflugZeit": "21:45"}
+
+    assert index.importiere(schreibe_json(tmp_path / "flugplan.json", [winter, sommer])) == 14
+
+    assert index.suche("LX16", "2025-03-29")["abflugZeit"] == "2025-03-29T22:30:00"
+    flug = index.suche("LX16", "2025-03-30")
+    assert flug["abflugZeit"] == "2025-03-30T21:45:00"
+    assert flug["ankunftZeit"] == "2025-03-31T06:10:00"
+    assert index.suche("LX16", "2025-10-26") is None
+    assert index.suche("LX16", "kein Datum") is None
+
+
+def test_erneuter_import_ersetzt_eintraege(index, tmp_path):
+    index.importiere(schreibe_json(tmp_path / "a.json", [EINTRAG]))
+    index.importiere(schreibe_json(tmp_path / "b.json", [{**EINTRAG, "abflugZeit": "07:15"}]))
+
+    assert index.anzahl() == 3
+    assert index.suche("LX1070", "2025-05-12")["abflugZeit"] == "2025-05-12T07:15:00"
+
+
+@pytest.mark.parametrize("daten, meldung", [
+    ({"a": 1}, "Liste"),
+    (["LX1070"], "Objekt"),
+    ([{**EINTRAG, "abflugCode": ""}], "abflugCode"),
+    ([{**EINTRAG, "wochentage": "08"}], "Wochentage"),
+    ([{**EINTRAG, "abflugZeit": "7 Uhr"}], "Ungültiger Wert"),
+    ([{**EINTRAG, "gueltigVon": 20250330}], "Ungültiger Wert"),
+    ([{**EINTRAG, "gueltigVon": "2025-10-26"}], "gueltigVon"),
+])
+def test_ungueltige_flugplaene(index, tmp_path, daten, meldung):
+    with pytest.raises(FlugplanFehler, match=meldung):
+        index.importiere(schreibe_json(tmp_path / "flugplan.json", daten))
+    assert index.anzahl() == 0
+
+
+def test_ungueltiges_json(index, tmp_path):
+    datei = tmp_path / "flugplan.json"
+    datei.write_text("[{", encoding="utf-8")
+
+    with pytest.raises(FlugplanFehler):
+        index.importiere(datei)
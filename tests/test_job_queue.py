@@ -0,0 +1,195 @@
+"""
+Tests für Lease, Backoff und Dead-Letter-Behandlung der Job-Warteschlange.
+"""
+
+import json
+import time
+
+import pytest
+
+from generator import job_queue
+from generator.job_queue import (
+    JobWarteschlange, LeaseVerlaengerung, QueueArbeit, STATUS_ERLEDIGT, STATUS_IN_ARBEIT, STATUS_TOT,
+    STATUS_WARTEND, bearbeite_job
+)
+
+
+class Uhr:
+    """Einstellbare Uhr statt time.time()."""
+
+    def __init__(self):
+        self.jetzt = 1_000_000.0
+
+    def __call__(self):
+        return self.jetzt
+
+
+@pytest.fixture
+def uhr(monkeypatch):
+    uhr = Uhr()
+    monkeypatch.setattr(job_queue.time, "time", uhr)
+    return uhr
+
+
+@pytest.fixture
+def warteschlange(tmp_path, uhr):
+    warteschlange = JobWarteschlange(tmp_path / "jobs.sqlite", lease_sekunden=60, max_versuche=3,
+                                     backoff_sekunden=10)
+    yield warteschlange
+    warteschlange.schliessen()
+
+
+def test_lease_haelt_job_exklusiv(warteschlange, uhr, tmp_path):
+    job_id = warteschlange.einreihen(tmp_path / "plan.json")
+
+    job = warteschlange.beanspruche("a")
+    assert job["id"] == job_id
+    assert job["status"] == STATUS_IN_ARBEIT
+    assert warteschlange.beanspruche("b") is None
+
+    # Nach Ablauf des Leases wird der Job neu vergeben, der alte Worker kann nicht mehr abschliessen
+    uhr.jetzt += 61
+    neu = warteschlange.beanspruche("b")
+    assert neu["id"] == job_id and neu["worker"] == "b" and neu["versuche"] == 2
+    assert not warteschlange.abschliessen(job_id, "a", "alt.pdf")
+    assert warteschlange.abschliessen(job_id, "b", "neu.pdf")
+    assert warteschlange.ergebnis(job_id) == "neu.pdf"
+
+
+def test_backoff_verdoppelt_wartezeit(warteschlange, uhr, tmp_path):
+    job_id = warteschlange.einreihen(tmp_path / "plan.json")
+
+    for wartezeit in (10, 20):
+        warteschlange.beanspruche("a")
+        assert warteschlange.fehlgeschlagen(job_id, "a", "Flight-API nicht erreichbar")
+        job = warteschlange.status(job_id)
+        assert job["status"] == STATUS_WARTEND
+        assert job["verfuegbar_ab"] == uhr.jetzt + wartezeit
+
+        uhr.jetzt += wartezeit - 1
+        assert warteschlange.beanspruche("a") is None
+        uhr.jetzt += 1
+
+
+def test_tot_nach_maximalen_versuchen(warteschlange, uhr, tmp_path):
+    job_id = warteschlange.einreihen(tmp_path / "plan.json")
+
+    for _ in range(3):
+        uhr.jetzt += 3600
+        assert warteschlange.beanspruche("a")["id"] == job_id
+        warteschlange.fehlgeschlagen(job_id, "a", "Fehler")
+
+    assert warteschlange.status(job_id)["status"] == STATUS_TOT
+    assert [job["id"] for job in warteschlange.tote_jobs()] == [job_id]
+    assert warteschlange.ist_leer()
+
+
+def test_abgelaufener_lease_beim_letzten_versuch_ist_tot(warteschlange, uhr, tmp_path):
+    job_id = warteschlange.einreihen(tmp_path / "plan.json")
+    for _ in range(3):
+        uhr.jetzt += 3600
+        warteschlange.beanspruche("a")
+    # Dritter Versuch, Worker abgestürzt
+    uhr.jetzt += 61
+
+    assert warteschlange.beanspruche("b") is None
+    assert warteschlange.status(job_id)["status"] == STATUS_TOT
+
+
+def test_ungueltiger_reiseplan_sofort_tot(warteschlange, tmp_path):
+    from generator.core import ReiseplanGenerator
+
+    plan = tmp_path / "ungueltig.json"
+    plan.write_text(json.dumps({"titel": "Ohne Pflichtfelder"}), encoding="utf-8")
+    job_id = warteschlange.einreihen(plan)
+
+    bearbeite_job(warteschlange, ReiseplanGenerator(linearisiert=False), warteschlange.beanspruche("a"), "a")
+
+    job = warteschlange.status(job_id)
+    assert job["status"] == STATUS_TOT
+    assert job["versuche"] == 1
+    assert job["fehler"].startswith("Ungültige Eingabe")
+
+
+class Generator:
+    """Generator, der den Lease während der Erstellung verliert."""
+
+    def __init__(self, warteschlange, uhr):
+        self.warteschlange = warteschlange
+        self.uhr = uhr
+
+    def generiere_reiseplan(self, reiseplan_pfad, **kwargs):
+        self.uhr.jetzt += 61
+        self.warteschlange.beanspruche("b")
+        return "a.pdf"
+
+
+def test_verlorener_lease_wird_nicht_als_erledigt_gemeldet(warteschlange, uhr, tmp_path, caplog):
+    job_id = warteschlange.einreihen(tmp_path / "plan.json")
+
+    bearbeite_job(warteschlange, Generator(warteschlange, uhr), warteschlange.beanspruche("a"), "a")
+
+    job = warteschlange.status(job_id)
+    assert job["status"] == STATUS_IN_ARBEIT and job["worker"] == "b"
+    assert "Lease verloren" in caplog.text
+    assert "erledigt" not in caplog.text
+
+
+def test_verlaengerter_lease_wird_nicht_neu_vergeben(warteschlange, uhr, tmp_path):
+    job_id = warteschlange.einreihen(tmp_path / "plan.json")
+    warteschlange.beanspruche("a")
+
+    uhr.jetzt += 50
+    assert warteschlange.verlaengere(job_id, "a")
+    uhr.jetzt += 50
+    assert warteschlange.beanspruche("b") is None
+
+    uhr.jetzt += 11
+    assert warteschlange.beanspruche("b")["worker"] == "b"
+    assert not warteschlange.verlaengere(job_id, "a")
+
+
+def test_lease_verlaengerung_waehrend_der_bearbeitung(tmp_path):
+    # Echte Zeit: der Hintergrund-Thread verlängert über eine eigene Verbindung
+    warteschlange = JobWarteschlange(tmp_path / "jobs.sqlite", lease_sekunden=1)
+    andere = JobWarteschlange(tmp_path / "jobs.sqlite", lease_sekunden=1)
+    try:
+        job_id = warteschlange.einreihen(tmp_path / "plan.json")
+        warteschlange.beanspruche("a")
+
+        with LeaseVerlaengerung(warteschlange, job_id, "a", intervall=0.2):
+            time.sleep(1.5)
+            assert andere.beanspruche("b") is None
+
+        assert warteschlange.abschliessen(job_id, "a", "a.pdf")
+    finally:
+        warteschlange.schliessen()
+        andere.schliessen()
+
+
+class KurzerLease(JobWarteschlange):
+    """Warteschlange mit einer Sekunde Lease."""
+
+    def __init__(self, db_pfad, lease_sekunden=1, **kwargs):
+        super().__init__(db_pfad, lease_sekunden, **kwargs)
+
+
+def test_queue_arbeit_haelt_lease_bei_langer_erstellung(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_queue, "JobWarteschlange", KurzerLease)
+    db_pfad = tmp_path / "jobs.sqlite"
+    andere = KurzerLease(db_pfad)
+    job_id = andere.einreihen(tmp_path / "plan.json")
+    zweiter_worker = []
+
+    class LangsamerGenerator:
+        def generiere_reiseplan(self, reiseplan_pfad, **kwargs):
+            time.sleep(1.5)
+            zweiter_worker.append(andere.beanspruche("b"))
+            return "a.pdf"
+
+    try:
+        assert QueueArbeit(db_pfad)(LangsamerGenerator())
+        assert zweiter_worker == [None]
+        assert andere.status(job_id)["status"] == STATUS_ERLEDIGT
+    finally:
+        andere.schliessen()
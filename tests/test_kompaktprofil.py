@@ -0,0 +1,73 @@
+"""
+Tests für das Kompaktprofil und seinen Grössenbericht.
+"""
+
+import json
+import os
+import re
+
+import pytest
+from PIL import Image as PILImage
+
+from generator.config import KOMPAKT_BILD_DPI
+from generator.core import PROFIL_KOMPAKT, ReiseplanGenerator
+from generator.logo_cache import KOPF_LOGO_GROESSE
+from generator.themes import ThemeRegistry
+from generator.utils.bild_utils import pixelgroesse
+
+
+def schreibe_plan(pfad):
+    daten = {
+        "titel": "Kompakt", "startdatum": "2025-05-15", "enddatum": "2025-05-16",
+        "reiseziel": "Berlin", "reisende": ["Anna Beispiel"], "theme": "gross",
+        "aktivitaeten": [{"name": "Termin", "datum": "2025-05-15", "ort": "Büro",
+                          "startzeit": "2025-05-15T09:00:00", "endzeit": "2025-05-15T10:00:00"}]
+    }
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """
+    Theme mit einem grossen, kaum komprimierbaren Logo.
+    """
+    verzeichnis = tmp_path / "themes"
+    verzeichnis.mkdir()
+    PILImage.frombytes("RGB", (800, 800), os.urandom(800 * 800 * 3)).save(verzeichnis / "gross.png")
+    (verzeichnis / "gross.json").write_text(json.dumps({"logo": "gross.png"}), encoding="utf-8")
+    return ThemeRegistry(verzeichnis)
+
+
+def generator_fuer(profil, registry):
+    generator = ReiseplanGenerator(profil, linearisiert=False)
+    generator.themes = registry
+    return generator
+
+
+def test_groessenbericht_im_kompaktprofil(tmp_path, registry):
+    generator = generator_fuer(PROFIL_KOMPAKT, registry)
+    bericht = {}
+
+    pdf_daten = generator.generiere_pdf_daten(schreibe_plan(tmp_path / "plan.json"), bericht=bericht)
+
+    assert bericht["bytes"] == len(pdf_daten)
+    assert bericht["bytes_gespart"] == bericht["bytes_standard"] - bericht["bytes"]
+    assert bericht["bytes_gespart"] > 0
+    assert bericht["fonts_ohne_subset"] == []
+    # Das Logo ist auf seine Anzeigegrösse bei KOMPAKT_BILD_DPI verkleinert
+    breiten = [int(breite) for breite in re.findall(rb"/Width (\d+)", pdf_daten)]
+    assert breiten and max(breiten) <= pixelgroesse(*KOPF_LOGO_GROESSE, KOMPAKT_BILD_DPI)[0]
+
+
+def test_kein_groessenbericht_im_standardprofil(tmp_path, registry):
+    generator = generator_fuer("standard", registry)
+    bericht = {}
+
+    assert generator.generiere_pdf_daten(schreibe_plan(tmp_path / "plan.json"), bericht=bericht)
+    assert bericht == {}
+
+
+def test_unbekanntes_profil():
+    with pytest.raises(ValueError, match="Unbekanntes Ausgabeprofil"):
+        ReiseplanGenerator("winzig")
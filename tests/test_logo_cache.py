@@ -0,0 +1,81 @@
+"""
+Tests für die Logo-Derivate im Logo-Cache und SVG-Logos der Block-Vorlagen.
+"""
+
+import pytest
+from PIL import Image as PILImage
+from reportlab.graphics import renderPM
+from reportlab.graphics.shapes import Drawing
+from reportlab.platypus import Image
+
+from generator.block_templates import BlockVorlagen
+from generator.logo_cache import LOGO_GROESSE, LogoCache
+from generator.utils.bild_utils import pixelgroesse
+
+SVG = ('<svg xmlns="http://www.w3.org/2000/svg" width="200" height="100">'
+       '<rect width="200" height="100" fill="#003366"/></svg>')
+
+
+def schreibe_png(pfad, groesse=(1200, 600), farbe="navy"):
+    PILImage.new("RGB", groesse, farbe).save(pfad)
+    return pfad
+
+
+def test_derivate_nach_inhalt_und_groesse(tmp_path):
+    cache = LogoCache(tmp_path / "cache")
+    a = schreibe_png(tmp_path / "a.png")
+    kopie = schreibe_png(tmp_path / "kopie.png")
+
+    derivat = cache.bild(a, *LOGO_GROESSE, dpi=150)
+
+    assert derivat.parent == cache.verzeichnis
+    assert PILImage.open(derivat).size[0] <= pixelgroesse(*LOGO_GROESSE, 150)[0]
+    # Gleicher Inhalt unter anderem Pfad: dasselbe Derivat
+    assert cache.bild(kopie, *LOGO_GROESSE, dpi=150) == derivat
+    # Andere Auflösung: eigenes Derivat
+    assert cache.bild(a, *LOGO_GROESSE, dpi=72) != derivat
+    # Geänderter Inhalt: neues Derivat
+    schreibe_png(a, farbe="red")
+    assert cache.bild(a, *LOGO_GROESSE, dpi=150) != derivat
+
+
+def test_kleine_bilder_bleiben_original(tmp_path):
+    cache = LogoCache(tmp_path / "cache")
+    klein = schreibe_png(tmp_path / "klein.png", groesse=(20, 10))
+
+    assert cache.bild(klein, *LOGO_GROESSE, dpi=150) == klein
+    assert cache.bild(klein, *LOGO_GROESSE, dpi=150) == klein
+    assert [pfad.suffix for pfad in cache.verzeichnis.iterdir()] == [".original"]
+
+
+def test_svg_ohne_raster_backend_bleibt_vektorgrafik(tmp_path, monkeypatch):
+    def ohne_backend(*args, **kwargs):
+        raise RuntimeError("kein renderPM-Backend")
+
+    monkeypatch.setattr(renderPM, "drawToFile", ohne_backend)
+    svg = tmp_path / "logo.svg"
+    svg.write_text(SVG, encoding="utf-8")
+    # Jedes SVG gilt als langsam, kann aber nicht gerastert werden
+    cache = LogoCache(tmp_path / "cache", svg_raster_ms=-1)
+    vorlagen = BlockVorlagen(bild_dpi=150, logo_cache=cache)
+
+    logo = vorlagen.svg_logo(svg, *LOGO_GROESSE)
+
+    assert isinstance(logo, Drawing)
+    assert (logo.width, logo.height) == pytest.approx(LOGO_GROESSE)
+    assert [pfad.suffix for pfad in cache.verzeichnis.iterdir()] == [".vektor"]
+
+
+def test_gerastertes_svg_in_anzeigegroesse(tmp_path):
+    svg = tmp_path / "logo.svg"
+    svg.write_text(SVG, encoding="utf-8")
+    cache = LogoCache(tmp_path / "cache")
+    # Vorhandenes Raster im Cache, wie es svg_raster mit renderPM ablegt
+    breite_px, hoehe_px = pixelgroesse(*LOGO_GROESSE, 150)
+    cache.verzeichnis.mkdir()
+    schreibe_png(cache.verzeichnis / f"{cache._quell_hash(svg)}-{breite_px}x{hoehe_px}.png", groesse=(400, 100))
+
+    logo = BlockVorlagen(bild_dpi=150, logo_cache=cache).svg_logo(svg, *LOGO_GROESSE)
+
+    assert isinstance(logo, Image)
+    assert logo.wrap(1000, 1000) == pytest.approx((LOGO_GROESSE[0], LOGO_GROESSE[0] / 4))
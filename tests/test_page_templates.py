@@ -0,0 +1,52 @@
+"""
+Tests für die laufende Kopf- und Fusszeile der Reiseplan-Seiten.
+"""
+
+import json
+
+import pytest
+
+from generator.core import ReiseplanGenerator
+
+# Optional, nur zum Auslesen der erstellten PDFs
+pymupdf = pytest.importorskip("pymupdf")
+
+
+def schreibe_plan(pfad, aktivitaeten=30):
+    """
+    Schreibt einen Reiseplan, dessen Ablauf und Aktivitäten mehrere Seiten umfassen.
+    """
+    termine = []
+    for nummer in range(aktivitaeten):
+        tag = f"2025-05-{15 + nummer // 6:02d}"
+        stunde = 9 + nummer % 6
+        termine.append({"name": f"Termin {nummer}", "datum": tag, "ort": "Büro",
+                        "startzeit": f"{tag}T{stunde:02d}:00:00", "endzeit": f"{tag}T{stunde:02d}:45:00"})
+    daten = {"titel": "Seitenrahmen", "startdatum": "2025-05-15", "enddatum": "2025-05-20",
+             "reiseziel": "Berlin", "reisende": ["Anna Beispiel"], "aktivitaeten": termine}
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+def test_seitenzahlen_kopf_und_fusszeile(tmp_path):
+    generator = ReiseplanGenerator(linearisiert=False)
+    reiseplan_daten = generator.lade_reiseplan(schreibe_plan(tmp_path / "plan.json"))
+
+    with pymupdf.open(stream=generator.rendere_pdf_daten(reiseplan_daten), filetype="pdf") as pdf:
+        seiten = pdf.page_count
+        assert seiten > 2
+        formulare = {}
+        for index, seite in enumerate(pdf):
+            text = " ".join(seite.get_text().split())
+            assert f"Seite {index + 1} von {seiten}" in text
+            assert "15.05.2025 - 20.05.2025" in text
+            namen = {name: xref for xref, name, _, _ in seite.get_xobjects()}
+            # Die erste Seite hat den grossen Header und keine Kopfzeile
+            assert ("FormXob.ReiseplanKopfzeile" in namen) == (index > 0)
+            for name, xref in namen.items():
+                formulare.setdefault(name, set()).add(xref)
+
+    # Jedes Formular ist einmal im Dokument enthalten und wird auf allen Seiten referenziert
+    assert sorted(formulare) == ["FormXob.ReiseplanFusszeile", "FormXob.ReiseplanKopfzeile",
+                                 "FormXob.ReiseplanSeitenzahl"]
+    assert all(len(xrefs) == 1 for xrefs in formulare.values())
@@ -0,0 +1,100 @@
+"""
+Tests für die Linearisierung erzeugter PDFs ("Fast Web View").
+"""
+
+import io
+import json
+import logging
+import os
+
+import pytest
+
+from generator.core import ReiseplanGenerator
+from generator.utils import pdf_utils
+from generator.utils.pdf_utils import linearisiere, linearisierung_verfuegbar
+
+
+def schreibe_plan(pfad):
+    daten = {
+        "titel": "Webansicht", "startdatum": "2025-05-15", "enddatum": "2025-05-16",
+        "reiseziel": "Berlin", "reisende": ["Anna Beispiel"],
+        "aktivitaeten": [{"name": "Termin", "datum": "2025-05-15", "ort": "Büro",
+                          "startzeit": "2025-05-15T09:00:00", "endzeit": "2025-05-15T10:00:00"}]
+    }
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+def schreibe_qpdf(verzeichnis, exit_code):
+    """
+    Legt ein Ersatz-qpdf an, das seine Argumente protokolliert und die Eingabe kopiert.
+    """
+    verzeichnis.mkdir()
+    qpdf = verzeichnis / "qpdf"
+    qpdf.write_text(
+        "#!/bin/sh\n"
+        f'echo "$@" > "{verzeichnis / "aufruf"}"\n'
+        'cp "$2" "$3"\n'
+        'echo "qpdf: Warnung" >&2\n'
+        f"exit {exit_code}\n",
+        encoding="utf-8"
+    )
+    qpdf.chmod(0o755)
+    return verzeichnis
+
+
+@pytest.fixture
+def ohne_pikepdf(monkeypatch):
+    monkeypatch.setattr(pdf_utils, "_pikepdf", lambda: None)
+
+
+def test_linearisiert_mit_pikepdf(tmp_path):
+    pikepdf = pytest.importorskip("pikepdf")
+    generator = ReiseplanGenerator(linearisiert=True)
+    assert generator.linearisiert
+    reiseplan_daten = generator.lade_reiseplan(schreibe_plan(tmp_path / "plan.json"))
+
+    pdf_pfad = tmp_path / "plan.pdf"
+    assert generator.rendere_reiseplan(reiseplan_daten, pdf_pfad=pdf_pfad) == str(pdf_pfad)
+    pdf_daten = generator.rendere_pdf_daten(reiseplan_daten)
+
+    with pikepdf.open(pdf_pfad) as pdf:
+        assert pdf.is_linearized
+        assert pdf.check_pdf_syntax() == []
+    with pikepdf.open(io.BytesIO(pdf_daten)) as pdf:
+        assert pdf.is_linearized
+    # Die temporäre Datei wurde an Ort und Stelle ersetzt
+    assert sorted(pfad.name for pfad in tmp_path.iterdir()) == ["plan.json", "plan.pdf"]
+
+
+@pytest.mark.parametrize("exit_code", [0, 3])
+def test_qpdf_als_ausweichloesung(tmp_path, monkeypatch, ohne_pikepdf, exit_code):
+    bin_verzeichnis = schreibe_qpdf(tmp_path / "bin", exit_code)
+    monkeypatch.setenv("PATH", f"{bin_verzeichnis}{os.pathsep}{os.environ['PATH']}")
+
+    assert linearisierung_verfuegbar()
+    assert linearisiere(b"%PDF-1.4 Inhalt") == b"%PDF-1.4 Inhalt"
+    assert (tmp_path / "bin" / "aufruf").read_text().startswith("--linearize ")
+
+
+def test_qpdf_fehler(tmp_path, monkeypatch, ohne_pikepdf):
+    bin_verzeichnis = schreibe_qpdf(tmp_path / "bin", 2)
+    monkeypatch.setenv("PATH", f"{bin_verzeichnis}{os.pathsep}{os.environ['PATH']}")
+
+    with pytest.raises(RuntimeError, match="qpdf fehlgeschlagen: qpdf: Warnung"):
+        linearisiere(b"%PDF-1.4")
+
+
+def test_ohne_werkzeug_wird_nicht_linearisiert(tmp_path, monkeypatch, ohne_pikepdf, caplog):
+    monkeypatch.setenv("PATH", str(tmp_path))
+
+    assert not linearisierung_verfuegbar()
+    with pytest.raises(RuntimeError, match="pikepdf oder qpdf"):
+        linearisiere(b"%PDF-1.4")
+
+    with caplog.at_level(logging.WARNING):
+        generator = ReiseplanGenerator(linearisiert=True)
+    assert not generator.linearisiert
+    assert "werden nicht linearisiert" in caplog.text
+    reiseplan_daten = generator.lade_reiseplan(schreibe_plan(tmp_path / "plan.json"))
+    assert generator.rendere_pdf_daten(reiseplan_daten).startswith(b"%PDF")
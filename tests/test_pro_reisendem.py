@@ -0,0 +1,151 @@
+"""
+Tests für die persönlichen Reisepläne pro Reisendem.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from generator import core
+from generator.config import OUTPUT_DIR
+from generator.core import ReiseplanGenerator, ReisendeFehlen
+from generator.utils.pdf_utils import PdfTeil
+
+
+def schreibe_plan(pfad, reisende, aktivitaeten=30):
+    """
+    Schreibt einen Reiseplan mit so vielen Aktivitäten, dass der Ablauf mehrere Seiten umfasst.
+    """
+    termine = []
+    for nummer in range(aktivitaeten):
+        tag = f"2025-05-{15 + nummer // 6:02d}"
+        stunde = 9 + nummer % 6
+        termine.append({
+            "name": f"Termin {nummer}", "datum": tag, "ort": "Büro",
+            "startzeit": f"{tag}T{stunde:02d}:00:00", "endzeit": f"{tag}T{stunde:02d}:45:00"
+        })
+    daten = {
+        "titel": "Gruppenreise", "startdatum": "2025-05-15", "enddatum": "2025-05-20",
+        "reiseziel": "Berlin", "reisende": reisende, "aktivitaeten": termine
+    }
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+@pytest.fixture
+def generator():
+    return ReiseplanGenerator(linearisiert=False)
+
+
+def _flowables(elemente):
+    """
+    Liefert alle Flowables einer Story einschliesslich des Inhalts von KeepTogether.
+    """
+    for element in elemente:
+        yield element
+        yield from _flowables(getattr(element, "_content", []))
+
+
+def test_keine_flowables_ueber_mehrere_dokumente_geteilt(generator, tmp_path, monkeypatch):
+    # ReportLab legt Layout-Zustand (z.B. _postponed) auf den Flowables ab und setzt ihn nie zurück
+    plan = schreibe_plan(tmp_path / "plan.json", ["Anna Beispiel", "Ben Muster"])
+    storys = []
+    baue_pdf = generator._baue_pdf
+
+    def aufzeichnen(pdf_pfad, elemente, *args, **kwargs):
+        # Die Flowables selbst festhalten, damit ihre id() nicht neu vergeben wird
+        storys.append(list(_flowables(elemente)))
+        return baue_pdf(pdf_pfad, elemente, *args, **kwargs)
+
+    monkeypatch.setattr(generator, "_baue_pdf", aufzeichnen)
+    generator.generiere_reiseplaene_pro_reisendem(plan)
+
+    assert len(storys) == 2
+    assert not {id(flowable) for flowable in storys[0]} & {id(flowable) for flowable in storys[1]}
+
+
+def test_mehrseitiger_ablauf_fuer_jeden_reisenden(generator, tmp_path):
+    plan = schreibe_plan(tmp_path / "plan.json", ["Anna Beispiel", "Ben Muster"])
+
+    pdf_pfade = generator.generiere_reiseplaene_pro_reisendem(plan)
+
+    assert len(pdf_pfade) == 2
+    seiten = [PdfTeil(open(pfad, "rb").read()).seiten for pfad in pdf_pfade]
+    assert seiten[0] > 3
+    assert seiten[0] == seiten[1]
+
+
+def test_sichere_und_eindeutige_dateinamen(generator, tmp_path):
+    plan = schreibe_plan(tmp_path / "plan.json", ["Anna Beispiel", "B/C Test", "Anna Beispiel"], aktivitaeten=3)
+
+    pdf_pfade = generator.generiere_reiseplaene_pro_reisendem(plan)
+
+    assert [Path(pfad).name for pfad in pdf_pfade] == [
+        "Gruppenreise-Anna-Beispiel.pdf", "Gruppenreise-B-C-Test.pdf", "Gruppenreise-Anna-Beispiel-2.pdf"
+    ]
+    assert all(Path(pfad).parent == OUTPUT_DIR for pfad in pdf_pfade)
+
+
+def test_fehlender_reisender_wird_gemeldet(generator, tmp_path, monkeypatch):
+    plan = schreibe_plan(tmp_path / "plan.json", ["Anna Beispiel", "Ben Muster"], aktivitaeten=3)
+    baue_pdf = generator._baue_pdf
+    monkeypatch.setattr(generator, "_baue_pdf",
+                        lambda pdf_pfad, *args, **kwargs: None if "Ben" in str(pdf_pfad)
+                        else baue_pdf(pdf_pfad, *args, **kwargs))
+
+    with pytest.raises(ReisendeFehlen) as fehler:
+        generator.generiere_reiseplaene_pro_reisendem(plan)
+
+    assert [Path(pfad).name for pfad in fehler.value.pdf_pfade] == ["Gruppenreise-Anna-Beispiel.pdf"]
+
+
+def _zaehle_aufrufe(monkeypatch, modul, name):
+    """
+    Ersetzt eine Funktion durch eine zählende Hülle und liefert die Liste der Aufrufe.
+    """
+    aufrufe = []
+    funktion = getattr(modul, name)
+
+    def zaehlen(*args, **kwargs):
+        aufrufe.append(args)
+        return funktion(*args, **kwargs)
+
+    monkeypatch.setattr(modul, name, zaehlen)
+    return aufrufe
+
+
+def test_zeitplan_einmal_fuer_alle_reisenden(generator, tmp_path, monkeypatch):
+    plan = schreibe_plan(tmp_path / "plan.json", ["Anna Beispiel", "Ben Muster", "Cleo Test"], aktivitaeten=6)
+    zeitplaene = _zaehle_aufrufe(monkeypatch, core, "erstelle_zeitplan")
+    konflikte = _zaehle_aufrufe(monkeypatch, core, "finde_konflikte")
+
+    assert len(generator.generiere_reiseplaene_pro_reisendem(plan)) == 3
+    assert len(zeitplaene) == len(konflikte) == 1
+
+
+def test_ohne_reisende_ein_gemeinsames_pdf_ohne_erneutes_laden(generator, tmp_path, monkeypatch):
+    plan = schreibe_plan(tmp_path / "plan.json", [], aktivitaeten=3)
+    geladen = _zaehle_aufrufe(monkeypatch, core, "lade_json_reiseplan")
+
+    pdf_pfade = generator.generiere_reiseplaene_pro_reisendem(plan)
+
+    assert [Path(pfad).name for pfad in pdf_pfade] == ["Gruppenreise.pdf"]
+    assert len(geladen) == 1
+
+
+def test_cli_endet_mit_fehler_bei_fehlendem_reisenden(tmp_path, monkeypatch):
+    import cli
+
+    plan = schreibe_plan(tmp_path / "plan.json", ["Anna Beispiel", "Ben Muster"], aktivitaeten=3)
+    baue_pdf = ReiseplanGenerator._baue_pdf
+    monkeypatch.setattr(ReiseplanGenerator, "_baue_pdf",
+                        lambda self, pdf_pfad, *args, **kwargs: None if "Ben" in str(pdf_pfad)
+                        else baue_pdf(self, pdf_pfad, *args, **kwargs))
+    monkeypatch.setattr(sys, "argv", ["cli.py", str(plan), "--pro-reisendem"])
+
+    with pytest.raises(SystemExit) as beendet:
+        cli.main()
+
+    assert beendet.value.code == 1
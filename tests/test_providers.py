@@ -0,0 +1,123 @@
+"""
+Tests für die gestaffelten Anfragen über mehrere Flugdaten-Provider.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from generator.apis.flight_api import FlightAPIException
+from generator.apis.providers import FlugdatenProvider, HedgingAbrufer
+
+
+class Provider(FlugdatenProvider):
+    """Provider mit vorgegebener Token-Wartezeit, Antwortzeit, p95 und Antwort."""
+
+    def __init__(self, name, token_wartezeit=0.0, antwortzeit=0.0, fehler=None, p95=None, token_fehler=None):
+        super().__init__("schluessel", "https://example.invalid")
+        self.name = name
+        self.token_wartezeit = token_wartezeit
+        self.antwortzeit = antwortzeit
+        self.fehler = fehler
+        self.p95_wert = p95
+        self.token_fehler = token_fehler
+        self.token_angefragt = threading.Event()
+        self.angefragt = threading.Event()
+
+    def p95(self):
+        return self.p95_wert
+
+    def warte_auf_token(self):
+        self.token_angefragt.set()
+        if self.token_fehler:
+            raise self.token_fehler
+        time.sleep(self.token_wartezeit)
+        return self.token_wartezeit
+
+    def frage_ab(self, flug_nr, flug_datum):
+        self.angefragt.set()
+        time.sleep(self.antwortzeit)
+        if self.fehler:
+            raise FlightAPIException(self.fehler)
+        return {"flugNr": flug_nr, "airline": self.name}
+
+
+class Zurueckhaltend(ThreadPoolExecutor):
+    """Führt nur die ersten Aufgaben aus; spätere bleiben als nicht gestartete Futures liegen."""
+
+    def __init__(self, gestartet):
+        super().__init__()
+        self.gestartet = gestartet
+        self.zurueckgehalten = []
+
+    def submit(self, fn, *args, **kwargs):
+        if self.gestartet:
+            self.gestartet -= 1
+            return super().submit(fn, *args, **kwargs)
+        future = Future()
+        self.zurueckgehalten.append(future)
+        return future
+
+
+def test_wartezeit_am_rate_limit_loest_keine_absicherung_aus():
+    langsam = Provider("a", token_wartezeit=0.3, antwortzeit=0.05)
+    reserve = Provider("b")
+
+    flug = HedgingAbrufer([langsam, reserve], start_verzoegerung=0.1).hole("LX1234", "2025-05-15")
+
+    assert flug["airline"] == "a"
+    assert not reserve.angefragt.is_set()
+
+
+def test_absicherung_nach_verzoegerung_ab_anfrage():
+    langsam = Provider("a", antwortzeit=1.0)
+    reserve = Provider("b")
+
+    flug = HedgingAbrufer([langsam, reserve], start_verzoegerung=0.1).hole("LX1234", "2025-05-15")
+
+    assert flug["airline"] == "b"
+
+
+def test_fehlgeschlagener_provider_startet_naechsten_sofort():
+    # a scheitert nach der Absicherung durch b, während b noch läuft; c muss sofort folgen
+    erster = Provider("a", antwortzeit=0.15, fehler="HTTP 500")
+    zweiter = Provider("b", antwortzeit=2.0, p95=5.0)
+    dritter = Provider("c")
+
+    start = time.monotonic()
+    flug = HedgingAbrufer([erster, zweiter, dritter], start_verzoegerung=0.1).hole("LX1234", "2025-05-15")
+
+    assert flug["airline"] == "c"
+    assert time.monotonic() - start < 1.0
+
+
+def test_fehler_des_rate_limits_fragt_naechsten_provider_an():
+    gesperrt = Provider("a", token_fehler=OSError("Zustandsdatei nicht beschreibbar"))
+    reserve = Provider("b")
+
+    flug = HedgingAbrufer([gesperrt, reserve], start_verzoegerung=5.0).hole("LX1234", "2025-05-15")
+
+    assert flug["airline"] == "b"
+    assert not gesperrt.angefragt.is_set()
+
+
+def test_fehler_des_rate_limits_als_flight_api_exception():
+    gesperrt = Provider("a", token_fehler=OSError("Zustandsdatei nicht beschreibbar"))
+
+    try:
+        HedgingAbrufer([gesperrt]).hole("LX1234", "2025-05-15")
+    except FlightAPIException as e:
+        assert "Rate-Limit" in str(e)
+    else:
+        raise AssertionError("FlightAPIException erwartet")
+
+
+def test_wartende_anfragen_werden_nach_antwort_verworfen():
+    erster = Provider("a", antwortzeit=0.2)
+    zweiter = Provider("b")
+    abrufer = HedgingAbrufer([erster, zweiter], start_verzoegerung=0.05)
+    abrufer._executor = Zurueckhaltend(gestartet=2)
+
+    assert abrufer.hole("LX1234", "2025-05-15")["airline"] == "a"
+    assert [future.cancelled() for future in abrufer._executor.zurueckgehalten] == [True]
+    assert not zweiter.token_angefragt.is_set()
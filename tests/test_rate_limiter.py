@@ -0,0 +1,88 @@
+"""
+Tests für den prozessübergreifenden Token-Bucket der Flugdaten-Provider.
+"""
+
+import multiprocessing
+
+import pytest
+
+from generator.apis import rate_limiter
+from generator.apis.rate_limiter import TokenBucket, flight_api_bucket, flight_api_metriken
+
+
+class Uhr:
+    """Einstellbare Uhr statt time.time()."""
+
+    def __init__(self):
+        self.jetzt = 1_000_000.0
+
+    def __call__(self):
+        return self.jetzt
+
+
+@pytest.fixture
+def uhr(monkeypatch):
+    uhr = Uhr()
+    monkeypatch.setattr(rate_limiter.time, "time", uhr)
+    return uhr
+
+
+def test_reservierung_ueber_burst_wartet_gestaffelt(tmp_path, uhr):
+    bucket = TokenBucket(tmp_path / "bucket", rate=10, burst=2)
+
+    wartezeiten = [bucket._reserviere() for _ in range(5)]
+
+    # Der Füllstand wird negativ; jeder weitere Aufrufer wartet einen Token länger
+    assert wartezeiten == pytest.approx([0.0, 0.0, 0.1, 0.2, 0.3])
+
+
+def test_nachfuellen_bis_zum_burst(tmp_path, uhr):
+    bucket = TokenBucket(tmp_path / "bucket", rate=10, burst=2)
+    for _ in range(4):
+        bucket._reserviere()
+
+    uhr.jetzt += 0.3
+    assert bucket._reserviere() == 0.0
+    uhr.jetzt += 60
+    assert [bucket._reserviere() for _ in range(3)] == pytest.approx([0.0, 0.0, 0.1])
+
+
+def test_zustandsdatei_wird_zwischen_prozessen_geteilt(tmp_path, uhr):
+    pfad = tmp_path / "bucket"
+    # Die Uhr wird per fork an den anderen Prozess vererbt
+    prozess = multiprocessing.get_context("fork").Process(
+        target=lambda: [TokenBucket(pfad, rate=10, burst=3)._reserviere() for _ in range(3)]
+    )
+    prozess.start()
+    prozess.join(10)
+    assert prozess.exitcode == 0
+
+    assert TokenBucket(pfad, rate=10, burst=3)._reserviere() == pytest.approx(0.1)
+
+
+def test_erwerbe_wartet_und_zaehlt(tmp_path, uhr, monkeypatch):
+    geschlafen = []
+    monkeypatch.setattr(rate_limiter.time, "sleep", geschlafen.append)
+    bucket = TokenBucket(tmp_path / "bucket", rate=4, burst=1)
+
+    assert [bucket.erwerbe() for _ in range(3)] == [0.0, 0.25, 0.5]
+    assert geschlafen == [0.25, 0.5]
+    assert bucket.metriken() == {"anfragen": 3, "gewartet": 2, "wartezeit_gesamt": 0.75, "wartezeit_max": 0.5}
+
+
+def test_rate_null_schaltet_rate_limit_ab(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "FLIGHT_API_RATE", 0)
+
+    assert flight_api_bucket() is None
+    assert flight_api_bucket("opensky") is None
+    assert flight_api_metriken() is None
+    with pytest.raises(ValueError):
+        TokenBucket(tmp_path / "bucket", rate=0, burst=1)
+
+
+def test_eigene_zustandsdatei_pro_provider():
+    standard, opensky = flight_api_bucket(), flight_api_bucket("opensky")
+
+    assert flight_api_bucket() is standard
+    assert standard.zustand_pfad.name == "flight_api.bucket"
+    assert opensky.zustand_pfad.name == "flight_api.opensky.bucket"
@@ -0,0 +1,69 @@
+"""
+Tests für die Reihenfolge der Render-Aufträge nach Priorität und Abreise.
+"""
+
+import json
+
+from generator.scheduling import abreise, frist, plane_reiseplaene
+
+
+def _plaene(tmp_path, plaene):
+    reiseplaene = []
+    for kennung, daten in plaene.items():
+        datei = tmp_path / kennung
+        datei.write_text(daten if isinstance(daten, str) else json.dumps(daten), encoding="utf-8")
+        reiseplaene.append((datei, kennung))
+    return reiseplaene
+
+
+def _flug(code, abflug_zeit):
+    return {"flugNr": "LX1", "flugDatum": abflug_zeit[:10], "abflugCode": code, "abflugZeit": abflug_zeit}
+
+
+def test_frueheste_abreise_zuerst(tmp_path):
+    reiseplaene = _plaene(tmp_path, {
+        "juni.json": {"startdatum": "2025-06-01"},
+        "kaputt.json": "{kein json",
+        "mai-nachmittag.json": {"startdatum": "2025-05-01", "fluege": [_flug("ZRH", "2025-05-15T16:00:00")]},
+        "mai-morgen.json": {"startdatum": "2025-05-20", "fluege": [_flug("ZRH", "2025-05-20T07:00:00"),
+                                                                  _flug("ZRH", "2025-05-15T08:00:00")]},
+    })
+
+    geordnet, planung = plane_reiseplaene(reiseplaene)
+
+    assert [kennung for _, kennung in geordnet] == ["mai-morgen.json", "mai-nachmittag.json", "juni.json",
+                                                   "kaputt.json"]
+    assert planung["kaputt.json"] == {"prioritaet": 0, "abreise": None, "frist": None}
+
+
+def test_abflugzeit_in_zeitzone_des_abflughafens(tmp_path):
+    # 10:00 in Zürich (08:00 UTC) liegt vor 06:00 in New York (10:00 UTC)
+    reiseplaene = _plaene(tmp_path, {
+        "new-york.json": {"fluege": [_flug("JFK", "2025-05-15T06:00:00")]},
+        "zuerich.json": {"fluege": [_flug("ZRH", "2025-05-15T10:00:00")]},
+    })
+
+    geordnet, planung = plane_reiseplaene(reiseplaene)
+
+    assert [kennung for _, kennung in geordnet] == ["zuerich.json", "new-york.json"]
+    assert planung["new-york.json"]["abreise"] - planung["zuerich.json"]["abreise"] == 2 * 3600
+
+
+def test_prioritaet_vor_abreise_und_stabile_reihenfolge(tmp_path):
+    reiseplaene = _plaene(tmp_path, {
+        "b.json": {"startdatum": "2025-05-15"},
+        "a.json": {"startdatum": "2025-05-15"},
+        "dringend.json": {"startdatum": "2025-09-01", "prioritaet": 1},
+        "frueh.json": {"startdatum": "2025-05-01"},
+    })
+
+    geordnet, _ = plane_reiseplaene(reiseplaene)
+
+    assert [kennung for _, kennung in geordnet] == ["dringend.json", "frueh.json", "b.json", "a.json"]
+
+
+def test_frist_vor_abreise():
+    abreise_zeit = abreise({"fluege": [_flug("ZRH", "2025-05-15T10:00:00+02:00")]})
+
+    assert frist(abreise_zeit, 24) == abreise_zeit - 24 * 3600
+    assert frist(None) is None
@@ -0,0 +1,59 @@
+"""
+Tests für die Erstellung grosser Reisepläne in Abschnitten.
+"""
+
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from generator.core import ReiseplanGenerator
+from generator.sections import rendere_in_abschnitten, teile_in_abschnitte
+
+# Optional, nur zum Auslesen der zusammengefügten PDFs
+pymupdf = pytest.importorskip("pymupdf")
+
+
+@pytest.fixture
+def reiseplan_daten(tmp_path):
+    """
+    Reiseplan über drei Wochen mit Hotels, Aktivitäten und Zusatzinformationen.
+    """
+    aktivitaeten = []
+    for nummer in range(45):
+        tag = f"2025-05-{5 + nummer // 3:02d}"
+        stunde = 9 + 2 * (nummer % 3)
+        aktivitaeten.append({"name": f"Termin {nummer}", "datum": tag, "ort": "Büro",
+                             "startzeit": f"{tag}T{stunde:02d}:00:00", "endzeit": f"{tag}T{stunde:02d}:45:00"})
+    daten = {
+        "titel": "Roadshow", "startdatum": "2025-05-05", "enddatum": "2025-05-19", "reiseziel": "Berlin",
+        "reisende": ["Anna Beispiel"], "aktivitaeten": aktivitaeten,
+        "hotels": [{"name": "Hotel Adlon", "adresse": "Unter den Linden 77",
+                    "checkin": "2025-05-05T15:00:00", "checkout": "2025-05-19T11:00:00"}],
+        "zusatzinfo": {"notizen": "Gute Reise"},
+    }
+    pfad = tmp_path / "roadshow.json"
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return ReiseplanGenerator(linearisiert=False).lade_reiseplan(pfad)
+
+
+def test_seitenzahlen_und_lesezeichen_des_gesamtdokuments(reiseplan_daten):
+    generator = ReiseplanGenerator(linearisiert=False)
+    ziel = io.BytesIO()
+    with ThreadPoolExecutor(2) as executor:
+        seiten = rendere_in_abschnitten(generator, reiseplan_daten, ziel, 2, executor)
+
+    abschnitte = teile_in_abschnitte(reiseplan_daten)
+    with pymupdf.open(stream=ziel.getvalue(), filetype="pdf") as pdf:
+        assert pdf.page_count == seiten
+        for index, seite in enumerate(pdf):
+            assert f"Seite {index + 1} von {seiten}" in " ".join(seite.get_text().split())
+
+        lesezeichen = pdf.get_toc()
+        assert [titel for _, titel, _ in lesezeichen] == [abschnitt["titel"] for abschnitt in abschnitte]
+        erste_seiten = [seite for _, _, seite in lesezeichen]
+        assert erste_seiten[0] == 1
+        assert erste_seiten == sorted(set(erste_seiten))
+        # Jeder Abschnitt beginnt mit der Überschrift seines Inhalts auf der verlinkten Seite
+        assert "Zusätzliche Informationen" in pdf[erste_seiten[-1] - 1].get_text()
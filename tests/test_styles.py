@@ -0,0 +1,61 @@
+"""
+Tests für das geteilte Stylesheet und die Nutzung eines Generators aus mehreren Threads.
+"""
+
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from reportlab.lib.styles import getSampleStyleSheet
+
+from generator.core import ReiseplanGenerator
+from generator.styles import standard_styles
+
+# Dokument-ID und Zeitstempel unterscheiden sich bei jedem Lauf
+_VARIABEL = re.compile(rb"\[<[0-9a-f]{32}><[0-9a-f]{32}>\]|/(?:CreationDate|ModDate) \(D:[^)]*\)")
+
+
+def schreibe_plan(pfad, nummer):
+    """
+    Schreibt einen Reiseplan, dessen Umfang von der Nummer abhängt.
+    """
+    termine = []
+    for index in range(5 + 4 * nummer):
+        tag = f"2025-05-{15 + index // 6:02d}"
+        stunde = 9 + index % 6
+        termine.append({"name": f"Termin {nummer}.{index}", "datum": tag, "ort": "Büro",
+                        "startzeit": f"{tag}T{stunde:02d}:00:00", "endzeit": f"{tag}T{stunde:02d}:45:00"})
+    daten = {"titel": f"Reise {nummer}", "startdatum": "2025-05-15", "enddatum": "2025-05-20",
+             "reiseziel": "Berlin", "reisende": [f"Reisende {nummer}"], "aktivitaeten": termine}
+    pfad.write_text(json.dumps(daten), encoding="utf-8")
+    return pfad
+
+
+def ohne_zeitstempel(pdf_daten):
+    return _VARIABEL.sub(b"", pdf_daten)
+
+
+def test_styles_geteilt_und_schreibgeschuetzt():
+    styles = standard_styles()
+
+    assert standard_styles() is styles
+    with pytest.raises(TypeError):
+        styles["Normal"] = styles["Titel"]
+    # Das Beispiel-Stylesheet von ReportLab bleibt unverändert
+    assert styles["Normal"].fontName == "OpenSans"
+    assert getSampleStyleSheet()["Normal"].fontName == "Helvetica"
+
+
+def test_parallele_erstellung_wie_sequentiell(tmp_path):
+    generator = ReiseplanGenerator(linearisiert=False)
+    plaene = [generator.lade_reiseplan(schreibe_plan(tmp_path / f"plan{nummer}.json", nummer))
+              for nummer in range(4)]
+    sequentiell = [ohne_zeitstempel(generator.rendere_pdf_daten(daten)) for daten in plaene]
+
+    # Jeder Plan wird mehrfach gleichzeitig auf demselben Generator erstellt
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        parallel = list(executor.map(generator.rendere_pdf_daten, plaene * 8))
+
+    assert len(set(sequentiell)) == len(plaene)
+    assert [ohne_zeitstempel(pdf) for pdf in parallel] == sequentiell * 8
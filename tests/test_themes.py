@@ -0,0 +1,111 @@
+"""
+Tests für Theme-Registry, Theme-Dateien und die Block-Vorlagen pro Theme.
+"""
+
+import json
+import threading
+
+import pytest
+from reportlab.lib import colors
+
+from generator.config import FONTS_DIR
+from generator.core import ReiseplanGenerator
+from generator.themes import STANDARD_FARBEN, STANDARD_THEME, ThemeFehler, ThemeRegistry
+
+
+def schreibe_theme(verzeichnis, theme_id, **definition):
+    verzeichnis.mkdir(exist_ok=True)
+    (verzeichnis / f"{theme_id}.json").write_text(json.dumps(definition), encoding="utf-8")
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ThemeRegistry(tmp_path / "themes")
+
+
+@pytest.mark.parametrize("theme_id", ["../standard", "Acme", "acme.json", "-acme", "acme corp"])
+def test_ungueltige_theme_id(registry, theme_id):
+    with pytest.raises(ThemeFehler, match="Ungültige Theme-ID"):
+        registry.theme(theme_id)
+
+
+def test_unbekanntes_und_unlesbares_theme(registry):
+    with pytest.raises(ThemeFehler, match="Unbekanntes Theme"):
+        registry.theme("acme")
+
+    registry.verzeichnis.mkdir()
+    (registry.verzeichnis / "kaputt.json").write_text("{", encoding="utf-8")
+    with pytest.raises(ThemeFehler, match="nicht gelesen"):
+        registry.theme("kaputt")
+
+
+@pytest.mark.parametrize("wert", ["#12345", "blau", 42])
+def test_ungueltige_farbe(registry, wert):
+    schreibe_theme(registry.verzeichnis, "acme", farben={"titel": wert})
+
+    with pytest.raises(ThemeFehler, match="Ungültige Farbe 'titel'"):
+        registry.theme("acme")
+
+
+def test_fehlende_angaben_aus_dem_standard_theme(registry, caplog):
+    schreibe_theme(registry.verzeichnis, "acme", farben={"titel": "#003366", "hintergrund": "#ffffff"})
+
+    theme = registry.theme("acme")
+
+    assert theme.farben["titel"] == colors.HexColor("#003366")
+    assert {name: theme.farben[name] for name in ("label", "linie", "rahmen")} == {
+        name: STANDARD_FARBEN[name] for name in ("label", "linie", "rahmen")
+    }
+    assert (theme.schrift, theme.schrift_fett) == ("OpenSans", "OpenSans-Bold")
+    assert theme.styles["Titel"].textColor == colors.HexColor("#003366")
+    assert "unbekannte Farbe 'hintergrund'" in caplog.text
+    # Ohne ID gilt das Standard-Theme
+    assert registry.theme(None) is registry.theme(STANDARD_THEME)
+    assert registry.verfuegbare_themes() == ["acme", STANDARD_THEME]
+
+
+def test_schrift_relativ_zum_fonts_verzeichnis(registry):
+    schreibe_theme(registry.verzeichnis, "fett", schrift=str(FONTS_DIR / "OpenSans-Bold.ttf"))
+
+    theme = registry.theme("fett")
+
+    # Ohne fette Schrift gilt die Grundschrift für beide
+    assert (theme.schrift, theme.schrift_fett) == ("OpenSans-Bold", "OpenSans-Bold")
+
+
+def test_logo_null_und_fehlendes_logo(registry, caplog):
+    schreibe_theme(registry.verzeichnis, "ohne", logo=None)
+    schreibe_theme(registry.verzeichnis, "fehlt", logo="gibtsnicht.png")
+
+    assert registry.theme("ohne").logo is None
+    assert registry.theme("fehlt").logo is None
+    assert "gibtsnicht.png nicht gefunden" in caplog.text
+
+
+def test_theme_wird_einmal_kompiliert(registry):
+    schreibe_theme(registry.verzeichnis, "acme", farben={"linie": "#003366"})
+    themes = []
+    threads = [threading.Thread(target=lambda: themes.append(registry.theme("acme"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(theme) for theme in themes}) == 1
+
+
+def test_block_vorlagen_pro_theme(registry):
+    schreibe_theme(registry.verzeichnis, "acme", farben={"label": "#dce6f0"})
+    generator = ReiseplanGenerator(linearisiert=False)
+    generator.themes = registry
+
+    acme = generator.vorlagen_fuer({"theme": "acme"})
+    standard = generator.vorlagen_fuer({})
+
+    assert generator.vorlagen_fuer({"theme": "acme"}) is acme
+    assert acme is not standard
+    assert acme.theme.id == "acme" and standard.theme.id == STANDARD_THEME
+    hintergrund = [befehl for befehl in acme.detail_stil.getCommands() if befehl[0] == "BACKGROUND"]
+    assert hintergrund[0][3] == colors.HexColor("#dce6f0")
+    with pytest.raises(ThemeFehler):
+        generator.vorlagen_fuer({"theme": "gibtsnicht"})
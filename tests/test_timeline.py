@@ -0,0 +1,58 @@
+"""
+Tests für den chronologischen Ablauf und die Erkennung von Überschneidungen.
+"""
+
+from generator.timeline import erstelle_zeitplan, finde_konflikte
+
+
+def _titel(konflikte):
+    return [(frueher["titel"], spaeter["titel"]) for frueher, spaeter in konflikte]
+
+
+def test_ueberlappende_termine_derselben_gruppe():
+    termine = erstelle_zeitplan({
+        "fluege": [{"flugNr": "LX1234", "flugDatum": "2025-05-15", "abflugCode": "ZRH", "ankunftCode": "TXL",
+                    "abflugZeit": "2025-05-15T08:00:00", "ankunftZeit": "2025-05-15T09:30:00"}],
+        "aktivitaeten": [
+            {"name": "Frühstück", "datum": "2025-05-15", "startzeit": "09:00", "endzeit": "10:00"},
+            {"name": "Meeting", "datum": "2025-05-15", "startzeit": "09:45", "endzeit": "11:00"},
+            {"name": "Mittagessen", "datum": "2025-05-15", "startzeit": "11:00", "endzeit": "12:00"},
+        ],
+        "hotels": [{"name": "Hotel Adlon", "checkin": "2025-05-15T15:00:00", "checkout": "2025-05-16T11:00:00"}],
+    })
+
+    assert _titel(finde_konflikte(termine)) == [("Flug LX1234", "Frühstück"), ("Frühstück", "Meeting")]
+
+
+def test_hotels_nur_untereinander():
+    termine = erstelle_zeitplan({
+        "hotels": [
+            {"name": "Hotel A", "checkin": "2025-05-15T15:00:00", "checkout": "2025-05-17T11:00:00"},
+            {"name": "Hotel B", "checkin": "2025-05-16T15:00:00", "checkout": "2025-05-17T11:00:00"},
+        ],
+        "aktivitaeten": [{"name": "Abendessen", "datum": "2025-05-16", "startzeit": "19:00", "endzeit": "21:00"}],
+    })
+
+    assert _titel(finde_konflikte(termine)) == [("Hotel A", "Hotel B")]
+
+
+def test_termine_ohne_ende_oder_uhrzeit_ohne_konflikt():
+    termine = erstelle_zeitplan({
+        "aktivitaeten": [
+            {"name": "Ganztägig", "datum": "2025-05-15"},
+            {"name": "Offen", "datum": "2025-05-15", "startzeit": "09:00"},
+            {"name": "Rückwärts", "datum": "2025-05-15", "startzeit": "10:00", "endzeit": "09:00"},
+            {"name": "Workshop", "datum": "2025-05-15", "startzeit": "09:00", "endzeit": "12:00"},
+        ]
+    })
+
+    assert finde_konflikte(termine) == []
+
+
+def test_alle_paare_bei_mehrfacher_ueberlappung():
+    termine = erstelle_zeitplan({
+        "aktivitaeten": [{"name": f"Termin {nummer}", "datum": "2025-05-15",
+                          "startzeit": f"{9 + nummer:02d}:00", "endzeit": "18:00"} for nummer in range(4)]
+    })
+
+    assert len(finde_konflikte(termine)) == 6
@@ -0,0 +1,52 @@
+"""
+Tests für Neustarts abgestürzter Worker im vorgeladenen Worker-Pool.
+"""
+
+import multiprocessing
+import time
+
+from generator.worker_pool import VorgeladenerWorkerPool
+
+
+def absturz(generator):
+    raise RuntimeError("Fehler beim Start")
+
+
+class ErsteAbstuerze:
+    """Die ersten Aufrufe über alle Worker stürzen ab, danach beenden sich die Worker regulär."""
+
+    def __init__(self, anzahl):
+        # Wird per fork an die Worker vererbt
+        self.verbleibend = multiprocessing.get_context("fork").Value("i", anzahl)
+
+    def __call__(self, generator):
+        with self.verbleibend.get_lock():
+            if self.verbleibend.value > 0:
+                self.verbleibend.value -= 1
+                raise RuntimeError("Fehler beim Start")
+        return None
+
+
+def test_abgestuerzter_worker_mit_backoff_und_grenze(caplog):
+    pool = VorgeladenerWorkerPool(1, absturz, neustart_backoff=0.1, max_neustarts=2)
+
+    start = time.monotonic()
+    pool.starten()
+    pool.warten()
+
+    # Zwei Neustarts nach 0.1s und 0.2s, danach kein weiterer Fork
+    assert pool.abstuerze == [3]
+    assert time.monotonic() - start >= 0.3
+    assert "nicht mehr neu gestartet" in caplog.text
+
+
+def test_abstuerze_werden_pro_platz_gezaehlt(caplog):
+    # Beide Plätze stürzen je einmal ab; das zählt nicht als zwei Abstürze in Folge
+    pool = VorgeladenerWorkerPool(2, ErsteAbstuerze(2), neustart_backoff=0.05, max_neustarts=1)
+
+    pool.starten()
+    pool.warten()
+
+    assert pool.abstuerze == [0, 0]
+    assert "nicht mehr neu gestartet" not in caplog.text
+    assert caplog.text.count("neu (1/1)") == 2